@@ -10,7 +10,9 @@ from .coroutines import *
 from .events import *
 from .exceptions import *
 from .futures import *
+from .instrumentation import *
 from .locks import *
+from .multiloop import *
 from .protocols import *
 from .runners import *
 from .queues import *
@@ -28,7 +30,9 @@ __all__ = (base_events.__all__ +
            events.__all__ +
            exceptions.__all__ +
            futures.__all__ +
+           instrumentation.__all__ +
            locks.__all__ +
+           multiloop.__all__ +
            protocols.__all__ +
            runners.__all__ +
            queues.__all__ +
@@ -43,3 +47,9 @@ if sys.platform == 'win32':  # pragma: no cover
 else:
     from .unix_events import *  # pragma: no cover
     __all__ += unix_events.__all__
+    try:
+        from .uring_events import *
+    except ImportError:
+        pass
+    else:
+        __all__ += uring_events.__all__
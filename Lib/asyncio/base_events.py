@@ -273,6 +273,7 @@ class Server(events.AbstractServer):
         self._loop = loop
         self._sockets = sockets
         self._active_count = 0
+        self._clients = weakref.WeakSet()
         self._waiters = []
         self._protocol_factory = protocol_factory
         self._backlog = backlog
@@ -284,13 +285,15 @@ class Server(events.AbstractServer):
     def __repr__(self):
         return f'<{self.__class__.__name__} sockets={self.sockets!r}>'
 
-    def _attach(self):
+    def _attach(self, transport):
         assert self._sockets is not None
         self._active_count += 1
+        self._clients.add(transport)
 
-    def _detach(self):
+    def _detach(self, transport):
         assert self._active_count > 0
         self._active_count -= 1
+        self._clients.discard(transport)
         if self._active_count == 0 and self._sockets is None:
             self._wakeup()
 
@@ -398,6 +401,7 @@ class BaseEventLoop(events.AbstractEventLoop):
         self.slow_callback_duration = 0.1
         self._current_handle = None
         self._task_factory = None
+        self._instrumentation = None
         self._coroutine_origin_tracking_enabled = False
         self._coroutine_origin_tracking_saved_depth = None
 
@@ -453,6 +457,18 @@ class BaseEventLoop(events.AbstractEventLoop):
         """Return a task factory, or None if the default one is in use."""
         return self._task_factory
 
+    def set_instrumentation(self, instrumentation):
+        """Set the object collecting statistics about the event loop.
+
+        instrumentation is a LoopInstrumentation instance, or None to stop
+        collecting statistics.
+        """
+        self._instrumentation = instrumentation
+
+    def get_instrumentation(self):
+        """Return the LoopInstrumentation in use, or None."""
+        return self._instrumentation
+
     def _make_socket_transport(self, sock, protocol, waiter=None, *,
                                extra=None, server=None):
         """Create socket transport."""
@@ -1834,7 +1850,13 @@ class BaseEventLoop(events.AbstractEventLoop):
             when = self._scheduled[0]._when
             timeout = min(max(0, when - self.time()), MAXIMUM_SELECT_TIMEOUT)
 
-        event_list = self._selector.select(timeout)
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            t0 = self.time()
+            event_list = self._selector.select(timeout)
+            instrumentation._record_select(self.time() - t0)
+        else:
+            event_list = self._selector.select(timeout)
         self._process_events(event_list)
 
         # Handle 'later' callbacks that are ready.
@@ -1854,6 +1876,8 @@ class BaseEventLoop(events.AbstractEventLoop):
         # they will be run the next time (after another I/O poll).
         # Use an idiom that is thread-safe without using locks.
         ntodo = len(self._ready)
+        if instrumentation is not None:
+            instrumentation._record_iteration(ntodo)
         for i in range(ntodo):
             handle = self._ready.popleft()
             if handle._cancelled:
@@ -1864,11 +1888,18 @@ class BaseEventLoop(events.AbstractEventLoop):
                     t0 = self.time()
                     handle._run()
                     dt = self.time() - t0
+                    if instrumentation is not None:
+                        instrumentation._record_callback(handle, t0, dt)
                     if dt >= self.slow_callback_duration:
                         logger.warning('Executing %s took %.3f seconds',
                                        _format_handle(handle), dt)
                 finally:
                     self._current_handle = None
+            elif instrumentation is not None:
+                t0 = self.time()
+                handle._run()
+                instrumentation._record_callback(handle, t0,
+                                                 self.time() - t0)
             else:
                 handle._run()
         handle = None  # Needed to break cycles when an exception occurs.
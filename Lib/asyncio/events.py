@@ -572,6 +572,14 @@ class AbstractEventLoop:
     def set_debug(self, enabled):
         raise NotImplementedError
 
+    # Instrumentation.
+
+    def get_instrumentation(self):
+        raise NotImplementedError
+
+    def set_instrumentation(self, instrumentation):
+        raise NotImplementedError
+
 
 class AbstractEventLoopPolicy:
     """Abstract policy for accessing the event loop."""
@@ -0,0 +1,126 @@
+"""Lightweight statistics about the health of an event loop."""
+
+__all__ = 'LoopInstrumentation',
+
+import bisect
+import collections
+
+from . import base_events
+from . import events
+
+
+# Upper bounds, in seconds, of the buckets of the duration histograms.
+_DURATION_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+# Upper bounds of the buckets of the ready queue length histogram.
+_LENGTH_BOUNDS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class _Histogram:
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self):
+        # The last bucket counts the values greater than every bound.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0,
+            'max': self.max,
+            'buckets': list(zip(self.bounds + (float('inf'),), self.counts)),
+        }
+
+
+class LoopInstrumentation:
+    """Collect statistics about an event loop.
+
+    Install an instance with loop.set_instrumentation().  Unlike debug mode,
+    it does not capture tracebacks, so it is cheap enough to stay enabled in
+    production.  It records:
+
+    * the duration of every callback (which includes the steps of tasks);
+    * the lag of timers: how late a callback scheduled with call_later() or
+      call_at() starts compared to its scheduled time;
+    * the length of the ready queue at every iteration of the loop;
+    * the time spent waiting for I/O events in the selector.
+
+    Callbacks which take slow_callback_duration seconds or more are counted,
+    and the max_slow_callbacks most recent ones are kept with their duration.
+    """
+
+    def __init__(self, *, slow_callback_duration=0.1, max_slow_callbacks=10,
+                 duration_bounds=_DURATION_BOUNDS):
+        self.slow_callback_duration = slow_callback_duration
+        self._callbacks = _Histogram(duration_bounds)
+        self._lag = _Histogram(duration_bounds)
+        self._select = _Histogram(duration_bounds)
+        self._ready = _Histogram(_LENGTH_BOUNDS)
+        self._slow_count = 0
+        self._slow = collections.deque(maxlen=max_slow_callbacks)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} '
+                f'iterations={self._ready.count} '
+                f'callbacks={self._callbacks.count} '
+                f'slow_callbacks={self._slow_count}>')
+
+    def reset(self):
+        """Clear the statistics collected so far."""
+        for histogram in (self._callbacks, self._lag, self._select,
+                          self._ready):
+            histogram.reset()
+        self._slow_count = 0
+        self._slow.clear()
+
+    def snapshot(self):
+        """Return the statistics collected so far as a dict.
+
+        The 'callbacks', 'lag', 'select' (durations in seconds) and 'ready'
+        (queue lengths) entries are dicts with the 'count', 'total', 'mean'
+        and 'max' of the values, and their distribution in 'buckets': a list
+        of (upper bound, count) pairs.  'iterations' is the number of
+        iterations of the loop, 'slow_callbacks' the number of slow
+        callbacks, and 'recent_slow_callbacks' a list of (description,
+        duration) pairs.
+        """
+        return {
+            'iterations': self._ready.count,
+            'callbacks': self._callbacks.snapshot(),
+            'lag': self._lag.snapshot(),
+            'select': self._select.snapshot(),
+            'ready': self._ready.snapshot(),
+            'slow_callbacks': self._slow_count,
+            'recent_slow_callbacks': list(self._slow),
+        }
+
+    # The methods below are called by the event loop.
+
+    def _record_select(self, duration):
+        self._select.add(duration)
+
+    def _record_iteration(self, ready):
+        self._ready.add(ready)
+
+    def _record_callback(self, handle, start, duration):
+        self._callbacks.add(duration)
+        if isinstance(handle, events.TimerHandle):
+            self._lag.add(max(0, start - handle._when))
+        if duration >= self.slow_callback_duration:
+            self._slow_count += 1
+            if self._slow.maxlen:
+                self._slow.append(
+                    (base_events._format_handle(handle), duration))
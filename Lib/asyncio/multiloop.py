@@ -0,0 +1,442 @@
+"""Run a server in several event loops sharing its listening port."""
+
+__all__ = 'MultiLoopServer',
+
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+
+from . import base_events
+from . import events
+from . import protocols
+from . import runners
+from . import tasks
+from .log import logger
+
+
+class _Worker:
+
+    def __init__(self, index, runner, conn):
+        self.index = index
+        self.runner = runner  # a Thread or a Process
+        self.conn = conn
+
+    def __repr__(self):
+        return f'<_Worker index={self.index} runner={self.runner!r}>'
+
+    def request(self, *msg):
+        self.conn.send(msg)
+        return self.reply()
+
+    def reply(self):
+        status, value = self.conn.recv()
+        if status == 'error':
+            try:
+                raise value
+            finally:
+                # Break a reference cycle with the exception.
+                value = None
+        return value
+
+
+class MultiLoopServer:
+    """Serve connections with several event loops, in processes or threads.
+
+    Each worker runs its own event loop with asyncio.run() and accepts
+    connections on the host and port of the server.  When SO_REUSEPORT is
+    available, every worker listens on its own socket and the kernel spreads
+    the connections across them; otherwise the workers share one listening
+    socket.
+
+    The methods of MultiLoopServer are not coroutines: they are called from
+    the code which manages the server, outside of any event loop.
+    """
+
+    def __init__(self, protocol_factory, host=None, port=None, *,
+                 workers=None, use_threads=False, reuse_port=None,
+                 drain_timeout=None, debug=False,
+                 family=socket.AF_UNSPEC, flags=socket.AI_PASSIVE,
+                 reuse_address=None, backlog=100, ssl=None,
+                 ssl_handshake_timeout=None):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 0:
+            raise ValueError('workers must be greater than 0')
+        if reuse_port is None:
+            reuse_port = hasattr(socket, 'SO_REUSEPORT')
+        self._protocol_factory = protocol_factory
+        self._host = host
+        self._port = port
+        self._nworkers = workers
+        self._use_threads = use_threads
+        self._reuse_port = reuse_port
+        self._drain_timeout = drain_timeout
+        self._debug = debug
+        self._bind_options = dict(family=family, flags=flags,
+                                  reuse_address=reuse_address,
+                                  reuse_port=reuse_port)
+        self._server_options = dict(
+            backlog=backlog, ssl=ssl,
+            ssl_handshake_timeout=ssl_handshake_timeout)
+        self._sockets = None
+        self._workers = []
+        self._next_index = 0
+
+    def __repr__(self):
+        info = [self.__class__.__name__]
+        if self._sockets is not None:
+            info.append(f'sockets={self.sockets!r}')
+        info.append(f'workers={len(self._workers)}')
+        if self._use_threads:
+            info.append('threads')
+        return '<{}>'.format(' '.join(info))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def sockets(self):
+        """The sockets bound by the server, which reserve its addresses."""
+        if self._sockets is None:
+            return ()
+        return tuple(self._sockets)
+
+    def is_serving(self):
+        return bool(self._workers)
+
+    def start(self):
+        """Bind the server and start its workers.
+
+        Return once every worker is accepting connections.  If a worker fails
+        to start, stop the others and raise its exception.
+        """
+        if events._get_running_loop() is not None:
+            raise RuntimeError(
+                'MultiLoopServer.start() cannot be called from a running '
+                'event loop')
+        if self._sockets is not None:
+            raise RuntimeError(f'server {self!r} is already started')
+
+        self._sockets = self._bind()
+        error = None
+        try:
+            for _ in range(self._nworkers):
+                self._workers.append(self._start_worker())
+            for worker in self._workers:
+                try:
+                    worker.reply()
+                except EOFError:
+                    if error is None:
+                        error = RuntimeError(f'{worker!r} exited while '
+                                             f'starting')
+                except BaseException as exc:
+                    if error is None:
+                        error = exc
+        except BaseException as exc:
+            error = exc
+        if error is not None:
+            self.close(0)
+            try:
+                raise error
+            finally:
+                # Break a reference cycle with the exception.
+                error = None
+
+    def stats(self):
+        """Return a list of statistics, one dict per worker.
+
+        The dicts have the following keys: 'worker' (the index of the worker),
+        'pid', 'started' (the time.time() when the worker started),
+        'accepted' (the number of connections accepted) and 'active' (the
+        number of connections currently open).
+        """
+        return [worker.request('stats') for worker in self._workers]
+
+    def restart(self, timeout=None):
+        """Replace the workers by new ones, one at a time.
+
+        Each new worker accepts connections before the worker it replaces is
+        stopped, so the server keeps serving during the restart.  timeout is
+        the same as for close().
+        """
+        for old in list(self._workers):
+            new = self._start_worker()
+            new.reply()
+            self._workers[self._workers.index(old)] = new
+            self._stop_workers([old], timeout)
+
+    def close(self, timeout=None):
+        """Stop the workers and close the sockets of the server.
+
+        The workers stop accepting connections at once and exit when their
+        connections are closed, or after timeout seconds.  The default timeout
+        is the drain_timeout given to the constructor; None waits for all the
+        connections to close.
+        """
+        workers = self._workers
+        self._workers = []
+        try:
+            self._stop_workers(workers, timeout)
+        finally:
+            sockets = self._sockets
+            self._sockets = None
+            if sockets is not None:
+                for sock in sockets:
+                    sock.close()
+
+    def serve_forever(self):
+        """Start the server if needed and serve until SIGINT or SIGTERM.
+
+        SIGHUP restarts the workers, and workers which exit unexpectedly are
+        replaced.  The server is closed when this method returns.
+        """
+        if self._sockets is None:
+            self.start()
+
+        signals = queue.SimpleQueue()
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for name in ('SIGINT', 'SIGTERM', 'SIGHUP'):
+                signum = getattr(signal, name, None)
+                if signum is not None:
+                    handlers[signum] = signal.signal(
+                        signum, lambda signum, frame: signals.put(signum))
+        try:
+            while True:
+                try:
+                    signum = signals.get(timeout=1.0)
+                except queue.Empty:
+                    self._replace_dead_workers()
+                    continue
+                if signum == getattr(signal, 'SIGHUP', None):
+                    self.restart()
+                else:
+                    break
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            self.close()
+
+    def _bind(self):
+        # Let create_server() resolve and bind the addresses, but not listen:
+        # with SO_REUSEPORT, the sockets only reserve the addresses for the
+        # sockets of the workers.
+        loop = events.new_event_loop()
+        try:
+            server = loop.run_until_complete(loop.create_server(
+                protocols.Protocol, self._host, self._port,
+                start_serving=False, **self._bind_options))
+            try:
+                # Keep duplicates: closing the server closes its sockets.
+                return [sock.dup() for sock in server._sockets]
+            finally:
+                server.close()
+                loop.run_until_complete(server.wait_closed())
+        finally:
+            loop.close()
+
+    def _start_worker(self):
+        index = self._next_index
+        self._next_index += 1
+        if self._reuse_port:
+            listen = [(sock.family, sock.type, sock.proto, sock.getsockname())
+                      for sock in self._sockets]
+        else:
+            listen = self._sockets
+        # Imported here to not slow down "import asyncio".
+        import multiprocessing
+        conn, child_conn = multiprocessing.Pipe()
+        inherited = []
+        if not self._use_threads:
+            # Use the current start method, without fixing it for the
+            # whole program as the default context would.
+            method = (multiprocessing.get_start_method(allow_none=True) or
+                      multiprocessing.get_all_start_methods()[0])
+            context = multiprocessing.get_context(method)
+            if method == 'fork':
+                # A forked worker must not keep the pipes of the other
+                # workers open: they would not notice when the parent
+                # exits.
+                inherited = [worker.conn.fileno()
+                             for worker in self._workers]
+                inherited.append(conn.fileno())
+        args = (index, child_conn, self._protocol_factory, listen,
+                self._bind_options['reuse_address'], self._server_options,
+                self._debug, not self._use_threads, inherited)
+        if self._use_threads:
+            runner = threading.Thread(target=_run_worker, args=args,
+                                      name=f'MultiLoopServer-{index}',
+                                      daemon=True)
+        else:
+            runner = context.Process(target=_run_worker, args=args,
+                                     name=f'MultiLoopServer-{index}',
+                                     daemon=True)
+        runner.start()
+        if not self._use_threads:
+            child_conn.close()
+        return _Worker(index, runner, conn)
+
+    def _stop_workers(self, workers, timeout):
+        if timeout is None:
+            timeout = self._drain_timeout
+        # Drain the workers concurrently.
+        stopping = []
+        for worker in workers:
+            try:
+                worker.conn.send(('stop', timeout))
+            except OSError:
+                pass
+            else:
+                stopping.append(worker)
+        for worker in stopping:
+            try:
+                worker.reply()
+            except (EOFError, OSError):
+                # The worker already exited.
+                pass
+            except Exception:
+                logger.error('%r failed while stopping', worker,
+                             exc_info=True)
+        for worker in workers:
+            worker.runner.join()
+            worker.conn.close()
+
+    def _replace_dead_workers(self):
+        for i, worker in enumerate(self._workers):
+            if not worker.runner.is_alive():
+                logger.warning('%r exited unexpectedly, replacing it', worker)
+                worker.conn.close()
+                new = self._start_worker()
+                new.reply()
+                self._workers[i] = new
+
+
+def _bind_like(sock, reuse_address):
+    # Create a socket listening on the same address as sock, in the same
+    # SO_REUSEPORT group.
+    family, type, proto, address = sock
+    new = socket.socket(family, type, proto)
+    try:
+        if reuse_address is None:
+            reuse_address = os.name == 'posix'
+        if reuse_address:
+            new.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        base_events._set_reuseport(new)
+        if family == getattr(socket, 'AF_INET6', None):
+            new.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, True)
+        new.bind(address)
+    except BaseException:
+        new.close()
+        raise
+    return new
+
+
+def _run_worker(index, conn, protocol_factory, listen, reuse_address,
+                server_options, debug, in_process, inherited):
+    for fd in inherited:
+        os.close(fd)
+    if in_process:
+        # The process is stopped by the parent, not by signals sent to the
+        # whole process group.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for name in ('SIGTERM', 'SIGHUP'):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), signal.SIG_DFL)
+    try:
+        runners.run(_serve(index, conn, protocol_factory, listen,
+                           reuse_address, server_options),
+                    debug=debug)
+    except BaseException as exc:
+        from concurrent.futures.process import _ExceptionWithTraceback
+        error = _ExceptionWithTraceback(exc, exc.__traceback__)
+        # Break a reference cycle between the frames of the event loop and
+        # the failed task.
+        exc.__traceback__ = None
+        try:
+            conn.send(('error', error))
+        except Exception:
+            conn.send(('error', RuntimeError(f'worker {index} failed: '
+                                             f'{exc!r}')))
+    finally:
+        conn.close()
+
+
+async def _serve(index, conn, protocol_factory, listen, reuse_address,
+                 server_options):
+    loop = events.get_running_loop()
+    stats = {'worker': index, 'pid': os.getpid(), 'started': time.time(),
+             'accepted': 0, 'active': 0}
+
+    def factory():
+        stats['accepted'] += 1
+        return protocol_factory()
+
+    servers = []
+    try:
+        for sock in listen:
+            if isinstance(sock, socket.socket):
+                sock = sock.dup()
+            else:
+                sock = _bind_like(sock, reuse_address)
+            try:
+                server = await loop.create_server(factory, sock=sock,
+                                                  **server_options)
+            except:
+                sock.close()
+                raise
+            servers.append(server)
+
+        def get_stats():
+            stats['active'] = sum(server._active_count for server in servers)
+            return dict(stats)
+
+        conn.send(('ok', get_stats()))
+        while True:
+            try:
+                msg = await loop.run_in_executor(None, conn.recv)
+            except (EOFError, OSError):
+                # The parent exited.
+                msg = ('stop', 0)
+            if msg[0] == 'stats':
+                conn.send(('ok', get_stats()))
+            elif msg[0] == 'stop':
+                break
+            else:
+                conn.send(('error', ValueError(f'unknown request {msg!r}')))
+
+        await _drain(loop, servers, msg[1])
+        try:
+            conn.send(('ok', get_stats()))
+        except OSError:
+            pass
+    finally:
+        for server in servers:
+            server.close()
+
+
+async def _drain(loop, servers, timeout):
+    # Stop accepting connections, then wait until the open connections are
+    # closed.  Server.wait_closed() does not wait for the connections of a
+    # closed server, so register to the wakeup of the server instead.
+    waiters = []
+    for server in servers:
+        server.close()
+        if server._waiters is not None:
+            waiter = loop.create_future()
+            server._waiters.append(waiter)
+            waiters.append(waiter)
+    if waiters and timeout != 0:
+        await tasks.wait(waiters, timeout=timeout)
+    for server in servers:
+        for transport in list(server._clients):
+            transport.abort()
+    if waiters:
+        # Let the transports call connection_lost().
+        await tasks.wait(waiters)
@@ -1,7 +1,7 @@
 """Event loop using a proactor and related classes.
 
 A proactor is a "notify-on-completion" multiplexer.  Currently a
-proactor is only implemented on Windows with IOCP.
+proactor is implemented on Windows with IOCP and on Linux with io_uring.
 """
 
 __all__ = 'BaseProactorEventLoop',
@@ -9,6 +9,7 @@ __all__ = 'BaseProactorEventLoop',
 import io
 import os
 import socket
+import sys
 import warnings
 import signal
 import threading
@@ -62,7 +63,7 @@ class _ProactorBasePipeTransport(transports._FlowControlMixin,
         self._closing = False  # Set when close() called.
         self._eof_written = False
         if self._server is not None:
-            self._server._attach()
+            self._server._attach(self)
         self._loop.call_soon(self._protocol.connection_made, self)
         if waiter is not None:
             # only wake up the waiter when connection_made() has been called
@@ -158,13 +159,18 @@ class _ProactorBasePipeTransport(transports._FlowControlMixin,
             # end then it may fail with ERROR_NETNAME_DELETED if we
             # just close our end.  First calling shutdown() seems to
             # cure it, but maybe using DisconnectEx() would be better.
+            # On Linux, shutdown() fails if the socket is not connected.
             if hasattr(self._sock, 'shutdown'):
-                self._sock.shutdown(socket.SHUT_RDWR)
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    if sys.platform == 'win32':
+                        raise
             self._sock.close()
             self._sock = None
             server = self._server
             if server is not None:
-                server._detach()
+                server._detach(self)
                 self._server = None
 
     def get_write_buffer_size(self):
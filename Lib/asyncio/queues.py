@@ -70,6 +70,14 @@ class Queue:
                 waiter.set_result(None)
                 break
 
+    def _wakeup_many(self, waiters, count):
+        # Wake up the next count waiters that aren't cancelled.
+        while count and waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
     def __repr__(self):
         return f'<{type(self).__name__} at {id(self):#x} {self._format()}>'
 
@@ -119,26 +127,29 @@ class Queue:
         slot is available before adding item.
         """
         while self.full():
-            putter = self._loop.create_future()
-            self._putters.append(putter)
-            try:
-                await putter
-            except:
-                putter.cancel()  # Just in case putter is not done yet.
-                try:
-                    # Clean self._putters from canceled putters.
-                    self._putters.remove(putter)
-                except ValueError:
-                    # The putter could be removed from self._putters by a
-                    # previous get_nowait call.
-                    pass
-                if not self.full() and not putter.cancelled():
-                    # We were woken up by get_nowait(), but can't take
-                    # the call.  Wake up the next in line.
-                    self._wakeup_next(self._putters)
-                raise
+            await self._wait_for_slot()
         return self.put_nowait(item)
 
+    async def _wait_for_slot(self):
+        putter = self._loop.create_future()
+        self._putters.append(putter)
+        try:
+            await putter
+        except:
+            putter.cancel()  # Just in case putter is not done yet.
+            try:
+                # Clean self._putters from canceled putters.
+                self._putters.remove(putter)
+            except ValueError:
+                # The putter could be removed from self._putters by a
+                # previous get_nowait call.
+                pass
+            if not self.full() and not putter.cancelled():
+                # We were woken up by get_nowait(), but can't take
+                # the call.  Wake up the next in line.
+                self._wakeup_next(self._putters)
+            raise
+
     def put_nowait(self, item):
         """Put an item into the queue without blocking.
 
@@ -151,32 +162,78 @@ class Queue:
         self._finished.clear()
         self._wakeup_next(self._getters)
 
+    async def put_many(self, items):
+        """Put the items of an iterable into the queue.
+
+        If the queue is full, wait until free slots are available before
+        adding the remaining items.  Waiting getters are woken up once per
+        batch of items added, rather than once per item.
+
+        If the call is cancelled, the items added so far stay in the queue.
+        The item taken from the iterable while waiting for a free slot is
+        dropped, and the following items are left in the iterable.
+        """
+        added = 0
+        try:
+            for item in items:
+                if self.full():
+                    self._put_done(added)
+                    added = 0
+                    while self.full():
+                        await self._wait_for_slot()
+                self._put(item)
+                added += 1
+        finally:
+            self._put_done(added)
+
+    def put_many_nowait(self, items):
+        """Put the items of an iterable into the queue without blocking.
+
+        If there are not enough free slots for all the items, raise
+        QueueFull and add none of them.
+        """
+        items = list(items)
+        if 0 < self._maxsize < self.qsize() + len(items):
+            raise QueueFull
+        for item in items:
+            self._put(item)
+        self._put_done(len(items))
+
+    def _put_done(self, count):
+        if count:
+            self._unfinished_tasks += count
+            self._finished.clear()
+            self._wakeup_many(self._getters, count)
+
     async def get(self):
         """Remove and return an item from the queue.
 
         If queue is empty, wait until an item is available.
         """
         while self.empty():
-            getter = self._loop.create_future()
-            self._getters.append(getter)
-            try:
-                await getter
-            except:
-                getter.cancel()  # Just in case getter is not done yet.
-                try:
-                    # Clean self._getters from canceled getters.
-                    self._getters.remove(getter)
-                except ValueError:
-                    # The getter could be removed from self._getters by a
-                    # previous put_nowait call.
-                    pass
-                if not self.empty() and not getter.cancelled():
-                    # We were woken up by put_nowait(), but can't take
-                    # the call.  Wake up the next in line.
-                    self._wakeup_next(self._getters)
-                raise
+            await self._wait_for_item()
         return self.get_nowait()
 
+    async def _wait_for_item(self):
+        getter = self._loop.create_future()
+        self._getters.append(getter)
+        try:
+            await getter
+        except:
+            getter.cancel()  # Just in case getter is not done yet.
+            try:
+                # Clean self._getters from canceled getters.
+                self._getters.remove(getter)
+            except ValueError:
+                # The getter could be removed from self._getters by a
+                # previous put_nowait call.
+                pass
+            if not self.empty() and not getter.cancelled():
+                # We were woken up by put_nowait(), but can't take
+                # the call.  Wake up the next in line.
+                self._wakeup_next(self._getters)
+            raise
+
     def get_nowait(self):
         """Remove and return an item from the queue.
 
@@ -188,6 +245,36 @@ class Queue:
         self._wakeup_next(self._putters)
         return item
 
+    async def get_many(self, max_items=None):
+        """Remove and return a list of items from the queue.
+
+        If queue is empty, wait until an item is available.  Then return all
+        the available items, but no more than max_items if it is not None.
+        Waiting putters are woken up once per batch of items removed.
+        """
+        if max_items is not None and max_items <= 0:
+            raise ValueError('max_items must be greater than 0')
+        while self.empty():
+            await self._wait_for_item()
+        return self.get_many_nowait(max_items)
+
+    def get_many_nowait(self, max_items=None):
+        """Remove and return a list of items from the queue.
+
+        Return the available items, but no more than max_items if it is not
+        None.  Raise QueueEmpty if no item is immediately available.
+        """
+        if max_items is not None and max_items <= 0:
+            raise ValueError('max_items must be greater than 0')
+        if self.empty():
+            raise QueueEmpty
+        count = self.qsize()
+        if max_items is not None:
+            count = min(count, max_items)
+        items = [self._get() for _ in range(count)]
+        self._wakeup_many(self._putters, count)
+        return items
+
     def task_done(self):
         """Indicate that a formerly enqueued task is complete.
 
@@ -1,6 +1,6 @@
 __all__ = (
     'StreamReader', 'StreamWriter', 'StreamReaderProtocol',
-    'open_connection', 'start_server')
+    'BufferedStreamReaderProtocol', 'open_connection', 'start_server')
 
 import socket
 import sys
@@ -21,9 +21,14 @@ from .tasks import sleep
 
 _DEFAULT_LIMIT = 2 ** 16  # 64 KiB
 
+# Below this size, slicing the buffer is faster than copying it only once
+# through a memoryview.
+_COPY_THRESHOLD = 2 ** 12  # 4 KiB
+
 
 async def open_connection(host=None, port=None, *,
-                          loop=None, limit=_DEFAULT_LIMIT, **kwds):
+                          loop=None, limit=_DEFAULT_LIMIT, buffered=False,
+                          **kwds):
     """A wrapper for create_connection() returning a (reader, writer) pair.
 
     The reader returned is a StreamReader instance; the writer is a
@@ -34,8 +39,9 @@ async def open_connection(host=None, port=None, *,
     with various optional keyword arguments following.
 
     Additional optional keyword arguments are loop (to set the event loop
-    instance to use) and limit (to set the buffer limit passed to the
-    StreamReader).
+    instance to use), limit (to set the buffer limit passed to the
+    StreamReader) and buffered (to receive data with a
+    BufferedStreamReaderProtocol).
 
     (If you want to customize the StreamReader and/or
     StreamReaderProtocol classes, just copy the code -- there's
@@ -48,7 +54,7 @@ async def open_connection(host=None, port=None, *,
                       "and scheduled for removal in Python 3.10.",
                       DeprecationWarning, stacklevel=2)
     reader = StreamReader(limit=limit, loop=loop)
-    protocol = StreamReaderProtocol(reader, loop=loop)
+    protocol = _protocol_class(buffered)(reader, loop=loop)
     transport, _ = await loop.create_connection(
         lambda: protocol, host, port, **kwds)
     writer = StreamWriter(transport, protocol, reader, loop)
@@ -56,7 +62,8 @@ async def open_connection(host=None, port=None, *,
 
 
 async def start_server(client_connected_cb, host=None, port=None, *,
-                       loop=None, limit=_DEFAULT_LIMIT, **kwds):
+                       loop=None, limit=_DEFAULT_LIMIT, buffered=False,
+                       **kwds):
     """Start a socket server, call back for each client connected.
 
     The first parameter, `client_connected_cb`, takes two parameters:
@@ -72,8 +79,9 @@ async def start_server(client_connected_cb, host=None, port=None, *,
     following.  The return value is the same as loop.create_server().
 
     Additional optional keyword arguments are loop (to set the event loop
-    instance to use) and limit (to set the buffer limit passed to the
-    StreamReader).
+    instance to use), limit (to set the buffer limit passed to the
+    StreamReader) and buffered (to receive data with a
+    BufferedStreamReaderProtocol).
 
     The return value is the same as loop.create_server(), i.e. a
     Server object which can be used to stop the service.
@@ -85,10 +93,11 @@ async def start_server(client_connected_cb, host=None, port=None, *,
                       "and scheduled for removal in Python 3.10.",
                       DeprecationWarning, stacklevel=2)
 
+    protocol_class = _protocol_class(buffered)
+
     def factory():
         reader = StreamReader(limit=limit, loop=loop)
-        protocol = StreamReaderProtocol(reader, client_connected_cb,
-                                        loop=loop)
+        protocol = protocol_class(reader, client_connected_cb, loop=loop)
         return protocol
 
     return await loop.create_server(factory, host, port, **kwds)
@@ -98,7 +107,8 @@ if hasattr(socket, 'AF_UNIX'):
     # UNIX Domain Sockets are supported on this platform
 
     async def open_unix_connection(path=None, *,
-                                   loop=None, limit=_DEFAULT_LIMIT, **kwds):
+                                   loop=None, limit=_DEFAULT_LIMIT,
+                                   buffered=False, **kwds):
         """Similar to `open_connection` but works with UNIX Domain Sockets."""
         if loop is None:
             loop = events.get_event_loop()
@@ -107,14 +117,15 @@ if hasattr(socket, 'AF_UNIX'):
                           "and scheduled for removal in Python 3.10.",
                           DeprecationWarning, stacklevel=2)
         reader = StreamReader(limit=limit, loop=loop)
-        protocol = StreamReaderProtocol(reader, loop=loop)
+        protocol = _protocol_class(buffered)(reader, loop=loop)
         transport, _ = await loop.create_unix_connection(
             lambda: protocol, path, **kwds)
         writer = StreamWriter(transport, protocol, reader, loop)
         return reader, writer
 
     async def start_unix_server(client_connected_cb, path=None, *,
-                                loop=None, limit=_DEFAULT_LIMIT, **kwds):
+                                loop=None, limit=_DEFAULT_LIMIT,
+                                buffered=False, **kwds):
         """Similar to `start_server` but works with UNIX Domain Sockets."""
         if loop is None:
             loop = events.get_event_loop()
@@ -123,15 +134,22 @@ if hasattr(socket, 'AF_UNIX'):
                           "and scheduled for removal in Python 3.10.",
                           DeprecationWarning, stacklevel=2)
 
+        protocol_class = _protocol_class(buffered)
+
         def factory():
             reader = StreamReader(limit=limit, loop=loop)
-            protocol = StreamReaderProtocol(reader, client_connected_cb,
-                                            loop=loop)
+            protocol = protocol_class(reader, client_connected_cb, loop=loop)
             return protocol
 
         return await loop.create_unix_server(factory, path, **kwds)
 
 
+def _protocol_class(buffered):
+    if buffered:
+        return BufferedStreamReaderProtocol
+    return StreamReaderProtocol
+
+
 class FlowControlMixin(protocols.Protocol):
     """Reusable flow control logic for StreamWriter.drain().
 
@@ -324,6 +342,49 @@ class StreamReaderProtocol(FlowControlMixin, protocols.Protocol):
             closed.exception()
 
 
+class BufferedStreamReaderProtocol(StreamReaderProtocol,
+                                   protocols.BufferedProtocol):
+    """StreamReaderProtocol receiving data with the buffer protocol.
+
+    The transport receives data in a buffer reused for the whole connection
+    rather than in a new bytes object for each chunk, and straight in the
+    buffer of the caller when StreamReader.readinto() waits for data.
+    """
+
+    def __init__(self, stream_reader, client_connected_cb=None, loop=None):
+        super().__init__(stream_reader, client_connected_cb, loop=loop)
+        self._recv_buffer = None
+        self._recv_view = None
+
+    def get_buffer(self, sizehint):
+        reader = self._stream_reader
+        if reader is not None:
+            view = reader._get_readinto_buffer()
+            if view is not None:
+                self._recv_view = view
+                return view
+        if self._recv_buffer is None:
+            self._recv_buffer = memoryview(bytearray(_DEFAULT_LIMIT))
+        self._recv_view = self._recv_buffer
+        return self._recv_buffer
+
+    def buffer_updated(self, nbytes):
+        view = self._recv_view
+        self._recv_view = None
+        reader = self._stream_reader
+        if reader is None:
+            return
+        if view is self._recv_buffer:
+            reader.feed_data(view[:nbytes])
+        else:
+            reader._readinto_updated(nbytes)
+
+    def connection_lost(self, exc):
+        super().connection_lost(exc)
+        self._recv_buffer = None
+        self._recv_view = None
+
+
 class StreamWriter:
     """Wraps a Transport.
 
@@ -426,6 +487,8 @@ class StreamReader:
         self._exception = None
         self._transport = None
         self._paused = False
+        self._readinto_view = None  # Buffer of a waiting readinto()
+        self._readinto_nbytes = 0
         if self._loop.get_debug():
             self._source_traceback = format_helpers.extract_stack(
                 sys._getframe(1))
@@ -507,6 +570,31 @@ class StreamReader:
             else:
                 self._paused = True
 
+    def _get_readinto_buffer(self):
+        """Return the buffer of a waiting readinto(), or None.
+
+        A BufferedStreamReaderProtocol receives data straight in this
+        buffer, and then calls _readinto_updated().
+        """
+        if self._readinto_view is None or self._buffer or self._eof:
+            return None
+        return self._readinto_view
+
+    def _readinto_updated(self, nbytes):
+        self._readinto_view = None
+        self._readinto_nbytes = nbytes
+        self._wakeup_waiter()
+
+    def _consume(self, n):
+        """Remove the first n bytes of the buffer and return them."""
+        if n < _COPY_THRESHOLD:
+            data = bytes(self._buffer[:n])
+        else:
+            with memoryview(self._buffer) as view:
+                data = view[:n].tobytes()
+        del self._buffer[:n]
+        return data
+
     async def _wait_for_data(self, func_name):
         """Wait until feed_data() or feed_eof() is called.
 
@@ -652,10 +740,9 @@ class StreamReader:
             raise exceptions.LimitOverrunError(
                 'Separator is found, but chunk is longer than limit', isep)
 
-        chunk = self._buffer[:isep + seplen]
-        del self._buffer[:isep + seplen]
+        chunk = self._consume(isep + seplen)
         self._maybe_resume_transport()
-        return bytes(chunk)
+        return chunk
 
     async def read(self, n=-1):
         """Read up to `n` bytes from the stream.
@@ -701,12 +788,63 @@ class StreamReader:
             await self._wait_for_data('read')
 
         # This will work right even if buffer is less than n bytes
-        data = bytes(self._buffer[:n])
-        del self._buffer[:n]
+        data = self._consume(n)
 
         self._maybe_resume_transport()
         return data
 
+    async def readinto(self, buf):
+        """Read up to len(buf) bytes from the stream into buf.
+
+        Return the number of bytes read, which is at least one unless buf is
+        empty or the EOF was received before any byte is read.  buf must be
+        a writable bytes-like object.
+
+        Unlike read(), the data is only copied once, from the internal
+        buffer into buf.  When the stream is fed by a
+        BufferedStreamReaderProtocol and the internal buffer is empty, the
+        transport receives the data directly into buf.
+
+        If stream was paused, this function will automatically resume it if
+        needed.
+        """
+        if self._exception is not None:
+            raise self._exception
+
+        with memoryview(buf) as view:
+            if view.readonly:
+                raise TypeError('readinto() argument must be a writable '
+                                'bytes-like object')
+            with view.cast('B') as view:
+                if not view:
+                    return 0
+
+                if not self._buffer and not self._eof:
+                    self._readinto_view = view
+                    self._readinto_nbytes = 0
+                    try:
+                        await self._wait_for_data('readinto')
+                    except BaseException:
+                        if self._readinto_nbytes:
+                            # Cancelled after data was received in buf:
+                            # keep it for the next read.
+                            self._buffer[:0] = view[:self._readinto_nbytes]
+                        raise
+                    finally:
+                        self._readinto_view = None
+                        nbytes = self._readinto_nbytes
+                        self._readinto_nbytes = 0
+                    if nbytes:
+                        return nbytes
+
+                nbytes = min(len(view), len(self._buffer))
+                with memoryview(self._buffer) as data:
+                    view[:nbytes] = data[:nbytes]
+                del self._buffer[:nbytes]
+
+        self._maybe_resume_transport()
+        return nbytes
+
     async def readexactly(self, n):
         """Read exactly `n` bytes.
 
@@ -743,8 +881,7 @@ class StreamReader:
             data = bytes(self._buffer)
             self._buffer.clear()
         else:
-            data = bytes(self._buffer[:n])
-            del self._buffer[:n]
+            data = self._consume(n)
         self._maybe_resume_transport()
         return data
 
@@ -3,12 +3,13 @@
 __all__ = (
     'Task', 'create_task',
     'FIRST_COMPLETED', 'FIRST_EXCEPTION', 'ALL_COMPLETED',
-    'wait', 'wait_for', 'as_completed', 'sleep',
+    'wait', 'wait_for', 'as_completed', 'bounded_map', 'sleep',
     'gather', 'shield', 'ensure_future', 'run_coroutine_threadsafe',
     'current_task', 'all_tasks',
     '_register_task', '_unregister_task', '_enter_task', '_leave_task',
 )
 
+import collections
 import concurrent.futures
 import contextvars
 import functools
@@ -615,6 +616,114 @@ def as_completed(fs, *, loop=None, timeout=None):
         yield _wait_for_one()
 
 
+def bounded_map(func, iterable, *, limit, ordered=True,
+                return_exceptions=False):
+    """Run func() on the items of iterable, at most limit at a time.
+
+    This is an asynchronous generator; the proper way to use it is:
+
+        async for result in bounded_map(fetch, urls, limit=100):
+            # Use result.
+
+    iterable can be an iterable or an asynchronous iterable; it is consumed
+    lazily, as tasks complete.  func(item) must return an awaitable, which
+    is wrapped in a task.  At most limit tasks run at the same time.
+
+    If ordered is true (the default), results are yielded in the order of
+    iterable: completed results wait for the earlier ones, and count in the
+    limit.  Otherwise, results are yielded as soon as their task completes.
+
+    If return_exceptions is false (the default), the first failure is
+    propagated, after the other tasks are cancelled: the first one in the
+    order of iterable if ordered is true, the first one raised otherwise.
+    If it is true, exceptions are yielded like successful results.
+
+    The running tasks are cancelled when the generator is closed.
+    """
+    if limit <= 0:
+        raise ValueError('limit must be greater than 0')
+    return _bounded_map(func, iterable, limit, ordered, return_exceptions)
+
+
+async def _bounded_map(func, iterable, limit, ordered, return_exceptions):
+    loop = events.get_running_loop()
+    if hasattr(iterable, '__aiter__'):
+        aiterator = iterable.__aiter__()
+        iterator = None
+    else:
+        aiterator = None
+        iterator = iter(iterable)
+
+    pending = collections.deque()  # Tasks not yielded yet, in input order
+    done = collections.deque()  # Completed tasks, for ordered=False
+    waiter = None
+
+    def _on_completion(task):
+        if not ordered:
+            done.append(task)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _result(task):
+        if not return_exceptions:
+            return task.result()
+        if task.cancelled():
+            return exceptions.CancelledError()
+        exc = task.exception()
+        return task.result() if exc is None else exc
+
+    try:
+        while True:
+            # Start new tasks until the limit is reached.
+            while len(pending) < limit and (iterator or aiterator):
+                if iterator is not None:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        iterator = None
+                        break
+                else:
+                    try:
+                        item = await aiterator.__anext__()
+                    except StopAsyncIteration:
+                        aiterator = None
+                        break
+                task = ensure_future(func(item), loop=loop)
+                task.add_done_callback(_on_completion)
+                pending.append(task)
+
+            if ordered:
+                if not pending:
+                    return
+                if pending[0].done():
+                    yield _result(pending.popleft())
+                    continue
+            else:
+                if done:
+                    task = done.popleft()
+                    pending.remove(task)
+                    yield _result(task)
+                    continue
+                if not pending:
+                    return
+
+            waiter = loop.create_future()
+            try:
+                await waiter
+            finally:
+                waiter = None
+    finally:
+        for task in pending:
+            task.remove_done_callback(_on_completion)
+            task.cancel()
+        if pending:
+            await _wait(pending, None, ALL_COMPLETED, loop)
+            for task in pending:
+                if not task.cancelled():
+                    # Mark the exception as retrieved.
+                    task.exception()
+
+
 @types.coroutine
 def __sleep0():
     """Skip one event loop run cycle.
@@ -0,0 +1,404 @@
+"""Proactor event loop for Linux using io_uring."""
+
+import _uring
+import itertools
+import os
+import select
+import socket
+import sys
+import time
+import warnings
+
+from . import futures
+from . import proactor_events
+from . import unix_events
+from .log import logger
+from .unix_events import _UnixSelectorEventLoop
+
+
+__all__ = ('UringProactor', 'UringEventLoop', 'UringEventLoopPolicy')
+
+
+# Returned by the completion callback of an operation which was queued
+# again: the future is not done yet.
+_PENDING = object()
+
+
+class _UringFuture(futures.Future):
+    """Subclass of Future which represents an io_uring operation.
+
+    Cancelling it will immediately cancel the operation.
+    """
+
+    def __init__(self, proactor, *, loop=None):
+        super().__init__(loop=loop)
+        if self._source_traceback:
+            del self._source_traceback[-1]
+        self._proactor = proactor
+        self._key = None
+
+    def _repr_info(self):
+        info = super()._repr_info()
+        if self._key is not None:
+            info.insert(1, f'operation={self._key}')
+        return info
+
+    def cancel(self):
+        if self._key is not None and not self.done():
+            self._proactor._cancel(self._key)
+        self._key = None
+        return super().cancel()
+
+
+class _UringWritePipeTransport(proactor_events._ProactorWritePipeTransport):
+    """Write pipe transport noticing when the read end is closed.
+
+    Reading from the write end of a pipe fails on Linux: wait for the
+    pipe to be hung up instead.
+    """
+
+    def __init__(self, *args, **kw):
+        proactor_events._ProactorBaseWritePipeTransport.__init__(
+            self, *args, **kw)
+        self._read_fut = self._loop._proactor.wait_hangup(self._sock)
+        self._read_fut.add_done_callback(self._pipe_closed)
+
+
+class UringEventLoop(proactor_events.BaseProactorEventLoop):
+    """Linux version of proactor event loop using io_uring.
+
+    Adds signal handling, subprocess and UNIX Domain Socket support like
+    the Unix selector event loop.
+    """
+
+    def __init__(self, proactor=None):
+        if proactor is None:
+            proactor = UringProactor()
+        super().__init__(proactor)
+        self._signal_handlers = {}
+
+    def close(self):
+        super().close()
+        if not sys.is_finalizing():
+            for sig in list(self._signal_handlers):
+                self.remove_signal_handler(sig)
+        else:
+            if self._signal_handlers:
+                warnings.warn(f"Closing the loop {self!r} "
+                              f"on interpreter shutdown "
+                              f"stage, skipping signal handlers removal",
+                              ResourceWarning,
+                              source=self)
+                self._signal_handlers.clear()
+
+    def run_forever(self):
+        # Unlike with IOCP, the read of the self-pipe is kept pending when
+        # the loop stops: cancelling it could lose the number of a signal
+        # received in the meantime.
+        self._check_closed()
+        if self._self_reading_future is None:
+            self._loop_self_reading()
+        super().run_forever()
+
+    def _loop_self_reading(self, f=None):
+        if f is not None and not f.cancelled() and f.exception() is None:
+            # The signal numbers are written to the self-pipe.
+            self._process_self_data(f.result())
+        super()._loop_self_reading(f)
+
+    # Signals, child processes and UNIX Domain Sockets are handled exactly
+    # like in the selector event loop.
+    _process_self_data = _UnixSelectorEventLoop._process_self_data
+    add_signal_handler = _UnixSelectorEventLoop.add_signal_handler
+    _handle_signal = _UnixSelectorEventLoop._handle_signal
+    remove_signal_handler = _UnixSelectorEventLoop.remove_signal_handler
+    _check_signal = _UnixSelectorEventLoop._check_signal
+    _make_subprocess_transport = (
+        _UnixSelectorEventLoop._make_subprocess_transport)
+    _child_watcher_callback = _UnixSelectorEventLoop._child_watcher_callback
+    create_unix_connection = _UnixSelectorEventLoop.create_unix_connection
+    create_unix_server = _UnixSelectorEventLoop.create_unix_server
+
+    async def sock_connect(self, sock, address):
+        if sock.family != socket.AF_UNIX:
+            resolved = await self._ensure_resolved(
+                address, family=sock.family, proto=sock.proto, loop=self)
+            _, _, _, _, address = resolved[0]
+        return await self._proactor.connect(sock, address)
+
+    def _make_write_pipe_transport(self, sock, protocol, waiter=None,
+                                   extra=None):
+        return _UringWritePipeTransport(self, sock, protocol, waiter, extra)
+
+
+class UringProactor:
+    """Proactor implementation using io_uring.
+
+    Operations are queued in the submission queue of the ring and handed to
+    the kernel at once, together with the wait for completions, by a single
+    io_uring_enter() system call per event loop iteration.
+    """
+
+    def __init__(self, entries=256):
+        self._loop = None
+        self._results = []
+        self._ring = _uring.Ring(entries)
+        self._keys = itertools.count(1)
+        # key => (future, obj, callback, discard)
+        self._cache = {}
+
+    def _check_closed(self):
+        if self._ring is None:
+            raise RuntimeError('UringProactor is closed')
+
+    def __repr__(self):
+        info = ['operation#=%s' % len(self._cache),
+                'result#=%s' % len(self._results)]
+        if self._ring is None:
+            info.append('closed')
+        return '<%s %s>' % (self.__class__.__name__, " ".join(info))
+
+    def set_loop(self, loop):
+        self._loop = loop
+
+    def select(self, timeout=None):
+        # Always poll: queued operations are only submitted there.
+        self._poll(0 if self._results else timeout)
+        tmp = self._results
+        self._results = []
+        return tmp
+
+    def _result(self, value):
+        fut = self._loop.create_future()
+        fut.set_result(value)
+        return fut
+
+    def _submit(self, method, obj, callback, *args, fut=None, discard=None):
+        # Queue an operation of the ring.  callback(fut, result, data) is
+        # called with its completion and returns the result of the future,
+        # or _PENDING if it queued another operation for the same future.
+        # discard(result) is called instead if the future was already done,
+        # to release what the operation created.
+        self._check_closed()
+        key = next(self._keys)
+        method(key, *args)
+        if fut is None:
+            fut = _UringFuture(self, loop=self._loop)
+        fut._key = key
+        self._cache[key] = (fut, obj, callback, discard)
+        return fut
+
+    def _cancel(self, key):
+        if self._ring is not None:
+            self._ring.cancel(key)
+
+    def _call_when_ready(self, conn, events, func, *args, fut=None):
+        # Call func(*args) once conn is ready, polling again if it would
+        # still block.
+        def finish_poll(fut, revents, data):
+            try:
+                return func(*args)
+            except (BlockingIOError, InterruptedError):
+                self._call_when_ready(conn, events, func, *args, fut=fut)
+                return _PENDING
+
+        return self._submit(self._ring.poll, conn, finish_poll,
+                            conn.fileno(), events, fut=fut)
+
+    def _call_or_poll(self, conn, events, func, *args):
+        try:
+            value = func(*args)
+        except (BlockingIOError, InterruptedError):
+            return self._call_when_ready(conn, events, func, *args)
+        return self._result(value)
+
+    @staticmethod
+    def _finish_data(fut, result, data):
+        return data
+
+    @staticmethod
+    def _finish_count(fut, result, data):
+        return result
+
+    def recv(self, conn, nbytes, flags=0):
+        if isinstance(conn, socket.socket):
+            return self._submit(self._ring.recv, conn, self._finish_data,
+                                conn.fileno(), nbytes, flags)
+        return self._submit(self._ring.read, conn, self._finish_data,
+                            conn.fileno(), nbytes)
+
+    def recv_into(self, conn, buf, flags=0):
+        if isinstance(conn, socket.socket):
+            return self._submit(self._ring.recv_into, conn,
+                                self._finish_count, conn.fileno(), buf, flags)
+        return self._submit(self._ring.read_into, conn, self._finish_count,
+                            conn.fileno(), buf)
+
+    def recvfrom(self, conn, nbytes, flags=0):
+        return self._call_when_ready(conn, select.POLLIN,
+                                     conn.recvfrom, nbytes, flags)
+
+    def sendto(self, conn, buf, flags=0, addr=None):
+        if addr is None:
+            return self._call_or_poll(conn, select.POLLOUT,
+                                      conn.send, buf, flags)
+        return self._call_or_poll(conn, select.POLLOUT,
+                                  conn.sendto, buf, flags, addr)
+
+    def send(self, conn, buf, flags=0):
+        # Like IOCP, complete once the whole buffer was sent: queue the
+        # rest again after a partial write.
+        if isinstance(conn, socket.socket):
+            method = self._ring.send
+            args = (flags,)
+        else:
+            method = self._ring.write
+            args = ()
+        data = memoryview(buf).cast('B')
+        total = len(data)
+
+        def finish_send(fut, result, _):
+            nonlocal data
+            data = data[result:]
+            if data and result:
+                self._submit(method, conn, finish_send,
+                             conn.fileno(), data, *args, fut=fut)
+                return _PENDING
+            return total - len(data)
+
+        return self._submit(method, conn, finish_send,
+                            conn.fileno(), data, *args)
+
+    def accept(self, listener):
+        def finish_accept(fut, fd, data):
+            conn = socket.socket(listener.family, listener.type,
+                                 listener.proto, fileno=fd)
+            conn.settimeout(listener.gettimeout())
+            return conn, conn.getpeername()
+
+        return self._submit(self._ring.accept, listener, finish_accept,
+                            listener.fileno(), socket.SOCK_CLOEXEC,
+                            discard=os.close)
+
+    def connect(self, conn, address):
+        def finish_connect():
+            err = conn.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if err != 0:
+                raise OSError(err, f'Connect call failed {address}')
+
+        try:
+            conn.connect(address)
+        except (BlockingIOError, InterruptedError):
+            return self._call_when_ready(conn, select.POLLOUT,
+                                         finish_connect)
+        return self._result(None)
+
+    def sendfile(self, sock, file, offset, count):
+        total = count
+
+        def send():
+            nonlocal offset, count
+            while count:
+                sent = os.sendfile(sock.fileno(), file.fileno(),
+                                   offset, count)
+                if not sent:
+                    break  # EOF
+                offset += sent
+                count -= sent
+            return total - count
+
+        return self._call_or_poll(sock, select.POLLOUT, send)
+
+    def wait_hangup(self, pipe):
+        """Wait until the other end of a pipe is closed.
+
+        Return a Future object set with b'', like recv() at end of file.
+        """
+        def finish_poll(fut, revents, data):
+            return b''
+
+        # POLLERR and POLLHUP are always reported.
+        return self._submit(self._ring.poll, pipe, finish_poll,
+                            pipe.fileno(), 0)
+
+    def _poll(self, timeout=None):
+        if timeout is not None and timeout < 0:
+            raise ValueError("negative timeout")
+
+        for key, result, data in self._ring.submit(timeout):
+            try:
+                f, obj, callback, discard = self._cache.pop(key)
+            except KeyError:
+                if self._loop.get_debug():
+                    self._loop.call_exception_handler({
+                        'message': 'io_uring returned an unexpected event',
+                        'status': f'key={key} result={result}',
+                    })
+                continue
+
+            if f.done():
+                # The future was cancelled, but the operation may have
+                # completed anyway.
+                if result >= 0 and discard is not None:
+                    discard(result)
+                continue
+            if result < 0:
+                f.set_exception(OSError(-result, os.strerror(-result)))
+                self._results.append(f)
+                continue
+            try:
+                value = callback(f, result, data)
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except BaseException as e:
+                f.set_exception(e)
+                self._results.append(f)
+            else:
+                if value is not _PENDING:
+                    f.set_result(value)
+                    self._results.append(f)
+
+    def _stop_serving(self, obj):
+        # Closing the socket does not cancel the operations queued with
+        # it: the ring holds its own reference to the file.
+        for f, cached_obj, callback, discard in list(self._cache.values()):
+            if cached_obj is obj:
+                f.cancel()
+
+    def close(self):
+        if self._ring is None:
+            # already closed
+            return
+
+        # Cancel remaining registered operations.
+        for fut, obj, callback, discard in list(self._cache.values()):
+            if not fut.done():
+                fut.cancel()
+
+        # Wait until all cancelled operations complete: the kernel may use
+        # their buffers until then. Display progress every second if the
+        # loop is still running.
+        msg_update = 1.0
+        start_time = time.monotonic()
+        next_msg = start_time + msg_update
+        while self._cache:
+            if next_msg <= time.monotonic():
+                logger.debug('%r is running after closing for %.1f seconds',
+                             self, time.monotonic() - start_time)
+                next_msg = time.monotonic() + msg_update
+
+            # handle a few events, or timeout
+            self._poll(msg_update)
+
+        self._results = []
+
+        self._ring.close()
+        self._ring = None
+
+    def __del__(self):
+        self.close()
+
+
+class UringEventLoopPolicy(unix_events.DefaultEventLoopPolicy):
+    """UNIX event loop policy creating io_uring event loops."""
+    _loop_factory = UringEventLoop
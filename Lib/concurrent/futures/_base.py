@@ -4,6 +4,7 @@
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import collections
+import itertools
 import logging
 import threading
 import time
@@ -558,7 +559,7 @@ class Executor(object):
         """
         raise NotImplementedError()
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -570,6 +571,10 @@ class Executor(object):
                 before being passed to a child process. This argument is only
                 used by ProcessPoolExecutor; it is ignored by
                 ThreadPoolExecutor.
+            buffersize: The maximum number of submitted calls whose results
+                have not been yielded yet. If None, all the calls are
+                submitted at once; otherwise the iterables are consumed
+                lazily, as the results are yielded.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -580,23 +585,40 @@ class Executor(object):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if buffersize is not None:
+            if not isinstance(buffersize, int):
+                raise TypeError("buffersize must be an integer or None")
+            if buffersize < 1:
+                raise ValueError("buffersize must be None or >= 1.")
+
         if timeout is not None:
             end_time = timeout + time.monotonic()
 
-        fs = [self.submit(fn, *args) for args in zip(*iterables)]
+        zipped_iterables = zip(*iterables)
+        if buffersize is None:
+            fs = collections.deque(self.submit(fn, *args)
+                                   for args in zipped_iterables)
+        else:
+            fs = collections.deque(
+                self.submit(fn, *args)
+                for args in itertools.islice(zipped_iterables, buffersize))
 
         # Yield must be hidden in closure so that the futures are submitted
         # before the first iterator value is required.
         def result_iterator():
             try:
-                # reverse to keep finishing order
-                fs.reverse()
                 while fs:
                     # Careful not to keep a reference to the popped future
                     if timeout is None:
-                        yield fs.pop().result()
+                        yield fs.popleft().result()
                     else:
-                        yield fs.pop().result(end_time - time.monotonic())
+                        yield fs.popleft().result(end_time - time.monotonic())
+                    if buffersize is not None:
+                        # Replace the call whose result was yielded, so
+                        # that at most buffersize calls are in flight.
+                        args = next(zipped_iterables, None)
+                        if args is not None:
+                            fs.append(self.submit(fn, *args))
             finally:
                 for future in fs:
                     future.cancel()
@@ -46,6 +46,7 @@ Process #1..n:
 __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
+import io
 import os
 from concurrent.futures import _base
 import queue
@@ -53,11 +54,14 @@ from queue import Full
 import multiprocessing as mp
 import multiprocessing.connection
 from multiprocessing.queues import Queue
+from multiprocessing.reduction import ForkingPickler
+import pickle
 import threading
 import weakref
 from functools import partial
 import itertools
 import sys
+import time
 import traceback
 
 # Workers are created as daemon threads and processes. This is done to allow the
@@ -109,6 +113,13 @@ def _python_exit():
 # (Futures in the call queue cannot be cancelled).
 EXTRA_QUEUED_CALLS = 1
 
+# With chunksize='auto', map() sizes the chunks so that processing one of
+# them takes about _AUTO_CHUNK_DURATION seconds in a worker, which amortizes
+# the cost of passing a chunk between processes.  The chunk size at most
+# doubles from one chunk to the next, up to _AUTO_MAX_CHUNKSIZE.
+_AUTO_CHUNK_DURATION = 0.02
+_AUTO_MAX_CHUNKSIZE = 1 << 14
+
 
 # On Windows, WaitForMultipleObjects is used to wait for processes to finish.
 # It can wait on, at most, 63 objects. There is an overhead of two objects:
@@ -177,6 +188,144 @@ class _SafeQueue(Queue):
             super()._on_queue_feeder_error(e, obj)
 
 
+def _rebuild_buffer(cls, buf):
+    return cls(buf)
+
+def _rebuild_memoryview(buf, readonly, format, shape):
+    data = bytes(buf) if readonly else bytearray(buf)
+    return memoryview(data).cast(format, shape)
+
+
+class _LargeBuffer(object):
+    """Wrapper pickling a bytes-like object as an out-of-band buffer"""
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __reduce_ex__(self, protocol):
+        obj = self.obj
+        if type(obj) is memoryview:
+            return _rebuild_memoryview, (pickle.PickleBuffer(obj),
+                                         obj.readonly, obj.format, obj.shape)
+        return _rebuild_buffer, (type(obj), pickle.PickleBuffer(obj))
+
+
+def _wrap_large_buffers(obj, threshold):
+    """Wraps the bytes-like objects of at least threshold bytes in obj.
+
+    The pickler does not let the bytes type be reduced differently, so the
+    large bytes, bytearray and memoryview objects found in obj, directly or
+    in nested tuples, lists and dict values, are wrapped in _LargeBuffer.
+    The containers are copied only when some of their items are wrapped.
+    """
+    cls = type(obj)
+    if cls is bytes or cls is bytearray:
+        if len(obj) >= threshold:
+            return _LargeBuffer(obj)
+    elif cls is memoryview:
+        # memoryview.cast() only supports native single character formats
+        if (obj.nbytes >= threshold and obj.c_contiguous
+                and len(obj.format) == 1):
+            return _LargeBuffer(obj)
+    elif cls is tuple or cls is list:
+        items = [_wrap_large_buffers(item, threshold) for item in obj]
+        if any(new is not old for new, old in zip(items, obj)):
+            return cls(items)
+    elif cls is dict:
+        items = {key: _wrap_large_buffers(value, threshold)
+                 for key, value in obj.items()}
+        if any(items[key] is not value for key, value in obj.items()):
+            return items
+    return obj
+
+
+class _SharedMemoryPayload(object):
+    """An object pickled with its large buffers stored in shared memory.
+
+    Buffers of at least threshold bytes are copied to shared memory segments
+    instead of going through the pickle data and the queue pipes. The
+    segments are created by the pickling process and unlinked by the
+    process that owns the executor once they are not needed anymore.
+    """
+    def __init__(self, obj, threshold):
+        self.threshold = threshold
+        # (name, size) pairs of the segments, in the order of the buffers
+        self.segments = []
+        f = io.BytesIO()
+        try:
+            obj = _wrap_large_buffers(obj, threshold)
+            ForkingPickler(f, 5, True, self._store_buffer).dump(obj)
+        except BaseException:
+            self.unlink()
+            raise
+        self.data = f.getvalue()
+
+    def _store_buffer(self, buf):
+        from multiprocessing.shared_memory import SharedMemory
+        with buf.raw() as raw:
+            if raw.nbytes < self.threshold:
+                # Pickle small buffers in-band
+                return True
+            shm = SharedMemory(create=True, size=raw.nbytes)
+            self.segments.append((shm.name, raw.nbytes))
+            try:
+                shm.buf[:raw.nbytes] = raw
+            finally:
+                shm.close()
+        return False
+
+    def load(self):
+        from multiprocessing.shared_memory import SharedMemory
+        shms = []
+        buffers = []
+        try:
+            for name, size in self.segments:
+                shm = SharedMemory(name)
+                shms.append(shm)
+                buffers.append(shm.buf[:size])
+            return pickle.loads(self.data, buffers=buffers)
+        finally:
+            # The rebuilt objects hold copies of the buffers
+            for buf in buffers:
+                buf.release()
+            for shm in shms:
+                shm.close()
+
+    def unlink(self):
+        from multiprocessing.shared_memory import SharedMemory
+        for name, _ in self.segments:
+            try:
+                shm = SharedMemory(name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            shm.unlink()
+
+
+def _call_with_shared_memory(payload):
+    """Runs a call whose arguments are stored in a _SharedMemoryPayload.
+
+    This function is run in a separate process.
+    """
+    fn, args, kwargs = payload.load()
+    threshold = payload.threshold
+    del payload
+    return _SharedMemoryPayload(fn(*args, **kwargs), threshold)
+
+
+def _load_shared_memory_result(result_item):
+    """Replaces the _SharedMemoryPayload of a result by the result itself"""
+    payload = result_item.result
+    result_item.result = None
+    try:
+        result_item.result = payload.load()
+    except BaseException as e:
+        result_item.exception = e
+    finally:
+        payload.unlink()
+
+
 def _get_chunks(*iterables, chunksize):
     """ Iterates over zip()ed iterables in chunks. """
     it = zip(*iterables)
@@ -186,6 +335,43 @@ def _get_chunks(*iterables, chunksize):
             return
         yield chunk
 
+class _ChunkSizeTuner(object):
+    """Adapts the chunk size of map() to the duration of the calls.
+
+    The chunks are built lazily, using the chunk size estimated from the
+    chunks processed so far.
+    """
+    def __init__(self):
+        self.chunksize = 1
+        self._item_duration = None
+
+    def get_chunks(self, *iterables):
+        it = zip(*iterables)
+        while True:
+            chunk = tuple(itertools.islice(it, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def update(self, duration, count):
+        item_duration = duration / count
+        if self._item_duration is not None:
+            # Smooth the estimate over the previous chunks.
+            item_duration = (self._item_duration + item_duration) / 2
+        self._item_duration = item_duration
+        if item_duration > 0:
+            chunksize = int(_AUTO_CHUNK_DURATION / item_duration)
+        else:
+            chunksize = _AUTO_MAX_CHUNKSIZE
+        self.chunksize = max(1, min(chunksize, 2 * self.chunksize,
+                                    _AUTO_MAX_CHUNKSIZE))
+
+    def process_results(self, timed_results):
+        for duration, results in timed_results:
+            self.update(duration, len(results))
+            yield results
+
+
 def _process_chunk(fn, chunk):
     """ Processes a chunk of an iterable passed to map.
 
@@ -197,6 +383,18 @@ def _process_chunk(fn, chunk):
     """
     return [fn(*args) for args in chunk]
 
+def _process_timed_chunk(fn, chunk):
+    """ Processes a chunk of an iterable passed to map(chunksize='auto').
+
+    Returns the time spent in the calls and the list of their results.
+
+    This function is run in a separate process.
+
+    """
+    start = time.perf_counter()
+    results = [fn(*args) for args in chunk]
+    return time.perf_counter() - start, results
+
 
 def _sendback_result(result_queue, work_id, result=None, exception=None):
     """Safely send back the given result or exception"""
@@ -293,7 +491,8 @@ def _queue_management_worker(executor_reference,
                              work_ids_queue,
                              call_queue,
                              result_queue,
-                             thread_wakeup):
+                             thread_wakeup,
+                             template=None):
     """Manages the communication between this process and the worker processes.
 
     This function is run in a local thread.
@@ -314,6 +513,8 @@ def _queue_management_worker(executor_reference,
         thread_wakeup: A _ThreadWakeup to allow waking up the
             queue_manager_thread from the main Thread and avoid deadlocks
             caused by permanently locked queues.
+        template: The multiprocessing context forking the workers from a
+            template process, to stop once the workers exited, or None.
     """
     executor = None
 
@@ -343,6 +544,8 @@ def _queue_management_worker(executor_reference,
         # some ctx.Queue methods may deadlock on Mac OS X.
         for p in processes.values():
             p.join()
+        if template is not None:
+            template.close()
 
     result_reader = result_queue._reader
     wakeup_reader = thread_wakeup._reader
@@ -353,6 +556,16 @@ def _queue_management_worker(executor_reference,
                                 work_ids_queue,
                                 call_queue)
 
+        # The last pending work items may just have been dropped because
+        # their futures were cancelled while the executor was shutting down:
+        # no result will wake this thread up anymore.
+        if not pending_work_items:
+            executor = executor_reference()
+            if shutting_down():
+                shutdown_worker()
+                return
+            executor = None
+
         # Wait for a result to be ready in the result_queue while checking
         # that all worker processes are still running, or for a wake up
         # signal send. The wake up signals come either from new tasks being
@@ -411,6 +624,8 @@ def _queue_management_worker(executor_reference,
                 shutdown_worker()
                 return
         elif result_item is not None:
+            if isinstance(result_item.result, _SharedMemoryPayload):
+                _load_shared_memory_result(result_item)
             work_item = pending_work_items.pop(result_item.work_id, None)
             # work_item can be None if another process terminated (see above)
             if work_item is not None:
@@ -496,7 +711,8 @@ class BrokenProcessPool(_base.BrokenExecutor):
 
 class ProcessPoolExecutor(_base.Executor):
     def __init__(self, max_workers=None, mp_context=None,
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *,
+                 shared_memory_threshold=None, template=False):
         """Initializes a new ProcessPoolExecutor instance.
 
         Args:
@@ -507,9 +723,29 @@ class ProcessPoolExecutor(_base.Executor):
                 object should provide SimpleQueue, Queue and Process.
             initializer: A callable used to initialize worker processes.
             initargs: A tuple of arguments to pass to the initializer.
+            shared_memory_threshold: If not None, bytes, bytearray and
+                memoryview objects of at least this many bytes in the
+                arguments and results of the calls are passed through shared
+                memory instead of the pipes of the queues.
+            template: If true, the initializer is called once, in a template
+                process from which the workers are forked, using the
+                forkserver start method.
         """
         _check_system_limits()
 
+        if shared_memory_threshold is not None:
+            if sys.platform == 'win32':
+                raise NotImplementedError(
+                    "shared_memory_threshold is not supported on Windows")
+            if shared_memory_threshold <= 0:
+                raise ValueError(
+                    "shared_memory_threshold must be greater than 0")
+            # Share the resource tracker of this process with the workers,
+            # so that it knows about the segments that they create.
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self._shared_memory_threshold = shared_memory_threshold
+
         if max_workers is None:
             self._max_workers = os.cpu_count() or 1
             if sys.platform == 'win32':
@@ -525,12 +761,23 @@ class ProcessPoolExecutor(_base.Executor):
 
             self._max_workers = max_workers
 
-        if mp_context is None:
-            mp_context = mp.get_context()
-        self._mp_context = mp_context
-
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
+
+        if template:
+            # The workers are forked from a template process which already
+            # called the initializer.
+            mp_context = mp.context._get_template_context(
+                initializer, initargs, mp_context)
+            self._template = mp_context
+            initializer = None
+            initargs = ()
+        else:
+            if mp_context is None:
+                mp_context = mp.get_context()
+            self._template = None
+        self._mp_context = mp_context
+
         self._initializer = initializer
         self._initargs = initargs
 
@@ -590,7 +837,8 @@ class ProcessPoolExecutor(_base.Executor):
                       self._work_ids,
                       self._call_queue,
                       self._result_queue,
-                      self._queue_management_thread_wakeup),
+                      self._queue_management_thread_wakeup,
+                      self._template),
                 name="QueueManagerThread")
             self._queue_management_thread.daemon = True
             self._queue_management_thread.start()
@@ -609,6 +857,21 @@ class ProcessPoolExecutor(_base.Executor):
             self._processes[p.pid] = p
 
     def submit(self, fn, /, *args, **kwargs):
+        payload = None
+        if self._shared_memory_threshold is not None:
+            # Copy the large buffers to shared memory before taking the lock
+            payload = _SharedMemoryPayload((fn, args, kwargs),
+                                           self._shared_memory_threshold)
+            fn, args, kwargs = _call_with_shared_memory, (payload,), {}
+        try:
+            return self._submit(fn, args, kwargs, payload)
+        except BaseException:
+            if payload is not None:
+                payload.unlink()
+            raise
+    submit.__doc__ = _base.Executor.submit.__doc__
+
+    def _submit(self, fn, args, kwargs, payload):
         with self._shutdown_lock:
             if self._broken:
                 raise BrokenProcessPool(self._broken)
@@ -619,6 +882,11 @@ class ProcessPoolExecutor(_base.Executor):
                                    'interpreter shutdown')
 
             f = _base.Future()
+            if payload is not None:
+                # The worker is done with the arguments once the future is
+                # done, whatever the outcome.
+                f.add_done_callback(
+                    lambda _, payload=payload: payload.unlink())
             w = _WorkItem(f, fn, args, kwargs)
 
             self._pending_work_items[self._queue_count] = w
@@ -629,9 +897,8 @@ class ProcessPoolExecutor(_base.Executor):
 
             self._start_queue_management_thread()
             return f
-    submit.__doc__ = _base.Executor.submit.__doc__
 
-    def map(self, fn, *iterables, timeout=None, chunksize=1):
+    def map(self, fn, *iterables, timeout=None, chunksize=1, buffersize=None):
         """Returns an iterator equivalent to map(fn, iter).
 
         Args:
@@ -642,6 +909,12 @@ class ProcessPoolExecutor(_base.Executor):
             chunksize: If greater than one, the iterables will be chopped into
                 chunks of size chunksize and submitted to the process pool.
                 If set to one, the items in the list will be sent one at a time.
+                If set to 'auto', the size of the chunks is adjusted to the
+                measured duration of the calls.
+            buffersize: The maximum number of submitted chunks whose results
+                have not been yielded yet. If None, all the chunks are
+                submitted at once, unless chunksize is 'auto', in which case
+                it defaults to twice the number of workers.
 
         Returns:
             An iterator equivalent to: map(func, *iterables) but the calls may
@@ -652,12 +925,24 @@ class ProcessPoolExecutor(_base.Executor):
                 before the given timeout.
             Exception: If fn(*args) raises for any values.
         """
+        if chunksize == 'auto':
+            if buffersize is None:
+                buffersize = 2 * self._max_workers
+            tuner = _ChunkSizeTuner()
+            results = super().map(partial(_process_timed_chunk, fn),
+                                  tuner.get_chunks(*iterables),
+                                  timeout=timeout,
+                                  buffersize=buffersize)
+            return _chain_from_iterable_of_lists(
+                tuner.process_results(results))
+
         if chunksize < 1:
             raise ValueError("chunksize must be >= 1.")
 
         results = super().map(partial(_process_chunk, fn),
                               _get_chunks(*iterables, chunksize=chunksize),
-                              timeout=timeout)
+                              timeout=timeout,
+                              buffersize=buffersize)
         return _chain_from_iterable_of_lists(results)
 
     def shutdown(self, wait=True):
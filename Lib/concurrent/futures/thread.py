@@ -7,6 +7,7 @@ __author__ = 'Brian Quinlan (brian@sweetapp.com)'
 
 import atexit
 from concurrent.futures import _base
+import heapq
 import itertools
 import queue
 import threading
@@ -67,7 +68,32 @@ class _WorkItem(object):
             self.future.set_result(result)
 
 
-def _worker(executor_reference, work_queue, initializer, initargs):
+class _PriorityWorkQueue(queue.PriorityQueue):
+    """Work queue ordered by priority, then by submission order.
+
+    Work items are put as (priority, work_item) pairs and got back alone.
+    The None sentinel used to wake up the workers sorts after every work
+    item, so that the pending work items are still run on shutdown.
+    """
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._counter = itertools.count().__next__
+
+    def _put(self, item):
+        if item is None:
+            entry = (1, 0, self._counter(), None)
+        else:
+            priority, work_item = item
+            entry = (0, priority, self._counter(), work_item)
+        heapq.heappush(self.queue, entry)
+
+    def _get(self):
+        return heapq.heappop(self.queue)[-1]
+
+
+def _worker(executor_reference, work_queue, initializer, initargs,
+            idle_timeout=None, queue_slots=None):
     if initializer is not None:
         try:
             initializer(*initargs)
@@ -79,8 +105,19 @@ def _worker(executor_reference, work_queue, initializer, initargs):
             return
     try:
         while True:
-            work_item = work_queue.get(block=True)
+            try:
+                work_item = work_queue.get(block=True, timeout=idle_timeout)
+            except queue.Empty:
+                # The thread stayed idle for idle_timeout seconds
+                executor = executor_reference()
+                if executor is None or executor._retire_idle_thread():
+                    return
+                del executor
+                continue
             if work_item is not None:
+                # Make room in the bounded work queue
+                if queue_slots is not None:
+                    queue_slots.release()
                 work_item.run()
                 # Delete references to object. See issue16284
                 del work_item
@@ -122,7 +159,9 @@ class ThreadPoolExecutor(_base.Executor):
     _counter = itertools.count().__next__
 
     def __init__(self, max_workers=None, thread_name_prefix='',
-                 initializer=None, initargs=()):
+                 initializer=None, initargs=(), *, min_workers=0,
+                 idle_timeout=None, max_queue_size=0, queue_timeout=None,
+                 priorities=False):
         """Initializes a new ThreadPoolExecutor instance.
 
         Args:
@@ -131,6 +170,17 @@ class ThreadPoolExecutor(_base.Executor):
             thread_name_prefix: An optional name prefix to give our threads.
             initializer: A callable used to initialize worker threads.
             initargs: A tuple of arguments to pass to the initializer.
+            min_workers: The number of threads that are kept alive when
+                idle threads are retired.
+            idle_timeout: The number of seconds after which an idle thread
+                is retired. If None, idle threads are never retired.
+            max_queue_size: The maximum number of calls waiting for a
+                thread. If 0, the number of waiting calls is unbounded.
+            queue_timeout: The number of seconds submit() waits for room
+                when max_queue_size calls are already waiting, before
+                raising queue.Full. If None, submit() waits forever.
+            priorities: If true, waiting calls are run by priority, as
+                given to submit_with_priority().
         """
         if max_workers is None:
             # ThreadPoolExecutor is often used to:
@@ -144,11 +194,29 @@ class ThreadPoolExecutor(_base.Executor):
         if max_workers <= 0:
             raise ValueError("max_workers must be greater than 0")
 
+        if not 0 <= min_workers <= max_workers:
+            raise ValueError("min_workers must be between 0 and max_workers")
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must be greater or equal to 0")
+
         if initializer is not None and not callable(initializer):
             raise TypeError("initializer must be a callable")
 
         self._max_workers = max_workers
-        self._work_queue = queue.SimpleQueue()
+        self._min_workers = min_workers
+        self._idle_timeout = idle_timeout
+        if priorities:
+            self._work_queue = _PriorityWorkQueue()
+        else:
+            self._work_queue = queue.SimpleQueue()
+        self._priorities = priorities
+        if max_queue_size:
+            self._queue_slots = threading.Semaphore(max_queue_size)
+        else:
+            self._queue_slots = None
+        self._queue_timeout = queue_timeout
         self._idle_semaphore = threading.Semaphore(0)
         self._threads = set()
         self._broken = False
@@ -160,23 +228,56 @@ class ThreadPoolExecutor(_base.Executor):
         self._initargs = initargs
 
     def submit(self, fn, /, *args, **kwargs):
-        with self._shutdown_lock, _global_shutdown_lock:
-            if self._broken:
-                raise BrokenThreadPool(self._broken)
+        return self._submit(0, fn, args, kwargs)
+    submit.__doc__ = _base.Executor.submit.__doc__
 
-            if self._shutdown:
-                raise RuntimeError('cannot schedule new futures after shutdown')
-            if _shutdown:
-                raise RuntimeError('cannot schedule new futures after '
-                                   'interpreter shutdown')
+    def submit_with_priority(self, priority, fn, /, *args, **kwargs):
+        """Submits a callable to be executed with the given arguments and
+        priority.
 
-            f = _base.Future()
-            w = _WorkItem(f, fn, args, kwargs)
+        Waiting calls with a lower priority value are run first; calls with
+        the same priority are run in submission order. Calls submitted with
+        submit() have a priority of 0. The executor must have been created
+        with priorities=True.
 
-            self._work_queue.put(w)
-            self._adjust_thread_count()
-            return f
-    submit.__doc__ = _base.Executor.submit.__doc__
+        Returns:
+            A Future representing the given call.
+        """
+        if not self._priorities:
+            raise ValueError('submit_with_priority() requires an executor '
+                             'created with priorities=True')
+        return self._submit(priority, fn, args, kwargs)
+
+    def _submit(self, priority, fn, args, kwargs):
+        if self._queue_slots is not None:
+            if not self._queue_slots.acquire(timeout=self._queue_timeout):
+                raise queue.Full('too many calls are waiting for a thread')
+        queued = False
+        try:
+            with self._shutdown_lock, _global_shutdown_lock:
+                if self._broken:
+                    raise BrokenThreadPool(self._broken)
+
+                if self._shutdown:
+                    raise RuntimeError('cannot schedule new futures after '
+                                       'shutdown')
+                if _shutdown:
+                    raise RuntimeError('cannot schedule new futures after '
+                                       'interpreter shutdown')
+
+                f = _base.Future()
+                w = _WorkItem(f, fn, args, kwargs)
+
+                if self._priorities:
+                    self._work_queue.put((priority, w))
+                else:
+                    self._work_queue.put(w)
+                queued = True
+                self._adjust_thread_count()
+                return f
+        finally:
+            if not queued and self._queue_slots is not None:
+                self._queue_slots.release()
 
     def _adjust_thread_count(self):
         # if idle threads are available, don't spin new threads
@@ -196,12 +297,30 @@ class ThreadPoolExecutor(_base.Executor):
                                  args=(weakref.ref(self, weakref_cb),
                                        self._work_queue,
                                        self._initializer,
-                                       self._initargs))
+                                       self._initargs,
+                                       self._idle_timeout,
+                                       self._queue_slots))
             t.daemon = True
             t.start()
             self._threads.add(t)
             _threads_queues[t] = self._work_queue
 
+    def _retire_idle_thread(self):
+        # Called by a worker thread that stayed idle for idle_timeout
+        # seconds. Return True if the thread must exit.
+        with self._shutdown_lock, _global_shutdown_lock:
+            if len(self._threads) <= self._min_workers:
+                return False
+            # Take the thread out of the idle count, so that submit() does
+            # not rely on it. If the count is already 0, every idle thread,
+            # including this one, is needed by a call that was just queued.
+            if not self._idle_semaphore.acquire(timeout=0):
+                return False
+            t = threading.current_thread()
+            self._threads.discard(t)
+            _threads_queues.pop(t, None)
+            return True
+
     def _initializer_failed(self):
         with self._shutdown_lock:
             self._broken = ('A thread initializer failed, the thread pool '
@@ -213,6 +332,8 @@ class ThreadPoolExecutor(_base.Executor):
                 except queue.Empty:
                     break
                 if work_item is not None:
+                    if self._queue_slots is not None:
+                        self._queue_slots.release()
                     work_item.future.set_exception(BrokenThreadPool(self._broken))
 
     def shutdown(self, wait=True):
@@ -220,6 +341,7 @@ class ThreadPoolExecutor(_base.Executor):
             self._shutdown = True
             self._work_queue.put(None)
         if wait:
-            for t in self._threads:
+            # Idle threads may retire concurrently
+            for t in list(self._threads):
                 t.join()
     shutdown.__doc__ = _base.Executor.shutdown.__doc__
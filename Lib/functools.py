@@ -11,13 +11,15 @@
 
 __all__ = ['update_wrapper', 'wraps', 'WRAPPER_ASSIGNMENTS', 'WRAPPER_UPDATES',
            'total_ordering', 'cmp_to_key', 'lru_cache', 'reduce', 'partial',
-           'partialmethod', 'singledispatch', 'singledispatchmethod']
+           'partialmethod', 'singledispatch', 'singledispatchmethod',
+           'async_lru_cache']
 
 from abc import get_cache_token
 from collections import namedtuple
 # import types, weakref  # Deferred to single_dispatch()
 from reprlib import recursive_repr
 from _thread import RLock
+from time import monotonic as _monotonic
 
 
 ################################################################################
@@ -466,7 +468,7 @@ def _make_key(args, kwds, typed,
         return key[0]
     return _HashedSeq(key)
 
-def lru_cache(maxsize=128, typed=False):
+def lru_cache(maxsize=128, typed=False, *, ttl=None, maxcost=None, cost=None):
     """Least-recently-used cache decorator.
 
     If *maxsize* is set to None, the LRU features are disabled and the cache
@@ -476,6 +478,13 @@ def lru_cache(maxsize=128, typed=False):
     For example, f(3.0) and f(3) will be treated as distinct calls with
     distinct results.
 
+    If *ttl* is set, cached results expire *ttl* seconds after they were
+    computed and the next call recomputes them.
+
+    If *maxcost* is set, least recently used results are evicted to keep the
+    total cost of the cached results under *maxcost*.  The cost of a result
+    is given by the *cost* callable, which defaults to sys.getsizeof().
+
     Arguments to the cached function must be hashable.
 
     View the cache statistics named tuple (hits, misses, maxsize, currsize)
@@ -491,6 +500,29 @@ def lru_cache(maxsize=128, typed=False):
     # The internals of the lru_cache are encapsulated for thread safety and
     # to allow the implementation to change (including a possible C version).
 
+    if ttl is not None and not ttl > 0:
+        raise ValueError('ttl must be positive')
+    if maxcost is not None:
+        if not isinstance(maxcost, int):
+            raise TypeError('maxcost should be an integer or None')
+        # Negative maxcost is treated as 0
+        if maxcost < 0:
+            maxcost = 0
+        if cost is None:
+            from sys import getsizeof as cost
+        elif not callable(cost):
+            raise TypeError('cost should be a callable')
+    elif cost is not None:
+        raise TypeError('cost requires maxcost')
+
+    def cache_parameters():
+        parameters = {'maxsize': maxsize, 'typed': typed}
+        if ttl is not None:
+            parameters['ttl'] = ttl
+        if maxcost is not None:
+            parameters['maxcost'] = maxcost
+        return parameters
+
     if isinstance(maxsize, int):
         # Negative maxsize is treated as 0
         if maxsize < 0:
@@ -498,34 +530,46 @@ def lru_cache(maxsize=128, typed=False):
     elif callable(maxsize) and isinstance(typed, bool):
         # The user_function was passed in directly via the maxsize argument
         user_function, maxsize = maxsize, 128
-        wrapper = _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo)
-        wrapper.cache_parameters = lambda : {'maxsize': maxsize, 'typed': typed}
+        wrapper = _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo,
+                                     ttl, maxcost, cost)
+        wrapper.cache_parameters = cache_parameters
         return update_wrapper(wrapper, user_function)
     elif maxsize is not None:
         raise TypeError(
             'Expected first argument to be an integer, a callable, or None')
 
     def decorating_function(user_function):
-        wrapper = _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo)
-        wrapper.cache_parameters = lambda : {'maxsize': maxsize, 'typed': typed}
+        wrapper = _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo,
+                                     ttl, maxcost, cost)
+        wrapper.cache_parameters = cache_parameters
         return update_wrapper(wrapper, user_function)
 
     return decorating_function
 
-def _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo):
+def _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo,
+                       ttl=None, maxcost=None, cost=None):
     # Constants shared by all lru cache instances:
     sentinel = object()          # unique object used to signal cache misses
     make_key = _make_key         # build a key from the function arguments
     PREV, NEXT, KEY, RESULT = 0, 1, 2, 3   # names for the link fields
+    EXPIRES, COST = 4, 5         # extra link fields used with ttl or maxcost
+    EPREV, ENEXT = 6, 7          # links in expiration order, used with ttl
+    timer = _monotonic           # clock used to expire cached results
 
     cache = {}
     hits = misses = 0
     full = False
+    currcost = 0
     cache_get = cache.get    # bound method to lookup a key or return None
     cache_len = cache.__len__  # get cache size without calling len()
     lock = RLock()           # because linkedlist updates aren't threadsafe
     root = []                # root of the circular doubly linked list
     root[:] = [root, root, None, None]     # initialize by pointing to self
+    # With a ttl, the links are also chained in the order they were added,
+    # which is the order they expire in, since a hit moves a link to the
+    # front of the queue regardless of its age.
+    eroot = [None] * 8       # root of the list in expiration order
+    eroot[EPREV] = eroot[ENEXT] = eroot
 
     if maxsize == 0:
 
@@ -536,6 +580,87 @@ def _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo):
             result = user_function(*args, **kwds)
             return result
 
+    elif ttl is not None or maxcost is not None:
+
+        def unlink(link):
+            # Remove a link from the queues and the cache dictionary
+            nonlocal currcost
+            (link_prev, link_next, key, _result, _expires, link_cost,
+             link_eprev, link_enext) = link
+            link_prev[NEXT] = link_next
+            link_next[PREV] = link_prev
+            if ttl is not None:
+                link_eprev[ENEXT] = link_enext
+                link_enext[EPREV] = link_eprev
+            currcost -= link_cost
+            del cache[key]
+
+        def wrapper(*args, **kwds):
+            # Caching limited by age and/or total cost that tracks accesses
+            # by recency.  Links are never reused.  Unlinked entries are kept
+            # alive in the discarded list until the function returns, so that
+            # no arbitrary clean-up code runs while the links are updated.
+            nonlocal hits, misses, currcost
+            key = make_key(args, kwds, typed)
+            discarded = []
+            with lock:
+                link = cache_get(key)
+                if link is not None:
+                    if ttl is None or link[EXPIRES] > timer():
+                        # Move the link to the front of the circular queue
+                        link_prev, link_next = link[PREV], link[NEXT]
+                        link_prev[NEXT] = link_next
+                        link_next[PREV] = link_prev
+                        last = root[PREV]
+                        last[NEXT] = root[PREV] = link
+                        link[PREV] = last
+                        link[NEXT] = root
+                        hits += 1
+                        return link[RESULT]
+                    # The result is stale: drop it and compute a new one.
+                    discarded.append(link)
+                    unlink(link)
+                misses += 1
+            result = user_function(*args, **kwds)
+            size = cost(result) if maxcost is not None else 0
+            if size < 0:
+                raise ValueError('cost must be non-negative')
+            with lock:
+                if key in cache:
+                    # This same key was added to the cache while the lock
+                    # was released.
+                    pass
+                elif maxcost is not None and size > maxcost:
+                    # The result would not fit even in an empty cache.
+                    pass
+                else:
+                    # Purge the expired entries, then evict the least
+                    # recently used ones until there is room for the new
+                    # entry.
+                    expires = elast = None
+                    if ttl is not None:
+                        now = timer()
+                        while (eroot[ENEXT] is not eroot and
+                               eroot[ENEXT][EXPIRES] <= now):
+                            discarded.append(eroot[ENEXT])
+                            unlink(eroot[ENEXT])
+                        expires = now + ttl
+                        elast = eroot[EPREV]
+                    while root[NEXT] is not root and (
+                            (maxsize is not None and cache_len() >= maxsize) or
+                            (maxcost is not None and
+                             currcost + size > maxcost)):
+                        discarded.append(root[NEXT])
+                        unlink(root[NEXT])
+                    last = root[PREV]
+                    link = [last, root, key, result, expires, size,
+                            elast, eroot]
+                    last[NEXT] = root[PREV] = cache[key] = link
+                    if ttl is not None:
+                        elast[ENEXT] = eroot[EPREV] = link
+                    currcost += size
+            return result
+
     elif maxsize is None:
 
         def wrapper(*args, **kwds):
@@ -617,12 +742,14 @@ def _lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo):
 
     def cache_clear():
         """Clear the cache and cache statistics"""
-        nonlocal hits, misses, full
+        nonlocal hits, misses, full, currcost
         with lock:
             cache.clear()
             root[:] = [root, root, None, None]
+            eroot[EPREV] = eroot[ENEXT] = eroot
             hits = misses = 0
             full = False
+            currcost = 0
 
     wrapper.cache_info = cache_info
     wrapper.cache_clear = cache_clear
@@ -634,6 +761,124 @@ except ImportError:
     pass
 
 
+################################################################################
+### async_lru_cache() - LRU cache decorator for coroutine functions
+################################################################################
+
+def async_lru_cache(maxsize=128, typed=False):
+    """Least-recently-used cache decorator for coroutine functions.
+
+    Works like lru_cache(), but caches the results of the awaited calls
+    instead of the coroutine objects, which can only be awaited once.
+
+    Concurrent calls with the same arguments share a single pending call of
+    the wrapped function, which runs in its own task.  Cancelling one of the
+    callers does not cancel that call.  Exceptions are propagated to every
+    waiting caller and are not cached.
+
+    If *maxsize* is set to None, the LRU features are disabled and the cache
+    can grow without bound.  If it is set to 0, results are not cached but
+    concurrent calls are still shared.
+
+    View the cache statistics named tuple (hits, misses, maxsize, currsize)
+    with f.cache_info().  Calls that join a pending call count as hits.
+    Clear the cache and statistics with f.cache_clear().  Access the
+    underlying function with f.__wrapped__.
+
+    """
+
+    if isinstance(maxsize, int):
+        # Negative maxsize is treated as 0
+        if maxsize < 0:
+            maxsize = 0
+    elif callable(maxsize) and isinstance(typed, bool):
+        # The user_function was passed in directly via the maxsize argument
+        user_function, maxsize = maxsize, 128
+        wrapper = _async_lru_cache_wrapper(user_function, maxsize, typed,
+                                           _CacheInfo)
+        wrapper.cache_parameters = lambda : {'maxsize': maxsize,
+                                             'typed': typed}
+        return update_wrapper(wrapper, user_function)
+    elif maxsize is not None:
+        raise TypeError(
+            'Expected first argument to be an integer, a callable, or None')
+
+    def decorating_function(user_function):
+        wrapper = _async_lru_cache_wrapper(user_function, maxsize, typed,
+                                           _CacheInfo)
+        wrapper.cache_parameters = lambda : {'maxsize': maxsize,
+                                             'typed': typed}
+        return update_wrapper(wrapper, user_function)
+
+    return decorating_function
+
+def _async_lru_cache_wrapper(user_function, maxsize, typed, _CacheInfo):
+    # Deferred import: asyncio imports functools.
+    from asyncio import ensure_future, shield
+
+    sentinel = object()          # unique object used to signal cache misses
+    make_key = _make_key         # build a key from the function arguments
+
+    # All accesses happen in the event loop thread, so no lock is needed.
+    # The dict keeps the cached results ordered from least to most recently
+    # used: a hit moves its key to the end by popping and reinserting it.
+    cache = {}                   # results of the completed calls
+    pending = {}                 # tasks of the calls in progress
+    hits = misses = 0
+    cache_get = cache.get
+    cache_pop = cache.pop
+    cache_len = cache.__len__
+
+    def call_done(key, task):
+        if pending.get(key) is not task:
+            # cache_clear() was called while the call was in progress
+            return
+        del pending[key]
+        if maxsize == 0 or task.cancelled() or task.exception() is not None:
+            return
+        cache[key] = task.result()
+        if maxsize is not None and cache_len() > maxsize:
+            # Evict the least recently used result
+            del cache[next(iter(cache))]
+
+    async def wrapper(*args, **kwds):
+        nonlocal hits, misses
+        key = make_key(args, kwds, typed)
+        if maxsize is None:
+            result = cache_get(key, sentinel)
+        else:
+            result = cache_pop(key, sentinel)
+            if result is not sentinel:
+                cache[key] = result
+        if result is not sentinel:
+            hits += 1
+            return result
+        task = pending.get(key)
+        if task is None:
+            misses += 1
+            task = ensure_future(user_function(*args, **kwds))
+            pending[key] = task
+            task.add_done_callback(partial(call_done, key))
+        else:
+            hits += 1
+        return await shield(task)
+
+    def cache_info():
+        """Report cache statistics"""
+        return _CacheInfo(hits, misses, maxsize, cache_len())
+
+    def cache_clear():
+        """Clear the cache and cache statistics"""
+        nonlocal hits, misses
+        cache.clear()
+        pending.clear()
+        hits = misses = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
 ################################################################################
 ### singledispatch() - single-dispatch generic function decorator
 ################################################################################
@@ -109,6 +109,10 @@ responses = {v: v.phrase for v in http.HTTPStatus.__members__.values()}
 _MAXLINE = 65536
 _MAXHEADERS = 100
 
+# maximal number of buffers passed to sendmsg() at once (IOV_MAX on most
+# platforms)
+_MAXIOV = 1024
+
 # Header name/value ABNF (http://tools.ietf.org/html/rfc7230#section-3.2)
 #
 # VCHAR          = %x21-7E
@@ -137,6 +141,11 @@ _MAXHEADERS = 100
 _is_legal_header_name = re.compile(rb'[^:\s][^:\r\n]*').fullmatch
 _is_illegal_header_value = re.compile(rb'\n(?![ \t])|\r(?![ \t\n])').search
 
+# A header line the email parser stores as is, apart from the whitespace
+# before the value (see parse_headers()).
+_simple_header_line = re.compile(
+    rb'([\041-\071\073-\176]+):[ \t]*([^\r\n]*)\r?\n').fullmatch
+
 # These characters are not allowed within HTTP URL paths.
 #  See https://tools.ietf.org/html/rfc3986#section-3.3 and the
 #  https://tools.ietf.org/html/rfc3986#appendix-A pchar definition.
@@ -217,6 +226,29 @@ def parse_headers(fp, _class=HTTPMessage):
             raise HTTPException("got more than %d headers" % _MAXHEADERS)
         if line in (b'\r\n', b'\n', b''):
             break
+    # Plain "name: value" lines make up nearly every header block and can
+    # be stored directly; anything else is left to the email parser.  So
+    # are message/* and multipart/* content types, for which the parser
+    # builds a multipart payload or records defects.
+    fields = []
+    for line in headers[:-1]:
+        m = _simple_header_line(line)
+        if m is None:
+            break
+        field = m.groups()
+        name, value = field
+        if len(name) == 12 and name.lower() == b'content-type':
+            value = value.lower()
+            if b'message' in value or b'multipart' in value:
+                break
+        fields.append(field)
+    else:
+        msg = _class()
+        for name, value in fields:
+            msg.set_raw(name.decode('iso-8859-1'),
+                        value.decode('iso-8859-1'))
+        msg.set_payload('')
+        return msg
     hstring = b''.join(headers).decode('iso-8859-1')
     return email.parser.Parser(_class=_class).parsestr(hstring)
 
@@ -546,7 +578,9 @@ class HTTPResponse(io.BufferedIOBase):
         if not chunk_left: # Can be 0 or None
             if chunk_left is not None:
                 # We are at the end of chunk, discard chunk end
-                self._safe_read(2)  # toss the CRLF at the end of the chunk
+                crlf = self.fp.read(2)  # toss the CRLF at the end of the chunk
+                if len(crlf) < 2:
+                    raise IncompleteRead(crlf, 2-len(crlf))
             try:
                 chunk_left = self._read_next_chunk_size()
             except ValueError:
@@ -563,12 +597,16 @@ class HTTPResponse(io.BufferedIOBase):
     def _readall_chunked(self):
         assert self.chunked != _UNKNOWN
         value = []
+        read = self.fp.read
         try:
             while True:
                 chunk_left = self._get_chunk_left()
                 if chunk_left is None:
                     break
-                value.append(self._safe_read(chunk_left))
+                data = read(chunk_left)
+                if len(data) < chunk_left:
+                    raise IncompleteRead(data, chunk_left-len(data))
+                value.append(data)
                 self.chunk_left = 0
             return b''.join(value)
         except IncompleteRead:
@@ -578,6 +616,7 @@ class HTTPResponse(io.BufferedIOBase):
         assert self.chunked != _UNKNOWN
         total_bytes = 0
         mvb = memoryview(b)
+        readinto = self.fp.readinto
         try:
             while True:
                 chunk_left = self._get_chunk_left()
@@ -585,12 +624,15 @@ class HTTPResponse(io.BufferedIOBase):
                     return total_bytes
 
                 if len(mvb) <= chunk_left:
-                    n = self._safe_readinto(mvb)
+                    n = readinto(mvb)
+                    if n < len(mvb):
+                        raise IncompleteRead(bytes(mvb[:n]), len(mvb)-n)
                     self.chunk_left = chunk_left - n
                     return total_bytes + n
 
-                temp_mvb = mvb[:chunk_left]
-                n = self._safe_readinto(temp_mvb)
+                n = readinto(mvb[:chunk_left])
+                if n < chunk_left:
+                    raise IncompleteRead(bytes(mvb[:n]), chunk_left-n)
                 mvb = mvb[n:]
                 total_bytes += n
                 self.chunk_left = 0
@@ -764,6 +806,55 @@ class HTTPResponse(io.BufferedIOBase):
         '''
         return self.status
 
+def _sendmsg_all(sock, buffers):
+    """Send all the data of a list of byte memoryviews with sock.sendmsg(),
+    without concatenating them."""
+    i = 0
+    n = len(buffers)
+    while i < n:
+        sent = sock.sendmsg(buffers[i:i + _MAXIOV])
+        while sent:
+            size = buffers[i].nbytes
+            if sent < size:
+                buffers[i] = buffers[i][sent:]
+                break
+            sent -= size
+            i += 1
+        else:
+            # skip the empty buffers
+            while i < n and not buffers[i].nbytes:
+                i += 1
+
+
+class _PipelineReader:
+    """Reader of a response to a pipelined request.
+
+    The responses to the requests pipelined on a connection share the
+    buffered reader of its socket, which may contain the beginning of the
+    next responses: it is only closed by the response if owner is true.
+    """
+    def __init__(self, fp):
+        self._fp = fp
+        self.owner = False
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def close(self):
+        if self.owner:
+            self._fp.close()
+
+
+class _PipelineSocket:
+    # Passed to response_class instead of the socket, so that makefile()
+    # returns a reader of the shared buffered reader.
+    def __init__(self, fp):
+        self._fp = fp
+
+    def makefile(self, mode, buffering=None):
+        return _PipelineReader(self._fp)
+
+
 class HTTPConnection:
 
     _http_vsn = 11
@@ -813,15 +904,23 @@ class HTTPConnection:
         return None
 
     def __init__(self, host, port=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
-                 source_address=None, blocksize=8192):
+                 source_address=None, blocksize=8192, *, pipelining=False):
         self.timeout = timeout
         self.source_address = source_address
         self.blocksize = blocksize
+        self.pipelining = pipelining
         self.sock = None
         self._buffer = []
         self.__response = None
         self.__state = _CS_IDLE
         self._method = None
+        # pipelining: methods of the requests awaiting a response (None for
+        # the requests lost when the connection was closed), buffers of the
+        # requests not sent yet, and the buffered reader shared by the
+        # responses
+        self._pending = collections.deque()
+        self._queued = []
+        self._pipeline_fp = None
         self._tunnel_host = None
         self._tunnel_port = None
         self._tunnel_headers = {}
@@ -922,7 +1021,14 @@ class HTTPConnection:
     def close(self):
         """Close the connection to the HTTP server."""
         self.__state = _CS_IDLE
+        # the pipelined requests will not get a response
+        self._pending = collections.deque([None] * len(self._pending))
+        self._queued = []
         try:
+            fp = self._pipeline_fp
+            if fp:
+                self._pipeline_fp = None
+                fp.close()
             sock = self.sock
             if sock:
                 self.sock = None
@@ -939,6 +1045,10 @@ class HTTPConnection:
         file-like object that supports a .read() method, or an iterable object.
         """
 
+        if self._queued:
+            # send the pipelined requests first
+            self._send_buffers([])
+
         if self.sock is None:
             if self.auto_open:
                 self.connect()
@@ -992,17 +1102,60 @@ class HTTPConnection:
                 datablock = datablock.encode("iso-8859-1")
             yield datablock
 
+    def _send_buffers(self, buffers):
+        """Send the queued buffers of the pipelined requests, then the
+        bytes-like objects of buffers.
+
+        The buffers are sent with sendmsg() calls when the socket supports
+        it, rather than concatenated or sent one by one.
+        """
+        if self._queued:
+            buffers = self._queued + buffers
+            self._queued = []
+        if not buffers:
+            return
+        # subclasses overriding send() get all the data
+        if type(self).send is HTTPConnection.send and 'send' not in vars(self):
+            if self.sock is None:
+                if self.auto_open:
+                    self.connect()
+                else:
+                    raise NotConnected()
+            if hasattr(self.sock, 'sendmsg'):
+                try:
+                    views = [memoryview(b).cast('B') for b in buffers]
+                except (TypeError, ValueError):
+                    pass
+                else:
+                    if self.debuglevel > 0:
+                        for data in buffers:
+                            print("send:", repr(data))
+                    try:
+                        _sendmsg_all(self.sock, views)
+                    except NotImplementedError:
+                        # SSL sockets, which fail before sending anything
+                        pass
+                    else:
+                        return
+        for data in buffers:
+            self.send(data)
+
     def _send_output(self, message_body=None, encode_chunked=False):
         """Send the currently buffered request and clear the buffer.
 
         Appends an extra \\r\\n to the buffer.
         A message_body may be specified, to be appended to the request.
+
+        Bytes-like bodies are sent with the request headers.  In pipelining
+        mode, such requests are only queued, to be sent by getresponse().
         """
         self._buffer.extend((b"", b""))
         msg = b"\r\n".join(self._buffer)
         del self._buffer[:]
-        self.send(msg)
+        buffers = [msg]
+        chunked = encode_chunked and self._http_vsn == 11
 
+        chunks = None
         if message_body is not None:
 
             # create a consistent interface to message_body
@@ -1017,7 +1170,7 @@ class HTTPConnection:
                     # implements the buffer API.  it /would/ be easier
                     # to capture if PyObject_CheckBuffer was exposed
                     # to Python.
-                    memoryview(message_body)
+                    size = memoryview(message_body).nbytes
                 except TypeError:
                     try:
                         chunks = iter(message_body)
@@ -1028,21 +1181,38 @@ class HTTPConnection:
                 else:
                     # the object implements the buffer interface and
                     # can be passed directly into socket methods
-                    chunks = (message_body,)
+                    if not size:
+                        if self.debuglevel > 0:
+                            print('Zero length chunk ignored')
+                    elif chunked:
+                        buffers += (f'{size:X}\r\n'.encode('ascii'),
+                                    message_body, b'\r\n')
+                    else:
+                        buffers.append(message_body)
+                    if chunked:
+                        # end chunked transfer
+                        buffers.append(b'0\r\n\r\n')
 
+        if chunks is None and self.pipelining:
+            self._queued += buffers
+            return
+        self._send_buffers(buffers)
+
+        if chunks is not None:
             for chunk in chunks:
                 if not chunk:
                     if self.debuglevel > 0:
                         print('Zero length chunk ignored')
                     continue
 
-                if encode_chunked and self._http_vsn == 11:
+                if chunked:
                     # chunked encoding
-                    chunk = f'{len(chunk):X}\r\n'.encode('ascii') + chunk \
-                        + b'\r\n'
-                self.send(chunk)
+                    self._send_buffers([f'{len(chunk):X}\r\n'.encode('ascii'),
+                                        chunk, b'\r\n'])
+                else:
+                    self.send(chunk)
 
-            if encode_chunked and self._http_vsn == 11:
+            if chunked:
                 # end chunked transfer
                 self.send(b'0\r\n\r\n')
 
@@ -1223,6 +1393,11 @@ class HTTPConnection:
         else:
             raise CannotSendHeader()
         self._send_output(message_body, encode_chunked=encode_chunked)
+        if self.pipelining:
+            # the response will be read by getresponse(), after the
+            # responses to the previous requests
+            self._pending.append(self._method)
+            self.__state = _CS_IDLE
 
     def request(self, method, url, body=None, headers={}, *,
                 encode_chunked=False):
@@ -1308,6 +1483,9 @@ class HTTPConnection:
         #   2) persistent: the response was retained and we await its
         #                  isclosed() status to become true.
         #
+        if self.pipelining:
+            return self._get_pipelined_response()
+
         if self.__state != _CS_REQ_SENT or self.__response:
             raise ResponseNotReady(self.__state)
 
@@ -1338,6 +1516,51 @@ class HTTPConnection:
             response.close()
             raise
 
+    def _get_pipelined_response(self):
+        # getresponse() in pipelining mode: the requests were sent (or
+        # queued) by endheaders(), and their responses are read in order.
+        if self.__response and self.__response.isclosed():
+            self.__response = None
+        if self.__state != _CS_IDLE or self.__response or not self._pending:
+            raise ResponseNotReady(self.__state)
+
+        method = self._pending.popleft()
+        if method is None:
+            raise RemoteDisconnected("Remote end closed connection before "
+                                     "the response to a pipelined request")
+        self._send_buffers([])
+        if self._pipeline_fp is None:
+            self._pipeline_fp = self.sock.makefile('rb')
+        sock = _PipelineSocket(self._pipeline_fp)
+        if self.debuglevel > 0:
+            response = self.response_class(sock, self.debuglevel,
+                                           method=method)
+        else:
+            response = self.response_class(sock, method=method)
+
+        try:
+            try:
+                response.begin()
+            except ConnectionError:
+                self.close()
+                raise
+            assert response.will_close != _UNKNOWN
+
+            if response.will_close:
+                # this effectively passes the connection to the response
+                if isinstance(response.fp, _PipelineReader):
+                    response.fp.owner = True
+                    self._pipeline_fp = None
+                self.close()
+            else:
+                # remember this, so we can tell when it is complete
+                self.__response = response
+
+            return response
+        except:
+            response.close()
+            raise
+
 try:
     import ssl
 except ImportError:
@@ -1353,10 +1576,11 @@ else:
         def __init__(self, host, port=None, key_file=None, cert_file=None,
                      timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
                      source_address=None, *, context=None,
-                     check_hostname=None, blocksize=8192):
+                     check_hostname=None, blocksize=8192, pipelining=False):
             super(HTTPSConnection, self).__init__(host, port, timeout,
                                                   source_address,
-                                                  blocksize=blocksize)
+                                                  blocksize=blocksize,
+                                                  pipelining=pipelining)
             if (key_file is not None or cert_file is not None or
                         check_hostname is not None):
                 import warnings
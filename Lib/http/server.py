@@ -83,10 +83,12 @@ XXX To do:
 __version__ = "0.6"
 
 __all__ = [
-    "HTTPServer", "ThreadingHTTPServer", "BaseHTTPRequestHandler",
-    "SimpleHTTPRequestHandler", "CGIHTTPRequestHandler",
+    "HTTPServer", "ThreadingHTTPServer", "AsyncHTTPServer",
+    "BaseHTTPRequestHandler",
+    "SimpleHTTPRequestHandler", "CGIHTTPRequestHandler", "FileCache",
 ]
 
+import collections
 import copy
 import datetime
 import email.utils
@@ -96,11 +98,14 @@ import io
 import mimetypes
 import os
 import posixpath
+import re
 import select
 import shutil
 import socket # For gethostbyaddr()
 import socketserver
+import stat
 import sys
+import threading
 import time
 import urllib.parse
 from functools import partial
@@ -144,6 +149,435 @@ class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
 
+class _AsyncConnection:
+    """Socket-like object handed to request handlers by AsyncHTTPServer.
+
+    The request has already been read into rfile.  Everything the handler
+    sends is queued and written to the transport once the handler returns.
+    """
+
+    def __init__(self, sock, rfile):
+        self._sock = sock
+        self._rfile = rfile
+        self._output = []   # bytes and (file, offset, count) tuples
+
+    def settimeout(self, timeout):
+        # Timeouts are applied by the server while reading the request.
+        pass
+
+    def setsockopt(self, *args):
+        self._sock.setsockopt(*args)
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def getpeername(self):
+        return self._sock.getpeername()
+
+    def getsockname(self):
+        return self._sock.getsockname()
+
+    def makefile(self, mode='r', buffering=None):
+        if 'r' in mode:
+            return self._rfile
+        return socketserver._SocketWriter(self)
+
+    def sendall(self, data):
+        self._output.append(bytes(data))
+
+    def sendfile(self, file, offset=0, count=None):
+        if count is None:
+            count = max(os.fstat(file.fileno()).st_size - offset, 0)
+        if count:
+            # The handler usually closes the file as soon as this returns,
+            # so keep a file of our own until the data has been sent.
+            if isinstance(file, _CachedFile):
+                own = file._entry.acquire()
+            else:
+                own = open(os.dup(file.fileno()), 'rb')
+            self._output.append((own, offset, count))
+        file.seek(offset + count)
+        return count
+
+    def close(self):
+        for item in self._output:
+            if not isinstance(item, bytes):
+                item[0].close()
+        self._output = []
+
+
+class _AsyncHTTPProtocol:
+    """asyncio protocol serving one connection of an AsyncHTTPServer.
+
+    Requests are taken from the receive buffer once they are complete,
+    including their body, and handled in order, so pipelined requests
+    are answered in the order they arrived.
+    """
+
+    def __init__(self, server):
+        self._server = server
+        self._transport = None
+        self._buffer = bytearray()
+        self._timer = None
+        self._sending = False       # sendfile() output is being sent
+        self._paused = False        # the transport asked us to stop writing
+        self._eof = False
+        self._reset()
+
+    def _reset(self):
+        # Parsing state of the request at the start of the buffer.
+        self._head = None           # (head length, version, body length)
+        self._chunk_pos = 0         # end of the chunks scanned so far
+        self._trailer = False       # scanning the trailer of a chunked body
+        self._continued = False     # no "100 Continue" is due (any more)
+        self._close = False         # close after answering this request
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._sock = transport.get_extra_info('socket')
+        self._client_address = transport.get_extra_info('peername')
+        self._server._connections.add(transport)
+        self._start_timer()
+
+    def connection_lost(self, exc):
+        self._server._connections.discard(self._transport)
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def pause_writing(self):
+        # Stop reading requests from a client which does not read the
+        # responses, instead of buffering them.
+        self._paused = True
+        self._transport.pause_reading()
+        self._start_timer()
+
+    def resume_writing(self):
+        self._paused = False
+        self._transport.resume_reading()
+        self._start_timer()
+        self._process()
+
+    def data_received(self, data):
+        self._buffer += data
+        self._start_timer()
+        self._process()
+
+    def eof_received(self):
+        self._eof = True
+        self._process()
+        # Keep the transport open until the last response has been sent.
+        return True
+
+    def _start_timer(self):
+        # The timeout applies while waiting for the client, not while a
+        # response is being sent.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        timeout = self._server._handler_class.timeout
+        if (timeout is not None and not (self._sending or self._paused) and
+                not self._transport.is_closing()):
+            self._timer = self._server._loop.call_later(
+                timeout, self._transport.close)
+
+    def _process(self):
+        transport = self._transport
+        while not (self._sending or self._paused or transport.is_closing()):
+            end = self._request_end() if self._buffer else None
+            if end is None:
+                if not self._eof:
+                    return
+                if not self._buffer:
+                    transport.close()
+                    return
+                # Hand the rest to the handler, as HTTPServer would.
+                end = len(self._buffer)
+                self._close = True
+            request = bytes(self._buffer[:end])
+            del self._buffer[:end]
+            close = self._close
+            continued = self._head is not None and self._continued
+            self._reset()
+            self._handle(request, close, continued)
+
+    def _reject(self, status):
+        """Answer the request at the start of the buffer with an error
+        status without handling it, and close the connection."""
+        handler_class = self._server._handler_class
+        content = (handler_class.error_message_format % {
+            'code': status,
+            'message': html.escape(status.phrase, quote=False),
+            'explain': html.escape(status.description, quote=False)
+        }).encode('UTF-8', 'replace')
+        self._transport.write(b'%s %d %s\r\n%s\r\n\r\n%s' % (
+            handler_class.protocol_version.encode('latin-1'), status,
+            status.phrase.encode('latin-1'),
+            b'\r\n'.join([
+                b'Connection: close',
+                b'Content-Type: ' +
+                handler_class.error_content_type.encode('latin-1'),
+                b'Content-Length: %d' % len(content)]),
+            content))
+        self._buffer.clear()
+        self._transport.close()
+
+    def _request_end(self):
+        """Return the length of the first complete request in the buffer.
+
+        None is returned if more data is needed, or if the request was
+        rejected without being handled.
+        """
+        buf = self._buffer
+        max_size = self._server.max_body_size
+        if self._head is None:
+            i = buf.find(b'\n')
+            if i < 0:
+                if len(buf) > http.client._MAXLINE:
+                    # Let the handler reject the request line as too long.
+                    self._close = True
+                    return len(buf)
+                return None
+            words = buf[:i].split()
+            if len(words) < 3:
+                # HTTP/0.9 and malformed requests have no headers.
+                return i + 1
+            ends = [j + n for j, n in ((buf.find(b'\n\r\n', i), 3),
+                                       (buf.find(b'\n\n', i), 2))
+                    if j >= 0]
+            if not ends:
+                if (buf.count(b'\n', i) > http.client._MAXHEADERS + 1 or
+                        len(buf) - buf.rfind(b'\n') > http.client._MAXLINE):
+                    # Let the handler reject the headers.
+                    self._close = True
+                    return len(buf)
+                return None
+            head_end = min(ends)
+            if buf.count(b'\n', i, head_end) > http.client._MAXHEADERS + 1:
+                self._close = True
+                return head_end
+            # Only the headers that frame the body are looked at here; the
+            # handler parses all of them.
+            head = bytes(buf[i:head_end]).lower()
+            def header(name):
+                j = head.find(b'\n' + name + b':')
+                if j < 0:
+                    return None
+                return head[j+len(name)+2:head.find(b'\n', j+1)].strip()
+            length = 0
+            if header(b'transfer-encoding') == b'chunked':
+                length = None
+            else:
+                try:
+                    length = int(header(b'content-length') or 0)
+                except ValueError:
+                    pass
+            if length is not None and length <= 0:
+                return head_end
+            if (length is not None and max_size is not None and
+                    length > max_size):
+                self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                return None
+            expect = header(b'expect') == b'100-continue'
+            self._head = (head_end, bytes(words[2]), length)
+            self._chunk_pos = head_end
+            self._continued = not expect
+        head_end, version, length = self._head
+        if length is not None:
+            if len(buf) >= head_end + length:
+                return head_end + length
+        else:
+            # Find the end of the chunked body, keeping its framing for
+            # the handler to decode.
+            pos = self._chunk_pos
+            while True:
+                if max_size is not None and pos - head_end > max_size:
+                    self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    return None
+                i = buf.find(b'\n', pos)
+                if i < 0:
+                    if len(buf) - pos > http.client._MAXLINE:
+                        # A chunk size or trailer line that never ends.
+                        self._reject(HTTPStatus.BAD_REQUEST)
+                        return None
+                    break
+                if self._trailer:
+                    if i - pos <= 1:
+                        return i + 1
+                    pos = self._chunk_pos = i + 1
+                    continue
+                try:
+                    size = int(buf[pos:i].split(b';', 1)[0], 16)
+                except ValueError:
+                    size = -1
+                if size < 0:
+                    self._close = True
+                    return i + 1
+                if (max_size is not None and
+                        i + 1 + size - head_end > max_size):
+                    self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    return None
+                if not size:
+                    self._trailer = True
+                    pos = self._chunk_pos = i + 1
+                    continue
+                if len(buf) < i + 1 + size + 2:
+                    break
+                pos = self._chunk_pos = i + 1 + size + 2
+        # The body is read before the handler runs, so answer
+        # "Expect: 100-continue" here (see handle_expect_100()).
+        if not self._continued:
+            self._continued = True
+            protocol_version = self._server._handler_class.protocol_version
+            if version >= b'HTTP/1.1' and protocol_version >= 'HTTP/1.1':
+                self._transport.write(b'%s %d %s\r\n\r\n' % (
+                    protocol_version.encode('latin-1'), HTTPStatus.CONTINUE,
+                    HTTPStatus.CONTINUE.phrase.encode('latin-1')))
+        return None
+
+    def _handle(self, request, close, continued=False):
+        server = self._server
+        conn = _AsyncConnection(self._sock, io.BytesIO(request))
+        try:
+            handler = server.RequestHandlerClass(
+                conn, self._client_address, server)
+        except Exception:
+            conn.close()
+            server.handle_error(conn, self._client_address)
+            self._transport.close()
+            return
+        # handle() only reads another request line, and finds rfile
+        # exhausted, if the connection is to be kept open.
+        close = close or bool(handler.raw_requestline)
+        output = conn._output
+        if continued and output and output[0].split(None, 2)[1:2] == [b'100']:
+            # "100 Continue" was sent while the body was being received.
+            del output[0]
+        if all(isinstance(item, bytes) for item in conn._output):
+            self._transport.writelines(conn._output)
+            if close:
+                self._transport.close()
+        else:
+            self._sending = True
+            self._start_timer()
+            self._server._loop.create_task(self._sendfile(conn, close))
+
+    async def _sendfile(self, conn, close):
+        transport = self._transport
+        loop = self._server._loop
+        data = []
+        try:
+            for item in conn._output:
+                if isinstance(item, bytes):
+                    data.append(item)
+                    continue
+                transport.writelines(data)
+                data = []
+                file, offset, count = item
+                await loop.sendfile(transport, file, offset, count)
+            transport.writelines(data)
+        except (ConnectionError, RuntimeError):
+            # The client went away, or the transport was closed.
+            close = True
+        finally:
+            conn.close()
+        self._sending = False
+        self._start_timer()
+        if close:
+            transport.close()
+        else:
+            self._process()
+
+
+class AsyncHTTPServer:
+
+    """HTTP server running on an asyncio event loop.
+
+    Connections are served by the event loop rather than by a thread
+    each, so a single thread can keep thousands of keep-alive connections
+    open.  Every request is read completely, body included, and then
+    passed to an instance of RequestHandlerClass, which handles it
+    exactly as under HTTPServer.  Request handlers run in the event loop
+    and should not block.
+    """
+
+    request_queue_size = 100
+
+    # Requests are buffered in memory before they are handled: larger
+    # bodies are rejected with "413 Request Entity Too Large".
+    max_body_size = 1024 * 1024
+
+    def __init__(self, server_address, RequestHandlerClass):
+        self.server_address = server_address
+        self.RequestHandlerClass = RequestHandlerClass
+        # Class attributes of the handler are needed before a handler is
+        # created; RequestHandlerClass may be a partial (see test()).
+        handler_class = RequestHandlerClass
+        while isinstance(handler_class, partial):
+            handler_class = handler_class.func
+        self._handler_class = handler_class
+        self._server = None
+        self._closed = False
+        self._connections = set()
+
+    async def start(self):
+        """Bind the server socket and start accepting connections."""
+        import asyncio
+        self._loop = loop = asyncio.get_running_loop()
+        host, port = self.server_address[:2]
+        self._server = await loop.create_server(
+            lambda: _AsyncHTTPProtocol(self), host or None, port,
+            backlog=self.request_queue_size, reuse_address=True)
+        self.server_address = self._server.sockets[0].getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+
+    async def serve_forever(self):
+        """Accept connections until the server is closed."""
+        import asyncio
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            if not self._closed:
+                raise
+
+    def close(self):
+        """Stop listening and close all open connections."""
+        self._closed = True
+        if self._server is not None:
+            self._server.close()
+        for transport in list(self._connections):
+            transport.close()
+
+    async def wait_closed(self):
+        """Wait until the server is closed."""
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+        await self.wait_closed()
+
+    def handle_error(self, request, client_address):
+        """Handle an error gracefully.  May be overridden.
+
+        The default is to print a traceback and close the connection.
+
+        """
+        print('-'*40, file=sys.stderr)
+        print('Exception happened during processing of request from',
+            client_address, file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        print('-'*40, file=sys.stderr)
+
+
 class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
 
     """HTTP request handler base class.
@@ -624,6 +1058,224 @@ class BaseHTTPRequestHandler(socketserver.StreamRequestHandler):
     }
 
 
+_byte_range = re.compile(r'\s*bytes\s*=\s*([0-9]*)\s*-\s*([0-9]*)\s*', re.I)
+
+
+class _CachedFileEntry:
+    # A descriptor opened by a FileCache.  It is closed once it has left
+    # the cache and no _CachedFile uses it any longer.
+
+    def __init__(self, cache, path, fd, st):
+        self.cache = cache
+        self.path = path
+        self.fd = fd
+        self.stat = st
+        self.refs = 1               # the cache's own reference
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.cache._lock:
+            self.refs += 1
+        return _CachedFile(self)
+
+    def release(self):
+        with self.cache._lock:
+            self.refs -= 1
+            if self.refs:
+                return
+        os.close(self.fd)
+
+    def pread(self, size, offset):
+        if hasattr(os, 'pread'):
+            return os.pread(self.fd, size, offset)
+        with self.lock:
+            os.lseek(self.fd, offset, os.SEEK_SET)
+            return os.read(self.fd, size)
+
+
+class _CachedFile(io.RawIOBase):
+    """Binary file reading a descriptor shared through a FileCache.
+
+    Every instance has its own position and reads with positional I/O, so
+    several requests can use the same descriptor at once.
+    """
+
+    mode = 'rb'
+
+    def __init__(self, entry):
+        self._entry = entry
+        self._pos = 0
+        self.name = entry.path
+
+    def fileno(self):
+        self._checkClosed()
+        return self._entry.fd
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        self._checkClosed()
+        with memoryview(b) as view, view.cast('B') as view:
+            data = self._entry.pread(len(view), self._pos)
+            n = len(data)
+            view[:n] = data
+        self._pos += n
+        return n
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        self._checkClosed()
+        if whence == os.SEEK_CUR:
+            pos += self._pos
+        elif whence == os.SEEK_END:
+            pos += self._entry.stat.st_size
+        elif whence != os.SEEK_SET:
+            raise ValueError("invalid whence (%r)" % whence)
+        if pos < 0:
+            raise ValueError("negative seek position %r" % pos)
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        self._checkClosed()
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self._entry.release()
+
+
+class _FileRange(io.RawIOBase):
+    """Binary file reading another file up to position end only.
+
+    send_head() returns one for a partial content response, so that
+    copying it to the end copies the requested range of bytes.
+    """
+
+    mode = 'rb'
+
+    def __init__(self, file, start, end):
+        self.file = file
+        self.end = end
+        file.seek(start)
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        self._checkClosed()
+        with memoryview(b) as view, view.cast('B') as view:
+            size = max(min(len(view), self.end - self.file.tell()), 0)
+            return self.file.readinto(view[:size])
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        self._checkClosed()
+        return self.file.seek(pos, whence)
+
+    def tell(self):
+        self._checkClosed()
+        return self.file.tell()
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self.file.close()
+
+
+class FileCache:
+
+    """Bounded cache of open regular files and their stat results.
+
+    Set as the file_cache attribute of SimpleHTTPRequestHandler, it saves
+    opening and examining a file on every request.  A cached file is only
+    used again while os.stat() reports the same modification time, size
+    and inode for its path, so a file which is modified or replaced is
+    opened anew.  At most maxsize files are kept open; the least recently
+    used one is closed first.  The cache can be shared between threads.
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 0:
+            maxsize = 0
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def open(self, path):
+        """Open path for reading in binary mode.
+
+        Return a tuple (file, stat_result), where stat_result is the
+        result of os.stat() for the file.  The caller must close the
+        file.
+        """
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                old = entry.stat
+                if (old.st_mtime_ns == st.st_mtime_ns and
+                        old.st_size == st.st_size and
+                        old.st_ino == st.st_ino and
+                        old.st_dev == st.st_dev):
+                    self._entries.move_to_end(path)
+                    entry.refs += 1
+                    return _CachedFile(entry), st
+                del self._entries[path]
+        if entry is not None:
+            entry.release()
+        if stat.S_ISREG(st.st_mode):
+            fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                st = os.fstat(fd)
+            except:
+                os.close(fd)
+                raise
+            if stat.S_ISREG(st.st_mode):
+                return self._add(path, fd, st), st
+            os.close(fd)
+        # Anything else, a directory or a device for example, is opened
+        # as usual and not cached.
+        f = open(path, 'rb')
+        return f, os.fstat(f.fileno())
+
+    def _add(self, path, fd, st):
+        entry = _CachedFileEntry(self, path, fd, st)
+        entry.refs += 1             # the file returned to the caller
+        evicted = []
+        with self._lock:
+            # Another thread may have opened the same path meanwhile.
+            old = self._entries.pop(path, None)
+            if old is not None:
+                evicted.append(old)
+            self._entries[path] = entry
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False)[1])
+        for old in evicted:
+            old.release()
+        return _CachedFile(entry)
+
+    def clear(self):
+        """Remove all files from the cache.
+
+        Files still in use are closed once the last user closes them.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.release()
+
+
 class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
     """Simple HTTP request handler with GET and HEAD commands.
@@ -639,6 +1291,10 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
 
     server_version = "SimpleHTTP/" + __version__
 
+    # A FileCache shared by all requests, or None to open files anew for
+    # every request
+    file_cache = None
+
     def __init__(self, *args, directory=None, **kwargs):
         if directory is None:
             directory = os.getcwd()
@@ -701,13 +1357,18 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
             self.send_error(HTTPStatus.NOT_FOUND, "File not found")
             return None
         try:
-            f = open(path, 'rb')
+            if self.file_cache is not None:
+                f, fs = self.file_cache.open(path)
+            else:
+                f = open(path, 'rb')
+                fs = None
         except OSError:
             self.send_error(HTTPStatus.NOT_FOUND, "File not found")
             return None
 
         try:
-            fs = os.fstat(f.fileno())
+            if fs is None:
+                fs = os.fstat(f.fileno())
             # Use browser cache if possible
             if ("If-Modified-Since" in self.headers
                     and "If-None-Match" not in self.headers):
@@ -736,17 +1397,75 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
                             f.close()
                             return None
 
-            self.send_response(HTTPStatus.OK)
+            size = fs[6]
+            last_modified = self.date_time_string(fs.st_mtime)
+            byte_range = None
+            if ("Range" in self.headers and self.command == "GET"
+                    and self.headers.get("If-Range",
+                                         last_modified) == last_modified):
+                byte_range = self.parse_range(self.headers["Range"], size)
+                if byte_range == (None, None):
+                    self.send_response(
+                        HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", "bytes */%d" % size)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    f.close()
+                    return None
+
+            if byte_range is None:
+                self.send_response(HTTPStatus.OK)
+            else:
+                first, last = byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-Range",
+                    "bytes %d-%d/%d" % (first, last, size))
+                size = last - first + 1
+                f = _FileRange(f, first, last + 1)
             self.send_header("Content-type", ctype)
-            self.send_header("Content-Length", str(fs[6]))
-            self.send_header("Last-Modified",
-                self.date_time_string(fs.st_mtime))
+            self.send_header("Content-Length", str(size))
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Accept-Ranges", "bytes")
             self.end_headers()
             return f
         except:
             f.close()
             raise
 
+    def parse_range(self, value, size):
+        """Parse the value of a Range header for a file of SIZE bytes.
+
+        Return a tuple (first, last) with the positions of the first and
+        the last byte requested, None if the header is to be ignored, or
+        (None, None) if the range cannot be satisfied.  Only a single
+        range of bytes is supported; the whole file is sent for requests
+        of several ranges.
+
+        """
+        match = _byte_range.fullmatch(value)
+        if match is None:
+            return None
+        first, last = match.groups()
+        if not first:
+            # A suffix range: the last bytes of the file
+            if not last:
+                return None
+            length = int(last)
+            if not length or not size:
+                return None, None
+            return max(size - length, 0), size - 1
+        first = int(first)
+        if last:
+            last = int(last)
+            if last < first:
+                return None
+            last = min(last, size - 1)
+        else:
+            last = size - 1
+        if first >= size:
+            return None, None
+        return first, last
+
     def list_directory(self, path):
         """Helper to produce a directory listing (absent index.html).
 
@@ -848,7 +1567,27 @@ class SimpleHTTPRequestHandler(BaseHTTPRequestHandler):
         -- note however that this the default server uses this
         to copy binary data as well.
 
+        When copying a regular file to the unbuffered writer which
+        StreamRequestHandler.setup() creates for the connection, the data
+        is sent with the connection's sendfile() method, so it does not
+        pass through userspace buffers.
+
         """
+        connection = getattr(self, 'connection', None)
+        if (isinstance(outputfile, socketserver._SocketWriter) and
+                outputfile._sock is connection and
+                hasattr(connection, 'sendfile')):
+            try:
+                regular = stat.S_ISREG(os.fstat(source.fileno()).st_mode)
+            except (AttributeError, OSError):
+                regular = False
+            if regular:
+                count = None
+                if isinstance(source, _FileRange):
+                    count = max(source.end - source.tell(), 0)
+                    source = source.file
+                connection.sendfile(source, source.tell(), count)
+                return
         shutil.copyfileobj(source, outputfile)
 
     def guess_type(self, path):
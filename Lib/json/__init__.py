@@ -97,15 +97,18 @@ Using json.tool from the shell to validate and pretty-print::
 """
 __version__ = '2.0.9'
 __all__ = [
-    'dump', 'dumps', 'load', 'loads',
-    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder',
+    'dump', 'dumps', 'dumpb', 'load', 'loads', 'iterload',
+    'JSONDecoder', 'JSONDecodeError', 'JSONEncoder', 'JSONStreamDecoder',
+    'Codec',
 ]
 
 __author__ = 'Bob Ippolito <bob@redivi.com>'
 
-from .decoder import JSONDecoder, JSONDecodeError
+from .decoder import JSONDecoder, JSONDecodeError, JSONStreamDecoder
 from .encoder import JSONEncoder
+from .codec import Codec
 import codecs
+import io
 
 _default_encoder = JSONEncoder(
     skipkeys=False,
@@ -121,7 +124,8 @@ def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         allow_nan=True, cls=None, indent=None, separators=None,
         default=None, sort_keys=False, **kw):
     """Serialize ``obj`` as a JSON formatted stream to ``fp`` (a
-    ``.write()``-supporting file-like object).
+    ``.write()``-supporting file-like object).  If ``fp`` is a binary file,
+    the stream is encoded to UTF-8.
 
     If ``skipkeys`` is true then ``dict`` keys that are not basic types
     (``str``, ``int``, ``float``, ``bool``, ``None``) will be skipped
@@ -166,17 +170,21 @@ def dump(obj, fp, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         check_circular and allow_nan and
         cls is None and indent is None and separators is None and
         default is None and not sort_keys and not kw):
-        iterable = _default_encoder.iterencode(obj)
+        encoder = _default_encoder
     else:
         if cls is None:
             cls = JSONEncoder
-        iterable = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+        encoder = cls(skipkeys=skipkeys, ensure_ascii=ensure_ascii,
             check_circular=check_circular, allow_nan=allow_nan, indent=indent,
             separators=separators,
-            default=default, sort_keys=sort_keys, **kw).iterencode(obj)
+            default=default, sort_keys=sort_keys, **kw)
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        # Binary file: write UTF-8 encoded chunks
+        encoder.encode_bytes(obj, fp.write)
+        return
     # could accelerate with writelines in some versions of Python, at
     # a debuggability cost
-    for chunk in iterable:
+    for chunk in encoder.iterencode(obj):
         fp.write(chunk)
 
 
@@ -238,8 +246,35 @@ def dumps(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
         **kw).encode(obj)
 
 
+def dumpb(obj, *, skipkeys=False, ensure_ascii=True, check_circular=True,
+        allow_nan=True, cls=None, indent=None, separators=None,
+        default=None, sort_keys=False, **kw):
+    """Serialize ``obj`` to a JSON formatted ``bytes`` object, encoded to
+    UTF-8.
+
+    This is faster than encoding the result of ``dumps()``, which has the
+    same arguments.
+    """
+    # cached encoder
+    if (not skipkeys and ensure_ascii and
+        check_circular and allow_nan and
+        cls is None and indent is None and separators is None and
+        default is None and not sort_keys and not kw):
+        return _default_encoder.encode_bytes(obj)
+    if cls is None:
+        cls = JSONEncoder
+    return cls(
+        skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+        check_circular=check_circular, allow_nan=allow_nan, indent=indent,
+        separators=separators, default=default, sort_keys=sort_keys,
+        **kw).encode_bytes(obj)
+
+
 _default_decoder = JSONDecoder(object_hook=None, object_pairs_hook=None)
 
+# Size of the chunks read by iterload().
+_CHUNK_SIZE = 64 * 1024
+
 
 def detect_encoding(b):
     bstartswith = b.startswith
@@ -368,3 +403,38 @@ def loads(s, *, cls=None, object_hook=None, parse_float=None,
     if parse_constant is not None:
         kw['parse_constant'] = parse_constant
     return cls(**kw).decode(s)
+
+
+def iterload(fp, *, items=False, chunk_size=_CHUNK_SIZE, cls=None,
+        object_hook=None, parse_float=None, parse_int=None,
+        parse_constant=None, object_pairs_hook=None, **kw):
+    """Deserialize ``fp`` (a ``.read()``-supporting file-like object
+    containing a stream of JSON documents separated by optional whitespace,
+    such as JSON Lines) and return an iterator of the Python objects.
+
+    ``fp`` is read in chunks of ``chunk_size`` characters or bytes and only
+    the data of the document being decoded is kept in memory.  If ``items``
+    is true, every document must be an array and the iterator returns the
+    items of the arrays instead, one at a time.
+
+    The other arguments have the same meaning as in ``load()``.
+    """
+    if cls is None:
+        cls = JSONDecoder
+    if object_hook is not None:
+        kw['object_hook'] = object_hook
+    if object_pairs_hook is not None:
+        kw['object_pairs_hook'] = object_pairs_hook
+    if parse_float is not None:
+        kw['parse_float'] = parse_float
+    if parse_int is not None:
+        kw['parse_int'] = parse_int
+    if parse_constant is not None:
+        kw['parse_constant'] = parse_constant
+    decoder = JSONStreamDecoder(cls(**kw), items=items)
+    while True:
+        data = fp.read(chunk_size)
+        if not data:
+            break
+        yield from decoder.feed(data)
+    yield from decoder.close()
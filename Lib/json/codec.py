@@ -0,0 +1,259 @@
+"""Implementation of Codec, a JSON encoder and decoder of typed data
+"""
+from .decoder import JSONDecoder
+from .encoder import FLUSH_SIZE, JSONEncoder, _field_names
+
+__all__ = ['Codec']
+
+
+class Codec(object):
+    """JSON encoder and decoder of a type of Python data structures, which
+    can be built from dataclasses and typing.NamedTuple classes.
+
+    The type annotations of the classes are compiled once, when the codec
+    is created, into a specialized encoder and decoder::
+
+        >>> from dataclasses import dataclass
+        >>> from typing import List
+        >>> from json.codec import Codec
+        >>> @dataclass
+        ... class Point:
+        ...     x: int
+        ...     y: int
+        ...
+        >>> codec = Codec(List[Point])
+        >>> codec.encode([Point(1, 2), Point(3, 4)])
+        '[{"x": 1, "y": 2}, {"x": 3, "y": 4}]'
+        >>> codec.decode('[{"x": 1, "y": 2}]')
+        [Point(x=1, y=2)]
+
+    Supported annotations are dataclasses, typing.NamedTuple classes,
+    str, int, float, bool, None, typing.Any, lists and tuples of a
+    supported type, dicts with supported values and Optional of a supported
+    type.  Unions of types which are decoded as is
+    (such as Union[int, str]) are supported too.
+
+    Encoder options (skipkeys, ensure_ascii, check_circular, allow_nan,
+    sort_keys, indent, separators, default) have the same meaning as in
+    JSONEncoder, and decoder options (parse_float, parse_int,
+    parse_constant, strict) have the same meaning as in JSONDecoder.
+
+    """
+    def __init__(self, tp, *, skipkeys=False, ensure_ascii=True,
+            check_circular=True, allow_nan=True, sort_keys=False,
+            indent=None, separators=None, default=None, parse_float=None,
+            parse_int=None, parse_constant=None, strict=True):
+        self.type = tp
+        types = []
+        self._convert = _compile(tp, {}, types)
+        self.encoder = JSONEncoder(
+            skipkeys=skipkeys, ensure_ascii=ensure_ascii,
+            check_circular=check_circular, allow_nan=allow_nan,
+            sort_keys=sort_keys, indent=indent, separators=separators,
+            default=default, types=types)
+        self.decoder = JSONDecoder(
+            parse_float=parse_float, parse_int=parse_int,
+            parse_constant=parse_constant, strict=strict)
+
+    def encode(self, obj):
+        """Return a JSON string representation of obj."""
+        return self.encoder.encode(obj)
+
+    def encode_bytes(self, obj, write=None, flush_size=FLUSH_SIZE):
+        """Return a JSON representation of obj encoded to UTF-8.
+
+        See JSONEncoder.encode_bytes() for the meaning of write and
+        flush_size.
+        """
+        return self.encoder.encode_bytes(obj, write, flush_size)
+
+    def decode(self, s):
+        """Return the instance of the type of the codec represented by the
+        JSON document s (a str instance).
+
+        Raise JSONDecodeError if s is not a valid JSON document, and
+        ValueError or TypeError if it does not match the type.
+        """
+        return self.convert(self.decoder.decode(s))
+
+    def convert(self, value):
+        """Convert value, a Python object as returned by json.loads(), to
+        an instance of the type of the codec.
+        """
+        if self._convert is None:
+            return value
+        return self._convert(value)
+
+
+def _compile(tp, converters, types):
+    """Return a function converting a decoded JSON value to an instance of
+    tp, or None if the value can be used as is.
+
+    converters caches the functions of the dataclasses and named tuples,
+    which are appended to types.
+    """
+    import typing
+
+    if tp in converters:
+        return converters[tp]
+    if tp is typing.Any or tp in (str, int, float, bool, object,
+                                  list, dict, None, type(None)):
+        return None
+    if tp is tuple:
+        return _sequence(tuple, None)
+
+    if isinstance(tp, type):
+        try:
+            _field_names(tp)
+        except TypeError:
+            pass
+        else:
+            return _compile_class(tp, converters, types)
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is typing.Union:
+        non_null = [arg for arg in args if arg is not type(None)]
+        convs = [_compile(arg, converters, types) for arg in non_null]
+        if not any(convs):
+            return None
+        if len(convs) != 1:
+            raise TypeError(f'unsupported union: {tp!r}')
+        return _optional(convs[0])
+    if origin in (list, tuple):
+        if origin is tuple and args and args[-1] is not Ellipsis:
+            return _fixed_tuple(tp, [_compile(arg, converters, types)
+                                     for arg in args])
+        conv = _compile(args[0], converters, types) if args else None
+        return _sequence(origin, conv)
+    if origin is dict:
+        conv = _compile(args[1], converters, types) if args else None
+        return _mapping(conv)
+    raise TypeError(f'unsupported type: {tp!r}')
+
+
+def _compile_class(cls, converters, types):
+    import typing
+
+    if issubclass(cls, tuple):
+        names = _field_names(cls)
+    else:
+        import dataclasses
+        names = [field.name for field in dataclasses.fields(cls)
+                 if field.init]
+    fields = []
+    name = cls.__qualname__
+
+    def check(value):
+        if not isinstance(value, dict):
+            raise ValueError(f'expected a JSON object for {name}, '
+                             f'not {type(value).__name__}')
+
+    def convert_missing(value):
+        # Some fields are missing: let the constructor use their default
+        # values, or raise a TypeError.
+        kwargs = {}
+        for key, conv in fields:
+            if key in value:
+                item = value[key]
+                kwargs[key] = item if conv is None else conv(item)
+        return cls(**kwargs)
+
+    def convert(value):
+        return compiled(value)
+
+    # Register the converter before compiling the fields, for recursive
+    # types.
+    converters[cls] = convert
+    types.append(cls)
+    hints = typing.get_type_hints(cls)
+    for key in names:
+        fields.append((key, _compile(hints.get(key, typing.Any),
+                                     converters, types)))
+
+    # Generate a function passing all the fields as positional arguments,
+    # like dataclasses generates __init__().
+    namespace = {'cls': cls, 'check': check, 'dict': dict, 'list': list,
+                 'check_array': _check_array,
+                 'convert_missing': convert_missing}
+    lines = ['def convert(value):',
+             '    if value.__class__ is not dict:',
+             '        check(value)',
+             '    try:']
+    args = []
+    for i, (key, conv) in enumerate(fields):
+        lines.append(f'        arg_{i} = value[{key!r}]')
+        if conv is _array:
+            lines.append(f'        if arg_{i}.__class__ is not list:')
+            lines.append(f'            check_array(arg_{i})')
+        elif conv is not None:
+            namespace[f'conv_{i}'] = conv
+            lines.append(f'        arg_{i} = conv_{i}(arg_{i})')
+        args.append(f'arg_{i}')
+    lines.append('        pass')
+    lines.append('    except KeyError:')
+    lines.append('        return convert_missing(value)')
+    lines.append(f'    return cls({", ".join(args)})')
+    exec('\n'.join(lines), namespace)
+    compiled = namespace['convert']
+    converters[cls] = compiled
+    return compiled
+
+
+def _optional(conv):
+    def convert(value):
+        if value is None:
+            return None
+        return conv(value)
+    return convert
+
+
+def _check_array(value):
+    if not isinstance(value, list):
+        raise ValueError(f'expected a JSON array, not {type(value).__name__}')
+
+
+def _array(value):
+    _check_array(value)
+    return value
+
+
+def _sequence(seqtype, conv):
+    if conv is None and seqtype is list:
+        # Inlined by _compile_class()
+        return _array
+    elif conv is None:
+        def convert(value):
+            _check_array(value)
+            return seqtype(value)
+    elif seqtype is list:
+        def convert(value):
+            _check_array(value)
+            return [conv(item) for item in value]
+    else:
+        def convert(value):
+            _check_array(value)
+            return seqtype([conv(item) for item in value])
+    return convert
+
+
+def _fixed_tuple(tp, convs):
+    def convert(value):
+        _check_array(value)
+        if len(value) != len(convs):
+            raise ValueError(f'expected a JSON array of {len(convs)} items '
+                             f'for {tp!r}, not {len(value)}')
+        return tuple(item if conv is None else conv(item)
+                     for conv, item in zip(convs, value))
+    return convert
+
+
+def _mapping(conv):
+    def convert(value):
+        if not isinstance(value, dict):
+            raise ValueError(f'expected a JSON object, '
+                             f'not {type(value).__name__}')
+        if conv is None:
+            return value
+        return {key: conv(item) for key, item in value.items()}
+    return convert
@@ -1,5 +1,6 @@
 """Implementation of JSONDecoder
 """
+import codecs
 import re
 
 from json import scanner
@@ -8,7 +9,7 @@ try:
 except ImportError:
     c_scanstring = None
 
-__all__ = ['JSONDecoder', 'JSONDecodeError']
+__all__ = ['JSONDecoder', 'JSONDecodeError', 'JSONStreamDecoder']
 
 FLAGS = re.VERBOSE | re.MULTILINE | re.DOTALL
 
@@ -354,3 +355,192 @@ class JSONDecoder(object):
         except StopIteration as err:
             raise JSONDecodeError("Expecting value", s, err.value) from None
         return obj, end
+
+
+ITEM_SEPARATOR = re.compile(r'[ \t\n\r]*,[ \t\n\r]*', FLAGS)
+
+# What JSONStreamDecoder expects next between the items of arrays.
+_EXPECT_ARRAY = 0
+_EXPECT_FIRST = 1
+_EXPECT_ITEM = 2
+_EXPECT_SEPARATOR = 3
+
+class JSONStreamDecoder(object):
+    """Incremental decoder for a stream of JSON documents.
+
+    Data is passed in chunks to ``feed()``, which returns the list of the
+    documents completed by the chunk.  The documents are separated by
+    optional whitespace, as in JSON Lines.  Only the data of the document
+    being received is kept in memory.
+
+    If ``items`` is true, every document must be an array and the items of
+    the arrays are returned instead of the arrays, so that the items of an
+    array of millions of objects can be processed one at a time.
+
+    ``decoder`` is the ``JSONDecoder`` used to decode the documents or
+    items; by default a ``JSONDecoder()`` is used.
+
+    """
+
+    def __init__(self, decoder=None, *, items=False):
+        if decoder is None:
+            decoder = JSONDecoder()
+        self.decoder = decoder
+        self._level = 1 if items else 0
+        self._state = (0, 0, 0)
+        self._expect = _EXPECT_ARRAY
+        # Data not decoded yet, from the end of the last value.
+        self._pending = []
+        self._pending_len = 0
+        self._bytes_decoder = None
+        self._closed = False
+        # Position of the pending data in the stream, for error messages.
+        self._pos = 0
+        self._lineno = 1
+        self._colno = 0
+
+    def feed(self, data):
+        """Decode a chunk of the stream and return the list of documents
+        (or array items) which it completes.
+
+        ``data`` is a ``str``, or UTF-8 encoded ``bytes`` or ``bytearray``.
+
+        """
+        if self._closed:
+            raise ValueError('feed() called after close()')
+        if isinstance(data, (bytes, bytearray)):
+            if self._bytes_decoder is None:
+                self._bytes_decoder = codecs.getincrementaldecoder(
+                    'utf-8-sig')()
+            data = self._bytes_decoder.decode(data)
+        elif not isinstance(data, str):
+            raise TypeError(f'data must be str, bytes or bytearray, '
+                            f'not {data.__class__.__name__}')
+        return self._decode(data, False)
+
+    def close(self):
+        """Mark the end of the stream and return the list of the remaining
+        documents (or array items).
+
+        Raise ``JSONDecodeError`` if the stream ends in the middle of a
+        document.
+
+        """
+        if self._closed:
+            return []
+        self._closed = True
+        data = ''
+        if self._bytes_decoder is not None:
+            data = self._bytes_decoder.decode(b'', True)
+        return self._decode(data, True)
+
+    def _decode(self, s, final):
+        depth, flags, start = self._state
+        spans, depth, flags, start = scanner.scan_stream(
+            s, depth, flags, start, self._level)
+        if final and flags & scanner.STREAM_IN_SCALAR:
+            spans.append((start, len(s)))
+            flags &= ~(scanner.STREAM_IN_SCALAR | scanner.STREAM_IN_VALUE)
+        # Keep start relative to the beginning of the next chunk.
+        self._state = (depth, flags, start - len(s))
+        if s:
+            self._pending.append(s)
+        if not spans and not final:
+            self._pending_len += len(s)
+            return []
+
+        doc = ''.join(self._pending)
+        shift = self._pending_len
+        values = []
+        end = 0
+        try:
+            for first, last in spans:
+                first += shift
+                last += shift
+                if self._level:
+                    self._check_separators(doc, end, first)
+                    if self._expect == _EXPECT_SEPARATOR:
+                        raise JSONDecodeError("Expecting ',' delimiter",
+                                              doc, first)
+                obj, end = self.decoder.raw_decode(doc, first)
+                if end != last:
+                    if self._level:
+                        raise JSONDecodeError("Expecting ',' delimiter",
+                                              doc, end)
+                    raise JSONDecodeError("Extra data", doc, end)
+                values.append(obj)
+                self._expect = _EXPECT_SEPARATOR
+            if final:
+                if flags & scanner.STREAM_IN_VALUE:
+                    # Let the decoder report why the last value is
+                    # incomplete.
+                    self.decoder.raw_decode(doc, start + shift)
+                    raise JSONDecodeError("Expecting value", doc, len(doc))
+                if self._level:
+                    self._check_separators(doc, end, len(doc))
+                    if self._expect == _EXPECT_SEPARATOR:
+                        raise JSONDecodeError("Expecting ',' delimiter",
+                                              doc, len(doc))
+                    elif self._expect != _EXPECT_ARRAY:
+                        raise JSONDecodeError("Expecting value",
+                                              doc, len(doc))
+        except JSONDecodeError as err:
+            raise self._error(err.msg, doc, err.pos) from None
+
+        self._advance(doc, end)
+        if end < len(doc):
+            rest = doc[end:]
+            self._pending = [rest]
+            self._pending_len = len(rest)
+        else:
+            self._pending = []
+            self._pending_len = 0
+        return values
+
+    def _check_separators(self, doc, pos, end, _m=ITEM_SEPARATOR.match):
+        # Check the text between two items of arrays.
+        expect = self._expect
+        if expect == _EXPECT_SEPARATOR:
+            # Fast path for the usual case.
+            m = _m(doc, pos, end)
+            if m is not None and m.end() == end:
+                self._expect = _EXPECT_ITEM
+                return
+        for idx in range(pos, end):
+            nextchar = doc[idx]
+            if nextchar in ' \t\n\r':
+                continue
+            if expect == _EXPECT_ARRAY:
+                if nextchar != '[':
+                    raise JSONDecodeError("Expecting '['", doc, idx)
+                expect = _EXPECT_FIRST
+            elif nextchar == ']' and expect != _EXPECT_ITEM:
+                expect = _EXPECT_ARRAY
+            elif nextchar == ',' and expect == _EXPECT_SEPARATOR:
+                expect = _EXPECT_ITEM
+            elif expect == _EXPECT_SEPARATOR:
+                raise JSONDecodeError("Expecting ',' delimiter", doc, idx)
+            else:
+                raise JSONDecodeError("Expecting value", doc, idx)
+        self._expect = expect
+
+    def _advance(self, doc, end):
+        # Move the position of the pending data past doc[:end].
+        newlines = doc.count('\n', 0, end)
+        if newlines:
+            self._lineno += newlines
+            self._colno = end - doc.rfind('\n', 0, end) - 1
+        else:
+            self._colno += end
+        self._pos += end
+
+    def _error(self, msg, doc, pos):
+        # Report the position in the whole stream rather than in doc.
+        err = JSONDecodeError(msg, doc, pos)
+        if err.lineno == 1:
+            err.colno += self._colno
+        err.lineno += self._lineno - 1
+        err.pos += self._pos
+        err.args = ('%s: line %d column %d (char %d)'
+                    % (msg, err.lineno, err.colno, err.pos),)
+        return err
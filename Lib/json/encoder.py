@@ -33,6 +33,9 @@ for i in range(0x20):
 
 INFINITY = float('inf')
 
+# Size of the chunks passed to write() by JSONEncoder.encode_bytes().
+FLUSH_SIZE = 64 * 1024
+
 def py_encode_basestring(s):
     """Return a JSON representation of a Python string
 
@@ -70,6 +73,22 @@ def py_encode_basestring_ascii(s):
 encode_basestring_ascii = (
     c_encode_basestring_ascii or py_encode_basestring_ascii)
 
+
+def _field_names(cls):
+    """Return the tuple of the names of the fields of a dataclass or
+    typing.NamedTuple class, in declaration order.
+
+    """
+    if isinstance(cls, type) and issubclass(cls, tuple):
+        names = getattr(cls, '_fields', None)
+        if isinstance(names, tuple):
+            return names
+    elif isinstance(cls, type) and hasattr(cls, '__dataclass_fields__'):
+        import dataclasses
+        return tuple(field.name for field in dataclasses.fields(cls))
+    raise TypeError(f'{cls!r} is not a dataclass or a named tuple')
+
+
 class JSONEncoder(object):
     """Extensible JSON <http://json.org> encoder for Python data structures.
 
@@ -101,9 +120,10 @@ class JSONEncoder(object):
     """
     item_separator = ', '
     key_separator = ': '
+    _type_fields = None
     def __init__(self, *, skipkeys=False, ensure_ascii=True,
             check_circular=True, allow_nan=True, sort_keys=False,
-            indent=None, separators=None, default=None):
+            indent=None, separators=None, default=None, types=None):
         """Constructor for JSONEncoder, with sensible defaults.
 
         If skipkeys is false, then it is a TypeError to attempt
@@ -142,6 +162,11 @@ class JSONEncoder(object):
         that can't otherwise be serialized.  It should return a JSON encodable
         version of the object or raise a ``TypeError``.
 
+        If specified, types should be an iterable of dataclasses and
+        typing.NamedTuple classes.  Their instances are encoded as JSON
+        objects mapping the field names to the field values, without
+        calling default or building an intermediate dict.
+
         """
 
         self.skipkeys = skipkeys
@@ -156,6 +181,8 @@ class JSONEncoder(object):
             self.item_separator = ','
         if default is not None:
             self.default = default
+        if types is not None:
+            self._type_fields = {cls: _field_names(cls) for cls in types}
 
     def default(self, o):
         """Implement this method in a subclass such that it returns
@@ -201,6 +228,52 @@ class JSONEncoder(object):
             chunks = list(chunks)
         return ''.join(chunks)
 
+    def encode_bytes(self, o, write=None, flush_size=FLUSH_SIZE):
+        """Return a JSON representation of a Python data structure, encoded
+        to UTF-8.
+
+        >>> from json.encoder import JSONEncoder
+        >>> JSONEncoder().encode_bytes({"foo": ["bar", "baz"]})
+        b'{"foo": ["bar", "baz"]}'
+
+        If ``write`` is not None, it is called with ``bytes`` chunks of
+        about ``flush_size`` bytes, for example the ``write()`` method of a
+        binary file, and None is returned.
+
+        """
+        if flush_size <= 0:
+            raise ValueError('flush_size must be positive')
+        if (c_make_encoder is not None and self.indent is None and
+                type(self).encode is JSONEncoder.encode and
+                type(self).iterencode is JSONEncoder.iterencode):
+            if self.check_circular:
+                markers = {}
+            else:
+                markers = None
+            if self.ensure_ascii:
+                _encoder = encode_basestring_ascii
+            else:
+                _encoder = encode_basestring
+            c_encoder = c_make_encoder(
+                markers, self.default, _encoder, self.indent,
+                self.key_separator, self.item_separator, self.sort_keys,
+                self.skipkeys, self.allow_nan, self._type_fields)
+            return c_encoder.encode_bytes(o, write, flush_size)
+
+        if write is None:
+            return self.encode(o).encode('utf-8')
+        chunks = []
+        size = 0
+        for chunk in self.iterencode(o):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= flush_size:
+                write(''.join(chunks).encode('utf-8'))
+                chunks.clear()
+                size = 0
+        if chunks:
+            write(''.join(chunks).encode('utf-8'))
+
     def iterencode(self, o, _one_shot=False):
         """Encode the given object and yield each string
         representation as available.
@@ -248,16 +321,17 @@ class JSONEncoder(object):
             _iterencode = c_make_encoder(
                 markers, self.default, _encoder, self.indent,
                 self.key_separator, self.item_separator, self.sort_keys,
-                self.skipkeys, self.allow_nan)
+                self.skipkeys, self.allow_nan, self._type_fields)
         else:
             _iterencode = _make_iterencode(
                 markers, self.default, _encoder, self.indent, floatstr,
                 self.key_separator, self.item_separator, self.sort_keys,
-                self.skipkeys, _one_shot)
+                self.skipkeys, _one_shot, self._type_fields)
         return _iterencode(o, 0)
 
 def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         _key_separator, _item_separator, _sort_keys, _skipkeys, _one_shot,
+        _fields=None,
         ## HACK: hand-optimized bytecode; turn globals into locals
         ValueError=ValueError,
         dict=dict,
@@ -268,6 +342,7 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         list=list,
         str=str,
         tuple=tuple,
+        type=type,
         _intstr=int.__repr__,
     ):
 
@@ -316,7 +391,9 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
                 yield buf + _floatstr(value)
             else:
                 yield buf
-                if isinstance(value, (list, tuple)):
+                if _fields is not None and type(value) in _fields:
+                    chunks = _iterencode_fields(value, _current_indent_level)
+                elif isinstance(value, (list, tuple)):
                     chunks = _iterencode_list(value, _current_indent_level)
                 elif isinstance(value, dict):
                     chunks = _iterencode_dict(value, _current_indent_level)
@@ -396,7 +473,9 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
                 # see comment for int/float in _make_iterencode
                 yield _floatstr(value)
             else:
-                if isinstance(value, (list, tuple)):
+                if _fields is not None and type(value) in _fields:
+                    chunks = _iterencode_fields(value, _current_indent_level)
+                elif isinstance(value, (list, tuple)):
                     chunks = _iterencode_list(value, _current_indent_level)
                 elif isinstance(value, dict):
                     chunks = _iterencode_dict(value, _current_indent_level)
@@ -410,6 +489,17 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         if markers is not None:
             del markers[markerid]
 
+    def _iterencode_fields(o, _current_indent_level):
+        if markers is not None:
+            markerid = id(o)
+            if markerid in markers:
+                raise ValueError("Circular reference detected")
+            markers[markerid] = o
+        dct = {name: getattr(o, name) for name in _fields[type(o)]}
+        yield from _iterencode_dict(dct, _current_indent_level)
+        if markers is not None:
+            del markers[markerid]
+
     def _iterencode(o, _current_indent_level):
         if isinstance(o, str):
             yield _encoder(o)
@@ -425,6 +515,8 @@ def _make_iterencode(markers, _default, _encoder, _indent, _floatstr,
         elif isinstance(o, float):
             # see comment for int/float in _make_iterencode
             yield _floatstr(o)
+        elif _fields is not None and type(o) in _fields:
+            yield from _iterencode_fields(o, _current_indent_level)
         elif isinstance(o, (list, tuple)):
             yield from _iterencode_list(o, _current_indent_level)
         elif isinstance(o, dict):
@@ -5,8 +5,12 @@ try:
     from _json import make_scanner as c_make_scanner
 except ImportError:
     c_make_scanner = None
+try:
+    from _json import scan_stream as c_scan_stream
+except ImportError:
+    c_scan_stream = None
 
-__all__ = ['make_scanner']
+__all__ = ['make_scanner', 'scan_stream']
 
 NUMBER_RE = re.compile(
     r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?',
@@ -71,3 +75,90 @@ def py_make_scanner(context):
     return scan_once
 
 make_scanner = c_make_scanner or py_make_scanner
+
+
+# Flags of the state of scan_stream(), also defined in _json.c.
+STREAM_IN_VALUE = 1
+STREAM_IN_STRING = 2
+STREAM_ESCAPE = 4
+STREAM_IN_SCALAR = 8
+
+STREAM_STRUCTURE = re.compile(r'["\[\]{}]')
+STREAM_STRING_END = re.compile(r'["\\]')
+STREAM_SCALAR_END = re.compile(r'[ \t\n\r,\[\]{}"]')
+
+def py_scan_stream(string, depth, flags, start, level):
+    """Find the boundaries of the JSON values in a chunk of a stream.
+
+    Values which begin inside level nested arrays or objects are reported
+    as a list of (start, end) indexes in string.  depth, flags and start
+    are the state left by the scan of the previous chunk, start being
+    relative to the beginning of string.  The values are not validated.
+
+    Returns a tuple of the list and the new depth, flags and start.
+    """
+    spans = []
+    idx = 0
+    end = len(string)
+    while idx < end:
+        if flags & STREAM_IN_STRING:
+            if flags & STREAM_ESCAPE:
+                flags &= ~STREAM_ESCAPE
+                idx += 1
+                continue
+            m = STREAM_STRING_END.search(string, idx)
+            if m is None:
+                break
+            idx = m.end()
+            if m.group() == '\\':
+                flags |= STREAM_ESCAPE
+                continue
+            flags &= ~STREAM_IN_STRING
+            if depth == level:
+                spans.append((start, idx))
+                flags &= ~STREAM_IN_VALUE
+            continue
+        if flags & STREAM_IN_SCALAR:
+            m = STREAM_SCALAR_END.search(string, idx)
+            if m is None:
+                break
+            idx = m.start()
+            spans.append((start, idx))
+            flags &= ~(STREAM_IN_SCALAR | STREAM_IN_VALUE)
+        elif depth > level:
+            m = STREAM_STRUCTURE.search(string, idx)
+            if m is None:
+                break
+            idx = m.start()
+
+        nextchar = string[idx]
+        if nextchar == '"':
+            flags |= STREAM_IN_STRING
+            if depth == level:
+                flags |= STREAM_IN_VALUE
+                start = idx
+        elif nextchar == '[' or nextchar == '{':
+            if depth == level:
+                flags |= STREAM_IN_VALUE
+                start = idx
+            depth += 1
+        elif nextchar == ']' or nextchar == '}':
+            if depth > level:
+                depth -= 1
+                if depth == level:
+                    spans.append((start, idx + 1))
+                    flags &= ~STREAM_IN_VALUE
+            elif depth > 0:
+                depth -= 1
+            elif level == 0:
+                # Let the decoder report the unexpected character.
+                spans.append((idx, idx + 1))
+        elif nextchar in ' \t\n\r':
+            pass
+        elif depth == level and (nextchar != ',' or level == 0):
+            flags |= STREAM_IN_SCALAR | STREAM_IN_VALUE
+            start = idx
+        idx += 1
+    return spans, depth, flags, start
+
+scan_stream = c_scan_stream or py_scan_stream
@@ -31,7 +31,8 @@ from string import Formatter as StrFormatter
 
 __all__ = ['BASIC_FORMAT', 'BufferingFormatter', 'CRITICAL', 'DEBUG', 'ERROR',
            'FATAL', 'FileHandler', 'Filter', 'Formatter', 'Handler', 'INFO',
-           'LogRecord', 'Logger', 'LoggerAdapter', 'NOTSET', 'NullHandler',
+           'LazyLogRecord', 'LogRecord', 'Logger', 'LoggerAdapter', 'NOTSET',
+           'NullHandler',
            'StreamHandler', 'WARN', 'WARNING', 'addLevelName', 'basicConfig',
            'captureWarnings', 'critical', 'debug', 'disable', 'error',
            'exception', 'fatal', 'getLevelName', 'getLogger', 'getLoggerClass',
@@ -185,6 +186,15 @@ _srcfile = os.path.normcase(addLevelName.__code__.co_filename)
 #if not hasattr(sys, '_getframe'):
 #    _srcfile = None
 
+#
+# Caches of os.path.normcase() for findCaller(), and of the filename and
+# module attributes of LogRecord, by source file name. The number of entries
+# is limited, in case the file names are generated.
+#
+_CACHE_SIZE = 1000
+_normcaseCache = {}
+_pathnameCache = {}
+
 
 def _checkLevel(level):
     if isinstance(level, int):
@@ -315,11 +325,9 @@ class LogRecord(object):
         self.levelno = level
         self.pathname = pathname
         try:
-            self.filename = os.path.basename(pathname)
-            self.module = os.path.splitext(self.filename)[0]
-        except (TypeError, ValueError, AttributeError):
-            self.filename = pathname
-            self.module = "Unknown module"
+            self.filename, self.module = _pathnameCache[pathname]
+        except (KeyError, TypeError):
+            self.filename, self.module = _splitPathname(pathname)
         self.exc_info = exc_info
         self.exc_text = None      # used to cache the traceback text
         self.stack_info = sinfo
@@ -369,6 +377,115 @@ class LogRecord(object):
             msg = msg % self.args
         return msg
 
+def _splitPathname(pathname):
+    """
+    Return the filename and module attributes of a LogRecord for pathname.
+    """
+    try:
+        filename = os.path.basename(pathname)
+        module = os.path.splitext(filename)[0]
+    except (TypeError, ValueError, AttributeError):
+        return pathname, "Unknown module"
+    if len(_pathnameCache) < _CACHE_SIZE:
+        try:
+            _pathnameCache[pathname] = filename, module
+        except TypeError:
+            pass
+    return filename, module
+
+
+class LazyLogRecord(LogRecord):
+    """
+    A LogRecord which computes some of its attributes only when they are
+    first accessed, for example by a formatter which references them.
+
+    The lazy attributes are levelname, filename, module, msecs,
+    relativeCreated and processName. They are not in the instance __dict__
+    until computed; call resolve() to compute them. Pickling or copying the
+    record computes them all.
+
+    To use it, call setLogRecordFactory(LazyLogRecord).
+    """
+    def __init__(self, name, level, pathname, lineno,
+                 msg, args, exc_info, func=None, sinfo=None, **kwargs):
+        """
+        Initialize a logging record with the information which cannot be
+        computed later.
+        """
+        self.created = time.time()
+        self.name = name
+        self.msg = msg
+        # See LogRecord.__init__()
+        if (args and len(args) == 1 and
+                isinstance(args[0], collections.abc.Mapping) and args[0]):
+            args = args[0]
+        self.args = args
+        self.levelno = level
+        self.pathname = pathname
+        self.exc_info = exc_info
+        self.exc_text = None      # used to cache the traceback text
+        self.stack_info = sinfo
+        self.lineno = lineno
+        self.funcName = func
+        if logThreads:
+            self.thread = threading.get_ident()
+            self.threadName = threading.current_thread().name
+        else: # pragma: no cover
+            self.thread = None
+            self.threadName = None
+        if logProcesses and hasattr(os, 'getpid'):
+            self.process = os.getpid()
+        else:
+            self.process = None
+
+    def __getattr__(self, name):
+        # Only called if name is not found by the normal lookup
+        try:
+            compute = _lazyRecordAttributes[name]
+        except KeyError:
+            raise AttributeError('%r object has no attribute %r'
+                                 % (type(self).__name__, name)) from None
+        value = compute(self)
+        self.__dict__[name] = value
+        return value
+
+    def resolve(self, names=None):
+        """
+        Compute the lazy attributes in names (all of them if names is None)
+        which have not been computed yet. Other names are ignored.
+        """
+        if names is None:
+            names = _lazyRecordAttributes
+        d = self.__dict__
+        for name in names:
+            if name not in d and name in _lazyRecordAttributes:
+                getattr(self, name)
+
+    def __getstate__(self):
+        self.resolve()
+        return self.__dict__
+
+def _processName(record):
+    if not logMultiprocessing: # pragma: no cover
+        return None
+    mp = sys.modules.get('multiprocessing')
+    if mp is not None:
+        # See LogRecord.__init__()
+        try:
+            return mp.current_process().name
+        except Exception: #pragma: no cover
+            pass
+    return 'MainProcess'
+
+_lazyRecordAttributes = {
+    'levelname': lambda record: getLevelName(record.levelno),
+    'filename': lambda record: _splitPathname(record.pathname)[0],
+    'module': lambda record: _splitPathname(record.pathname)[1],
+    'msecs': lambda record: (record.created - int(record.created)) * 1000,
+    'relativeCreated': lambda record: (record.created - _startTime) * 1000,
+    'processName': _processName,
+}
+
 #
 #   Determine which class to use when instantiating log records.
 #
@@ -417,12 +534,18 @@ class PercentStyle(object):
     asctime_search = '%(asctime)'
     validation_pattern = re.compile(r'%\(\w+\)[#0+ -]*(\*|\d+)?(\.(\*|\d+))?[diouxefgcrsa%]', re.I)
 
+    field_pattern = re.compile(r'%\(([^)]*)\)')
+
     def __init__(self, fmt):
         self._fmt = fmt or self.default_format
 
     def usesTime(self):
         return self._fmt.find(self.asctime_search) >= 0
 
+    def fields(self):
+        """Return the set of the record attributes used by the format"""
+        return set(self.field_pattern.findall(self._fmt))
+
     def validate(self):
         """Validate the input format, ensure it matches the correct style"""
         if not self.validation_pattern.search(self._fmt):
@@ -432,6 +555,11 @@ class PercentStyle(object):
         return self._fmt % record.__dict__
 
     def format(self, record):
+        if isinstance(record, LazyLogRecord):
+            fields = getattr(self, '_fields', None)
+            if fields is None:
+                fields = self._fields = self.fields()
+            record.resolve(fields)
         try:
             return self._format(record)
         except KeyError as e:
@@ -449,6 +577,14 @@ class StrFormatStyle(PercentStyle):
     def _format(self, record):
         return self._fmt.format(**record.__dict__)
 
+    def fields(self):
+        """Return the set of the record attributes used by the format"""
+        fields = set()
+        for _, fieldname, _, _ in _str_formatter.parse(self._fmt):
+            if fieldname:
+                fields.add(re.match(r'\w*', fieldname).group())
+        return fields
+
     def validate(self):
         """Validate the input format, ensure it is the correct string formatting style"""
         fields = set()
@@ -495,6 +631,13 @@ class StringTemplateStyle(PercentStyle):
         if not fields:
             raise ValueError('invalid format: no fields')
 
+    def fields(self):
+        """Return the set of the record attributes used by the format"""
+        fields = set()
+        for m in Template.pattern.finditer(self._fmt):
+            fields.add(m.group('named') or m.group('braced'))
+        return fields
+
     def _format(self, record):
         return self._tpl.substitute(**record.__dict__)
 
@@ -952,6 +1095,34 @@ class Handler(Filterer):
                 self.release()
         return rv
 
+    def emitBatch(self, records):
+        """
+        Emit a list of logging records.
+
+        This version just calls emit() for each record. Subclasses can
+        override it to write the records at once, e.g. with a single call to
+        the underlying I/O.
+        """
+        for record in records:
+            self.emit(record)
+
+    def handleBatch(self, records):
+        """
+        Conditionally emit the specified logging records.
+
+        The records which pass the filters of the handler are passed to
+        emitBatch(), with the I/O thread lock acquired once for the whole
+        batch. Returns the list of records passed to emitBatch().
+        """
+        records = [record for record in records if self.filter(record)]
+        if records:
+            self.acquire()
+            try:
+                self.emitBatch(records)
+            finally:
+                self.release()
+        return records
+
     def setFormatter(self, fmt):
         """
         Set the formatter for this handler.
@@ -1088,6 +1259,34 @@ class StreamHandler(Handler):
         except Exception:
             self.handleError(record)
 
+    def emitBatch(self, records):
+        """
+        Emit a list of records.
+
+        The records are formatted, then written to the stream with a single
+        write() and flushed once. If emit() is overridden by a subclass, it
+        is called for each record instead.
+        """
+        if type(self).emit not in (StreamHandler.emit, FileHandler.emit):
+            Handler.emitBatch(self, records)
+            return
+        chunks = []
+        for record in records:
+            try:
+                chunks.append(self.format(record) + self.terminator)
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(record)
+        if chunks:
+            try:
+                self.stream.write(''.join(chunks))
+                self.flush()
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(records[-1])
+
     def setStream(self, stream):
         """
         Sets the StreamHandler's stream to the specified value,
@@ -1184,6 +1383,17 @@ class FileHandler(StreamHandler):
             self.stream = self._open()
         StreamHandler.emit(self, record)
 
+    def emitBatch(self, records):
+        """
+        Emit a list of records.
+
+        If the stream was not opened because 'delay' was specified in the
+        constructor, open it before calling the superclass's emitBatch.
+        """
+        if self.stream is None and type(self).emit is FileHandler.emit:
+            self.stream = self._open()
+        StreamHandler.emitBatch(self, records)
+
     def __repr__(self):
         level = getLevelName(self.level)
         return '<%s %s (%s)>' % (self.__class__.__name__, self.baseFilename, level)
@@ -1520,7 +1730,12 @@ class Logger(Filterer):
         rv = "(unknown file)", 0, "(unknown function)", None
         while hasattr(f, "f_code"):
             co = f.f_code
-            filename = os.path.normcase(co.co_filename)
+            try:
+                filename = _normcaseCache[co.co_filename]
+            except KeyError:
+                filename = os.path.normcase(co.co_filename)
+                if len(_normcaseCache) < _CACHE_SIZE:
+                    _normcaseCache[co.co_filename] = filename
             if filename == _srcfile:
                 f = f.f_back
                 continue
@@ -1547,7 +1762,8 @@ class Logger(Filterer):
                              sinfo)
         if extra is not None:
             for key in extra:
-                if (key in ["message", "asctime"]) or (key in rv.__dict__):
+                if ((key in ["message", "asctime"]) or (key in rv.__dict__) or
+                        (key in _lazyRecordAttributes)):
                     raise KeyError("Attempt to overwrite %r in LogRecord" % key)
                 rv.__dict__[key] = extra[key]
         return rv
@@ -381,8 +381,24 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
         if self.stream:
             self.stream.close()
             self.stream = None
-        # get the time that this sequence started at and make it a TimeTuple
         currentTime = int(time.time())
+        dfn = self.rotation_filename(self.baseFilename + "." +
+                                     self._intervalSuffix(currentTime))
+        if os.path.exists(dfn):
+            os.remove(dfn)
+        self.rotate(self.baseFilename, dfn)
+        if self.backupCount > 0:
+            for s in self.getFilesToDelete():
+                os.remove(s)
+        if not self.delay:
+            self.stream = self._open()
+        self.rolloverAt = self._nextRollover(currentTime)
+
+    def _intervalSuffix(self, currentTime):
+        """
+        Return the suffix of the file rotated at currentTime, computed from
+        the time that the current interval started at.
+        """
         dstNow = time.localtime(currentTime)[-1]
         t = self.rolloverAt - self.interval
         if self.utc:
@@ -396,16 +412,13 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
                 else:
                     addend = -3600
                 timeTuple = time.localtime(t + addend)
-        dfn = self.rotation_filename(self.baseFilename + "." +
-                                     time.strftime(self.suffix, timeTuple))
-        if os.path.exists(dfn):
-            os.remove(dfn)
-        self.rotate(self.baseFilename, dfn)
-        if self.backupCount > 0:
-            for s in self.getFilesToDelete():
-                os.remove(s)
-        if not self.delay:
-            self.stream = self._open()
+        return time.strftime(self.suffix, timeTuple)
+
+    def _nextRollover(self, currentTime):
+        """
+        Return the rollover time following a rollover done at currentTime.
+        """
+        dstNow = time.localtime(currentTime)[-1]
         newRolloverAt = self.computeRollover(currentTime)
         while newRolloverAt <= currentTime:
             newRolloverAt = newRolloverAt + self.interval
@@ -418,7 +431,299 @@ class TimedRotatingFileHandler(BaseRotatingHandler):
                 else:           # DST bows out before next rollover, so we need to add an hour
                     addend = 3600
                 newRolloverAt += addend
-        self.rolloverAt = newRolloverAt
+        return newRolloverAt
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Handler for logging to a file, rotating the log file when it reaches a
+    certain size and/or at certain timed intervals.
+
+    Only the rename of the log file is done by the thread which logs: the
+    rotator and the deletion of old files are run by a background thread.
+    """
+    def __init__(self, filename, maxBytes=0, when=None, interval=1,
+                 backupCount=0, encoding=None, delay=False, utc=False,
+                 atTime=None, errors=None, compress=None, fsyncInterval=None):
+        """
+        Open the specified file and use it as the stream for logging.
+
+        If maxBytes is not zero, rollover occurs when the next record would
+        make the file reach maxBytes bytes. The size of the file is tracked
+        as records are written, rather than asked to the file. If when is
+        not None, rollover also occurs at timed intervals, as described by
+        TimedRotatingFileHandler.
+
+        The rotated files are named with the time that the current interval
+        started at (or the time of the rollover if when is None), followed
+        by ".1", ".2" etc. if several rollovers occur in the same interval.
+        If backupCount is > 0, no more than backupCount files are kept.
+
+        compress can be 'gzip', 'bz2' or 'lzma' to compress the rotated
+        files, by setting the rotator and namer attributes.
+
+        If fsyncInterval is not None, the file is also synchronized to disk
+        with os.fsync() when a record is written at least fsyncInterval
+        seconds after the previous synchronization, at rollover and when
+        the handler is closed.
+        """
+        # Without a 'when', the time suffix of the rotated files has the
+        # precision of the seconds, as with when='S'.
+        TimedRotatingFileHandler.__init__(self, filename, when or 'S',
+                                          interval, backupCount,
+                                          encoding=encoding, delay=delay,
+                                          utc=utc, atTime=atTime,
+                                          errors=errors)
+        self.maxBytes = maxBytes
+        if when is None:
+            self.rolloverAt = None
+        # Match the time, the rollover number and the extension added by
+        # the namer.
+        timeMatch = self.extMatch.pattern[1:-len(r'(\.\w+)?$')]
+        self.extMatch = re.compile(r'^(%s)(\.\d+)?(\.\w+)?$' % timeMatch,
+                                   re.ASCII)
+        if compress is not None:
+            try:
+                modname, ext = _COMPRESSORS[compress]
+            except KeyError:
+                raise ValueError("Invalid compression specified: %r"
+                                 % compress) from None
+            module = __import__(modname)
+            self.rotator = _compressingRotator(module)
+            self.namer = lambda name: name + ext
+        self.fsyncInterval = fsyncInterval
+        self._lastSync = time.monotonic()
+        self._rotations = queue.Queue()
+        self._rotationThread = None
+
+    def _open(self):
+        stream = TimedRotatingFileHandler._open(self)
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def _length(self, msg):
+        """
+        Return the number of bytes of msg once encoded.
+        """
+        if msg.isascii():
+            return len(msg)
+        return len(msg.encode(self.stream.encoding, self.stream.errors))
+
+    def _shouldRollover(self, length):
+        if self.maxBytes > 0 and self._size > 0:
+            if self._size + length >= self.maxBytes:
+                return True
+        return self.rolloverAt is not None and time.time() >= self.rolloverAt
+
+    def shouldRollover(self, record):
+        """
+        Determine if rollover should occur.
+
+        See if the supplied record would cause the file to exceed the size
+        limit we have, or if the current interval has ended.
+        """
+        if self.stream is None:                 # delay was set...
+            self.stream = self._open()
+        msg = self.format(record) + self.terminator
+        return self._shouldRollover(self._length(msg))
+
+    def emit(self, record):
+        """
+        Emit a record.
+
+        The record is formatted once, then written to the file after a
+        rollover if needed.
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            length = self._length(msg)
+            if self._shouldRollover(length):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += length
+            self.flush()
+            self._sync()
+        except RecursionError:  # See issue 36272
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def emitBatch(self, records):
+        """
+        Emit a list of records.
+
+        The records are formatted, then written with a single write() per
+        file. If emit() is overridden by a subclass, it is called for each
+        record instead.
+        """
+        if type(self).emit is not SizedTimedRotatingFileHandler.emit:
+            logging.Handler.emitBatch(self, records)
+            return
+        chunks = []
+        for record in records:
+            try:
+                msg = self.format(record) + self.terminator
+                if self.stream is None:
+                    self.stream = self._open()
+                length = self._length(msg)
+                if self._shouldRollover(length):
+                    if chunks:
+                        self.stream.write(''.join(chunks))
+                        chunks = []
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                chunks.append(msg)
+                self._size += length
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(record)
+        if chunks:
+            try:
+                self.stream.write(''.join(chunks))
+                self.flush()
+                self._sync()
+            except RecursionError:  # See issue 36272
+                raise
+            except Exception:
+                self.handleError(records[-1])
+
+    def _sync(self, force=False):
+        """
+        Synchronize the file to disk if fsyncInterval is set and the
+        interval has elapsed since the previous synchronization (or if
+        force is true).
+        """
+        if self.fsyncInterval is None or self.stream is None:
+            return
+        now = time.monotonic()
+        if force or now - self._lastSync >= self.fsyncInterval:
+            self.stream.flush()
+            os.fsync(self.stream.fileno())
+            self._lastSync = now
+
+    def getFilesToDelete(self):
+        """
+        Determine the files to delete when rolling over.
+
+        The files are sorted by time, then by rollover number.
+        """
+        dirName, baseName = os.path.split(self.baseFilename)
+        prefix = baseName + "."
+        plen = len(prefix)
+        result = []
+        for fileName in os.listdir(dirName):
+            if fileName[:plen] == prefix:
+                m = self.extMatch.match(fileName[plen:])
+                if m:
+                    number = m.group(2)
+                    key = (m.group(1), int(number[1:]) if number else 0)
+                    result.append((key, os.path.join(dirName, fileName)))
+        if len(result) < self.backupCount:
+            return []
+        result.sort()
+        return [fn for key, fn in result[:len(result) - self.backupCount]]
+
+    def doRollover(self):
+        """
+        Do a rollover.
+
+        The log file is renamed, then the rotator is called and the old
+        files are deleted by a background thread.
+        """
+        if self.stream:
+            self._sync(force=True)
+            self.stream.close()
+            self.stream = None
+        currentTime = int(time.time())
+        if self.rolloverAt is None:
+            suffix = time.strftime(self.suffix, time.gmtime(currentTime)
+                                   if self.utc else
+                                   time.localtime(currentTime))
+        else:
+            suffix = self._intervalSuffix(currentTime)
+        source = "%s.%s" % (self.baseFilename, suffix)
+        number = 0
+        while (os.path.exists(source) or
+               os.path.exists(self.rotation_filename(source))):
+            number += 1
+            source = "%s.%s.%d" % (self.baseFilename, suffix, number)
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, source)
+        if self._rotationThread is None:
+            self._rotationThread = threading.Thread(
+                target=self._rotateFiles, daemon=True)
+            self._rotationThread.start()
+        self._rotations.put(source)
+        self._size = 0
+        if not self.delay:
+            self.stream = self._open()
+        if self.rolloverAt is not None:
+            self.rolloverAt = self._nextRollover(currentTime)
+
+    def _rotateFiles(self):
+        """
+        Rotate the files renamed by doRollover() and delete the old files,
+        until None is received.
+        """
+        q = self._rotations
+        while True:
+            source = q.get()
+            try:
+                if source is None:
+                    break
+                dest = self.rotation_filename(source)
+                if dest != source and os.path.exists(source):
+                    self.rotate(source, dest)
+                if self.backupCount > 0:
+                    for s in self.getFilesToDelete():
+                        os.remove(s)
+            except Exception:
+                self.handleError(logging.makeLogRecord(
+                    {'msg': 'Rotating %s', 'args': (source,)}))
+            finally:
+                q.task_done()
+
+    def close(self):
+        """
+        Closes the stream, and waits for the pending rotations.
+        """
+        self.acquire()
+        try:
+            try:
+                self._sync(force=True)
+            finally:
+                TimedRotatingFileHandler.close(self)
+            thread = self._rotationThread
+            self._rotationThread = None
+        finally:
+            self.release()
+        if thread is not None:
+            self._rotations.put(None)
+            thread.join()
+
+_COMPRESSORS = {
+    'gzip': ('gzip', '.gz'),
+    'bz2': ('bz2', '.bz2'),
+    'lzma': ('lzma', '.xz'),
+}
+
+def _compressingRotator(module):
+    """
+    Return a rotator compressing the source file to dest with module (gzip,
+    bz2 or lzma), then removing the source file.
+    """
+    import shutil
+
+    def rotator(source, dest):
+        with open(source, 'rb') as sf, module.open(dest, 'wb') as df:
+            shutil.copyfileobj(sf, df)
+        os.remove(source)
+    return rotator
 
 class WatchedFileHandler(logging.FileHandler):
     """
@@ -606,6 +911,8 @@ class SocketHandler(logging.Handler):
         # See issue #14436: If msg or args are objects, they may not be
         # available on the receiving end. So we convert the msg % args
         # to a string, save it as msg and zap the args.
+        if isinstance(record, logging.LazyLogRecord):
+            record.resolve()
         d = dict(record.__dict__)
         d['msg'] = record.getMessage()
         d['args'] = None
@@ -645,6 +952,30 @@ class SocketHandler(logging.Handler):
         except Exception:
             self.handleError(record)
 
+    def emitBatch(self, records):
+        """
+        Emit a list of records.
+
+        Pickles the records and writes them to the socket with a single
+        send. If emit() or send() is overridden by a subclass, emit() is
+        called for each record instead.
+        """
+        if (type(self).emit is not SocketHandler.emit or
+                type(self).send is not SocketHandler.send):
+            logging.Handler.emitBatch(self, records)
+            return
+        chunks = []
+        for record in records:
+            try:
+                chunks.append(self.makePickle(record))
+            except Exception:
+                self.handleError(record)
+        if chunks:
+            try:
+                self.send(b''.join(chunks))
+            except Exception:
+                self.handleError(records[-1])
+
     def close(self):
         """
         Closes the socket.
@@ -1164,6 +1495,8 @@ class HTTPHandler(logging.Handler):
         that is sent as the CGI data. Overwrite in your class.
         Contributed by Franz Glasner.
         """
+        if isinstance(record, logging.LazyLogRecord):
+            record.resolve()
         return record.__dict__
 
     def emit(self, record):
@@ -1419,15 +1752,23 @@ class QueueListener(object):
     """
     _sentinel = None
 
-    def __init__(self, queue, *handlers, respect_handler_level=False):
+    def __init__(self, queue, *handlers, respect_handler_level=False,
+                 batch_size=1):
         """
         Initialise an instance with the specified queue and
         handlers.
+
+        If batch_size is greater than 1, up to batch_size records which are
+        already in the queue are dequeued at once and passed to
+        handleBatch().
         """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
         self.queue = queue
         self.handlers = handlers
         self._thread = None
         self.respect_handler_level = respect_handler_level
+        self.batch_size = batch_size
 
     def dequeue(self, block):
         """
@@ -1475,6 +1816,23 @@ class QueueListener(object):
             if process:
                 handler.handle(record)
 
+    def handleBatch(self, records):
+        """
+        Handle a list of records.
+
+        This prepares the records, then offers them to each handler's
+        handleBatch() method, so that a handler can write them at once.
+        """
+        records = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            if not self.respect_handler_level:
+                batch = records
+            else:
+                batch = [record for record in records
+                         if record.levelno >= handler.level]
+            if batch:
+                handler.handleBatch(batch)
+
     def _monitor(self):
         """
         Monitor the queue for records, and ask the handler
@@ -1485,6 +1843,9 @@ class QueueListener(object):
         """
         q = self.queue
         has_task_done = hasattr(q, 'task_done')
+        if self.batch_size > 1:
+            self._monitor_batches(has_task_done)
+            return
         while True:
             try:
                 record = self.dequeue(True)
@@ -1498,6 +1859,32 @@ class QueueListener(object):
             except queue.Empty:
                 break
 
+    def _monitor_batches(self, has_task_done):
+        q = self.queue
+        done = False
+        while not done:
+            try:
+                records = [self.dequeue(True)]
+            except queue.Empty:
+                break
+            # Take the records which are already available, without
+            # blocking.
+            while (records[-1] is not self._sentinel and
+                   len(records) < self.batch_size):
+                try:
+                    records.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            count = len(records)
+            if records[-1] is self._sentinel:
+                records.pop()
+                done = True
+            if records:
+                self.handleBatch(records)
+            if has_task_done:
+                for _ in range(count):
+                    q.task_done()
+
     def enqueue_sentinel(self):
         """
         This is used to enqueue the sentinel record.
@@ -1519,3 +1906,136 @@ class QueueListener(object):
         self.enqueue_sentinel()
         self._thread.join()
         self._thread = None
+
+
+class _AsyncListener(QueueListener):
+    """
+    The listener of an AsyncHandler: the sentinel is enqueued with a
+    blocking put(), since the bounded queue can be full.
+    """
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class AsyncHandler(QueueHandler):
+    """
+    This handler passes records to handlers which run in a background thread,
+    so that slow handlers don't block the threads which log.
+
+    Records are neither formatted nor copied in the logging thread: the
+    target handlers format them in the background thread, and receive them
+    in batches of up to batch_size records through their handleBatch()
+    method.
+
+    At most capacity records are waiting in the queue. When it is full,
+    overflow determines what happens to a new record: 'block' waits for a
+    free slot (backpressure), 'drop_new' discards the new record and
+    'drop_old' discards the oldest waiting record. The number of discarded
+    records is counted in the dropped attribute.
+    """
+
+    def __init__(self, *handlers, capacity=10000, overflow='block',
+                 batch_size=100, respect_handler_level=True):
+        """
+        Initialise the handler and start the background thread.
+        """
+        if overflow not in ('block', 'drop_new', 'drop_old'):
+            raise ValueError(f'invalid overflow policy: {overflow!r}')
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        QueueHandler.__init__(self, queue.Queue(capacity))
+        self.overflow = overflow
+        self.dropped = 0
+        self._closing = False
+        self.listener = _AsyncListener(
+            self.queue, *handlers, batch_size=batch_size,
+            respect_handler_level=respect_handler_level)
+        self.listener.start()
+
+    def handle(self, record):
+        """
+        Conditionally enqueue the specified logging record.
+
+        Unlike Handler.handle(), the I/O thread lock is not acquired, since
+        the queue does its own locking.
+        """
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record):
+        """
+        Prepare a record for queuing.
+
+        The record is enqueued as is: formatting is left to the target
+        handlers. Note that, as a consequence, the arguments of the message
+        should not be modified after the logging call.
+        """
+        return record
+
+    def enqueue(self, record):
+        """
+        Enqueue a record, applying the overflow policy if the queue is full.
+
+        Records logged after the handler has been closed, or while it is
+        being closed, are dropped.
+        """
+        if self._closing:
+            self._dropped()
+            return
+        if self.overflow == 'block':
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                if self.overflow == 'drop_new':
+                    self._dropped()
+                    return
+            # drop_old: discard the oldest record and try again
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                continue
+            self.queue.task_done()
+            if item is self.listener._sentinel:
+                # close() is stopping the listener: put its sentinel back
+                # and drop the new record instead.
+                self.queue.put(item)
+                self._dropped()
+                return
+            self._dropped()
+
+    def _dropped(self):
+        self.acquire()
+        try:
+            self.dropped += 1
+        finally:
+            self.release()
+
+    def flush(self):
+        """
+        Wait until the records enqueued so far have been handled, then flush
+        the target handlers.
+        """
+        if self.listener._thread is not None:
+            self.queue.join()
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def close(self):
+        """
+        Handle the remaining records and stop the background thread.
+
+        The target handlers are not closed, since they may be shared with
+        other loggers.
+        """
+        self._closing = True
+        try:
+            if self.listener._thread is not None:
+                self.listener.stop()
+        finally:
+            QueueHandler.close(self)
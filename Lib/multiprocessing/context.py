@@ -113,11 +113,17 @@ class BaseContext(object):
         return SimpleQueue(ctx=self.get_context())
 
     def Pool(self, processes=None, initializer=None, initargs=(),
-             maxtasksperchild=None):
+             maxtasksperchild=None, *, template=False):
         '''Returns a process pool object'''
         from .pool import Pool
+        if template and self.get_start_method(allow_none=True) is None:
+            # Template processes use the forkserver start method, unless
+            # another one was explicitly chosen.
+            context = None
+        else:
+            context = self.get_context()
         return Pool(processes, initializer, initargs, maxtasksperchild,
-                    context=self.get_context())
+                    context=context, template=template)
 
     def RawValue(self, typecode_or_type, *args):
         '''Returns a shared object'''
@@ -304,6 +310,35 @@ if sys.platform != 'win32':
             if not reduction.HAVE_SEND_HANDLE:
                 raise ValueError('forkserver start method not available')
 
+    class ForkServerTemplateProcess(process.BaseProcess):
+        _start_method = 'forkserver'
+        def __init__(self, *args, forkserver, **kwds):
+            super().__init__(*args, **kwds)
+            self._forkserver = forkserver
+        def __getstate__(self):
+            # The fork server stays in the parent process.
+            state = self.__dict__.copy()
+            del state['_forkserver']
+            return state
+        @staticmethod
+        def _Popen(process_obj):
+            from .popen_forkserver import Popen
+            return Popen(process_obj, process_obj._forkserver)
+
+    class ForkServerTemplateContext(ForkServerContext):
+        '''Context whose processes are forked from a dedicated fork server,
+        which called initializer(*initargs) once before forking them.'''
+        def __init__(self, initializer=None, initargs=()):
+            self._check_available()
+            from .forkserver import ForkServer
+            self._forkserver = ForkServer(initializer, initargs)
+        def Process(self, *args, **kwds):
+            return ForkServerTemplateProcess(
+                *args, forkserver=self._forkserver, **kwds)
+        def close(self):
+            '''Stop the template process once all its children exited.'''
+            self._forkserver._stop()
+
     _concrete_contexts = {
         'fork': ForkContext(),
         'spawn': SpawnContext(),
@@ -334,6 +369,20 @@ else:
     }
     _default_context = DefaultContext(_concrete_contexts['spawn'])
 
+#
+# Context forking its processes from a template process
+#
+
+def _get_template_context(initializer=None, initargs=(), context=None):
+    '''Return a context whose processes are forked from a template process,
+    which called initializer(*initargs) once beforehand.'''
+    if sys.platform == 'win32':
+        raise ValueError('forkserver start method not available')
+    if context is not None and context.get_start_method() != 'forkserver':
+        raise ValueError("a template process requires the 'forkserver' "
+                         "start method")
+    return ForkServerTemplateContext(initializer, initargs)
+
 #
 # Force the start method
 #
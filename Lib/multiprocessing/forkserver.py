@@ -1,4 +1,5 @@
 import errno
+import io
 import os
 import selectors
 import signal
@@ -10,7 +11,7 @@ import warnings
 
 from . import connection
 from . import process
-from .context import reduction
+from .context import reduction, set_spawning_popen
 from . import resource_tracker
 from . import spawn
 from . import util
@@ -31,13 +32,20 @@ SIGNED_STRUCT = struct.Struct('q')     # large enough for pid_t
 
 class ForkServer(object):
 
-    def __init__(self):
+    def __init__(self, initializer=None, initargs=()):
         self._forkserver_address = None
         self._forkserver_alive_fd = None
         self._forkserver_pid = None
         self._inherited_fds = None
         self._lock = threading.Lock()
-        self._preload_modules = ['__main__']
+        if initializer is None and not initargs:
+            self._preload_modules = ['__main__']
+            self._template = None
+        else:
+            # The template prepares itself like a child process, which
+            # imports the main module.
+            self._preload_modules = []
+            self._template = (initializer, initargs)
 
     def _stop(self):
         # Method used by unit tests to stop the server
@@ -132,6 +140,21 @@ class ForkServer(object):
             else:
                 data = {}
 
+            if self._template is not None:
+                # Pickle the template's initializer before starting the
+                # server, so that errors are raised here.
+                buf = io.BytesIO()
+                template_popen = _TemplatePopen()
+                set_spawning_popen(template_popen)
+                try:
+                    reduction.dump(
+                        spawn.get_preparation_data('ForkServerTemplate'), buf)
+                    reduction.dump(self._template, buf)
+                finally:
+                    set_spawning_popen(None)
+                template_r, template_w = os.pipe()
+                data['template_fd'] = template_r
+
             with socket.socket(socket.AF_UNIX) as listener:
                 address = connection.arbitrary_address('AF_UNIX')
                 listener.bind(address)
@@ -143,6 +166,9 @@ class ForkServer(object):
                 alive_r, alive_w = os.pipe()
                 try:
                     fds_to_pass = [listener.fileno(), alive_r]
+                    if self._template is not None:
+                        fds_to_pass.append(template_r)
+                        fds_to_pass += template_popen.fds
                     cmd %= (listener.fileno(), alive_r, self._preload_modules,
                             data)
                     exe = spawn.get_executable()
@@ -151,19 +177,67 @@ class ForkServer(object):
                     pid = util.spawnv_passfds(exe, args, fds_to_pass)
                 except:
                     os.close(alive_w)
+                    if self._template is not None:
+                        os.close(template_w)
                     raise
                 finally:
                     os.close(alive_r)
+                    if self._template is not None:
+                        os.close(template_r)
+                if self._template is not None:
+                    # The server reads the template while starting up.
+                    try:
+                        with open(template_w, 'wb', closefd=True) as f:
+                            f.write(buf.getbuffer())
+                    except BrokenPipeError:
+                        # The server died: connecting to it fails.
+                        pass
                 self._forkserver_address = address
                 self._forkserver_alive_fd = alive_w
                 self._forkserver_pid = pid
 
+
+class _DupFd(object):
+    def __init__(self, fd):
+        self.fd = fd
+    def detach(self):
+        return self.fd
+
+
+class _TemplatePopen(object):
+    '''Stands for the spawning popen while the template of a fork server is
+    pickled: like with the spawn start method, the file descriptors are
+    passed to the server with the same numbers.'''
+    DupFd = _DupFd
+
+    def __init__(self):
+        self.fds = []
+
+    def duplicate_for_child(self, fd):
+        self.fds.append(fd)
+        return fd
+
 #
 #
 #
 
-def main(listener_fd, alive_r, preload, main_path=None, sys_path=None):
+def main(listener_fd, alive_r, preload, main_path=None, sys_path=None,
+         template_fd=None):
     '''Run forkserver.'''
+    if template_fd is not None:
+        # Turn this server into a template for its children, by running the
+        # initializer of the template in it.
+        with open(template_fd, 'rb', closefd=True) as from_parent:
+            process.current_process()._inheriting = True
+            try:
+                preparation_data = reduction.pickle.load(from_parent)
+                spawn.prepare(preparation_data)
+                initializer, initargs = reduction.pickle.load(from_parent)
+            finally:
+                del process.current_process()._inheriting
+        if initializer is not None:
+            initializer(*initargs)
+
     if preload:
         if '__main__' in preload and main_path is not None:
             process.current_process()._inheriting = True
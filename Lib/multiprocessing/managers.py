@@ -1300,10 +1300,11 @@ if HAS_SHMEM:
         """Like SyncManager but uses SharedMemoryServer instead of Server.
 
         It provides methods for creating and returning SharedMemory instances
-        and for creating a list-like object (ShareableList) backed by shared
-        memory.  It also provides methods that create and return Proxy Objects
-        that support synchronization across processes (i.e. multi-process-safe
-        locks and semaphores).
+        and for creating list-like objects (ShareableList, ShareableArray) and
+        a dict-like object (ShareableDict) backed by shared memory.  It also
+        provides methods that create and return Proxy Objects that support
+        synchronization across processes (i.e. multi-process-safe locks and
+        semaphores).
         """
 
         _Server = SharedMemoryServer
@@ -1360,3 +1361,29 @@ if HAS_SHMEM:
                     sl.shm.unlink()
                     raise e
             return sl
+
+        def ShareableArray(self, typecode, initializer=(), **kwargs):
+            """Returns a new ShareableArray instance of the given typecode,
+            populated with the values from the initializer, to be tracked by
+            the manager."""
+            with self._Client(self._address, authkey=self._authkey) as conn:
+                sa = shared_memory.ShareableArray(typecode, initializer,
+                                                  **kwargs)
+                try:
+                    dispatch(conn, None, 'track_segment', (sa.shm.name,))
+                except BaseException as e:
+                    sa.unlink()
+                    raise e
+            return sa
+
+        def ShareableDict(self, mapping=(), **kwargs):
+            """Returns a new ShareableDict instance populated with the items
+            from the input mapping, to be tracked by the manager."""
+            with self._Client(self._address, authkey=self._authkey) as conn:
+                sd = shared_memory.ShareableDict(mapping, **kwargs)
+                try:
+                    dispatch(conn, None, 'track_segment', (sd.shm.name,))
+                except BaseException as e:
+                    sd.unlink()
+                    raise e
+            return sd
@@ -27,6 +27,7 @@ from queue import Empty
 # we avoid top-level imports which are liable to fail on some systems.
 from . import util
 from . import get_context, TimeoutError
+from .context import _get_template_context
 from .connection import wait
 
 #
@@ -181,13 +182,25 @@ class Pool(object):
         return ctx.Process(*args, **kwds)
 
     def __init__(self, processes=None, initializer=None, initargs=(),
-                 maxtasksperchild=None, context=None):
+                 maxtasksperchild=None, context=None, *, template=False):
         # Attributes initialized early to make sure that they exist in
         # __del__() if __init__() raises an exception
         self._pool = []
         self._state = INIT
 
-        self._ctx = context or get_context()
+        if initializer is not None and not callable(initializer):
+            raise TypeError('initializer must be a callable')
+
+        if template:
+            # The workers are forked from a template process which already
+            # called the initializer.
+            self._ctx = _get_template_context(initializer, initargs, context)
+            initializer = None
+            initargs = ()
+            self._template = self._ctx
+        else:
+            self._ctx = context or get_context()
+            self._template = None
         self._setup_queues()
         self._taskqueue = queue.SimpleQueue()
         # The _change_notifier queue exist to wake up self._handle_workers()
@@ -204,9 +217,6 @@ class Pool(object):
         if processes < 1:
             raise ValueError("Number of processes must be at least 1")
 
-        if initializer is not None and not callable(initializer):
-            raise TypeError('initializer must be a callable')
-
         self._processes = processes
         try:
             self._repopulate_pool()
@@ -216,6 +226,8 @@ class Pool(object):
                     p.terminate()
             for p in self._pool:
                 p.join()
+            if self._template is not None:
+                self._template.close()
             raise
 
         sentinels = self._get_sentinels()
@@ -253,7 +265,7 @@ class Pool(object):
             self, self._terminate_pool,
             args=(self._taskqueue, self._inqueue, self._outqueue, self._pool,
                   self._change_notifier, self._worker_handler, self._task_handler,
-                  self._result_handler, self._cache),
+                  self._result_handler, self._cache, self._template),
             exitpriority=15
             )
         self._state = RUN
@@ -666,6 +678,8 @@ class Pool(object):
         self._result_handler.join()
         for p in self._pool:
             p.join()
+        if self._template is not None:
+            self._template.close()
 
     @staticmethod
     def _help_stuff_finish(inqueue, task_handler, size):
@@ -678,7 +692,8 @@ class Pool(object):
 
     @classmethod
     def _terminate_pool(cls, taskqueue, inqueue, outqueue, pool, change_notifier,
-                        worker_handler, task_handler, result_handler, cache):
+                        worker_handler, task_handler, result_handler, cache,
+                        template=None):
         # this is guaranteed to only be called once
         util.debug('finalizing pool')
 
@@ -725,6 +740,10 @@ class Pool(object):
                     util.debug('cleaning up worker %d' % p.pid)
                     p.join()
 
+        if template is not None:
+            util.debug('stopping template process')
+            template.close()
+
     def __enter__(self):
         self._check_running()
         return self
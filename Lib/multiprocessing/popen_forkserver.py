@@ -30,8 +30,9 @@ class Popen(popen_fork.Popen):
     method = 'forkserver'
     DupFd = _DupFd
 
-    def __init__(self, process_obj):
+    def __init__(self, process_obj, server=None):
         self._fds = []
+        self._forkserver = server or forkserver._forkserver
         super().__init__(process_obj)
 
     def duplicate_for_child(self, fd):
@@ -48,7 +49,7 @@ class Popen(popen_fork.Popen):
         finally:
             set_spawning_popen(None)
 
-        self.sentinel, w = forkserver.connect_to_new_process(self._fds)
+        self.sentinel, w = self._forkserver.connect_to_new_process(self._fds)
         # Keep a duplicate of the data pipe's write end as a sentinel of the
         # parent process used by the child process.
         _parent_w = os.dup(w)
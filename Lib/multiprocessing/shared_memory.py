@@ -5,15 +5,21 @@ documentation for details.
 """
 
 
-__all__ = [ 'SharedMemory', 'ShareableList' ]
+__all__ = [ 'SharedMemory', 'ShareableList', 'ShareableArray',
+            'ShareableDict' ]
 
 
+from binascii import crc32 as _crc32
+import collections.abc
 from functools import partial
+import array
 import mmap
 import os
 import errno
+import pickle
 import struct
 import secrets
+import time
 
 if os.name == "nt":
     import _winapi
@@ -238,6 +244,24 @@ class SharedMemory:
             _posixshmem.shm_unlink(self._name)
             unregister(self._name, "shared_memory")
 
+    def _remap(self, size=0):
+        """Grows the shared memory block to at least size bytes, then maps
+        all of it again, including the space added by other processes.
+
+        Views of the previous mapping stay valid, the old mapping is only
+        released once they are all released.  Only supported on POSIX."""
+        if not _USE_POSIX:
+            raise NotImplementedError(
+                "shared memory blocks can only grow on POSIX systems")
+        if self._mmap is None:
+            raise ValueError("operation on closed shared memory block")
+        if size > os.fstat(self._fd).st_size:
+            os.ftruncate(self._fd, size)
+        size = os.fstat(self._fd).st_size
+        self._mmap = mmap.mmap(self._fd, size)
+        self._buf = memoryview(self._mmap)
+        self._size = size
+
 
 _encoding = "utf8"
 
@@ -508,3 +532,594 @@ class ShareableList:
                 return position
         else:
             raise ValueError(f"{value!r} not in this container")
+
+
+def _get_lock(lock, attached):
+    """Returns the lock to use for the given lock argument, or None.
+
+    A new lock cannot be created for a block attached to by name, since
+    it would not be shared with the processes already using the block."""
+    if lock is False:
+        return None
+    if lock in (True, None):
+        if attached:
+            raise ValueError("attaching to a block by name requires the "
+                             "lock of the original object, or lock=False")
+        from . import get_context
+        lock = get_context().Lock()
+    if not hasattr(lock, 'acquire'):
+        raise AttributeError("%r has no method 'acquire'" % lock)
+    return lock
+
+
+class ShareableArray:
+    """Pattern for a growable array of numbers shareable via a shared
+    memory block.
+
+    Like array.array, the items are stored as C values of the type given
+    by a typecode.  They follow a 16 bytes header storing the typecode and
+    the number of items, so that the array can be attached to by name.
+    Appending items beyond the capacity of the block makes it grow in place
+    (on POSIX systems only); other processes map the new space on demand.
+
+    Appends are serialized across processes by a multiprocessing lock, as
+    with multiprocessing.Array: lock=False disables it.  The lock is not
+    stored in the block, so attaching to an array by name requires passing
+    the lock of the original array (see get_lock()) or lock=False.
+    Pickled arrays share the lock."""
+
+    _header_size = 16
+
+    # Defaults; enables close() to run without errors.
+    shm = None
+    _length = None
+    _items = None
+
+    def __init__(self, typecode=None, initializer=(), *, name=None,
+                 capacity=0, lock=True):
+        if typecode is None and name is None:
+            raise TypeError("'typecode' can only be None if 'name' "
+                            "is specified")
+        self._lock = _get_lock(lock, typecode is None)
+        if typecode is None:
+            self.shm = SharedMemory(name)
+            typecode = struct.unpack_from(
+                "8s",
+                self.shm.buf,
+                0
+            )[0].rstrip(b'\x00').decode(_encoding)
+            items = None
+        else:
+            items = array.array(typecode, initializer)
+
+        if typecode == 'u':
+            raise ValueError("typecode 'u' is not supported")
+        self._typecode = typecode
+        self._itemsize = array.array(typecode).itemsize
+
+        if items is not None:
+            capacity = max(capacity, len(items), 1)
+            self.shm = SharedMemory(
+                name,
+                create=True,
+                size=self._header_size + capacity * self._itemsize
+            )
+            struct.pack_into(
+                "8sq",
+                self.shm.buf,
+                0,
+                typecode.encode(_encoding),
+                len(items)
+            )
+        self._map()
+        if items is not None:
+            self._items[:len(items)] = items
+
+    def _map(self):
+        "Casts the current mapping of the block to the header and the items."
+        buf = self.shm.buf
+        self._length = buf[8:self._header_size].cast("q")
+        end = len(buf) - (len(buf) - self._header_size) % self._itemsize
+        self._items = buf[self._header_size:end].cast(self._typecode)
+
+    def _remap(self, capacity=0):
+        "Maps the items added by other processes, growing to capacity."
+        self.shm._remap(self._header_size + capacity * self._itemsize)
+        self._map()
+
+    def _reserve(self, length):
+        "Makes room for length items; the lock must be held."
+        if length > len(self._items):
+            # Another process may have grown the block already.
+            self._remap()
+            if length > len(self._items):
+                self._remap(max(length, 2 * len(self._items)))
+
+    def __getitem__(self, position):
+        length = self._length[0]
+        if isinstance(position, slice):
+            if length > len(self._items):
+                self._remap()
+            result = array.array(self._typecode)
+            result.frombytes(self._items[:length][position].tobytes())
+            return result
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError("index out of range")
+        try:
+            return self._items[position]
+        except IndexError:
+            self._remap()
+            return self._items[position]
+
+    def __setitem__(self, position, value):
+        length = self._length[0]
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError("assignment index out of range")
+        try:
+            self._items[position] = value
+        except IndexError:
+            self._remap()
+            self._items[position] = value
+
+    def append(self, value):
+        "Appends value to the end of the array."
+        if self._lock is None:
+            self._append(value)
+        else:
+            with self._lock:
+                self._append(value)
+
+    def _append(self, value):
+        length = self._length[0]
+        self._reserve(length + 1)
+        self._items[length] = value
+        # Publish the item only once it is written.
+        self._length[0] = length + 1
+
+    def extend(self, iterable):
+        "Appends the items of iterable to the end of the array."
+        items = array.array(self._typecode, iterable)
+        if self._lock is None:
+            self._extend(items)
+        else:
+            with self._lock:
+                self._extend(items)
+
+    def _extend(self, items):
+        length = self._length[0]
+        self._reserve(length + len(items))
+        self._items[length:length + len(items)] = items
+        self._length[0] = length + len(items)
+
+    def __len__(self):
+        return self._length[0]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __reduce__(self):
+        lock = False if self._lock is None else self._lock
+        return partial(self.__class__, name=self.shm.name, lock=lock), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self._typecode!r}, '
+                f'{self.tolist()}, name={self.shm.name!r})')
+
+    @property
+    def typecode(self):
+        "The typecode character used to create the array."
+        return self._typecode
+
+    @property
+    def itemsize(self):
+        "The length in bytes of one array item."
+        return self._itemsize
+
+    @property
+    def buf(self):
+        """A memoryview of the items currently stored, formatted according
+        to the typecode."""
+        length = self._length[0]
+        if length > len(self._items):
+            self._remap()
+        return self._items[:length]
+
+    def get_lock(self):
+        "Returns the lock serializing appends, or None."
+        return self._lock
+
+    def tolist(self):
+        "Returns the items of the array as a list."
+        return self[:].tolist()
+
+    def __del__(self):
+        try:
+            self.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """Closes access to the shared memory from this instance but does
+        not destroy the shared memory block."""
+        # The views must be released before the mapping can be closed.
+        if self._items is not None:
+            self._length.release()
+            self._items.release()
+        if self.shm is not None:
+            self.shm.close()
+
+    def unlink(self):
+        "Requests that the underlying shared memory block be destroyed."
+        self.shm.unlink()
+
+
+# Layout of the header of a ShareableDict, as indices of 8 bytes words.
+_SEQUENCE = 0       # Odd while the table is being modified.
+_MASK = 1           # Number of slots of the table, minus one.
+_USED = 2           # Number of items.
+_FILL = 3           # Number of items and deleted items.
+_HEAP_END = 4       # Offset of the free space following the entries.
+_SIZE = 5           # Size of the block, known to all processes.
+_HEADER_WORDS = 8
+
+_EMPTY = 0
+_DELETED = -1
+
+# Kinds of keys and values.
+_BYTES = 0
+_STR = 1
+_PICKLED = 2
+
+_MIN_SLOTS = 8
+
+
+def _encode_key(key):
+    if isinstance(key, bytes):
+        return _BYTES, key
+    if isinstance(key, str):
+        return _STR, key.encode(_encoding)
+    raise TypeError(f"keys must be str or bytes, not {type(key).__name__}")
+
+
+def _encode_value(value):
+    if type(value) is bytes:
+        return _BYTES, value
+    if type(value) is str:
+        return _STR, value.encode(_encoding)
+    return _PICKLED, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(kind, data):
+    if kind == _BYTES:
+        return data
+    if kind == _STR:
+        return data.decode(_encoding)
+    return pickle.loads(data)
+
+
+class ShareableDict(collections.abc.MutableMapping):
+    """Pattern for a mutable mapping shareable via a shared memory block,
+    with str or bytes keys and values of any picklable type.
+
+    The block holds an open addressing hash table and the encoded keys and
+    values it points to.  Lookups do not take any lock: they are validated
+    with a sequence counter that writers make odd while they update the
+    table, and retried if the table changed meanwhile.  Writers are
+    serialized across processes by a multiprocessing lock; lock=False
+    disables it.  As with ShareableArray, attaching to a dict by name
+    requires passing the lock of the original dict, or lock=False.  The
+    block grows in place as needed (on POSIX systems only), and is
+    compacted when deleted and replaced items fill it."""
+
+    # Defaults; enables close() to run without errors.
+    shm = None
+    _words = None
+
+    def __init__(self, mapping=None, *, name=None, size=0, lock=True):
+        attached = name is not None and mapping is None
+        self._lock = _get_lock(lock, attached)
+        if attached:
+            self.shm = SharedMemory(name)
+        else:
+            items = [
+                (*_encode_key(key), *_encode_value(value))
+                for key, value in dict(mapping or ()).items()
+            ]
+            table = self._build_table(items)
+            self.shm = SharedMemory(
+                name,
+                create=True,
+                size=max(size, 2 * len(table))
+            )
+            self.shm.buf[:len(table)] = table
+            struct.pack_into("q", self.shm.buf, _SIZE * 8, self.shm.size)
+        self._map()
+
+    def _map(self):
+        buf = self.shm.buf
+        self._words = buf[:len(buf) - len(buf) % 8].cast("q")
+
+    def _remap(self, size=0):
+        self.shm._remap(size)
+        self._map()
+
+    def _refresh(self):
+        "Maps the space added to the block by other processes."
+        if self._words[_SIZE] > len(self.shm.buf):
+            self._remap()
+
+    @staticmethod
+    def _build_table(items, heap_size=0):
+        """Returns the content of a block holding the given encoded items,
+        with at least heap_size bytes of free space."""
+        # Keep the table at most one third full, so that it is rebuilt
+        # only after the number of items doubled.
+        nslots = _MIN_SLOTS
+        while nslots <= len(items) * 3:
+            nslots *= 2
+        heap_start = (_HEADER_WORDS + 2 * nslots) * 8
+        records = []
+        offset = heap_start
+        for kind, key, value_kind, value in items:
+            length = 16 + len(key) + len(value)
+            records.append((offset, kind, key, value_kind, value))
+            offset += (length + 7) & ~7
+        table = bytearray(offset + max(heap_size, offset - heap_start))
+        words = memoryview(table).cast("q")
+        words[_MASK] = nslots - 1
+        words[_USED] = words[_FILL] = len(items)
+        words[_HEAP_END] = offset
+        for offset, kind, key, value_kind, value in records:
+            struct.pack_into(
+                "qq%ds%ds" % (len(key), len(value)),
+                table,
+                offset,
+                len(key) << 2 | kind,
+                len(value) << 2 | value_kind,
+                key,
+                value
+            )
+            i = _crc32(key, kind) & (nslots - 1)
+            while words[_HEADER_WORDS + 2 * i + 1] != _EMPTY:
+                i = (i + 1) & (nslots - 1)
+            words[_HEADER_WORDS + 2 * i] = _crc32(key, kind)
+            words[_HEADER_WORDS + 2 * i + 1] = offset
+        words.release()
+        return table
+
+    def _find(self, kind, key, h):
+        """Returns the slot index of the key, or the slot where to insert it
+        as a negative number."""
+        words = self._words
+        buf = self.shm.buf
+        mask = words[_MASK]
+        i = h & mask
+        free = None
+        for _ in range(mask + 1):
+            slot = _HEADER_WORDS + 2 * i
+            offset = words[slot + 1]
+            if offset == _EMPTY:
+                return -1 - (slot if free is None else free)
+            if offset == _DELETED:
+                if free is None:
+                    free = slot
+            elif words[slot] == h:
+                key_info = words[offset >> 3]
+                if key_info == len(key) << 2 | kind:
+                    if buf[offset + 16:offset + 16 + len(key)] == key:
+                        return slot
+            i = (i + 1) & mask
+        if free is None:
+            # Only possible while reading a half-updated table.
+            raise ValueError("no free slot in the table")
+        return -1 - free
+
+    def _read(self, offset):
+        "Returns the decoding arguments of the key and value at offset."
+        words = self._words
+        key_info = words[offset >> 3]
+        value_info = words[(offset >> 3) + 1]
+        start = offset + 16 + (key_info >> 2)
+        end = start + (value_info >> 2)
+        return (key_info & 3, bytes(self.shm.buf[offset + 16:start]),
+                value_info & 3, bytes(self.shm.buf[start:end]))
+
+    def _consistent_read(self, func, *args):
+        """Calls func(*args) until the table did not change during the
+        call, and returns its result."""
+        words = self._words
+        while True:
+            sequence = words[_SEQUENCE]
+            if sequence & 1:
+                # A writer is updating the table.
+                time.sleep(0)
+                continue
+            try:
+                if words[_SIZE] > len(self.shm.buf):
+                    self._remap()
+                    words = self._words
+                    continue
+                result = func(*args)
+            except (IndexError, ValueError):
+                # Read a half-updated table.
+                if words[_SEQUENCE] == sequence:
+                    raise
+                continue
+            if words[_SEQUENCE] == sequence:
+                return result
+
+    def _lookup(self, kind, key, h):
+        slot = self._find(kind, key, h)
+        if slot < 0:
+            return None
+        return self._read(self._words[slot + 1])
+
+    def __getitem__(self, key):
+        kind, encoded = _encode_key(key)
+        entry = self._consistent_read(
+            self._lookup, kind, encoded, _crc32(encoded, kind)
+        )
+        if entry is None:
+            raise KeyError(key)
+        return _decode(entry[2], entry[3])
+
+    def __contains__(self, key):
+        try:
+            kind, encoded = _encode_key(key)
+        except TypeError:
+            return False
+        h = _crc32(encoded, kind)
+        return self._consistent_read(self._find, kind, encoded, h) >= 0
+
+    def _items(self):
+        words = self._words
+        return [
+            self._read(words[slot + 1])
+            for slot in range(_HEADER_WORDS,
+                              _HEADER_WORDS + 2 * (words[_MASK] + 1),
+                              2)
+            if words[slot + 1] > 0
+        ]
+
+    def __iter__(self):
+        for kind, key, _, _ in self._consistent_read(self._items):
+            yield _decode(kind, key)
+
+    def __len__(self):
+        return self._words[_USED]
+
+    def copy(self):
+        "D.copy() -> a dict holding a consistent snapshot of the items of D."
+        return {
+            _decode(kind, key): _decode(value_kind, value)
+            for kind, key, value_kind, value in self._consistent_read(
+                self._items
+            )
+        }
+
+    def __setitem__(self, key, value):
+        kind, encoded = _encode_key(key)
+        value_kind, value = _encode_value(value)
+        if self._lock is None:
+            self._set(kind, encoded, value_kind, value)
+        else:
+            with self._lock:
+                self._set(kind, encoded, value_kind, value)
+
+    def _set(self, kind, key, value_kind, value):
+        self._refresh()
+        words = self._words
+        length = (16 + len(key) + len(value) + 7) & ~7
+        if (words[_HEAP_END] + length > len(self._words) * 8
+                or (words[_FILL] + 1) * 3 >= (words[_MASK] + 1) * 2):
+            self._rebuild(length)
+            words = self._words
+        h = _crc32(key, kind)
+        slot = self._find(kind, key, h)
+        offset = words[_HEAP_END]
+        struct.pack_into(
+            "qq%ds%ds" % (len(key), len(value)),
+            self.shm.buf,
+            offset,
+            len(key) << 2 | kind,
+            len(value) << 2 | value_kind,
+            key,
+            value
+        )
+        words[_SEQUENCE] += 1
+        try:
+            if slot < 0:
+                slot = -1 - slot
+                if words[slot + 1] == _EMPTY:
+                    words[_FILL] += 1
+                words[_USED] += 1
+                words[slot] = h
+            words[slot + 1] = offset
+            words[_HEAP_END] = offset + length
+        finally:
+            words[_SEQUENCE] += 1
+
+    def __delitem__(self, key):
+        kind, encoded = _encode_key(key)
+        if self._lock is None:
+            self._delete(key, kind, encoded)
+        else:
+            with self._lock:
+                self._delete(key, kind, encoded)
+
+    def _delete(self, key, kind, encoded):
+        self._refresh()
+        words = self._words
+        slot = self._find(kind, encoded, _crc32(encoded, kind))
+        if slot < 0:
+            raise KeyError(key)
+        words[_SEQUENCE] += 1
+        try:
+            words[slot + 1] = _DELETED
+            words[_USED] -= 1
+        finally:
+            words[_SEQUENCE] += 1
+
+    def _rebuild(self, heap_size, items=None):
+        """Rewrites the table without its deleted and replaced items, with
+        at least heap_size bytes of free space; the lock must be held."""
+        if items is None:
+            items = self._items()
+        table = self._build_table(items, heap_size)
+        if len(table) > len(self._words) * 8:
+            self._remap(2 * len(table))
+        words = self._words
+        words[_SEQUENCE] += 1
+        try:
+            # The sequence counter is part of the header: keep it.
+            self.shm.buf[8:len(table)] = memoryview(table)[8:]
+            words[_SIZE] = len(self.shm.buf)
+        finally:
+            words[_SEQUENCE] += 1
+
+    def clear(self):
+        "D.clear() -> None.  Remove all items from D."
+        if self._lock is None:
+            self._clear()
+        else:
+            with self._lock:
+                self._clear()
+
+    def _clear(self):
+        self._refresh()
+        self._rebuild(0, [])
+
+    def __reduce__(self):
+        lock = False if self._lock is None else self._lock
+        return partial(self.__class__, name=self.shm.name, lock=lock), ()
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}({self.copy()}, '
+                f'name={self.shm.name!r})')
+
+    def get_lock(self):
+        "Returns the lock serializing updates, or None."
+        return self._lock
+
+    def __del__(self):
+        try:
+            self.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """Closes access to the shared memory from this instance but does
+        not destroy the shared memory block."""
+        # The view must be released before the mapping can be closed.
+        if self._words is not None:
+            self._words.release()
+        if self.shm is not None:
+            self.shm.close()
+
+    def unlink(self):
+        "Requests that the underlying shared memory block be destroyed."
+        self.shm.unlink()
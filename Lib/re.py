@@ -85,17 +85,19 @@ resulting RE will match the second character.
     \\       Matches a literal backslash.
 
 This module exports the following functions:
-    match     Match a regular expression pattern to the beginning of a string.
-    fullmatch Match a regular expression pattern to all of a string.
-    search    Search a string for the presence of a pattern.
-    sub       Substitute occurrences of a pattern found in a string.
-    subn      Same as sub, but also return the number of substitutions made.
-    split     Split a string by the occurrences of a pattern.
-    findall   Find all occurrences of a pattern in a string.
-    finditer  Return an iterator yielding a Match object for each match.
-    compile   Compile a pattern into a Pattern object.
-    purge     Clear the regular expression cache.
-    escape    Backslash all non-alphanumerics in a string.
+    match      Match a regular expression pattern to the beginning of a string.
+    fullmatch  Match a regular expression pattern to all of a string.
+    search     Search a string for the presence of a pattern.
+    sub        Substitute occurrences of a pattern found in a string.
+    subn       Same as sub, but also return the number of substitutions made.
+    split      Split a string by the occurrences of a pattern.
+    findall    Find all occurrences of a pattern in a string.
+    finditer   Return an iterator yielding a Match object for each match.
+    compile    Compile a pattern into a Pattern object.
+    purge      Clear the regular expression cache.
+    dump_cache Write the compiled patterns of the cache to a file.
+    load_cache Load compiled patterns from a file into the cache.
+    escape     Backslash all non-alphanumerics in a string.
 
 Some of the functions in this module takes flags as optional parameters:
     A  ASCII       For string patterns, make \w, \W, \b, \B, \d, \D
@@ -123,6 +125,8 @@ import enum
 import sre_compile
 import sre_parse
 import functools
+import marshal
+import _sre
 try:
     import _locale
 except ImportError:
@@ -133,6 +137,7 @@ except ImportError:
 __all__ = [
     "match", "fullmatch", "search", "sub", "subn", "split",
     "findall", "finditer", "compile", "purge", "template", "escape",
+    "dump_cache", "load_cache",
     "error", "Pattern", "Match", "A", "I", "L", "M", "S", "X", "U",
     "ASCII", "IGNORECASE", "LOCALE", "MULTILINE", "DOTALL", "VERBOSE",
     "UNICODE",
@@ -254,6 +259,41 @@ def purge():
     _cache.clear()
     _compile_repl.cache_clear()
 
+def dump_cache(file):
+    """Write the compiled patterns of the regular expression cache to the
+    binary file object *file*, so that they can be loaded later with
+    load_cache() without being parsed and compiled again."""
+    entries = []
+    for _, pattern, flags in list(_cache):
+        args = sre_compile.compile_args(pattern, flags)
+        # The opcodes are int subclasses, which cannot be marshalled
+        code = list(map(int, args[2]))
+        entries.append((flags, args[:2] + (code,) + args[3:]))
+    marshal.dump((_cache_magic(), entries), file)
+
+def load_cache(file):
+    """Load compiled patterns written by dump_cache() from the binary file
+    object *file* into the regular expression cache.  Return the number of
+    patterns loaded: 0 if the file was written by an incompatible version
+    of the regular expression engine, or is not a cache file at all."""
+    try:
+        magic, entries = marshal.load(file)
+    except (EOFError, ValueError, TypeError):
+        # Empty, truncated or not marshal data
+        return 0
+    if magic != _cache_magic():
+        return 0
+    count = 0
+    for flags, args in entries:
+        if len(_cache) >= _MAXCACHE:
+            break
+        pattern = args[0]
+        key = type(pattern), pattern, flags
+        if key not in _cache:
+            _cache[key] = _sre.compile(*args)
+            count += 1
+    return count
+
 def template(pattern, flags=0):
     "Compile a template pattern, returning a Pattern object"
     return _compile(pattern, flags|T)
@@ -284,6 +324,11 @@ Match = type(sre_compile.compile('', 0).match(''))
 _cache = {}  # ordered!
 
 _MAXCACHE = 512
+
+def _cache_magic():
+    # internal: identify the format of the code stored by dump_cache()
+    return (sre_compile.MAGIC, _sre.CODESIZE, _sre.MAXREPEAT, _sre.MAXGROUPS)
+
 def _compile(pattern, flags):
     # internal: compile pattern
     if isinstance(flags, RegexFlag):
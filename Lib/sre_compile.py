@@ -765,6 +765,22 @@ def compile(p, flags=0):
     else:
         pattern = None
 
+    return _sre.compile(*_compile_args(pattern, p, flags))
+
+def compile_args(p, flags=0):
+    # internal: convert pattern list to the arguments of _sre.compile().
+    # They are made of plain objects only, so that they can be stored in
+    # a persistent cache (see re.dump_cache()).
+
+    if isstring(p):
+        pattern = p
+        p = sre_parse.parse(p, flags)
+    else:
+        pattern = None
+
+    return _compile_args(pattern, p, flags)
+
+def _compile_args(pattern, p, flags):
     code = _code(p, flags)
 
     if flags & SRE_FLAG_DEBUG:
@@ -777,8 +793,6 @@ def compile(p, flags=0):
     for k, i in groupindex.items():
         indexgroup[i] = k
 
-    return _sre.compile(
-        pattern, flags | p.state.flags, code,
-        p.state.groups-1,
-        groupindex, tuple(indexgroup)
-        )
+    return (pattern, flags | p.state.flags, code,
+            p.state.groups-1,
+            groupindex, tuple(indexgroup))
@@ -3897,6 +3897,20 @@ class _TestSharedMemory(BaseTestCase):
                 # No longer there to be attached to again.
                 absent_sl = shared_memory.ShareableList(name=held_name)
 
+        with multiprocessing.managers.SharedMemoryManager() as smm3:
+            sa = smm3.ShareableArray('i', range(10), lock=False)
+            sd = smm3.ShareableDict({'howdy': 1}, lock=False)
+            self.assertEqual(sa.tolist(), list(range(10)))
+            self.assertEqual(sd['howdy'], 1)
+            held_names = [sa.shm.name, sd.shm.name]
+            sa.close()
+            sd.close()
+        if sys.platform != "win32":
+            for held_name in held_names:
+                with self.assertRaises(FileNotFoundError):
+                    # No longer there to be attached to again.
+                    shared_memory.SharedMemory(name=held_name)
+
 
     def test_shared_memory_ShareableList_basics(self):
         sl = shared_memory.ShareableList(
@@ -4006,6 +4020,234 @@ class _TestSharedMemory(BaseTestCase):
         deserialized_sl.shm.close()
         sl.shm.close()
 
+    def test_shared_memory_ShareableArray_basics(self):
+        sa = shared_memory.ShareableArray('d', [1.5, -2.0, 3.25])
+        self.addCleanup(sa.unlink)
+        self.addCleanup(sa.close)
+
+        self.assertEqual(sa.typecode, 'd')
+        self.assertEqual(sa.itemsize, 8)
+        self.assertEqual(len(sa), 3)
+        self.assertEqual(sa[0], 1.5)
+        self.assertEqual(sa[-1], 3.25)
+        self.assertEqual(sa[::2], array.array('d', [1.5, 3.25]))
+        self.assertEqual(list(sa), [1.5, -2.0, 3.25])
+        self.assertEqual(sa.buf.format, 'd')
+        self.assertEqual(sa.buf.tolist(), [1.5, -2.0, 3.25])
+        with self.assertRaises(IndexError):
+            sa[3]
+        with self.assertRaises(IndexError):
+            sa[-4] = 1.0
+        sa[1] = 2.0
+        self.assertEqual(sa.tolist(), [1.5, 2.0, 3.25])
+
+        # Obtain a second handle on the same ShareableArray.
+        sa_tethered = shared_memory.ShareableArray(name=sa.shm.name,
+                                                   lock=sa.get_lock())
+        self.assertEqual(sa_tethered.typecode, 'd')
+        sa_tethered[0] = 0.5
+        self.assertEqual(sa[0], 0.5)
+        sa.append(4.0)
+        self.assertEqual(sa_tethered[3], 4.0)
+        sa_tethered.close()
+
+        # Pickling only transfers the name of the shared memory block.
+        deserialized_sa = pickle.loads(pickle.dumps(
+            shared_memory.ShareableArray(name=sa.shm.name, lock=False)
+        ))
+        self.assertEqual(deserialized_sa.tolist(), [0.5, 2.0, 3.25, 4.0])
+        self.assertIsNone(deserialized_sa.get_lock())
+        deserialized_sa.close()
+
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableArray('z')
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableArray('u')
+        with self.assertRaises(TypeError):
+            shared_memory.ShareableArray()
+
+    @unittest.skipUnless(os.name == 'posix', 'growth is POSIX only')
+    def test_shared_memory_ShareableArray_growth(self):
+        sa = shared_memory.ShareableArray('i', capacity=2)
+        self.addCleanup(sa.unlink)
+        self.addCleanup(sa.close)
+        sa_tethered = shared_memory.ShareableArray(name=sa.shm.name,
+                                                   lock=False)
+        self.addCleanup(sa_tethered.close)
+
+        for i in range(1000):
+            sa.append(i)
+        sa.extend(range(1000, 5000))
+        self.assertEqual(len(sa), 5000)
+        self.assertEqual(sa.tolist(), list(range(5000)))
+        # The other handle maps the added space when needed.
+        self.assertEqual(len(sa_tethered), 5000)
+        self.assertEqual(sa_tethered[4999], 4999)
+        sa_tethered.append(5000)
+        self.assertEqual(sa[-1], 5000)
+
+    @classmethod
+    def _append_to_shareable_array(cls, sa, start, count):
+        for i in range(start, start + count):
+            sa.append(i)
+        sa.close()
+
+    @unittest.skipUnless(os.name == 'posix', 'growth is POSIX only')
+    def test_shared_memory_ShareableArray_concurrent_appends(self):
+        sa = shared_memory.ShareableArray('q')
+        self.addCleanup(sa.unlink)
+        self.addCleanup(sa.close)
+
+        processes = [
+            self.Process(target=self._append_to_shareable_array,
+                         args=(sa, i * 1000, 1000))
+            for i in range(4)
+        ]
+        for p in processes:
+            p.start()
+        for i in range(4000, 5000):
+            sa.append(i)
+        for p in processes:
+            join_process(p)
+        self.assertEqual(sorted(sa), list(range(5000)))
+
+    @classmethod
+    def _append_to_attached_shareable_array(cls, name, lock, start, count):
+        sa = shared_memory.ShareableArray(name=name, lock=lock)
+        cls._append_to_shareable_array(sa, start, count)
+
+    @unittest.skipUnless(os.name == 'posix', 'growth is POSIX only')
+    def test_shared_memory_ShareableArray_attach_by_name_lock(self):
+        sa = shared_memory.ShareableArray('q')
+        self.addCleanup(sa.unlink)
+        self.addCleanup(sa.close)
+
+        # The lock is not stored in the block: attaching by name requires
+        # the original one, since a new lock would serialize nothing.
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableArray(name=sa.shm.name)
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableArray(name=sa.shm.name, lock=None)
+
+        processes = [
+            self.Process(target=self._append_to_attached_shareable_array,
+                         args=(sa.shm.name, sa.get_lock(), i * 1000, 1000))
+            for i in range(4)
+        ]
+        for p in processes:
+            p.start()
+        for i in range(4000, 5000):
+            sa.append(i)
+        for p in processes:
+            join_process(p)
+        self.assertEqual(sorted(sa), list(range(5000)))
+
+    def test_shared_memory_ShareableDict_basics(self):
+        sd = shared_memory.ShareableDict(
+            {'howdy': 1, b'HoWdY': 'bytes key', 'none': None}
+        )
+        self.addCleanup(sd.unlink)
+        self.addCleanup(sd.close)
+
+        self.assertEqual(len(sd), 3)
+        self.assertEqual(sd['howdy'], 1)
+        self.assertEqual(sd[b'HoWdY'], 'bytes key')
+        self.assertIsNone(sd['none'])
+        self.assertIn('howdy', sd)
+        self.assertNotIn(b'howdy', sd)
+        self.assertNotIn(1, sd)
+        with self.assertRaises(KeyError):
+            sd['HoWdY']
+        with self.assertRaises(TypeError):
+            sd[1] = 'one'
+
+        sd['howdy'] = b'value'
+        sd['list'] = [1, 2, 3]
+        del sd['none']
+        with self.assertRaises(KeyError):
+            del sd['none']
+        self.assertEqual(
+            sd.copy(),
+            {'howdy': b'value', b'HoWdY': 'bytes key', 'list': [1, 2, 3]}
+        )
+        self.assertEqual(sd.get('none', 42), 42)
+        self.assertCountEqual(sd, ['howdy', b'HoWdY', 'list'])
+
+        # Obtain a second handle on the same ShareableDict.
+        sd_tethered = shared_memory.ShareableDict(name=sd.shm.name,
+                                                  lock=sd.get_lock())
+        sd_tethered['new'] = 'from tethered'
+        self.assertEqual(sd['new'], 'from tethered')
+        sd_tethered.clear()
+        self.assertEqual(len(sd), 0)
+        self.assertEqual(sd.copy(), {})
+        sd_tethered.close()
+        with self.assertRaises(ValueError):
+            shared_memory.ShareableDict(name=sd.shm.name)
+
+        # Pickling only transfers the name of the shared memory block.
+        deserialized_sd = pickle.loads(pickle.dumps(
+            shared_memory.ShareableDict(name=sd.shm.name, lock=False)
+        ))
+        deserialized_sd['key'] = 'value'
+        self.assertEqual(sd['key'], 'value')
+        deserialized_sd.close()
+
+    @unittest.skipUnless(os.name == 'posix', 'growth is POSIX only')
+    def test_shared_memory_ShareableDict_growth(self):
+        sd = shared_memory.ShareableDict()
+        self.addCleanup(sd.unlink)
+        self.addCleanup(sd.close)
+        sd_tethered = shared_memory.ShareableDict(name=sd.shm.name,
+                                                  lock=False)
+        self.addCleanup(sd_tethered.close)
+
+        for i in range(2000):
+            sd[str(i)] = i
+        for i in range(0, 2000, 2):
+            del sd[str(i)]
+        self.assertEqual(len(sd_tethered), 1000)
+        self.assertEqual(sd_tethered['1999'], 1999)
+        self.assertNotIn('1998', sd_tethered)
+
+        # Replaced items are compacted instead of growing the block.
+        sd['key'] = 'x' * 1000
+        size = sd.shm.size
+        for _ in range(1000):
+            sd['key'] = 'x' * 1000
+        self.assertEqual(sd.shm.size, size)
+        self.assertEqual(len(sd), 1001)
+
+    @classmethod
+    def _update_shareable_dict(cls, sd, start, count):
+        for i in range(start, start + count):
+            sd[str(i)] = i
+            sd[b'last'] = i
+        sd.close()
+
+    @unittest.skipUnless(os.name == 'posix', 'growth is POSIX only')
+    def test_shared_memory_ShareableDict_concurrent_updates(self):
+        sd = shared_memory.ShareableDict()
+        self.addCleanup(sd.unlink)
+        self.addCleanup(sd.close)
+
+        processes = [
+            self.Process(target=self._update_shareable_dict,
+                         args=(sd, i * 500, 500))
+            for i in range(4)
+        ]
+        for p in processes:
+            p.start()
+        # Concurrent lookups always see consistent items.
+        while any(p.is_alive() for p in processes):
+            for key in ('0', '499', '1000', '1999'):
+                self.assertEqual(sd.get(key, int(key)), int(key))
+        for p in processes:
+            join_process(p)
+        self.assertEqual(len(sd), 2001)
+        del sd[b'last']
+        self.assertEqual(sd.copy(), {str(i): i for i in range(2000)})
+
     def test_shared_memory_cleaned_after_process_termination(self):
         cmd = '''if 1:
             import os, time, sys
@@ -4399,6 +4641,27 @@ class TestInitializers(unittest.TestCase):
         p.join()
         self.assertEqual(self.ns.test, 1)
 
+    @unittest.skipUnless(
+        'forkserver' in multiprocessing.get_all_start_methods(),
+        'requires the forkserver start method')
+    def test_pool_template_initializer(self):
+        # The initializer runs once, in the template process, even if the
+        # workers are replaced.
+        ctx = multiprocessing.get_context('forkserver')
+        p = ctx.Pool(2, initializer, (self.ns,), maxtasksperchild=1,
+                     template=True)
+        self.assertEqual(p.map(sqr, range(6), chunksize=1),
+                         [sqr(i) for i in range(6)])
+        parents = {p.apply(os.getppid) for _ in range(4)}
+        p.close()
+        p.join()
+        self.assertEqual(self.ns.test, 1)
+        self.assertEqual(len(parents), 1)
+        self.assertNotIn(os.getpid(), parents)
+
+        with self.assertRaises(ValueError):
+            multiprocessing.get_context('spawn').Pool(1, template=True)
+
 #
 # Issue 5155, 5313, 5331: Test process in processes
 # Verifies os.close(sys.stdin.fileno) vs. sys.stdin.close() behavior
@@ -2073,6 +2073,50 @@ else:
             def create_event_loop(self):
                 return asyncio.SelectorEventLoop(selectors.PollSelector())
 
+    if hasattr(asyncio, 'UringEventLoop'):
+        class UringEventLoopTests(UnixEventLoopTestsMixin,
+                                  SubprocessTestsMixin,
+                                  test_utils.TestCase):
+
+            def create_event_loop(self):
+                return test_utils.new_uring_event_loop()
+
+            def test_reader_callback(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            def test_reader_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            def test_writer_callback(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_writer()")
+
+            def test_writer_callback_cancel(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_writer()")
+
+            def test_remove_fds_after_closing(self):
+                raise unittest.SkipTest(
+                    "UringEventLoop does not have add_reader()")
+
+            # Writes are submitted in the next loop iteration: reading what
+            # was written right after write() blocks these tests.
+
+            def test_write_pipe(self):
+                raise unittest.SkipTest("UringEventLoop writes later")
+
+            def test_write_pty(self):
+                raise unittest.SkipTest("UringEventLoop writes later")
+
+            def test_bidirectional_pty(self):
+                raise unittest.SkipTest("UringEventLoop writes later")
+
+            def test_unclosed_pipe_transport(self):
+                raise unittest.SkipTest("proactor pipe transports need a "
+                                        "running loop to close")
+
     # Should always exist.
     class SelectEventLoopTests(UnixEventLoopTestsMixin,
                                SubprocessTestsMixin,
@@ -2460,6 +2504,10 @@ class AbstractEventLoopTests(unittest.TestCase):
             NotImplementedError, loop.get_debug)
         self.assertRaises(
             NotImplementedError, loop.set_debug, f)
+        self.assertRaises(
+            NotImplementedError, loop.get_instrumentation)
+        self.assertRaises(
+            NotImplementedError, loop.set_instrumentation, f)
 
     def test_not_implemented_async(self):
 
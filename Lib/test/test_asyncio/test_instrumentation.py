@@ -0,0 +1,148 @@
+"""Tests for instrumentation.py."""
+
+import time
+import unittest
+
+import asyncio
+from asyncio import instrumentation
+from test.test_asyncio import utils as test_utils
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_add(self):
+        histogram = instrumentation._Histogram((1, 10))
+        for value in (0, 1, 2, 10, 11, 100):
+            histogram.add(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['count'], 6)
+        self.assertEqual(snapshot['total'], 124)
+        self.assertEqual(snapshot['max'], 100)
+        self.assertAlmostEqual(snapshot['mean'], 124 / 6)
+        self.assertEqual(snapshot['buckets'],
+                         [(1, 2), (10, 2), (float('inf'), 2)])
+
+    def test_empty(self):
+        snapshot = instrumentation._Histogram((1,)).snapshot()
+        self.assertEqual(snapshot['count'], 0)
+        self.assertEqual(snapshot['mean'], 0)
+        self.assertEqual(snapshot['buckets'], [(1, 0), (float('inf'), 0)])
+
+
+class LoopInstrumentationTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+        self.instrumentation = asyncio.LoopInstrumentation(
+            slow_callback_duration=0.05)
+        self.loop.set_instrumentation(self.instrumentation)
+
+    def tearDown(self):
+        self.loop.close()
+        self.loop = None
+        super().tearDown()
+
+    def run_callbacks(self, *callbacks):
+        for callback in callbacks:
+            self.loop.call_soon(callback)
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+    def test_get_set(self):
+        self.assertIs(self.loop.get_instrumentation(), self.instrumentation)
+        self.loop.set_instrumentation(None)
+        self.assertIsNone(self.loop.get_instrumentation())
+        self.run_callbacks(lambda: None)
+        self.assertEqual(self.instrumentation.snapshot()['iterations'], 0)
+
+    def test_callbacks(self):
+        self.run_callbacks(*[lambda: None] * 10)
+        stats = self.instrumentation.snapshot()
+        self.assertGreaterEqual(stats['iterations'], 1)
+        self.assertEqual(stats['callbacks']['count'], 11)
+        self.assertEqual(
+            sum(count for bound, count in stats['callbacks']['buckets']), 11)
+        self.assertEqual(stats['slow_callbacks'], 0)
+        self.assertEqual(stats['recent_slow_callbacks'], [])
+        self.assertEqual(stats['ready']['max'], 11)
+
+    def test_slow_callback(self):
+        def slow():
+            time.sleep(0.1)
+
+        self.run_callbacks(slow, lambda: None)
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['slow_callbacks'], 1)
+        (description, duration), = stats['recent_slow_callbacks']
+        self.assertIn('slow', description)
+        self.assertGreaterEqual(duration, 0.05)
+        self.assertGreaterEqual(stats['callbacks']['max'], 0.05)
+
+    def test_slow_task_step(self):
+        async def coro():
+            time.sleep(0.1)
+
+        self.loop.run_until_complete(coro())
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['slow_callbacks'], 1)
+        (description, duration), = stats['recent_slow_callbacks']
+        self.assertIn('coro()', description)
+
+    def test_max_slow_callbacks(self):
+        self.instrumentation = asyncio.LoopInstrumentation(
+            slow_callback_duration=0, max_slow_callbacks=2)
+        self.loop.set_instrumentation(self.instrumentation)
+        self.run_callbacks(*[lambda: None] * 5)
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['slow_callbacks'], 6)
+        self.assertEqual(len(stats['recent_slow_callbacks']), 2)
+
+    def test_lag(self):
+        def block():
+            time.sleep(0.1)
+
+        self.loop.call_later(0.01, lambda: None)
+        self.run_callbacks(block)
+        self.loop.call_later(0.02, self.loop.stop)
+        self.loop.run_forever()
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['lag']['count'], 2)
+        # The first timer was delayed by the blocking callback.
+        self.assertGreaterEqual(stats['lag']['max'], 0.05)
+
+    def test_select(self):
+        self.loop.run_until_complete(asyncio.sleep(0.1))
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['select']['count'], stats['iterations'])
+        self.assertGreaterEqual(stats['select']['total'], 0.05)
+
+    def test_debug_mode(self):
+        self.loop.set_debug(True)
+        self.run_callbacks(lambda: None)
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['callbacks']['count'], 2)
+
+    def test_reset(self):
+        self.run_callbacks(lambda: time.sleep(0.1))
+        self.instrumentation.reset()
+        stats = self.instrumentation.snapshot()
+        self.assertEqual(stats['iterations'], 0)
+        self.assertEqual(stats['callbacks']['count'], 0)
+        self.assertEqual(stats['slow_callbacks'], 0)
+        self.assertEqual(stats['recent_slow_callbacks'], [])
+
+    def test_repr(self):
+        self.run_callbacks(lambda: None)
+        self.assertRegex(repr(self.instrumentation),
+                         r'<LoopInstrumentation iterations=\d+ callbacks=2 '
+                         r'slow_callbacks=0>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""Tests for multiloop.py."""
+
+import os
+import signal
+import socket
+import threading
+import time
+import unittest
+from test import support
+from unittest import mock
+
+import asyncio
+from test.test_asyncio import utils as test_utils
+
+
+support.import_module('_multiprocessing')
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+class EchoProtocol(asyncio.Protocol):
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.transport.write(data)
+
+    def eof_received(self):
+        self.transport.close()
+
+
+def echo(address, data=b'ping'):
+    with socket.create_connection(address, timeout=support.SHORT_TIMEOUT) \
+            as sock:
+        sock.sendall(data)
+        return sock.recv(100)
+
+
+class MultiLoopServerTests(test_utils.TestCase):
+
+    use_threads = True
+
+    def new_server(self, **kwargs):
+        kwargs.setdefault('workers', 3)
+        kwargs.setdefault('use_threads', self.use_threads)
+        return asyncio.MultiLoopServer(EchoProtocol, '127.0.0.1', 0, **kwargs)
+
+    def test_serve(self):
+        with self.new_server() as server:
+            self.assertTrue(server.is_serving())
+            address = server.sockets[0].getsockname()
+            for i in range(20):
+                self.assertEqual(echo(address), b'ping')
+            stats = server.stats()
+            self.assertEqual([s['worker'] for s in stats], [0, 1, 2])
+            self.assertEqual(sum(s['accepted'] for s in stats), 20)
+            if not self.use_threads:
+                self.assertEqual(len({s['pid'] for s in stats}), 3)
+                self.assertNotIn(os.getpid(), {s['pid'] for s in stats})
+        self.assertFalse(server.is_serving())
+        self.assertEqual(server.sockets, ())
+        with self.assertRaises(OSError):
+            echo(address)
+
+    @unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'),
+                         'requires SO_REUSEPORT')
+    def test_shared_socket(self):
+        with self.new_server(reuse_port=False) as server:
+            address = server.sockets[0].getsockname()
+            for i in range(10):
+                self.assertEqual(echo(address), b'ping')
+            self.assertEqual(
+                sum(s['accepted'] for s in server.stats()), 10)
+
+    def test_active_connections(self):
+        with self.new_server(workers=1) as server:
+            address = server.sockets[0].getsockname()
+            with socket.create_connection(address) as sock:
+                sock.sendall(b'ping')
+                self.assertEqual(sock.recv(100), b'ping')
+                stats, = server.stats()
+                self.assertEqual(stats['accepted'], 1)
+                self.assertEqual(stats['active'], 1)
+            for i in range(100):
+                stats, = server.stats()
+                if not stats['active']:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(stats['active'], 0)
+
+    def test_restart(self):
+        with self.new_server(workers=2) as server:
+            address = server.sockets[0].getsockname()
+            self.assertEqual(echo(address), b'ping')
+            with socket.create_connection(address) as sock:
+                # The restart waits until the connection is closed.  Shut it
+                # down rather than closing it: forked workers inherit sock.
+                timer = threading.Timer(0.2, sock.shutdown, [socket.SHUT_WR])
+                timer.start()
+                server.restart()
+                timer.join()
+            self.assertEqual([s['worker'] for s in server.stats()], [2, 3])
+            self.assertEqual(echo(address), b'ping')
+
+    def test_drain_timeout(self):
+        server = self.new_server(workers=1, drain_timeout=0.1)
+        server.start()
+        address = server.sockets[0].getsockname()
+        with socket.create_connection(address) as sock:
+            sock.sendall(b'ping')
+            self.assertEqual(sock.recv(100), b'ping')
+            t0 = time.monotonic()
+            server.close()
+            self.assertLess(time.monotonic() - t0, support.SHORT_TIMEOUT)
+            # The connection was aborted after the timeout.
+            self.assertEqual(sock.recv(100), b'')
+
+    def test_start_error(self):
+        server = self.new_server(ssl=True)
+        with self.assertRaisesRegex(TypeError, 'ssl argument'):
+            server.start()
+        self.assertFalse(server.is_serving())
+        self.assertEqual(server.sockets, ())
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self.new_server(workers=0)
+
+    def test_start_in_running_loop(self):
+        server = self.new_server()
+
+        async def start():
+            server.start()
+
+        self.unpatch_get_running_loop()
+        loop = asyncio.new_event_loop()
+        self.set_event_loop(loop)
+        with self.assertRaises(RuntimeError):
+            loop.run_until_complete(start())
+
+    @unittest.skipUnless(hasattr(signal, 'SIGTERM'), 'requires SIGTERM')
+    def test_serve_forever(self):
+        server = self.new_server(workers=2)
+        server.start()
+        address = server.sockets[0].getsockname()
+
+        old_handler = signal.getsignal(signal.SIGTERM)
+
+        def client():
+            # Wait until serve_forever() handles the signals.
+            while signal.getsignal(signal.SIGTERM) is old_handler:
+                time.sleep(0.01)
+            self.assertEqual(echo(address), b'ping')
+            if hasattr(signal, 'SIGHUP'):
+                os.kill(os.getpid(), signal.SIGHUP)
+                time.sleep(0.5)
+                self.assertEqual(echo(address), b'ping')
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=client)
+        thread.start()
+        server.serve_forever()
+        thread.join()
+        # signal.getsignal() leaves reference cycles with the frames of the
+        # thread.
+        support.gc_collect()
+        self.assertIs(signal.getsignal(signal.SIGTERM), old_handler)
+        self.assertFalse(server.is_serving())
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+class ProcessMultiLoopServerTests(MultiLoopServerTests):
+
+    use_threads = False
+
+    def tearDown(self):
+        support.reap_children()
+        super().tearDown()
+
+    def test_start_method_not_fixed(self):
+        import multiprocessing.context
+        default_context = multiprocessing.context._default_context
+        with mock.patch.object(default_context, '_actual_context', None):
+            with self.new_server(workers=1) as server:
+                address = server.sockets[0].getsockname()
+                self.assertEqual(echo(address), b'ping')
+            self.assertIsNone(
+                multiprocessing.get_start_method(allow_none=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -611,6 +611,167 @@ class QueuePutTests(_QueueTestBase):
             loop.run_until_complete(put_task)
 
 
+class QueueManyTests(_QueueTestBase):
+
+    def setUp(self):
+        super().setUp()
+        asyncio.set_event_loop(self.loop)
+
+    def test_nonblocking_put_many(self):
+        q = asyncio.Queue()
+        q.put_many_nowait(iter([1, 2, 3]))
+        q.put_many_nowait([])
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(q._unfinished_tasks, 3)
+        self.assertEqual([q.get_nowait() for _ in range(3)], [1, 2, 3])
+
+    def test_nonblocking_put_many_full(self):
+        q = asyncio.Queue(3)
+        q.put_nowait(0)
+        self.assertRaises(asyncio.QueueFull, q.put_many_nowait, [1, 2, 3])
+        self.assertEqual(q.qsize(), 1)
+        q.put_many_nowait([1, 2])
+        self.assertTrue(q.full())
+
+    def test_nonblocking_get_many(self):
+        q = asyncio.Queue()
+        q.put_many_nowait(range(5))
+        self.assertEqual(q.get_many_nowait(2), [0, 1])
+        self.assertEqual(q.get_many_nowait(), [2, 3, 4])
+        self.assertRaises(asyncio.QueueEmpty, q.get_many_nowait)
+        self.assertRaises(ValueError, q.get_many_nowait, 0)
+
+    def test_put_many_wakes_getters(self):
+        q = asyncio.Queue()
+
+        async def getter():
+            return await q.get()
+
+        async def test():
+            tasks = [self.loop.create_task(getter()) for _ in range(3)]
+            await asyncio.sleep(0)
+            self.assertEqual(len(q._getters), 3)
+            q.put_many_nowait([1, 2])
+            self.assertEqual(len(q._getters), 1)
+            q.put_nowait(3)
+            return await asyncio.gather(*tasks)
+
+        self.assertEqual(self.loop.run_until_complete(test()), [1, 2, 3])
+
+    def test_blocking_get_many(self):
+        q = asyncio.Queue()
+
+        async def test():
+            task = self.loop.create_task(q.get_many(10))
+            await asyncio.sleep(0)
+            q.put_many_nowait([1, 2, 3])
+            q.put_nowait(4)
+            return await task
+
+        self.assertEqual(self.loop.run_until_complete(test()), [1, 2, 3, 4])
+
+    def test_blocking_get_many_invalid_max_items(self):
+        q = asyncio.Queue()
+        for max_items in 0, -1:
+            # Raised before waiting for an item
+            coro = q.get_many(max_items)
+            try:
+                with self.assertRaises(ValueError):
+                    coro.send(None)
+            finally:
+                coro.close()
+
+    def test_blocking_put_many(self):
+        q = asyncio.Queue(2)
+        batches = []
+
+        async def consumer():
+            while True:
+                items = await q.get_many()
+                batches.append(items)
+                if items[-1] == 9:
+                    return
+
+        async def test():
+            task = self.loop.create_task(consumer())
+            await q.put_many(range(10))
+            await task
+
+        self.loop.run_until_complete(test())
+        self.assertEqual(sum(batches, []), list(range(10)))
+        self.assertTrue(all(len(batch) <= 2 for batch in batches))
+        self.assertEqual(q._unfinished_tasks, 10)
+
+    def test_get_many_wakes_putters(self):
+        q = asyncio.Queue(2)
+        q.put_many_nowait([1, 2])
+
+        async def test():
+            tasks = [self.loop.create_task(q.put(i)) for i in (3, 4, 5)]
+            await asyncio.sleep(0)
+            self.assertEqual(len(q._putters), 3)
+            self.assertEqual(q.get_many_nowait(), [1, 2])
+            self.assertEqual(len(q._putters), 1)
+            await asyncio.sleep(0)
+            self.assertEqual(q.get_many_nowait(), [3, 4])
+            await asyncio.gather(*tasks)
+            self.assertEqual(q.get_many_nowait(), [5])
+
+        self.loop.run_until_complete(test())
+
+    def test_put_many_cancelled(self):
+        q = asyncio.Queue(2)
+
+        async def test():
+            items = iter([1, 2, 3, 4])
+            task = self.loop.create_task(q.put_many(items))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(q.get_many_nowait(), [1, 2])
+            self.assertEqual(q._unfinished_tasks, 2)
+            self.assertFalse(q._putters)
+            # The item waiting for a free slot was dropped.
+            self.assertEqual(list(items), [4])
+
+        self.loop.run_until_complete(test())
+
+    def test_get_many_cancelled(self):
+        q = asyncio.Queue()
+
+        async def test():
+            task = self.loop.create_task(q.get_many())
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertFalse(q._getters)
+
+        self.loop.run_until_complete(test())
+
+    def test_join(self):
+        q = asyncio.Queue()
+        q.put_many_nowait(range(3))
+
+        async def test():
+            for _ in q.get_many_nowait():
+                q.task_done()
+            await q.join()
+
+        self.loop.run_until_complete(test())
+
+    def test_priority_queue(self):
+        q = asyncio.PriorityQueue()
+        q.put_many_nowait([3, 1, 2])
+        self.assertEqual(q.get_many_nowait(), [1, 2, 3])
+
+    def test_lifo_queue(self):
+        q = asyncio.LifoQueue()
+        q.put_many_nowait([1, 2, 3])
+        self.assertEqual(q.get_many_nowait(2), [3, 2])
+
+
 class LifoQueueTests(_QueueTestBase):
 
     def test_order(self):
@@ -882,6 +882,20 @@ class SelectorSocketTransportTests(test_utils.TestCase):
         self.loop.run_until_complete(asyncio.sleep(0))
         tr.write_eof()
 
+    def test_close_with_empty_waiter_done(self):
+        # The waiter of loop.sendfile() is done once the buffer is empty;
+        # closing the transport while sendfile() runs must not fail.
+        errors = []
+        self.loop.set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        tr = self.socket_transport()
+        waiter = tr._make_empty_waiter()
+        self.assertTrue(waiter.done())
+        tr.close()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(errors, [])
+        self.assertIsNone(waiter.result())
+        self.protocol.connection_lost.assert_called_with(None)
+
     @mock.patch('asyncio.base_events.logger')
     def test_transport_close_remove_writer(self, m_log):
         remove_writer = self.loop._remove_writer = mock.Mock()
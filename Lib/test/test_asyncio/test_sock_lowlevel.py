@@ -328,6 +328,13 @@ else:
             def create_event_loop(self):
                 return asyncio.SelectorEventLoop(selectors.EpollSelector())
 
+    if hasattr(asyncio, 'UringEventLoop'):
+        class UringEventLoopTests(BaseSockTestsMixin,
+                                  test_utils.TestCase):
+
+            def create_event_loop(self):
+                return test_utils.new_uring_event_loop()
+
     if hasattr(selectors, 'PollSelector'):
         class PollEventLoopTests(BaseSockTestsMixin,
                                  test_utils.TestCase):
@@ -66,6 +66,29 @@ class StreamTests(test_utils.TestCase):
                                                loop=self.loop)
             self._basetest_open_connection(conn_fut)
 
+    def test_open_connection_buffered(self):
+        async def client(addr):
+            reader, writer = await asyncio.open_connection(*addr,
+                                                           buffered=True)
+            self.assertIsInstance(writer._protocol,
+                                  asyncio.BufferedStreamReaderProtocol)
+            writer.write(b'GET / HTTP/1.0\r\n\r\n')
+            self.assertEqual(b'HTTP/1.0 200 OK\r\n', await reader.readline())
+            buf = bytearray(1024)
+            data = bytearray()
+            while True:
+                n = await reader.readinto(buf)
+                if not n:
+                    break
+                data += buf[:n]
+            writer.close()
+            await writer.wait_closed()
+            return data
+
+        with test_utils.run_test_server() as httpd:
+            data = self.loop.run_until_complete(client(httpd.address))
+        self.assertTrue(data.endswith(b'\r\n\r\nTest message'))
+
     @support.skip_unless_bind_unix_socket
     def test_open_unix_connection(self):
         with test_utils.run_test_unix_server() as httpd:
@@ -533,6 +556,125 @@ class StreamTests(test_utils.TestCase):
                          '18 bytes read on a total of 36 expected bytes')
         self.assertEqual(b'', stream._buffer)
 
+    def test_read_large(self):
+        # Large chunks are copied once out of the buffer.
+        stream = asyncio.StreamReader(loop=self.loop)
+        data = bytes(range(256)) * 1000
+        stream.feed_data(data)
+        stream.feed_eof()
+
+        self.assertEqual(data[:100000],
+                         self.loop.run_until_complete(stream.read(100000)))
+        self.assertEqual(data[100000:200000],
+                         self.loop.run_until_complete(
+                             stream.readexactly(100000)))
+        self.assertEqual(data[200000:],
+                         self.loop.run_until_complete(stream.read()))
+
+    def test_readinto(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(self.DATA)
+
+        buf = bytearray(10)
+        n = self.loop.run_until_complete(stream.readinto(buf))
+        self.assertEqual(n, 10)
+        self.assertEqual(buf, self.DATA[:10])
+        self.assertEqual(self.DATA[10:], stream._buffer)
+
+        buf = memoryview(bytearray(30))
+        n = self.loop.run_until_complete(stream.readinto(buf[5:]))
+        self.assertEqual(n, 8)
+        self.assertEqual(buf[5:13], self.DATA[10:])
+        self.assertEqual(b'', stream._buffer)
+
+        self.assertEqual(
+            0, self.loop.run_until_complete(stream.readinto(bytearray())))
+
+    def test_readinto_wait(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        buf = bytearray(30)
+        read_task = self.loop.create_task(stream.readinto(buf))
+
+        def cb():
+            stream.feed_data(self.DATA)
+        self.loop.call_soon(cb)
+
+        n = self.loop.run_until_complete(read_task)
+        self.assertEqual(n, len(self.DATA))
+        self.assertEqual(buf[:n], self.DATA)
+
+    def test_readinto_eof(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        read_task = self.loop.create_task(stream.readinto(bytearray(10)))
+
+        def cb():
+            stream.feed_eof()
+        self.loop.call_soon(cb)
+
+        self.assertEqual(0, self.loop.run_until_complete(read_task))
+
+    def test_readinto_invalid(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        stream.feed_data(self.DATA)
+        with self.assertRaises(TypeError):
+            self.loop.run_until_complete(stream.readinto(b'readonly'))
+        with self.assertRaises(TypeError):
+            self.loop.run_until_complete(stream.readinto('str'))
+        self.assertEqual(self.DATA, stream._buffer)
+
+    def test_readinto_exception(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        read_task = self.loop.create_task(stream.readinto(bytearray(10)))
+
+        def cb():
+            stream.set_exception(ValueError())
+        self.loop.call_soon(cb)
+
+        self.assertRaises(
+            ValueError, self.loop.run_until_complete, read_task)
+
+    def test_readinto_buffered_protocol(self):
+        stream = asyncio.StreamReader(loop=self.loop)
+        protocol = asyncio.BufferedStreamReaderProtocol(stream,
+                                                        loop=self.loop)
+        self.assertIsInstance(protocol, asyncio.BufferedProtocol)
+
+        # Without a waiting readinto(), data goes to the internal buffer.
+        buf = protocol.get_buffer(-1)
+        self.assertGreater(len(buf), 0)
+        buf[:5] = b'line\n'
+        protocol.buffer_updated(5)
+        self.assertEqual(b'line\n', stream._buffer)
+        self.assertEqual(
+            b'line\n', self.loop.run_until_complete(stream.readline()))
+
+        # Otherwise, the data is received in the buffer of the caller.
+        target = bytearray(10)
+        read_task = self.loop.create_task(stream.readinto(target))
+        test_utils.run_briefly(self.loop)
+        buf = protocol.get_buffer(-1)
+        self.assertEqual(len(buf), 10)
+        buf[:4] = b'data'
+        self.assertEqual(target[:4], b'data')
+        protocol.buffer_updated(4)
+        self.assertEqual(4, self.loop.run_until_complete(read_task))
+        self.assertEqual(b'', stream._buffer)
+
+    def test_readinto_buffered_protocol_cancel(self):
+        # Data received in the buffer of a cancelled readinto() is kept.
+        stream = asyncio.StreamReader(loop=self.loop)
+        protocol = asyncio.BufferedStreamReaderProtocol(stream,
+                                                        loop=self.loop)
+        read_task = self.loop.create_task(stream.readinto(bytearray(10)))
+        test_utils.run_briefly(self.loop)
+        buf = protocol.get_buffer(-1)
+        buf[:4] = b'data'
+        protocol.buffer_updated(4)
+        read_task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(read_task)
+        self.assertEqual(b'data', stream._buffer)
+
     def test_readexactly_exception(self):
         stream = asyncio.StreamReader(loop=self.loop)
         stream.feed_data(b'line\n')
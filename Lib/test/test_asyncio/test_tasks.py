@@ -3308,6 +3308,183 @@ class WaitTests(test_utils.TestCase):
                 asyncio.wait_for(coroutine_function(), 0.01, loop=self.loop))
 
 
+class BoundedMapTests(test_utils.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.set_event_loop(self.loop)
+        self.running = 0
+        self.max_running = 0
+        self.pulled = []
+
+    def tearDown(self):
+        self.loop.close()
+        self.loop = None
+        super().tearDown()
+
+    async def work(self, delay):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(delay)
+            if delay < 0:
+                raise ValueError(delay)
+            return delay
+        finally:
+            self.running -= 1
+
+    def items(self, delays):
+        for delay in delays:
+            self.pulled.append(delay)
+            yield delay
+
+    def collect(self, aiterable):
+        async def collect():
+            return [x async for x in aiterable]
+        return self.loop.run_until_complete(collect())
+
+    def test_does_not_shadow_builtin(self):
+        # "from asyncio import *" must not replace the builtin map().
+        self.assertNotIn('map', asyncio.__all__)
+        self.assertIn('bounded_map', asyncio.__all__)
+
+    def test_ordered(self):
+        delays = [0.03, 0.01, 0.02, 0, 0.01]
+        results = self.collect(asyncio.bounded_map(self.work, delays, limit=2))
+        self.assertEqual(results, delays)
+        self.assertEqual(self.max_running, 2)
+
+    def test_unordered(self):
+        delays = [0.05, 0, 0.01, 0.02]
+        results = self.collect(asyncio.bounded_map(self.work, delays, limit=2,
+                                                   ordered=False))
+        self.assertEqual(results, [0, 0.01, 0.02, 0.05])
+        self.assertEqual(self.max_running, 2)
+
+    def test_limit_larger_than_input(self):
+        results = self.collect(asyncio.bounded_map(self.work, [0.01, 0],
+                                                   limit=10))
+        self.assertEqual(results, [0.01, 0])
+        self.assertEqual(self.max_running, 2)
+
+    def test_empty(self):
+        results = self.collect(asyncio.bounded_map(self.work, [], limit=1))
+        self.assertEqual(results, [])
+
+    def test_lazy_input(self):
+        async def consume():
+            it = asyncio.bounded_map(self.work, self.items([0] * 100),
+                                     limit=3)
+            results = []
+            async for x in it:
+                results.append(x)
+                self.assertLessEqual(len(self.pulled), len(results) + 3)
+            return results
+
+        results = self.loop.run_until_complete(consume())
+        self.assertEqual(results, [0] * 100)
+        self.assertEqual(len(self.pulled), 100)
+
+    def test_async_iterable(self):
+        async def agen():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+
+        async def double(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        results = self.collect(asyncio.bounded_map(double, agen(), limit=2))
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+
+    def test_exception(self):
+        async def consume():
+            results = []
+            with self.assertRaises(ValueError):
+                async for x in asyncio.bounded_map(self.work,
+                                                   [0, -1, 10, 10], limit=3):
+                    results.append(x)
+            return results
+
+        self.assertEqual(self.loop.run_until_complete(consume()), [0])
+        # The other tasks were cancelled.
+        self.assertEqual(self.running, 0)
+
+    def test_return_exceptions(self):
+        results = self.collect(asyncio.bounded_map(self.work, [0, -1, 0.01],
+                                                   limit=2,
+                                                   return_exceptions=True))
+        self.assertEqual(results[0], 0)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 0.01)
+
+    def test_return_exceptions_cancelled(self):
+        async def cancelled(x):
+            raise asyncio.CancelledError
+
+        results = self.collect(asyncio.bounded_map(cancelled, [1], limit=1,
+                                                   return_exceptions=True))
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+
+    def test_aclose_cancels_tasks(self):
+        async def consume():
+            it = asyncio.bounded_map(self.work, self.items([0, 10, 10, 10]),
+                                     limit=3)
+            self.assertEqual(await it.__anext__(), 0)
+            self.assertEqual(self.running, 2)
+            await it.aclose()
+            self.assertEqual(self.running, 0)
+
+        self.loop.run_until_complete(consume())
+        self.assertEqual(self.pulled, [0, 10, 10])
+
+    def test_cancel_consumer(self):
+        async def consume():
+            async for x in asyncio.bounded_map(self.work, [10, 10], limit=2):
+                pass
+
+        task = self.loop.create_task(consume())
+        self.loop.call_later(0.01, task.cancel)
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+        self.assertEqual(self.running, 0)
+
+    async def fail(self, delay):
+        await asyncio.sleep(delay)
+        raise ValueError(delay)
+
+    def test_exception_ordered(self):
+        # The failure of the earliest item wins, even if a later item
+        # failed first.
+        async def consume():
+            async for x in asyncio.bounded_map(self.fail, [0.02, 0.01],
+                                               limit=2):
+                pass
+
+        with self.assertRaises(ValueError) as cm:
+            self.loop.run_until_complete(consume())
+        self.assertEqual(cm.exception.args, (0.02,))
+
+    def test_exception_unordered(self):
+        async def consume():
+            async for x in asyncio.bounded_map(self.fail, [0.02, 0.01],
+                                               limit=2, ordered=False):
+                pass
+
+        with self.assertRaises(ValueError) as cm:
+            self.loop.run_until_complete(consume())
+        self.assertEqual(cm.exception.args, (0.01,))
+
+    def test_invalid_limit(self):
+        # The limit is checked by the call, before iteration starts.
+        with self.assertRaises(ValueError):
+            asyncio.bounded_map(self.work, [0], limit=0)
+        with self.assertRaises(ValueError):
+            asyncio.bounded_map(self.work, [0], limit=-1)
+
+
 class CompatibilityTests(test_utils.TestCase):
     # Tests for checking a bridge between old-styled coroutines
     # and async/await syntax
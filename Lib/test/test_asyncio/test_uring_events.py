@@ -0,0 +1,283 @@
+import errno
+import os
+import select
+import signal
+import socket
+import threading
+import time
+import unittest
+
+from test import support
+
+_uring = support.import_module('_uring')
+
+import asyncio
+from test.test_asyncio import utils as test_utils
+
+
+def tearDownModule():
+    asyncio.set_event_loop_policy(None)
+
+
+def new_ring(entries=8):
+    try:
+        return _uring.Ring(entries)
+    except OSError as exc:
+        raise unittest.SkipTest(f'io_uring is not available: {exc}')
+
+
+class RingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = new_ring()
+        self.addCleanup(self.ring.close)
+        self.a, self.b = socket.socketpair()
+        self.addCleanup(self.a.close)
+        self.addCleanup(self.b.close)
+
+    def test_recv_send(self):
+        self.ring.recv(1, self.a.fileno(), 100)
+        self.assertEqual(self.ring.submit(0), [])
+        self.assertEqual(self.ring.pending, 1)
+        self.b.send(b'data')
+        self.assertEqual(self.ring.submit(), [(1, 4, b'data')])
+
+        buf = bytearray(10)
+        self.ring.recv_into(2, self.a.fileno(), buf)
+        self.ring.send(3, self.b.fileno(), memoryview(b'xyz'))
+        completed = self.ring.submit()
+        if len(completed) < 2:
+            completed += self.ring.submit()
+        self.assertEqual(sorted(completed), [(2, 3, None), (3, 3, None)])
+        self.assertEqual(buf[:3], b'xyz')
+        self.assertEqual(self.ring.pending, 0)
+
+    def test_read_write(self):
+        with open(support.TESTFN, 'w+b') as f:
+            self.addCleanup(support.unlink, support.TESTFN)
+            self.ring.write(1, f.fileno(), b'0123456789', 0)
+            self.assertEqual(self.ring.submit(), [(1, 10, None)])
+            self.ring.read(2, f.fileno(), 4, 3)
+            self.assertEqual(self.ring.submit(), [(2, 4, b'3456')])
+            # -1 reads at the current position
+            self.ring.read(3, f.fileno(), 100)
+            self.assertEqual(self.ring.submit(), [(3, 10, b'0123456789')])
+            self.assertEqual(f.tell(), 10)
+
+    def test_errors(self):
+        self.ring.recv(1, -1, 10)
+        self.assertEqual(self.ring.submit(), [(1, -errno.EBADF, None)])
+        self.ring.recv(1, self.a.fileno(), 10)
+        with self.assertRaises(ValueError):
+            self.ring.recv(1, self.a.fileno(), 10)
+        with self.assertRaises(ValueError):
+            self.ring.recv(0, self.a.fileno(), 10)
+        with self.assertRaises(TypeError):
+            self.ring.recv_into(2, self.a.fileno(), b'read-only')
+        with self.assertRaises(ValueError):
+            self.ring.recv(2, self.a.fileno(), -1)
+        self.assertEqual(self.ring.pending, 1)
+
+    def test_poll_timeout_cancel(self):
+        self.ring.poll(1, self.a.fileno(), select.POLLIN)
+        t0 = time.monotonic()
+        self.assertEqual(self.ring.submit(0.1), [])
+        self.assertGreaterEqual(time.monotonic() - t0, 0.09)
+        self.ring.cancel(1)
+        self.assertEqual(self.ring.submit(), [(1, -errno.ECANCELED, None)])
+
+    def test_full_submission_queue(self):
+        # More operations than entries are queued without error.
+        for key in range(1, 33):
+            self.ring.recv(key, self.a.fileno(), 10)
+        self.assertEqual(self.ring.pending, 32)
+        self.b.send(b'x')
+        completed = self.ring.submit()
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0][1:], (1, b'x'))
+
+    def test_close_pending(self):
+        buf = bytearray(10)
+        self.ring.recv_into(1, self.a.fileno(), buf)
+        self.ring.close()
+        self.assertTrue(self.ring.closed)
+        self.assertEqual(self.ring.pending, 0)
+        # The buffer is no longer exported.
+        buf.extend(b'x')
+        with self.assertRaises(ValueError):
+            self.ring.submit()
+        with self.assertRaises(ValueError):
+            self.ring.fileno()
+
+
+class UpperProto(asyncio.Protocol):
+    def __init__(self):
+        self.buf = []
+
+    def connection_made(self, trans):
+        self.trans = trans
+
+    def data_received(self, data):
+        self.buf.append(data)
+
+    def eof_received(self):
+        self.trans.write(b''.join(self.buf).upper())
+        self.trans.close()
+
+
+class ProactorTests(test_utils.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.loop = test_utils.new_uring_event_loop()
+        self.set_event_loop(self.loop)
+
+    def test_close(self):
+        a, b = socket.socketpair()
+        trans = self.loop._make_socket_transport(a, asyncio.Protocol())
+        f = asyncio.ensure_future(self.loop.sock_recv(b, 100),
+                                  loop=self.loop)
+        trans.close()
+        self.loop.run_until_complete(f)
+        self.assertEqual(f.result(), b'')
+        b.close()
+
+    def test_echo(self):
+        server = self.loop.run_until_complete(
+            self.loop.create_server(UpperProto, '127.0.0.1', 0))
+        self.addCleanup(server.close)
+        port = server.sockets[0].getsockname()[1]
+
+        async def client():
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'hello\n' * 100000)
+            writer.write_eof()
+            data = await reader.read()
+            writer.close()
+            await writer.wait_closed()
+            return data
+
+        data = self.loop.run_until_complete(client())
+        self.assertEqual(data, b'HELLO\n' * 100000)
+
+    def test_cancel_recv(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        a.setblocking(False)
+        f = self.loop._proactor.recv(a, 100)
+        key = f._key
+        test_utils.run_briefly(self.loop)
+        f.cancel()
+        test_utils.run_briefly(self.loop)
+        self.assertNotIn(key, self.loop._proactor._cache)
+        # The cancelled operation did not consume the data.
+        b.send(b'data')
+        f = self.loop._proactor.recv(a, 100)
+        self.assertEqual(self.loop.run_until_complete(f), b'data')
+
+    def test_cancel_accept(self):
+        listener = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(listener.close)
+        listener.setblocking(False)
+        f = self.loop._proactor.accept(listener)
+        key = f._key
+        test_utils.run_briefly(self.loop)
+        f.cancel()
+        test_utils.run_briefly(self.loop)
+        self.assertNotIn(key, self.loop._proactor._cache)
+
+    def test_pending_at_close(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        buf = bytearray(100)
+        f = self.loop._proactor.recv_into(a, buf)
+        test_utils.run_briefly(self.loop)
+        proactor = self.loop._proactor
+        self.loop.close()
+        self.assertTrue(f.cancelled())
+        self.assertEqual(proactor._cache, {})
+        self.assertIsNone(proactor._ring)
+        # The buffer is no longer used by the kernel.
+        buf.extend(b'x')
+
+    def test_batched_submission(self):
+        # All the sends of a loop iteration are submitted together.
+        socks = [socket.socketpair() for i in range(10)]
+        for a, b in socks:
+            self.addCleanup(a.close)
+            self.addCleanup(b.close)
+
+        async def send_all():
+            await asyncio.gather(*[self.loop.sock_sendall(a, b'x')
+                                   for a, b in socks])
+
+        ring = self.loop._proactor._ring
+        submit = ring.submit
+        calls = []
+        class RingProxy:
+            def __getattr__(self, name):
+                return getattr(ring, name)
+            def submit(self, timeout=None):
+                calls.append(timeout)
+                return submit(timeout)
+        self.loop._proactor._ring = RingProxy()
+        try:
+            self.loop.run_until_complete(send_all())
+        finally:
+            self.loop._proactor._ring = ring
+        self.assertLess(len(calls), len(socks))
+        for a, b in socks:
+            self.assertEqual(b.recv(10), b'x')
+
+    def test_signal_handler(self):
+        called = []
+        self.loop.add_signal_handler(signal.SIGUSR1, called.append, 1)
+        self.addCleanup(self.loop.remove_signal_handler, signal.SIGUSR1)
+
+        def kill():
+            os.kill(os.getpid(), signal.SIGUSR1)
+
+        self.loop.call_soon(kill)
+        test_utils.run_until(self.loop, lambda: called)
+        self.assertEqual(called, [1])
+
+    def test_run_from_nonmain_thread(self):
+        finished = False
+
+        async def coro():
+            await asyncio.sleep(0)
+
+        def func():
+            nonlocal finished
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(coro())
+            loop.close()
+            finished = True
+
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+        self.assertTrue(finished)
+
+
+class UringPolicyTests(test_utils.TestCase):
+
+    def test_uring_policy(self):
+        async def main():
+            self.assertIsInstance(
+                asyncio.get_running_loop(),
+                asyncio.UringEventLoop)
+
+        new_ring().close()
+        old_policy = asyncio.get_event_loop_policy()
+        try:
+            asyncio.set_event_loop_policy(asyncio.UringEventLoopPolicy())
+            asyncio.run(main())
+        finally:
+            asyncio.set_event_loop_policy(old_policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -93,6 +93,14 @@ def dummy_ssl_context():
         return ssl.SSLContext(ssl.PROTOCOL_TLS)
 
 
+def new_uring_event_loop():
+    """Create a UringEventLoop, skipping the test if io_uring is unusable."""
+    try:
+        return asyncio.UringEventLoop()
+    except OSError as exc:
+        raise unittest.SkipTest(f'io_uring is not available: {exc}')
+
+
 def run_briefly(loop):
     async def once():
         pass
@@ -685,6 +685,30 @@ class ExecutorTest:
                 list(self.executor.map(pow, range(10), range(10), chunksize=3)),
                 list(map(pow, range(10), range(10))))
 
+    def test_map_buffersize(self):
+        self.assertEqual(
+                list(self.executor.map(pow, range(10), range(10),
+                                       buffersize=3)),
+                list(map(pow, range(10), range(10))))
+
+        consumed = []
+        def numbers():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        results = self.executor.map(abs, numbers(), buffersize=2)
+        self.assertEqual(len(consumed), 2)
+        self.assertEqual(list(itertools.islice(results, 5)), list(range(5)))
+        self.assertLessEqual(len(consumed), 7)
+        results.close()
+
+        for buffersize in (0, -1):
+            with self.assertRaises(ValueError):
+                self.executor.map(abs, range(3), buffersize=buffersize)
+        with self.assertRaises(TypeError):
+            self.executor.map(abs, range(3), buffersize=2.0)
+
     def test_map_exception(self):
         i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5])
         self.assertEqual(i.__next__(), (0, 1))
@@ -755,6 +779,24 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, BaseTestCase):
         self.executor.shutdown(wait=True)
         self.assertCountEqual(finished, range(10))
 
+    def test_map_buffersize_concurrency(self):
+        lock = threading.Lock()
+        running = peak = 0
+        def call(x):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+            return x
+
+        with self.executor_type(max_workers=8) as executor:
+            results = executor.map(call, range(20), buffersize=3)
+            self.assertEqual(list(results), list(range(20)))
+        self.assertLessEqual(peak, 3)
+
     def test_default_workers(self):
         executor = self.executor_type()
         expected = min(32, (os.cpu_count() or 1) + 4)
@@ -781,6 +823,101 @@ class ThreadPoolExecutorTest(ThreadPoolMixin, ExecutorTest, BaseTestCase):
         self.assertEqual(len(executor._threads), 1)
         executor.shutdown(wait=True)
 
+    def test_idle_thread_retirement(self):
+        executor = self.executor_type(4, idle_timeout=0.05)
+        sem = threading.Semaphore(0)
+        futures = [executor.submit(sem.acquire) for _ in range(4)]
+        self.assertEqual(len(executor._threads), 4)
+        for _ in range(4):
+            sem.release()
+        for f in futures:
+            f.result()
+        deadline = time.monotonic() + test.support.SHORT_TIMEOUT
+        while executor._threads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(executor._threads), 0)
+        self.assertEqual(executor.submit(mul, 6, 7).result(), 42)
+        executor.shutdown(wait=True)
+
+    def test_min_workers(self):
+        executor = self.executor_type(4, min_workers=2, idle_timeout=0.01)
+        sem = threading.Semaphore(0)
+        futures = [executor.submit(sem.acquire) for _ in range(4)]
+        for _ in range(4):
+            sem.release()
+        for f in futures:
+            f.result()
+        deadline = time.monotonic() + test.support.SHORT_TIMEOUT
+        while len(executor._threads) > 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        self.assertEqual(len(executor._threads), 2)
+        executor.shutdown(wait=True)
+
+        with self.assertRaises(ValueError):
+            self.executor_type(4, min_workers=5)
+        with self.assertRaises(ValueError):
+            self.executor_type(4, idle_timeout=0)
+
+    def test_bounded_queue(self):
+        executor = self.executor_type(1, max_queue_size=2, queue_timeout=0)
+        event = threading.Event()
+        futures = [executor.submit(event.wait)]
+        # Wait until the worker took the first call out of the queue
+        deadline = time.monotonic() + test.support.SHORT_TIMEOUT
+        while not futures[0].running() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        futures.append(executor.submit(mul, 2, 3))
+        futures.append(executor.submit(mul, 3, 4))
+        with self.assertRaises(queue.Full):
+            executor.submit(mul, 4, 5)
+        event.set()
+        self.assertEqual([f.result() for f in futures], [True, 6, 12])
+        self.assertEqual(executor.submit(mul, 4, 5).result(), 20)
+        executor.shutdown(wait=True)
+
+        with self.assertRaises(ValueError):
+            self.executor_type(1, max_queue_size=-1)
+
+    def test_bounded_queue_blocks(self):
+        executor = self.executor_type(1, max_queue_size=1)
+        event = threading.Event()
+        first = executor.submit(event.wait)
+        while not first.running():
+            time.sleep(0.01)
+        executor.submit(mul, 1, 2)
+        results = []
+        t = threading.Thread(
+            target=lambda: results.append(executor.submit(mul, 2, 3)))
+        t.start()
+        t.join(0.1)
+        self.assertTrue(t.is_alive())
+        event.set()
+        t.join()
+        self.assertEqual(results[0].result(), 6)
+        executor.shutdown(wait=True)
+
+    def test_priorities(self):
+        executor = self.executor_type(1, priorities=True)
+        event = threading.Event()
+        first = executor.submit(event.wait)
+        while not first.running():
+            time.sleep(0.01)
+        order = []
+        executor.submit(order.append, 'a')
+        executor.submit_with_priority(5, order.append, 'b')
+        executor.submit_with_priority(-1, order.append, 'c')
+        executor.submit_with_priority(5, order.append, 'd')
+        executor.submit_with_priority(-1, order.append, 'e')
+        event.set()
+        executor.shutdown(wait=True)
+        self.assertEqual(order, ['c', 'e', 'a', 'b', 'd'])
+
+        executor = self.executor_type(1)
+        with self.assertRaises(ValueError):
+            executor.submit_with_priority(1, mul, 1, 2)
+        executor.shutdown(wait=True)
+
 
 class ProcessPoolExecutorTest(ExecutorTest):
 
@@ -818,6 +955,63 @@ class ProcessPoolExecutorTest(ExecutorTest):
             ref)
         self.assertRaises(ValueError, bad_map)
 
+    def test_template_initializer(self):
+        mp_context = self.get_context()
+        if mp_context.get_start_method() != 'forkserver':
+            with self.assertRaises(ValueError):
+                self.executor_type(mp_context=mp_context, template=True)
+            return
+
+        with self.executor_type(2, mp_context=mp_context,
+                                initializer=init,
+                                initargs=('initialized',),
+                                template=True) as executor:
+            futures = [executor.submit(get_init_status) for _ in range(4)]
+            for f in futures:
+                self.assertEqual(f.result(), 'initialized')
+            # The workers are forked from the template process.
+            parents = {executor.submit(os.getppid).result()
+                       for _ in range(4)}
+        self.assertEqual(len(parents), 1)
+        self.assertNotIn(os.getpid(), parents)
+
+    def test_map_chunksize_auto(self):
+        ref = list(map(pow, range(1000), range(1000)))
+        self.assertEqual(
+            list(self.executor.map(pow, range(1000), range(1000),
+                                   chunksize='auto')),
+            ref)
+        self.assertEqual(
+            list(self.executor.map(pow, range(1000), range(1000),
+                                   chunksize='auto', buffersize=1)),
+            ref)
+
+        # The input is consumed lazily.
+        results = self.executor.map(abs, itertools.count(), chunksize='auto')
+        self.assertEqual(list(itertools.islice(results, 5000)),
+                         list(range(5000)))
+        results.close()
+
+        i = self.executor.map(divmod, [1, 1, 1, 1], [2, 3, 0, 5],
+                              chunksize='auto')
+        self.assertEqual(next(i), (0, 1))
+        self.assertEqual(next(i), (0, 1))
+        self.assertRaises(ZeroDivisionError, next, i)
+
+    def test_chunksize_tuner(self):
+        tuner = futures.process._ChunkSizeTuner()
+        self.assertEqual(tuner.chunksize, 1)
+        # Fast calls: the chunk size doubles at each step.
+        for expected in (2, 4, 8, 16):
+            tuner.update(1e-6 * tuner.chunksize, tuner.chunksize)
+            self.assertEqual(tuner.chunksize, expected)
+        # Slow calls: one call per chunk.
+        for _ in range(10):
+            tuner.update(1.0 * tuner.chunksize, tuner.chunksize)
+        self.assertEqual(tuner.chunksize, 1)
+        chunks = list(tuner.get_chunks(range(3), 'abc'))
+        self.assertEqual(chunks, [((0, 'a'),), ((1, 'b'),), ((2, 'c'),)])
+
     @classmethod
     def _test_traceback(cls):
         raise RuntimeError(123) # some comment
@@ -853,6 +1047,45 @@ class ProcessPoolExecutorTest(ExecutorTest):
 
         self.assertTrue(obj.event.wait(timeout=1))
 
+    def _shm_segments(self):
+        try:
+            return {name for name in os.listdir('/dev/shm')
+                    if name.startswith('psm_')}
+        except FileNotFoundError:
+            return set()
+
+    @unittest.skipIf(sys.platform == 'win32', 'POSIX shared memory only')
+    def test_shared_memory_transport(self):
+        segments = self._shm_segments()
+        executor = self.executor_type(max_workers=2,
+                                      mp_context=self.get_context(),
+                                      shared_memory_threshold=16)
+        self.addCleanup(executor.shutdown)
+        array = memoryview(bytearray(range(64))).cast('I')
+        args = (b'x' * 100, bytearray(b'y' * 50), array, b'small')
+        kwargs = {'nested': [b'z' * 20, (b'w' * 30,)]}
+        result_args, result_kwargs = executor.submit(
+            capture, *args, **kwargs).result()
+        self.assertEqual(result_args, args)
+        self.assertEqual(result_kwargs, kwargs)
+        self.assertIs(type(result_args[1]), bytearray)
+        self.assertIs(type(result_args[2]), memoryview)
+        self.assertEqual(result_args[2].format, 'I')
+        self.assertEqual(result_args[2].shape, (16,))
+        self.assertFalse(result_args[2].readonly)
+
+        self.assertEqual(list(executor.map(len, [b'a' * 100] * 10,
+                                           chunksize=3)),
+                         [100] * 10)
+        with self.assertRaises(ValueError):
+            executor.submit(int, b'a' * 100).result()
+        executor.shutdown()
+        self.assertEqual(self._shm_segments(), segments)
+
+    def test_shared_memory_threshold_errors(self):
+        with self.assertRaises((ValueError, NotImplementedError)):
+            self.executor_type(shared_memory_threshold=0)
+
 
 create_executor_tests(ProcessPoolExecutorTest,
                       executor_mixins=(ProcessPoolForkMixin,
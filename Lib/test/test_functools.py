@@ -1,4 +1,5 @@
 import abc
+import asyncio
 import builtins
 import collections
 import collections.abc
@@ -1666,6 +1667,112 @@ class TestLRU:
             return 1
         self.assertEqual(f.cache_parameters(), {'maxsize': 1000, "typed": True})
 
+        @self.module.lru_cache(maxsize=None, ttl=60, maxcost=100)
+        def f():
+            return 1
+        self.assertEqual(f.cache_parameters(),
+                         {'maxsize': None, 'typed': False, 'ttl': 60,
+                          'maxcost': 100})
+
+    def test_lru_cache_ttl(self):
+        calls = []
+        @self.module.lru_cache(maxsize=None, ttl=0.05)
+        def f(x):
+            calls.append(x)
+            return [x]
+
+        a = f(1)
+        self.assertIs(f(1), a)
+        self.assertEqual(f.cache_info(), self.module._CacheInfo(1, 1, None, 1))
+        time.sleep(0.1)
+        b = f(1)
+        self.assertIsNot(b, a)
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(f.cache_info(), self.module._CacheInfo(1, 2, None, 1))
+
+        # Expired entries are purged when a new entry is added
+        f(2)
+        time.sleep(0.1)
+        f(3)
+        self.assertEqual(f.cache_info().currsize, 1)
+
+        @self.module.lru_cache(maxsize=2, ttl=60)
+        def g(x):
+            return x
+        for x in (1, 2, 1, 3, 1, 2):
+            g(x)
+        self.assertEqual(g.cache_info(), self.module._CacheInfo(2, 4, 2, 2))
+
+    def test_lru_cache_ttl_recent_hit(self):
+        # An expired entry is purged even when a fresher entry was used
+        # less recently, instead of evicting that fresher entry.
+        calls = []
+        @self.module.lru_cache(maxsize=2, ttl=0.5)
+        def f(x):
+            calls.append(x)
+            return x
+
+        f(1)
+        time.sleep(0.3)
+        f(2)
+        f(1)            # hit: 1 is now the most recently used entry
+        time.sleep(0.3)
+        f(3)            # 1 has expired, 2 has not
+        self.assertEqual(f.cache_info().currsize, 2)
+        f(2)
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(f.cache_info(), self.module._CacheInfo(2, 3, 2, 2))
+
+    def test_lru_cache_maxcost(self):
+        calls = []
+        @self.module.lru_cache(maxsize=None, maxcost=10, cost=len)
+        def f(n):
+            calls.append(n)
+            return 'x' * n
+
+        for n in (4, 4, 5, 3):
+            f(n)
+        # 4 was evicted to make room for 3
+        self.assertEqual(f.cache_info(), self.module._CacheInfo(1, 3, None, 2))
+        f(5)
+        f(3)
+        self.assertEqual(f.cache_info().hits, 3)
+        # Results larger than maxcost are not cached
+        f(11)
+        f(11)
+        self.assertEqual(calls, [4, 5, 3, 11, 11])
+        self.assertEqual(f.cache_info().currsize, 2)
+        f(10)
+        self.assertEqual(f.cache_info().currsize, 1)
+        f.cache_clear()
+        for n in (4, 5):
+            f(n)
+        self.assertEqual(f.cache_info(), self.module._CacheInfo(0, 2, None, 2))
+
+        @self.module.lru_cache(maxcost=100)
+        def g(x):
+            return x
+        g(1)
+        self.assertEqual(g.cache_info().currsize, 1)
+
+        @self.module.lru_cache(maxsize=None, maxcost=10, cost=lambda r: -1)
+        def h(x):
+            return x
+        self.assertRaises(ValueError, h, 1)
+
+    def test_lru_cache_ttl_maxcost_errors(self):
+        lru_cache = self.module.lru_cache
+        with self.assertRaises(ValueError):
+            lru_cache(ttl=0)
+        with self.assertRaises(ValueError):
+            lru_cache(ttl=-1.5)
+        with self.assertRaises(TypeError):
+            lru_cache(maxcost=1.5)
+        with self.assertRaises(TypeError):
+            lru_cache(maxcost=10, cost=42)
+        with self.assertRaises(TypeError):
+            lru_cache(cost=len)
+
 
 @py_functools.lru_cache()
 def py_cached_func(x, y):
@@ -1704,6 +1811,134 @@ class TestLRUC(TestLRU, unittest.TestCase):
         return 3 * x + y
 
 
+class TestAsyncLRU(unittest.TestCase):
+
+    def tearDown(self):
+        asyncio.set_event_loop_policy(None)
+
+    def test_async_lru_cache(self):
+        calls = []
+        @functools.async_lru_cache(maxsize=2)
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0)
+            return x * 2
+
+        async def main():
+            self.assertEqual(await f(1), 2)
+            self.assertEqual(await f(1), 2)
+            self.assertEqual(await f(2), 4)
+            self.assertEqual(await f(1), 2)
+            self.assertEqual(await f(3), 6)   # evicts 2
+            self.assertEqual(await f(2), 4)
+        asyncio.run(main())
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(f.cache_info(), functools._CacheInfo(2, 4, 2, 2))
+        self.assertEqual(f.cache_parameters(), {'maxsize': 2, 'typed': False})
+        self.assertTrue(asyncio.iscoroutinefunction(f))
+
+        f.cache_clear()
+        self.assertEqual(f.cache_info(), functools._CacheInfo(0, 0, 2, 0))
+
+    def test_async_lru_cache_direct_decoration(self):
+        @functools.async_lru_cache
+        async def f(x):
+            return x
+        self.assertEqual(asyncio.run(f(42)), 42)
+        self.assertEqual(f.cache_info(), functools._CacheInfo(0, 1, 128, 1))
+        self.assertEqual(f.__name__, 'f')
+
+    def test_async_lru_cache_coalescing(self):
+        calls = []
+        @functools.async_lru_cache(maxsize=None)
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return [x]
+
+        async def main():
+            results = await asyncio.gather(*[f(1) for _ in range(10)],
+                                           *[f(2) for _ in range(5)])
+            first = results[0]
+            self.assertTrue(all(r is first for r in results[:10]))
+            self.assertEqual(results[-1], [2])
+            self.assertIs(await f(1), first)
+        asyncio.run(main())
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(f.cache_info(), functools._CacheInfo(14, 2, None, 2))
+
+    def test_async_lru_cache_no_caching(self):
+        calls = []
+        @functools.async_lru_cache(maxsize=0)
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0)
+            return x
+
+        async def main():
+            await asyncio.gather(f(1), f(1))
+            await f(1)
+        asyncio.run(main())
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(f.cache_info(), functools._CacheInfo(1, 2, 0, 0))
+
+    def test_async_lru_cache_exceptions(self):
+        calls = []
+        @functools.async_lru_cache()
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0)
+            raise ValueError(x)
+
+        async def main():
+            results = await asyncio.gather(f(1), f(1), return_exceptions=True)
+            self.assertEqual(len(results), 2)
+            for exc in results:
+                self.assertIsInstance(exc, ValueError)
+            with self.assertRaises(ValueError):
+                await f(1)
+        asyncio.run(main())
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(f.cache_info().currsize, 0)
+
+    def test_async_lru_cache_cancellation(self):
+        calls = []
+        @functools.async_lru_cache()
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return x
+
+        async def main():
+            t1 = asyncio.ensure_future(f(1))
+            t2 = asyncio.ensure_future(f(1))
+            await asyncio.sleep(0)
+            t1.cancel()
+            self.assertEqual(await t2, 1)
+            self.assertTrue(t1.cancelled())
+            self.assertEqual(await f(1), 1)
+        asyncio.run(main())
+        self.assertEqual(calls, [1])
+
+    def test_async_lru_cache_clear_while_pending(self):
+        calls = []
+        @functools.async_lru_cache()
+        async def f(x):
+            calls.append(x)
+            await asyncio.sleep(0.01)
+            return x
+
+        async def main():
+            t = asyncio.ensure_future(f(1))
+            await asyncio.sleep(0)
+            f.cache_clear()
+            self.assertEqual(await t, 1)
+            self.assertEqual(f.cache_info().currsize, 0)
+            self.assertEqual(await f(1), 1)
+        asyncio.run(main())
+        self.assertEqual(calls, [1, 1])
+
+
 class TestSingleDispatch(unittest.TestCase):
     def test_simple_overloads(self):
         @functools.singledispatch
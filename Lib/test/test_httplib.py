@@ -1,3 +1,4 @@
+import email.parser
 import errno
 from http import client
 import io
@@ -316,6 +317,36 @@ class HeaderTests(TestCase):
             self.assertIn(' folded with space', folded)
             self.assertTrue(folded.endswith('folded with tab'))
 
+    def test_parse_headers_like_email_parser(self):
+        # parse_headers() stores plain header lines itself; the result must
+        # not differ from what the email parser makes of them.
+        for text in (b'\r\n', b'',
+                     b'Host: example.com\r\nAccept:  */* \r\n\r\n',
+                     b'Empty:\r\nTab:\tvalue\r\nLF: only\n\n',
+                     b'Set-Cookie: a\r\nSet-Cookie: b\r\nNo: end\r\n',
+                     b'obs-text: \xe9\xff\r\n\r\n',
+                     b'obs-fold: text\r\n folded\r\n\r\n',
+                     b'First: val\r\n: nval\r\nbad line\r\nLast: val\r\n\r\n',
+                     b'CR: in\rvalue\r\n\r\n',
+                     b'Content-Type: text/html; charset=utf-8\r\n\r\n',
+                     b'Content-Type: message/rfc822\r\n\r\n',
+                     b'content-type: Message/HTTP\r\n\r\n',
+                     b'Content-Type: multipart/mixed; boundary=x\r\n\r\n',
+                     b'Content-Type:multipart/byteranges\r\n\r\n'):
+            with self.subTest(text=text):
+                msg = client.parse_headers(io.BytesIO(text))
+                expected = email.parser.Parser(
+                    _class=client.HTTPMessage).parsestr(
+                        text.decode('iso-8859-1'))
+                self.assertIsInstance(msg, client.HTTPMessage)
+                self.assertEqual(msg.items(), expected.items())
+                self.assertEqual(msg.is_multipart(), expected.is_multipart())
+                if not expected.is_multipart():
+                    self.assertEqual(msg.get_payload(),
+                                     expected.get_payload())
+                self.assertEqual([type(d) for d in msg.defects],
+                                 [type(d) for d in expected.defects])
+
     def test_invalid_headers(self):
         conn = client.HTTPConnection('example.com')
         conn.sock = FakeSocket('')
@@ -1060,6 +1091,45 @@ class BasicTest(TestCase):
         self.assertEqual(sock.file.read(), extradata.encode("ascii")) #we read to the end
         resp.close()
 
+    def test_chunked_truncated(self):
+        """Only complete chunks are reported as partial data"""
+        expected = chunked_expected
+        for x in ('3\r\nab', '3\r\nabc', '3\r\nabc\r'):
+            for readinto in (False, True):
+                sock = FakeSocket(chunked_start + x)
+                resp = client.HTTPResponse(sock, method="GET")
+                resp.begin()
+                partial = expected
+                if x != '3\r\nab':
+                    partial += b'abc'
+                with self.assertRaises(client.IncompleteRead) as cm:
+                    if readinto:
+                        resp.readinto(bytearray(128))
+                    else:
+                        resp.read()
+                self.assertEqual(cm.exception.partial, partial)
+                resp.close()
+
+    def test_chunked_many_chunks(self):
+        expected = b''.join(b'%d,' % i for i in range(1000))
+        body = ''.join('%x\r\n%d,\r\n' % (len(str(i)) + 1, i)
+                       for i in range(1000))
+        start = chunked_start[:chunked_start.index('\r\n\r\n') + 4]
+        sock = FakeSocket(start + body + last_chunk + chunked_end)
+        resp = client.HTTPResponse(sock, method="GET")
+        resp.begin()
+        self.assertEqual(resp.read(), expected)
+        self.assertTrue(resp.isclosed())
+
+        b = bytearray(len(expected) + 10)
+        sock = FakeSocket(start + body + last_chunk + chunked_end)
+        resp = client.HTTPResponse(sock, method="GET")
+        resp.begin()
+        self.assertEqual(resp.readinto(b), len(expected))
+        self.assertEqual(b[:len(expected)], expected)
+        self.assertEqual(resp.readinto(b), 0)
+        self.assertTrue(resp.isclosed())
+
     def test_content_length_sync(self):
         """Check that we don't read past the end of the Content-Length stream"""
         extradata = b"extradata"
@@ -1595,6 +1665,167 @@ class PersistenceTest(TestCase):
         self.assertEqual(conn.connections, 2)
 
 
+class VectoredSendTest(TestCase):
+
+    def make_socket(self):
+        a, b = socket.socketpair()
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        calls = []
+        class CountingSocket(socket.socket):
+            def sendmsg(self, buffers, *args):
+                calls.append(len(buffers))
+                return super().sendmsg(buffers, *args)
+        sock = CountingSocket(fileno=a.detach())
+        self.addCleanup(sock.close)
+        return sock, b, calls
+
+    def read_all(self, sock, size):
+        data = b''
+        while len(data) < size:
+            data += sock.recv(size - len(data))
+        return data
+
+    @unittest.skipUnless(hasattr(socket.socket, 'sendmsg'),
+                         'test needs socket.sendmsg()')
+    def test_request_body(self):
+        sock, peer, calls = self.make_socket()
+        conn = client.HTTPConnection('example.com')
+        conn.sock = sock
+        body = b'x' * 100000
+        conn.request('PUT', '/', body)
+        expected = (b'PUT / HTTP/1.1\r\nHost: example.com\r\n'
+                    b'Accept-Encoding: identity\r\n'
+                    b'Content-Length: 100000\r\n\r\n' + body)
+        self.assertEqual(self.read_all(peer, len(expected)), expected)
+        self.assertEqual(calls[0], 2)
+
+        del calls[:]
+        conn = client.HTTPConnection('example.com')
+        conn.sock = sock
+        conn.request('POST', '/', array.array('h', [1, 2]),
+                     {'Transfer-Encoding': 'chunked'}, encode_chunked=True)
+        expected = (b'POST / HTTP/1.1\r\nHost: example.com\r\n'
+                    b'Accept-Encoding: identity\r\n'
+                    b'Transfer-Encoding: chunked\r\n\r\n'
+                    b'4\r\n' + array.array('h', [1, 2]).tobytes() +
+                    b'\r\n0\r\n\r\n')
+        self.assertEqual(self.read_all(peer, len(expected)), expected)
+        self.assertEqual(calls, [5])
+
+    def test_partial_sendmsg(self):
+        class PartialSocket:
+            data = b''
+            def sendmsg(self, buffers):
+                # send at most 3 bytes
+                data = b''.join(bytes(b) for b in buffers)[:3]
+                self.data += data
+                return len(data)
+        sock = PartialSocket()
+        buffers = [b'abcd', b'', b'e', b'fghijklm', b'']
+        client._sendmsg_all(sock, [memoryview(b) for b in buffers])
+        self.assertEqual(sock.data, b''.join(buffers))
+
+    def test_send_override(self):
+        # Subclasses overriding send() get all the data
+        class SendConnection(client.HTTPConnection):
+            def send(self, data):
+                self.sent.append(data)
+        conn = SendConnection('example.com')
+        conn.sent = []
+        conn.sock = socket.socket()
+        self.addCleanup(conn.sock.close)
+        conn.request('PUT', '/', b'body')
+        self.assertEqual(conn.sent[-1], b'body')
+
+
+class PipeliningTest(TestCase):
+
+    def response(self, body, headers=''):
+        return ('HTTP/1.1 200 OK\r\n{}Content-Length: {}\r\n\r\n{}'
+                .format(headers, len(body), body))
+
+    def test_pipelining(self):
+        conn = FakeSocketHTTPConnection(
+            self.response('first') +
+            'HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\n' +
+            self.response('third'))
+        conn.pipelining = True
+        conn.request('GET', '/first')
+        conn.request('HEAD', '/second')
+        conn.request('POST', '/third', b'body')
+        # the requests are queued until getresponse()
+        self.assertIsNone(conn.sock)
+        response = conn.getresponse()
+        self.assertEqual(conn.connections, 1)
+        data = conn.sock.data
+        self.assertEqual(data.count(b'HTTP/1.1\r\n'), 3)
+        self.assertLess(data.index(b'GET /first'), data.index(b'HEAD /second'))
+        self.assertLess(data.index(b'HEAD /second'),
+                        data.index(b'POST /third'))
+        self.assertTrue(data.endswith(b'\r\n\r\nbody'))
+        # the previous response must be read first
+        self.assertRaises(client.ResponseNotReady, conn.getresponse)
+        self.assertEqual(response.read(), b'first')
+        response = conn.getresponse()
+        self.assertEqual(response.read(), b'')
+        response = conn.getresponse()
+        self.assertEqual(response.read(), b'third')
+        self.assertRaises(client.ResponseNotReady, conn.getresponse)
+        self.assertIsNotNone(conn.sock)
+
+    def test_request_after_response(self):
+        conn = FakeSocketHTTPConnection(self.response('first') +
+                                        self.response('second'))
+        conn.pipelining = True
+        conn.request('GET', '/first')
+        response = conn.getresponse()
+        conn.request('GET', '/second')
+        self.assertEqual(response.read(), b'first')
+        self.assertEqual(conn.getresponse().read(), b'second')
+
+    def test_closed_by_server(self):
+        conn = FakeSocketHTTPConnection(
+            self.response('first', 'Connection: close\r\n') +
+            self.response('second'))
+        conn.pipelining = True
+        conn.request('GET', '/first')
+        conn.request('GET', '/second')
+        response = conn.getresponse()
+        self.assertIsNone(conn.sock)
+        self.assertEqual(response.read(), b'first')
+        self.assertRaises(client.RemoteDisconnected, conn.getresponse)
+        self.assertRaises(client.ResponseNotReady, conn.getresponse)
+        # a new request reconnects
+        conn.request('GET', '/third')
+        self.assertEqual(conn.getresponse().read(), b'first')
+        self.assertEqual(conn.connections, 2)
+
+    def test_close(self):
+        conn = FakeSocketHTTPConnection(self.response('first'))
+        conn.pipelining = True
+        conn.request('GET', '/first')
+        conn.request('GET', '/second')
+        conn.close()
+        self.assertRaises(client.RemoteDisconnected, conn.getresponse)
+        self.assertRaises(client.RemoteDisconnected, conn.getresponse)
+        self.assertEqual(conn.connections, 0)
+
+    def test_streamed_body(self):
+        conn = FakeSocketHTTPConnection(self.response('first') +
+                                        self.response('second'))
+        conn.pipelining = True
+        conn.request('GET', '/first')
+        # a file body is sent immediately, after the queued requests
+        conn.request('PUT', '/second', io.BytesIO(b'body'),
+                     {'Content-Length': '4'})
+        data = conn.sock.data
+        self.assertLess(data.index(b'GET /first'), data.index(b'PUT /second'))
+        self.assertTrue(data.endswith(b'body'))
+        self.assertEqual(conn.getresponse().read(), b'first')
+        self.assertEqual(conn.getresponse().read(), b'second')
+
+
 class HTTPSTest(TestCase):
 
     def setUp(self):
@@ -25,6 +25,7 @@ import tempfile
 import time
 import datetime
 import threading
+from functools import partial
 from unittest import mock
 from io import BytesIO
 
@@ -555,6 +556,122 @@ class SimpleHTTPServerTestCase(BaseTestCase):
         html_text = '>%s<' % html.escape(filename, quote=False)
         self.assertIn(html_text.encode(enc), body)
 
+    def test_range(self):
+        def get(value, method='GET'):
+            response = self.request(self.base_url + '/test', method=method,
+                                    headers={'Range': value})
+            return (response.status, response.getheader('Content-Range'),
+                    response.read())
+
+        size = len(self.data)
+        self.assertEqual(get('bytes=0-3'),
+            (HTTPStatus.PARTIAL_CONTENT, 'bytes 0-3/%d' % size,
+             self.data[:4]))
+        self.assertEqual(get('bytes=4-'),
+            (HTTPStatus.PARTIAL_CONTENT, 'bytes 4-%d/%d' % (size - 1, size),
+             self.data[4:]))
+        self.assertEqual(get('bytes=-5'),
+            (HTTPStatus.PARTIAL_CONTENT,
+             'bytes %d-%d/%d' % (size - 5, size - 1, size), self.data[-5:]))
+        self.assertEqual(get('bytes=10-1000'),
+            (HTTPStatus.PARTIAL_CONTENT, 'bytes 10-%d/%d' % (size - 1, size),
+             self.data[10:]))
+        self.assertEqual(get('bytes=%d-' % size),
+            (HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, 'bytes */%d' % size,
+             b''))
+        self.assertEqual(get('bytes=-0'),
+            (HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, 'bytes */%d' % size,
+             b''))
+        # Invalid and multiple ranges are ignored
+        for value in 'bytes=3-2', 'bytes=0-1,3-4', 'lines=0-1', 'bytes=x-':
+            with self.subTest(value=value):
+                self.assertEqual(get(value), (HTTPStatus.OK, None, self.data))
+        self.assertEqual(get('bytes=0-3', method='HEAD'),
+                         (HTTPStatus.OK, None, b''))
+        response = self.request(self.base_url + '/test')
+        self.assertEqual(response.getheader('Accept-Ranges'), 'bytes')
+
+    def test_range_copyfile_override(self):
+        # A copyfile() override copying the file returned by send_head()
+        # to the end sends the requested range only.
+        def copyfile(handler, source, outputfile):
+            shutil.copyfileobj(source, outputfile)
+        with mock.patch.object(self.request_handler, 'copyfile', copyfile):
+            with socket.create_connection((self.HOST, self.PORT)) as sock:
+                sock.sendall(b'GET %s/test HTTP/1.0\r\n'
+                             b'Range: bytes=1-2\r\n\r\n'
+                             % self.base_url.encode('ascii'))
+                data = b''
+                while True:
+                    chunk = sock.recv(1024)
+                    if not chunk:
+                        break
+                    data += chunk
+        self.assertTrue(data.startswith(b'HTTP/1.0 206 '))
+        self.assertTrue(data.endswith(b'\r\n\r\n' + self.data[1:3]))
+
+    def test_wrapped_wfile(self):
+        # A writer installed by setup() sees the whole response, even if
+        # the connection supports sendfile().
+        written = []
+        class Writer:
+            def __init__(self, wfile):
+                self.wfile = wfile
+            def write(self, data):
+                written.append(bytes(data))
+                return self.wfile.write(data)
+            def flush(self):
+                self.wfile.flush()
+            @property
+            def closed(self):
+                return self.wfile.closed
+            def close(self):
+                self.wfile.close()
+        def setup(handler):
+            SimpleHTTPRequestHandler.setup(handler)
+            handler.wfile = Writer(handler.wfile)
+        with mock.patch.object(self.request_handler, 'setup', setup):
+            response = self.request(self.base_url + '/test')
+            self.check_status_and_reason(response, HTTPStatus.OK,
+                                         data=self.data)
+        self.assertTrue(b''.join(written).endswith(b'\r\n\r\n' + self.data))
+
+    def test_if_range(self):
+        headers = {'Range': 'bytes=1-2', 'If-Range': self.last_modif_header}
+        response = self.request(self.base_url + '/test', headers=headers)
+        self.assertEqual(response.status, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(response.read(), self.data[1:3])
+        old_dt = self.last_modif_datetime - datetime.timedelta(days=1)
+        for value in email.utils.format_datetime(old_dt, usegmt=True), '"x"':
+            with self.subTest(value=value):
+                headers['If-Range'] = value
+                response = self.request(self.base_url + '/test',
+                                        headers=headers)
+                self.assertEqual(response.status, HTTPStatus.OK)
+                self.assertEqual(response.read(), self.data)
+
+
+class SimpleHTTPServerFileCacheTestCase(SimpleHTTPServerTestCase):
+    class request_handler(NoLogRequestHandler, SimpleHTTPRequestHandler):
+        file_cache = server.FileCache()
+
+    def tearDown(self):
+        self.request_handler.file_cache.clear()
+        super().tearDown()
+
+    def test_file_changed(self):
+        path = os.path.join(self.tempdir, 'test')
+        response = self.request(self.base_url + '/test')
+        self.assertEqual(response.read(), self.data)
+        with open(path, 'ab') as f:
+            f.write(b'!')
+        os.utime(path, (0, 0))
+        response = self.request(self.base_url + '/test')
+        self.assertEqual(response.read(), self.data + b'!')
+        os.replace(os.path.join(self.tempdir, 'test'), path + '2')
+        response = self.request(self.base_url + '/test')
+        self.check_status_and_reason(response, HTTPStatus.NOT_FOUND)
+
 
 cgi_file1 = """\
 #!%s
@@ -790,6 +907,322 @@ class CGIHTTPServerTestCase(BaseTestCase):
             (res.read(), res.getheader('Content-type'), res.status))
 
 
+class AsyncServerThread(threading.Thread):
+    def __init__(self, test_object, request_handler):
+        threading.Thread.__init__(self)
+        self.request_handler = request_handler
+        self.test_object = test_object
+        self.started = threading.Event()
+
+    def run(self):
+        import asyncio
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        import asyncio
+        self.loop = asyncio.get_event_loop()
+        self.server = server.AsyncHTTPServer(('localhost', 0),
+                                             self.request_handler)
+        await self.server.start()
+        self.test_object.HOST, self.test_object.PORT = \
+            self.server.server_address[:2]
+        self.started.set()
+        self.test_object = None
+        await self.server.serve_forever()
+        await self.server.wait_closed()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.join()
+
+
+class AsyncHTTPServerTestCase(unittest.TestCase):
+    class request_handler(NoLogRequestHandler, SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path != '/':
+                return SimpleHTTPRequestHandler.do_GET(self)
+            body = ('%s:%d' % self.client_address[:2]).encode('ascii')
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if self.headers.get('Transfer-Encoding') == 'chunked':
+                body = b''
+                while True:
+                    size = int(self.rfile.readline(), 16)
+                    body += self.rfile.read(size)
+                    self.rfile.readline()
+                    if not size:
+                        break
+            else:
+                body = self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_ERROR(self):
+            raise ValueError('handler failed')
+
+    def setUp(self):
+        self._threads = support.threading_setup()
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.data = os.urandom(100000)
+        with open(os.path.join(self.tempdir, 'file'), 'wb') as f:
+            f.write(self.data)
+        handler = partial(self.request_handler, directory=self.tempdir)
+        self.thread = AsyncServerThread(self, handler)
+        self.thread.start()
+        self.thread.started.wait()
+
+    def tearDown(self):
+        import asyncio
+        self.thread.stop()
+        self.thread = None
+        asyncio.set_event_loop_policy(None)
+        support.threading_cleanup(*self._threads)
+
+    def connect(self):
+        sock = socket.create_connection((self.HOST, self.PORT))
+        self.addCleanup(sock.close)
+        return sock
+
+    def recv_all(self, sock):
+        data = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return data
+            data += chunk
+
+    def test_keep_alive(self):
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        self.addCleanup(conn.close)
+        conn.request('GET', '/')
+        first = conn.getresponse().read()
+        conn.request('GET', '/')
+        self.assertEqual(conn.getresponse().read(), first)
+        self.assertEqual(first.decode('ascii'),
+                         '%s:%d' % conn.sock.getsockname()[:2])
+
+    def test_pipelining(self):
+        sock = self.connect()
+        sock.sendall(b'GET / HTTP/1.1\r\n\r\n'
+                     b'POST /echo HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc'
+                     b'GET / HTTP/1.1\r\nConnection: close\r\n\r\n')
+        data = self.recv_all(sock)
+        self.assertEqual(data.count(b'HTTP/1.1 200 OK\r\n'), 3)
+        self.assertIn(b'\r\n\r\nabcHTTP/1.1 200 OK', data)
+
+    def test_request_body(self):
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        self.addCleanup(conn.close)
+        body = b'x' * 200000
+        conn.request('POST', '/echo', body)
+        self.assertEqual(conn.getresponse().read(), body)
+        conn.request('POST', '/echo', iter([b'spam', b'', b'eggs']),
+                     encode_chunked=True)
+        self.assertEqual(conn.getresponse().read(), b'spameggs')
+
+    def test_expect_continue(self):
+        sock = self.connect()
+        sock.sendall(b'POST /echo HTTP/1.1\r\nExpect: 100-continue\r\n'
+                     b'Content-Length: 4\r\n\r\n')
+        self.assertEqual(sock.recv(1024), b'HTTP/1.1 100 Continue\r\n\r\n')
+        sock.sendall(b'spam')
+        response = sock.recv(1024)
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK\r\n'))
+        self.assertTrue(response.endswith(b'\r\n\r\nspam'))
+
+    def test_http_1_0_closes(self):
+        sock = self.connect()
+        sock.sendall(b'GET / HTTP/1.0\r\n\r\n')
+        data = self.recv_all(sock)
+        self.assertTrue(data.startswith(b'HTTP/1.1 200 OK\r\n'))
+
+    def test_request_line_too_long(self):
+        sock = self.connect()
+        sock.sendall(b'GET /' + b'x' * 70000)
+        data = self.recv_all(sock)
+        self.assertTrue(data.startswith(b'HTTP/1.1 414 '))
+
+    def test_body_too_large(self):
+        sock = self.connect()
+        sock.sendall(b'POST /echo HTTP/1.1\r\n'
+                     b'Content-Length: 100000000000\r\n\r\n')
+        data = self.recv_all(sock)
+        self.assertTrue(data.startswith(b'HTTP/1.1 413 '))
+        self.assertIn(b'\r\nConnection: close\r\n', data)
+
+        with mock.patch.object(server.AsyncHTTPServer, 'max_body_size', 10):
+            sock = self.connect()
+            sock.sendall(b'POST /echo HTTP/1.1\r\n'
+                         b'Transfer-Encoding: chunked\r\n\r\n'
+                         b'5\r\nspam!\r\n')
+            sock.sendall(b'5\r\neggs!\r\n')
+            self.assertTrue(self.recv_all(sock).startswith(b'HTTP/1.1 413 '))
+
+            # Small bodies are still accepted.
+            conn = http.client.HTTPConnection(self.HOST, self.PORT)
+            self.addCleanup(conn.close)
+            conn.request('POST', '/echo', b'spam')
+            self.assertEqual(conn.getresponse().read(), b'spam')
+
+    def test_chunk_line_too_long(self):
+        sock = self.connect()
+        sock.sendall(b'POST /echo HTTP/1.1\r\n'
+                     b'Transfer-Encoding: chunked\r\n\r\n')
+        sock.sendall(b'0' * 70000)
+        self.assertTrue(self.recv_all(sock).startswith(b'HTTP/1.1 400 '))
+
+    def test_sendfile(self):
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        self.addCleanup(conn.close)
+        for i in range(2):
+            conn.request('GET', '/file')
+            response = conn.getresponse()
+            self.assertEqual(response.status, HTTPStatus.OK)
+            self.assertEqual(response.read(), self.data)
+
+    def test_sendfile_empty_file(self):
+        open(os.path.join(self.tempdir, 'empty'), 'wb').close()
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        self.addCleanup(conn.close)
+        for i in range(2):
+            conn.request('GET', '/empty')
+            response = conn.getresponse()
+            self.assertEqual(response.status, HTTPStatus.OK)
+            self.assertEqual(response.read(), b'')
+
+    def test_sendfile_range(self):
+        cache = server.FileCache()
+        self.addCleanup(cache.clear)
+        conn = http.client.HTTPConnection(self.HOST, self.PORT)
+        self.addCleanup(conn.close)
+        for file_cache in None, cache, cache:
+            with mock.patch.object(self.request_handler, 'file_cache',
+                                   file_cache):
+                conn.request('GET', '/file', headers={'Range': 'bytes=10-'})
+                response = conn.getresponse()
+                self.assertEqual(response.status, HTTPStatus.PARTIAL_CONTENT)
+                self.assertEqual(response.read(), self.data[10:])
+                conn.request('GET', '/file')
+                self.assertEqual(conn.getresponse().read(), self.data)
+
+    def test_timeout_idle(self):
+        with mock.patch.object(self.request_handler, 'timeout', 0.2):
+            sock = self.connect()
+            sock.sendall(b'GET / HTTP/1.1\r\n\r\n')
+            response = self.recv_all(sock)
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK\r\n'))
+
+    def test_timeout_while_sending(self):
+        # The handler timeout does not cut a response which the client
+        # reads slowly.
+        data = os.urandom(4 * 1024 * 1024)
+        with open(os.path.join(self.tempdir, 'big'), 'wb') as f:
+            f.write(data)
+        with mock.patch.object(self.request_handler, 'timeout', 0.2):
+            sock = socket.socket()
+            self.addCleanup(sock.close)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            sock.connect((self.HOST, self.PORT))
+            sock.sendall(b'GET /big HTTP/1.1\r\nConnection: close\r\n\r\n')
+            time.sleep(0.6)
+            response = self.recv_all(sock)
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK\r\n'))
+        self.assertTrue(response.endswith(b'\r\n\r\n' + data))
+
+    def test_handler_error(self):
+        sock = self.connect()
+        with support.captured_stderr() as err:
+            sock.sendall(b'ERROR / HTTP/1.1\r\n\r\n')
+            self.assertEqual(self.recv_all(sock), b'')
+        self.assertIn('ValueError: handler failed', err.getvalue())
+
+
+class FileCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tempdir, str(i))
+            with open(path, 'wb') as f:
+                f.write(b'data %d' % i)
+            self.paths.append(path)
+
+    def assertClosed(self, fd):
+        self.assertRaises(OSError, os.fstat, fd)
+
+    def test_open(self):
+        cache = server.FileCache()
+        self.addCleanup(cache.clear)
+        path = self.paths[0]
+        f, st = cache.open(path)
+        with f:
+            self.assertEqual(st, os.stat(path))
+            self.assertEqual(f.read(), b'data 0')
+            self.assertEqual(f.seek(-2, os.SEEK_END), 4)
+            self.assertEqual(f.read(), b' 0')
+            fd = f.fileno()
+        g, st = cache.open(path)
+        with g:
+            # A second user of the same descriptor has its own position
+            self.assertEqual(g.fileno(), fd)
+            self.assertEqual(g.tell(), 0)
+            self.assertEqual(g.read(4), b'data')
+        self.assertRaises(ValueError, f.fileno)
+        os.fstat(fd)
+        cache.clear()
+        self.assertClosed(fd)
+
+    def test_modified(self):
+        cache = server.FileCache()
+        self.addCleanup(cache.clear)
+        path = self.paths[0]
+        cache.open(path)[0].close()
+        with open(path, 'ab') as f:
+            f.write(b'!')
+        os.utime(path, (0, 0))
+        f, st = cache.open(path)
+        with f:
+            self.assertEqual(f.read(), b'data 0!')
+            self.assertEqual(st.st_size, 7)
+
+    def test_maxsize(self):
+        cache = server.FileCache(2)
+        self.addCleanup(cache.clear)
+        fds = []
+        for path in self.paths:
+            f, st = cache.open(path)
+            with f:
+                fds.append(f.fileno())
+        # The least recently used file is closed
+        self.assertClosed(fds[0])
+        os.fstat(fds[1])
+        os.fstat(fds[2])
+        # A file in use stays open until it is closed
+        f, st = cache.open(self.paths[1])
+        cache.clear()
+        self.assertClosed(fds[2])
+        self.assertEqual(f.read(), b'data 1')
+        f.close()
+        self.assertClosed(fds[1])
+
+    def test_not_regular(self):
+        cache = server.FileCache()
+        self.addCleanup(cache.clear)
+        self.assertRaises(OSError, cache.open, self.tempdir)
+        self.assertRaises(FileNotFoundError, cache.open,
+                          os.path.join(self.tempdir, 'missing'))
+
+
 class SocketlessRequestHandler(SimpleHTTPRequestHandler):
     def __init__(self, directory=None):
         request = mock.Mock()
@@ -1237,8 +1670,11 @@ def test_main(verbose=None):
             BaseHTTPRequestHandlerTestCase,
             BaseHTTPServerTestCase,
             SimpleHTTPServerTestCase,
+            SimpleHTTPServerFileCacheTestCase,
             CGIHTTPServerTestCase,
+            AsyncHTTPServerTestCase,
             SimpleHTTPRequestHandlerTestCase,
+            FileCacheTestCase,
             MiscTestCase,
             ScriptTestCase
         )
@@ -31,6 +31,8 @@ class TestPyTest(PyTest):
     def test_pyjson(self):
         self.assertEqual(self.json.scanner.make_scanner.__module__,
                          'json.scanner')
+        self.assertEqual(self.json.scanner.scan_stream.__module__,
+                         'json.scanner')
         self.assertEqual(self.json.decoder.scanstring.__module__,
                          'json.decoder')
         self.assertEqual(self.json.encoder.encode_basestring_ascii.__module__,
@@ -39,6 +41,7 @@ class TestPyTest(PyTest):
 class TestCTest(CTest):
     def test_cjson(self):
         self.assertEqual(self.json.scanner.make_scanner.__module__, '_json')
+        self.assertEqual(self.json.scanner.scan_stream.__module__, '_json')
         self.assertEqual(self.json.decoder.scanstring.__module__, '_json')
         self.assertEqual(self.json.encoder.c_make_encoder.__module__, '_json')
         self.assertEqual(self.json.encoder.encode_basestring_ascii.__module__,
@@ -47,7 +50,7 @@ class TestCTest(CTest):
 
 def load_tests(loader, _, pattern):
     suite = unittest.TestSuite()
-    for mod in (json, json.encoder, json.decoder):
+    for mod in (json, json.encoder, json.decoder, json.codec):
         suite.addTest(doctest.DocTestSuite(mod))
     suite.addTest(TestPyTest('test_pyjson'))
     suite.addTest(TestCTest('test_cjson'))
@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+from typing import (Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple,
+                    Union)
+from test.test_json import PyTest, CTest
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+@dataclass
+class Node:
+    name: str
+    children: List['Node'] = field(default_factory=list)
+    parent: Optional['Node'] = field(default=None, repr=False)
+
+
+@dataclass
+class Shape:
+    name: str
+    points: List[Point]
+    tags: Tuple[str, ...] = ()
+    attrs: Dict[str, Point] = field(default_factory=dict)
+    box: Optional[Tuple[Point, Point]] = None
+    extra: Any = None
+    id: Union[int, str] = 0
+    computed: int = field(default=0, init=False)
+
+
+class TestCodec:
+    def test_encode_types(self):
+        shape = Shape('s', [Point(1, 2), Point(3, 4)],
+                      attrs={'o': Point(0, 0)})
+        expected = ('{"name": "s", "points": [{"x": 1, "y": 2}, '
+                    '{"x": 3, "y": 4}], "tags": [], '
+                    '"attrs": {"o": {"x": 0, "y": 0}}, "box": null, '
+                    '"extra": null, "id": 0, "computed": 0}')
+        types = [Shape, Point]
+        self.assertEqual(self.dumps(shape, types=types), expected)
+        self.assertEqual(self.json.dumpb(shape, types=types),
+                         expected.encode('ascii'))
+        self.assertEqual(self.dumps([Point(1, 2), (1, 2)], types=types),
+                         '[{"x": 1, "y": 2}, [1, 2]]')
+        # Without types, named tuples are encoded as arrays
+        self.assertEqual(self.dumps(Point(1, 2)), '[1, 2]')
+        self.assertEqual(self.dumps(Point(2, 1), types=types, sort_keys=True,
+                                    separators=(',', ':')),
+                         '{"x":2,"y":1}')
+        self.assertEqual(self.dumps(Point(2, 1), types=types, indent=1),
+                         '{\n "x": 2,\n "y": 1\n}')
+
+    def test_encode_types_errors(self):
+        self.assertRaises(TypeError, self.json.JSONEncoder, types=[dict])
+        self.assertRaises(TypeError, self.json.JSONEncoder, types=[tuple])
+        self.assertRaises(TypeError, self.json.JSONEncoder,
+                          types=[Shape('s', [])])
+        node = Node('a')
+        node.children.append(node)
+        with self.assertRaises(ValueError):
+            self.dumps(node, types=[Node])
+        with self.assertRaises(TypeError):
+            self.dumps(Node('a', [object()]), types=[Node])
+
+    def test_roundtrip(self):
+        codec = self.json.Codec(List[Shape])
+        shapes = [
+            Shape('a', [Point(1, 2)], ('t', 'u'),
+                  {'k': Point(5, 6)}, (Point(0, 0), Point(9, 9)),
+                  {'any': [1, 'x']}, 'id'),
+            Shape('b', []),
+        ]
+        s = codec.encode(shapes)
+        self.assertEqual(self.loads(s)[0]['box'], [{'x': 0, 'y': 0},
+                                                   {'x': 9, 'y': 9}])
+        decoded = codec.decode(s)
+        self.assertEqual(decoded, shapes)
+        self.assertIsInstance(decoded[0].box[0], Point)
+        self.assertIsInstance(decoded[0].box, tuple)
+        self.assertIsInstance(decoded[0].tags, tuple)
+        self.assertEqual(codec.decode(codec.encode_bytes(shapes).decode()),
+                         shapes)
+        self.assertEqual(codec.convert(self.loads(s)), shapes)
+
+    def test_recursive_type(self):
+        codec = self.json.Codec(Node)
+        tree = Node('root', [Node('a', [Node('b')]), Node('c')])
+        self.assertEqual(codec.encode(tree),
+                         '{"name": "root", "children": [{"name": "a", '
+                         '"children": [{"name": "b", "children": [], '
+                         '"parent": null}], "parent": null}, {"name": "c", '
+                         '"children": [], "parent": null}], "parent": null}')
+        self.assertEqual(codec.decode(codec.encode(tree)), tree)
+
+    def test_plain_types(self):
+        codec = self.json.Codec(Dict[str, List[int]])
+        self.assertEqual(codec.decode('{"a": [1, 2]}'), {'a': [1, 2]})
+        codec = self.json.Codec(Tuple[int, str])
+        self.assertEqual(codec.decode('[1, "a"]'), (1, 'a'))
+        self.assertEqual(self.json.Codec(int).decode('1'), 1)
+
+    def test_decode_defaults(self):
+        codec = self.json.Codec(Shape)
+        self.assertEqual(codec.decode('{"name": "x", "points": [], '
+                                      '"unknown": 1, "computed": 5}'),
+                         Shape('x', []))
+
+    def test_decode_errors(self):
+        codec = self.json.Codec(Shape)
+        self.assertRaises(self.JSONDecodeError, codec.decode, '{')
+        self.assertRaises(TypeError, codec.decode, '{"name": "x"}')
+        self.assertRaises(ValueError, codec.decode, '[]')
+        self.assertRaises(ValueError, codec.decode,
+                          '{"name": "x", "points": {}}')
+        self.assertRaises(ValueError, codec.decode,
+                          '{"name": "x", "points": [1]}')
+        self.assertRaises(ValueError, codec.decode,
+                          '{"name": "x", "points": [], '
+                          '"box": [{"x": 1, "y": 2}]}')
+        self.assertRaises(ValueError, codec.decode,
+                          '{"name": "x", "points": [], "attrs": []}')
+
+    def test_unsupported_types(self):
+        self.assertRaises(TypeError, self.json.Codec, complex)
+        self.assertRaises(TypeError, self.json.Codec, Union[Point, Node])
+        self.assertRaises(TypeError, self.json.Codec, List[bytes])
+        self.assertRaises(TypeError, self.json.Codec, FrozenSet[int])
+
+    def test_options(self):
+        codec = self.json.Codec(Point, sort_keys=True, indent=2,
+                                parse_int=float)
+        self.assertEqual(codec.encode(Point(1, 2)),
+                         '{\n  "x": 1,\n  "y": 2\n}')
+        self.assertEqual(codec.decode('{"y": 1, "x": 2}'), Point(2.0, 1.0))
+
+
+class TestPyCodec(TestCodec, PyTest): pass
+class TestCCodec(TestCodec, CTest): pass
@@ -1,4 +1,4 @@
-from io import StringIO
+from io import BytesIO, StringIO
 from test.test_json import PyTest, CTest
 
 from test.support import bigmemtest, _1G
@@ -12,6 +12,51 @@ class TestDump:
     def test_dumps(self):
         self.assertEqual(self.dumps({}), '{}')
 
+    def test_dump_binary_file(self):
+        bio = BytesIO()
+        self.json.dump({'a': ['\xe9\u20ac\U0001f600']}, bio,
+                       ensure_ascii=False)
+        self.assertEqual(bio.getvalue(),
+                         '{"a": ["\xe9\u20ac\U0001f600"]}'.encode('utf-8'))
+
+    def test_dumpb(self):
+        for obj in ({}, [], 'x', 1, 1.5, None, True,
+                    {'a': [1, 2.5, None, False, '\xe9\u20ac\U0001f600'],
+                     'b': {'c': 'x' * 1000}}):
+            for kw in ({}, {'ensure_ascii': False}, {'indent': 2},
+                       {'sort_keys': True, 'separators': (',', ':')}):
+                with self.subTest(obj=obj, kw=kw):
+                    self.assertEqual(self.json.dumpb(obj, **kw),
+                                     self.dumps(obj, **kw).encode('utf-8'))
+
+    def test_dumpb_surrogates(self):
+        self.assertEqual(self.json.dumpb('\ud800'), b'"\\ud800"')
+        with self.assertRaises(UnicodeEncodeError):
+            self.json.dumpb('\ud800', ensure_ascii=False)
+
+    def test_encode_bytes_write(self):
+        obj = [{'n': i, 's': '\xe9' * i} for i in range(200)]
+        expected = self.dumps(obj, ensure_ascii=False).encode('utf-8')
+        encoder = self.json.JSONEncoder(ensure_ascii=False)
+        for flush_size in (1, 10, 1000, len(expected) * 2):
+            with self.subTest(flush_size=flush_size):
+                chunks = []
+                self.assertIsNone(encoder.encode_bytes(obj, chunks.append,
+                                                       flush_size))
+                self.assertEqual(b''.join(chunks), expected)
+                self.assertTrue(all(chunks))
+                if flush_size < len(expected):
+                    self.assertGreater(len(chunks), 1)
+        self.assertRaises(ValueError, encoder.encode_bytes, obj, None, 0)
+
+    def test_encode_bytes_errors(self):
+        encoder = self.json.JSONEncoder()
+        self.assertRaises(TypeError, encoder.encode_bytes, [1, object()])
+        def write(data):
+            raise OSError('disk full')
+        with self.assertRaises(OSError):
+            encoder.encode_bytes(list(range(1000)), write, 10)
+
     def test_dump_skipkeys(self):
         v = {b'invalid_key': False, 'valid_key': True}
         with self.assertRaises(TypeError):
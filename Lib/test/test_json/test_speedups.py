@@ -71,3 +71,20 @@ class TestEncode(CTest):
     def test_unsortable_keys(self):
         with self.assertRaises(TypeError):
             self.json.encoder.JSONEncoder(sort_keys=True).encode({'a': 1, 1: 'a'})
+
+    def test_bad_fields(self):
+        make_encoder = self.json.encoder.c_make_encoder
+        with self.assertRaises(TypeError):
+            make_encoder(None, str, self.json.encoder.encode_basestring,
+                         None, ': ', ', ', False, False, False, [])
+        class C:
+            a = 1
+        def test(names):
+            enc = make_encoder(None, str, self.json.encoder.encode_basestring,
+                               None, ': ', ', ', False, False, False,
+                               {C: names})
+            return enc(C(), 0)
+        self.assertEqual(''.join(test(('a',))), '{"a": 1}')
+        self.assertRaises(TypeError, test, ['a'])
+        self.assertRaises(TypeError, test, (1,))
+        self.assertRaises(AttributeError, test, ('b',))
@@ -0,0 +1,111 @@
+from io import BytesIO, StringIO
+from test.test_json import PyTest, CTest
+from test.test_json.test_pass1 import JSON as PASS1
+
+
+class TestStream:
+    def iterload(self, s, **kw):
+        kw.setdefault('chunk_size', 3)
+        fp = BytesIO(s) if isinstance(s, bytes) else StringIO(s)
+        return list(self.json.iterload(fp, **kw))
+
+    def test_documents(self):
+        s = '{"a": [1, 2]} 3 "x" [4]\n5\ntrue null -1.5e3 {} [] ""'
+        expected = [{'a': [1, 2]}, 3, 'x', [4], 5, True, None, -1.5e3,
+                    {}, [], '']
+        for chunk_size in range(1, 10):
+            self.assertEqual(self.iterload(s, chunk_size=chunk_size),
+                             expected)
+
+    def test_json_lines(self):
+        lines = [{'id': i, 'name': 'n\\"}]' * i} for i in range(50)]
+        s = ''.join(self.dumps(line) + '\n' for line in lines)
+        self.assertEqual(self.iterload(s, chunk_size=7), lines)
+
+    def test_pass1(self):
+        expected = self.loads(PASS1)
+        for chunk_size in (1, 2, 3, 5, 64):
+            self.assertEqual(self.iterload(PASS1, chunk_size=chunk_size),
+                             [expected])
+            self.assertEqual(self.iterload(PASS1, chunk_size=chunk_size,
+                                           items=True),
+                             expected)
+
+    def test_items(self):
+        s = '[1, {"b": [2, "]"]}, "c\\"]", [3]] []\n[ 4 ,5 ]'
+        expected = [1, {'b': [2, ']']}, 'c"]', [3], 4, 5]
+        for chunk_size in range(1, 10):
+            self.assertEqual(
+                self.iterload(s, items=True, chunk_size=chunk_size),
+                expected)
+
+    def test_bytes(self):
+        s = '["\xe9€\U0001f600", 1]'.encode('utf-8')
+        for chunk_size in range(1, 5):
+            self.assertEqual(self.iterload(s, chunk_size=chunk_size),
+                             [['\xe9€\U0001f600', 1]])
+        self.assertEqual(self.iterload(b'\xef\xbb\xbf[1]'), [[1]])
+
+    def test_decoder_options(self):
+        self.assertEqual(self.iterload('{"a": 1.5} {"b": 2}',
+                                       object_pairs_hook=list,
+                                       parse_float=str),
+                         [[('a', '1.5')], [('b', 2)]])
+
+    def test_feed(self):
+        decoder = self.json.JSONStreamDecoder()
+        self.assertEqual(decoder.feed('{"a": '), [])
+        self.assertEqual(decoder.feed('1} {"b"'), [{'a': 1}])
+        self.assertEqual(decoder.feed(b': 2}\n12'), [{'b': 2}])
+        self.assertEqual(decoder.close(), [12])
+        self.assertEqual(decoder.close(), [])
+        self.assertRaises(ValueError, decoder.feed, '1')
+        self.assertRaises(TypeError, self.json.JSONStreamDecoder().feed, 1)
+
+    def test_only_pending_data_is_kept(self):
+        decoder = self.json.JSONStreamDecoder(items=True)
+        decoder.feed('[' + '{"a": 1},' * 1000)
+        decoder.feed('{"b": ')
+        self.assertEqual(''.join(decoder._pending), ',{"b": ')
+
+    def check_error(self, s, msg, pos, lineno, colno, **kw):
+        for chunk_size in (1, 3, 100):
+            with self.subTest(s=s, chunk_size=chunk_size):
+                with self.assertRaises(self.JSONDecodeError) as cm:
+                    self.iterload(s, chunk_size=chunk_size, **kw)
+                err = cm.exception
+                self.assertEqual(err.msg, msg)
+                self.assertEqual(err.pos, pos)
+                self.assertEqual(err.lineno, lineno)
+                self.assertEqual(err.colno, colno)
+                self.assertEqual(str(err),
+                                 '%s: line %d column %d (char %d)'
+                                 % (msg, lineno, colno, pos))
+
+    def test_errors(self):
+        self.check_error('[1, 2', "Expecting ',' delimiter", 5, 1, 6)
+        self.check_error('{"a": 1}\n {"a" 2}', "Expecting ':' delimiter",
+                         15, 2, 7)
+        self.check_error('"abc', 'Unterminated string starting at', 0, 1, 1)
+        self.check_error('1 12x', 'Extra data', 4, 1, 5)
+        self.check_error('[1] ]', 'Expecting value', 4, 1, 5)
+        self.check_error('[1, 2]\n\n {"a": tru}', 'Expecting value', 15, 3, 8)
+
+    def test_items_errors(self):
+        self.check_error('[1 2]', "Expecting ',' delimiter", 3, 1, 4,
+                         items=True)
+        self.check_error('[1,]', 'Expecting value', 3, 1, 4, items=True)
+        self.check_error('[,1]', 'Expecting value', 1, 1, 2, items=True)
+        self.check_error('{}', "Expecting '['", 0, 1, 1, items=True)
+        self.check_error('[1] 2', "Expecting '['", 4, 1, 5, items=True)
+        self.check_error('[1,\n2x]', "Expecting ',' delimiter", 5, 2, 2,
+                         items=True)
+        self.check_error('[1, 2', "Expecting ',' delimiter", 5, 1, 6,
+                         items=True)
+        self.check_error('[1,', 'Expecting value', 3, 1, 4, items=True)
+        self.check_error('[[1]', "Expecting ',' delimiter", 4, 1, 5,
+                         items=True)
+
+
+class TestPyStream(TestStream, PyTest): pass
+class TestCStream(TestStream, CTest): pass
@@ -806,6 +806,38 @@ class StreamHandlerTest(BaseTest):
         h = logging.StreamHandler(StreamWithIntName())
         self.assertEqual(repr(h), '<StreamHandler 2 (NOTSET)>')
 
+    def test_handle_batch(self):
+        class Stream(io.StringIO):
+            writes = 0
+            def write(self, s):
+                self.writes += 1
+                return super().write(s)
+        stream = Stream()
+        h = logging.StreamHandler(stream)
+        h.setFormatter(logging.Formatter('%(levelname)s:%(message)s'))
+        h.addFilter(lambda record: record.msg != 'filtered')
+        records = [logging.makeLogRecord({'msg': msg, 'levelname': 'INFO'})
+                   for msg in ('a', 'filtered', 'b', 'c')]
+        handled = h.handleBatch(records)
+        self.assertEqual([r.msg for r in handled], ['a', 'b', 'c'])
+        self.assertEqual(stream.getvalue(), 'INFO:a\nINFO:b\nINFO:c\n')
+        self.assertEqual(stream.writes, 1)
+
+        # A subclass overriding emit() gets one call per record
+        h = TestStreamHandler(BadStream())
+        h.handleBatch(records[:1])
+        self.assertIs(h.error_record, records[0])
+
+    def test_emit_batch_errors(self):
+        stream = io.StringIO()
+        h = logging.StreamHandler(stream)
+        bad = logging.makeLogRecord({'msg': '%d', 'args': ('x',)})
+        good = logging.makeLogRecord({'msg': 'good'})
+        with support.captured_stderr() as stderr:
+            h.emitBatch([good, bad, good])
+        self.assertIn('TypeError', stderr.getvalue())
+        self.assertEqual(stream.getvalue(), 'good\ngood\n')
+
 # -- The following section could be moved into a server_helper.py module
 # -- if it proves to be of wider utility than just test_logging
 
@@ -1748,6 +1780,21 @@ class SocketHandlerTest(BaseTest):
         time.sleep(self.sock_hdlr.retryTime - now + 0.001)
         self.root_logger.error('Nor this')
 
+    def test_handle_batch(self):
+        if self.server_exception:
+            self.skipTest(self.server_exception)
+        records = [logging.makeLogRecord({'msg': msg})
+                   for msg in ('spam', 'eggs', 'ham')]
+        sent = []
+        send = self.sock_hdlr.send
+        self.sock_hdlr.send = lambda s: (sent.append(s), send(s))
+        self.sock_hdlr.handleBatch(records)
+        for _ in records:
+            self.handled.acquire()
+        self.assertEqual(self.log_output, "spam\neggs\nham\n")
+        # The records were sent at once
+        self.assertEqual(len(sent), 1)
+
 def _get_temp_domain_socket():
     fd, fn = tempfile.mkstemp(prefix='test_logging_', suffix='.sock')
     os.close(fd)
@@ -3568,6 +3615,169 @@ class QueueHandlerTest(BaseTest):
         listener.stop()
         self.assertEqual(self.stream.getvalue().strip(), "que -> ERROR: error")
 
+    def test_queue_listener_batches(self):
+        handler = support.TestHandler(support.Matcher())
+        batches = []
+        handle_batch = handler.handleBatch
+        handler.handleBatch = lambda records: (
+            batches.append(len(records)), handle_batch(records))
+        for i in range(10):
+            self.que_logger.warning(self.next_message())
+        self.assertRaises(ValueError, logging.handlers.QueueListener,
+                          self.queue, handler, batch_size=0)
+        listener = logging.handlers.QueueListener(self.queue, handler,
+                                                  batch_size=4)
+        listener.start()
+        listener.stop()
+        self.assertEqual(batches, [4, 4, 2])
+        self.assertEqual([r['msg'] for r in handler.buffer],
+                         [str(i) for i in range(1, 11)])
+        self.queue.join()
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class AsyncHandlerTest(BaseTest):
+
+    def setUp(self):
+        BaseTest.setUp(self)
+        self.target = ListHandler()
+        self.logger = logging.getLogger('async')
+        self.logger.propagate = False
+        self.handlers = []
+
+    def tearDown(self):
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.target.close()
+        BaseTest.tearDown(self)
+
+    def make_handler(self, *handlers, **kwargs):
+        handler = logging.handlers.AsyncHandler(*handlers, **kwargs)
+        self.handlers.append(handler)
+        self.logger.addHandler(handler)
+        return handler
+
+    def test_records_are_handled(self):
+        handler = self.make_handler(self.target, batch_size=3)
+        for i in range(10):
+            self.logger.warning('message %d', i)
+        handler.flush()
+        self.assertEqual([r.getMessage() for r in self.target.records],
+                         ['message %d' % i for i in range(10)])
+        # Records are not formatted or copied in the logging thread
+        self.assertEqual(self.target.records[0].msg, 'message %d')
+        self.assertEqual(self.target.records[0].args, (0,))
+
+    def test_formatting_in_listener_thread(self):
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(logging.Formatter('%(threadName)s %(message)s'))
+        handler = self.make_handler(target)
+        self.logger.warning('%s', 'spam')
+        handler.close()
+        self.assertEqual(stream.getvalue(),
+                         '%s spam\n' % threading.current_thread().name)
+
+    def test_respect_handler_level(self):
+        self.target.setLevel(logging.ERROR)
+        handler = self.make_handler(self.target)
+        self.logger.warning('warning')
+        self.logger.error('error')
+        handler.flush()
+        self.assertEqual([r.msg for r in self.target.records], ['error'])
+
+    def test_close(self):
+        handler = self.make_handler(self.target)
+        for i in range(100):
+            self.logger.warning('%d', i)
+        handler.close()
+        self.assertEqual(len(self.target.records), 100)
+        self.logger.warning('after close')
+        self.assertEqual(len(self.target.records), 100)
+        self.assertEqual(handler.dropped, 1)
+        handler.close()
+
+    def blocked_handler(self, **kwargs):
+        # Return a handler whose target blocks until the returned event is
+        # set, and wait until the first record reached the target.
+        started = threading.Event()
+        unblock = threading.Event()
+        def emit(record):
+            started.set()
+            unblock.wait()
+            self.target.records.append(record)
+        self.target.emit = emit
+        handler = self.make_handler(self.target, batch_size=1, **kwargs)
+        self.logger.warning('first')
+        started.wait()
+        return handler, unblock
+
+    def test_overflow_drop_new(self):
+        handler, unblock = self.blocked_handler(capacity=2,
+                                                overflow='drop_new')
+        for msg in ('a', 'b', 'c', 'd'):
+            self.logger.warning(msg)
+        self.assertEqual(handler.dropped, 2)
+        unblock.set()
+        handler.flush()
+        self.assertEqual([r.msg for r in self.target.records],
+                         ['first', 'a', 'b'])
+
+    def test_overflow_drop_old(self):
+        handler, unblock = self.blocked_handler(capacity=2,
+                                                overflow='drop_old')
+        for msg in ('a', 'b', 'c', 'd'):
+            self.logger.warning(msg)
+        self.assertEqual(handler.dropped, 2)
+        unblock.set()
+        handler.flush()
+        self.assertEqual([r.msg for r in self.target.records],
+                         ['first', 'c', 'd'])
+
+    def test_overflow_drop_old_keeps_sentinel(self):
+        # A record logged while close() is stopping the listener must not
+        # discard the sentinel, or the listener never stops.
+        handler, unblock = self.blocked_handler(capacity=1,
+                                                overflow='drop_old')
+        listener = handler.listener
+        thread = listener._thread
+        listener.enqueue_sentinel()
+        self.logger.warning('a')
+        self.assertEqual(handler.dropped, 1)
+        unblock.set()
+        thread.join(support.SHORT_TIMEOUT)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([r.msg for r in self.target.records], ['first'])
+
+    def test_overflow_block(self):
+        handler, unblock = self.blocked_handler(capacity=1)
+        self.logger.warning('a')
+        thread = threading.Thread(target=self.logger.warning, args=('b',))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        unblock.set()
+        thread.join()
+        handler.flush()
+        self.assertEqual([r.msg for r in self.target.records],
+                         ['first', 'a', 'b'])
+        self.assertEqual(handler.dropped, 0)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, logging.handlers.AsyncHandler,
+                          overflow='spam')
+        self.assertRaises(ValueError, logging.handlers.AsyncHandler,
+                          capacity=0)
+
 if hasattr(logging.handlers, 'QueueListener'):
     import multiprocessing
     from unittest.mock import patch
@@ -4315,6 +4525,95 @@ class LogRecordTest(BaseTest):
             logging.logProcesses = log_processes
             logging.logMultiprocessing = log_multiprocessing
 
+    def test_filename_module(self):
+        path = os.path.join('path', 'to', 'module.py')
+        for i in range(2):
+            r = logging.LogRecord('n', logging.INFO, path, 1, 'msg', (), None)
+            self.assertEqual(r.filename, 'module.py')
+            self.assertEqual(r.module, 'module')
+        r = logging.LogRecord('n', logging.INFO, None, 1, 'msg', (), None)
+        self.assertEqual(r.filename, None)
+        self.assertEqual(r.module, 'Unknown module')
+
+    def make_lazy_record(self, **kwargs):
+        return logging.LazyLogRecord('lazy', logging.INFO,
+                                     os.path.join('path', 'to', 'lazy.py'),
+                                     10, 'a %s', ('message',), None,
+                                     'func', **kwargs)
+
+    def test_lazy_record(self):
+        r = self.make_lazy_record()
+        lazy = ['levelname', 'filename', 'module', 'msecs',
+                'relativeCreated', 'processName']
+        for name in lazy:
+            self.assertNotIn(name, r.__dict__)
+        self.assertEqual(r.getMessage(), 'a message')
+        self.assertEqual(r.levelname, 'INFO')
+        self.assertIn('levelname', r.__dict__)
+        self.assertEqual(r.filename, 'lazy.py')
+        self.assertEqual(r.module, 'lazy')
+        self.assertEqual(r.processName, 'MainProcess')
+        self.assertEqual(r.msecs, (r.created - int(r.created)) * 1000)
+        self.assertGreater(r.relativeCreated, 0)
+        self.assertEqual(r.funcName, 'func')
+        self.assertEqual(r.threadName, threading.current_thread().name)
+        self.assertFalse(hasattr(r, 'nonexistent'))
+        self.assertRaises(AttributeError, getattr, r, 'message')
+
+        eager = logging.LogRecord('lazy', logging.INFO, r.pathname, 10,
+                                  'a %s', ('message',), None, 'func')
+        r = self.make_lazy_record()
+        r.resolve()
+        self.assertEqual(sorted(r.__dict__), sorted(eager.__dict__))
+        r = self.make_lazy_record()
+        r.resolve(['module', 'unknown'])
+        self.assertIn('module', r.__dict__)
+        self.assertNotIn('unknown', r.__dict__)
+        self.assertNotIn('levelname', r.__dict__)
+
+    def test_lazy_record_format(self):
+        for fmt, style in (('%(levelname)s:%(module)s:%(message)s', '%'),
+                           ('{levelname}:{module!s:>4}:{message}', '{'),
+                           ('$levelname:${module}:$message', '$')):
+            r = self.make_lazy_record()
+            f = logging.Formatter(fmt, style=style)
+            self.assertEqual(f.format(r), 'INFO:lazy:a message')
+            self.assertNotIn('filename', r.__dict__)
+        f = logging.Formatter('%(asctime)s', datefmt=None)
+        r = self.make_lazy_record()
+        self.assertRegex(f.format(r), r',\d{3}$')
+
+    def test_lazy_record_copy(self):
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            r = self.make_lazy_record()
+            r2 = pickle.loads(pickle.dumps(r, proto))
+            self.assertEqual(r2.__dict__, r.__dict__)
+            self.assertIn('levelname', r2.__dict__)
+        r = self.make_lazy_record()
+        r2 = copy.copy(r)
+        self.assertEqual(r2.__dict__, r.__dict__)
+        self.assertIn('module', r2.__dict__)
+
+    def test_lazy_record_factory(self):
+        h = RecordingHandler()
+        logger = logging.getLogger('lazy')
+        logger.addHandler(h)
+        orig_factory = logging.getLogRecordFactory()
+        logging.setLogRecordFactory(logging.LazyLogRecord)
+        try:
+            logger.error('lazy %s', 'record', extra={'key': 'value'})
+            self.assertRaises(KeyError, logger.error, 'msg',
+                              extra={'levelname': 'x'})
+        finally:
+            logging.setLogRecordFactory(orig_factory)
+            logger.removeHandler(h)
+            h.close()
+        r, = h.records
+        self.assertIsInstance(r, logging.LazyLogRecord)
+        self.assertEqual(r.key, 'value')
+        self.assertEqual(r.funcName, 'test_lazy_record_factory')
+        self.assertEqual(r.filename, os.path.basename(__file__))
+
 class BasicConfigTest(unittest.TestCase):
 
     """Test suite for logging.basicConfig."""
@@ -5251,6 +5550,155 @@ for when, exp in (('S', 1),
     setattr(TimedRotatingFileHandlerTest, "test_compute_rollover_%s" % when, test_compute_rollover)
 
 
+class SizedTimedRotatingFileHandlerTest(BaseFileTest):
+    def next_rec(self):
+        return logging.LogRecord('n', logging.DEBUG, 'p', 1,
+                                 self.next_message(), None, None, None)
+
+    def rotated_files(self, rh):
+        # Return the rotated files, oldest first
+        dirName, baseName = os.path.split(self.fn)
+        result = []
+        for fileName in os.listdir(dirName):
+            if fileName.startswith(baseName + '.'):
+                m = rh.extMatch.match(fileName[len(baseName) + 1:])
+                self.assertIsNotNone(m, fileName)
+                number = int(m.group(2)[1:]) if m.group(2) else 0
+                path = os.path.join(dirName, fileName)
+                result.append(((m.group(1), number), path))
+                self.rmfiles.append(path)
+        return [path for key, path in sorted(result)]
+
+    def read(self, filename, opener=open):
+        with opener(filename, 'rb') as f:
+            return f.read().decode('ascii')
+
+    def test_size_rollover(self):
+        with open(self.fn, 'w') as f:
+            f.write('x' * 12)
+        # Each record has 5 bytes with its newline
+        rh = logging.handlers.SizedTimedRotatingFileHandler(
+            self.fn, maxBytes=16, backupCount=2)
+        self.assertEqual(rh.rolloverAt, None)
+        messages = ['m%03d' % i for i in range(9)]
+        self.assertTrue(rh.shouldRollover(
+            logging.makeLogRecord({'msg': messages[0]})))
+        for msg in messages:
+            rh.emit(logging.makeLogRecord({'msg': msg}))
+        rh.close()
+        rotated = self.rotated_files(rh)
+        self.assertEqual(len(rotated), 2)
+        newline = os.linesep
+        self.assertEqual(self.read(rotated[0]),
+                         newline.join(messages[:3]) + newline)
+        self.assertEqual(self.read(rotated[1]),
+                         newline.join(messages[3:6]) + newline)
+        self.assertEqual(self.read(self.fn),
+                         newline.join(messages[6:]) + newline)
+
+    def test_no_rollover(self):
+        rh = logging.handlers.SizedTimedRotatingFileHandler(self.fn)
+        for i in range(10):
+            rh.emit(self.next_rec())
+        self.assertFalse(rh.shouldRollover(self.next_rec()))
+        rh.close()
+        self.assertEqual(self.rotated_files(rh), [])
+
+    def test_time_rollover(self):
+        rh = logging.handlers.SizedTimedRotatingFileHandler(
+            self.fn, maxBytes=1000, when='midnight', delay=True)
+        r1 = self.next_rec()
+        rh.emit(r1)
+        self.assertFalse(rh.shouldRollover(r1))
+        rolloverAt = rh.rolloverAt
+        rh.rolloverAt = time.time() - 1
+        r2 = self.next_rec()
+        rh.emit(r2)
+        self.assertGreaterEqual(rh.rolloverAt, rolloverAt)
+        rh.close()
+        rotated, = self.rotated_files(rh)
+        self.assertEqual(self.read(rotated), r1.msg + os.linesep)
+        self.assertEqual(self.read(self.fn), r2.msg + os.linesep)
+
+    def test_handle_batch(self):
+        rh = logging.handlers.SizedTimedRotatingFileHandler(
+            self.fn, maxBytes=16)
+        records = [logging.makeLogRecord({'msg': 'm%03d' % i})
+                   for i in range(7)]
+        self.assertEqual(rh.handleBatch(records), records)
+        rh.close()
+        rotated = self.rotated_files(rh)
+        self.assertEqual(len(rotated), 2)
+        contents = ''.join(self.read(fn) for fn in rotated + [self.fn])
+        self.assertEqual(contents, ''.join(r.msg + os.linesep
+                                           for r in records))
+
+    def test_background_rotator(self):
+        threads = []
+
+        def rotator(source, dest):
+            threads.append(threading.get_ident())
+            os.rename(source, dest)
+
+        rh = logging.handlers.SizedTimedRotatingFileHandler(
+            self.fn, maxBytes=1, backupCount=1)
+        rh.rotator = rotator
+        rh.namer = lambda name: name + '.rotated'
+        for i in range(3):
+            rh.emit(self.next_rec())
+        rh.close()
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.get_ident(), threads)
+        rotated, = self.rotated_files(rh)
+        self.assertTrue(rotated.endswith('.rotated'))
+
+    @support.requires_zlib
+    def test_compress(self):
+        import gzip
+        rh = logging.handlers.SizedTimedRotatingFileHandler(
+            self.fn, maxBytes=1, compress='gzip')
+        records = [self.next_rec() for i in range(3)]
+        for record in records:
+            rh.emit(record)
+        rh.close()
+        rotated = self.rotated_files(rh)
+        self.assertEqual(len(rotated), 2)
+        for fn, record in zip(rotated, records):
+            self.assertTrue(fn.endswith('.gz'))
+            self.assertEqual(self.read(fn, gzip.open),
+                             record.msg + os.linesep)
+
+    def test_invalid_compress(self):
+        self.assertRaises(ValueError,
+                          logging.handlers.SizedTimedRotatingFileHandler,
+                          self.fn, compress='zip', delay=True)
+
+    def test_fsync(self):
+        calls = []
+        def fsync(fd):
+            calls.append(fd)
+        with support.swap_attr(os, 'fsync', fsync):
+            rh = logging.handlers.SizedTimedRotatingFileHandler(self.fn)
+            rh.emit(self.next_rec())
+            rh.close()
+            self.assertEqual(calls, [])
+            rh = logging.handlers.SizedTimedRotatingFileHandler(
+                self.fn, fsyncInterval=0)
+            rh.emit(self.next_rec())
+            rh.emit(self.next_rec())
+            self.assertEqual(len(calls), 2)
+            rh.close()
+            self.assertEqual(len(calls), 3)
+            calls.clear()
+            rh = logging.handlers.SizedTimedRotatingFileHandler(
+                self.fn, fsyncInterval=3600)
+            rh.emit(self.next_rec())
+            rh.emit(self.next_rec())
+            self.assertEqual(calls, [])
+            rh.close()
+            self.assertEqual(len(calls), 1)
+
+
 @unittest.skipUnless(win32evtlog, 'win32evtlog/win32evtlogutil/pywintypes required for this test.')
 class NTEventLogHandlerTest(BaseTest):
     def test_basic(self):
@@ -5308,9 +5756,11 @@ def test_main():
         DatagramHandlerTest, MemoryTest, EncodingTest, WarningsTest,
         ConfigDictTest, ManagerTest, FormatterTest, BufferingFormatterTest,
         StreamHandlerTest, LogRecordFactoryTest, ChildLoggerTest,
-        QueueHandlerTest, ShutdownTest, ModuleLevelMiscTest, BasicConfigTest,
+        QueueHandlerTest, AsyncHandlerTest, ShutdownTest, ModuleLevelMiscTest,
+        BasicConfigTest,
         LoggerAdapterTest, LoggerTest, SMTPHandlerTest, FileHandlerTest,
         RotatingFileHandlerTest,  LastResortTest, LogRecordTest,
+        SizedTimedRotatingFileHandlerTest,
         ExceptionTest, SysLogHandlerTest, IPv6SysLogHandlerTest, HTTPHandlerTest,
         NTEventLogHandlerTest, TimedRotatingFileHandlerTest,
         UnixSocketHandlerTest, UnixDatagramHandlerTest, UnixSysLogHandlerTest,
@@ -1,6 +1,8 @@
 from test.support import (gc_collect, bigmemtest, _2G,
                           cpython_only, captured_stdout)
+import io
 import locale
+import marshal
 import re
 import sre_compile
 import string
@@ -2198,6 +2200,70 @@ class ImplementationTest(unittest.TestCase):
         self.assertEqual(f("abcabdac"), [0, 0, 0, 1, 2, 0, 1, 0])
 
 
+class PersistentCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        re.purge()
+        self.addCleanup(re.purge)
+
+    def dump(self):
+        f = io.BytesIO()
+        re.dump_cache(f)
+        f.seek(0)
+        return f
+
+    def test_dump_and_load(self):
+        re.compile(r'(?P<word>\w+)\s+(\d+)', re.I)
+        re.compile(rb'[a-c]+')
+        re.search('x*y', 'xxy')
+        f = self.dump()
+        re.purge()
+        self.assertEqual(re.load_cache(f), 3)
+
+        # The loaded patterns are returned from the cache
+        p = re.compile(r'(?P<word>\w+)\s+(\d+)', re.I)
+        self.assertIs(re.compile(r'(?P<word>\w+)\s+(\d+)', re.I), p)
+        self.assertEqual(p.flags, re.I | re.U)
+        self.assertEqual(p.groups, 2)
+        self.assertEqual(p.groupindex, {'word': 1})
+        self.assertEqual(p.match('Spam  42').groups(), ('Spam', '42'))
+        self.assertEqual(p.match('Spam  42')['word'], 'Spam')
+        self.assertEqual(re.compile(rb'[a-c]+').findall(b'abxcd'),
+                         [b'ab', b'c'])
+        self.assertEqual(re.search('x*y', 'xxy').span(), (0, 3))
+
+    def test_load_keeps_existing_patterns(self):
+        re.compile('a+b')
+        f = self.dump()
+        p = re.compile('a+b')
+        self.assertEqual(re.load_cache(f), 0)
+        self.assertIs(re.compile('a+b'), p)
+
+    def test_load_outdated_cache(self):
+        f = io.BytesIO()
+        marshal.dump(((0, 0, 0, 0), [(0, ('a', 32, [], 0, {}, (None,)))]), f)
+        f.seek(0)
+        self.assertEqual(re.load_cache(f), 0)
+
+    def test_load_corrupted_cache(self):
+        data = self.dump().getvalue()
+        for data in (b'', data[:len(data) // 2], b'\xff' * 10,
+                     marshal.dumps(42), marshal.dumps((1, 2, 3))):
+            with self.subTest(data=data):
+                self.assertEqual(re.load_cache(io.BytesIO(data)), 0)
+
+    def test_load_invalid_code(self):
+        re.compile('a+b')
+        magic, entries = marshal.load(self.dump())
+        flags, args = entries[0]
+        args = args[:2] + ([0xdead] * len(args[2]),) + args[3:]
+        f = io.BytesIO()
+        marshal.dump((magic, [(flags, args)]), f)
+        f.seek(0)
+        re.purge()
+        self.assertRaises(RuntimeError, re.load_cache, f)
+
+
 class ExternalTests(unittest.TestCase):
 
     def test_re_benchmarks(self):
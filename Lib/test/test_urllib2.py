@@ -1927,5 +1927,72 @@ class RequestTests(unittest.TestCase):
             self.assertEqual(req.get_full_url(), req.full_url)
 
 
+
+class HTTPConnectionPoolTests(unittest.TestCase):
+
+    class FakeConnection:
+        def __init__(self):
+            self.sock, self.peer = socket.socketpair()
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+            self.sock.close()
+            self.peer.close()
+
+    def make_connections(self, n):
+        conns = [self.FakeConnection() for i in range(n)]
+        for conn in conns:
+            self.addCleanup(conn.close)
+        return conns
+
+    def test_get_put(self):
+        pool = urllib.request.HTTPConnectionPool(maxsize=2)
+        self.assertIsNone(pool.get('a'))
+        c1, c2, c3 = self.make_connections(3)
+        pool.put('a', c1)
+        pool.put('a', c2)
+        pool.put('a', c3)
+        # Only maxsize connections are kept per key
+        self.assertTrue(c3.closed)
+        self.assertIsNone(pool.get('b'))
+        self.assertIs(pool.get('a'), c2)
+        self.assertIs(pool.get('a'), c1)
+        self.assertIsNone(pool.get('a'))
+        self.assertFalse(c1.closed or c2.closed)
+
+    def test_idle_timeout(self):
+        pool = urllib.request.HTTPConnectionPool(idle_timeout=0)
+        c1, c2 = self.make_connections(2)
+        pool.put('a', c1)
+        self.assertIsNone(pool.get('a'))
+        self.assertTrue(c1.closed)
+        pool = urllib.request.HTTPConnectionPool(idle_timeout=60)
+        pool.put('a', c2)
+        pool.idle_timeout = 0
+        pool.put('b', self.make_connections(1)[0])
+        # Expired connections are closed when a connection is returned
+        self.assertTrue(c2.closed)
+
+    def test_dropped(self):
+        pool = urllib.request.HTTPConnectionPool()
+        c1, c2 = self.make_connections(2)
+        pool.put('a', c1)
+        pool.put('a', c2)
+        c2.peer.close()
+        self.assertIs(pool.get('a'), c1)
+        self.assertTrue(c2.closed)
+
+    def test_close(self):
+        pool = urllib.request.HTTPConnectionPool()
+        c1, c2 = self.make_connections(2)
+        pool.put('a', c1)
+        pool.put('b', c2)
+        pool.close()
+        self.assertTrue(c1.closed)
+        self.assertTrue(c2.closed)
+        self.assertIsNone(pool.get('a'))
+
+
 if __name__ == "__main__":
     unittest.main()
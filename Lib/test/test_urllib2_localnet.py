@@ -400,6 +400,7 @@ def GetRequestHandler(responses):
         server_version = "TestHTTP/"
         requests = []
         headers_received = []
+        clients = []
         port = 80
 
         def do_GET(self):
@@ -417,6 +418,7 @@ def GetRequestHandler(responses):
         def send_head(self):
             FakeHTTPRequestHandler.headers_received = self.headers
             self.requests.append(self.path)
+            self.clients.append(self.client_address)
             response_code, headers, body = responses.pop(0)
 
             self.send_response(response_code)
@@ -557,6 +559,93 @@ class TestUrlopen(unittest.TestCase):
         self.assertEqual(data, expected_response)
         self.assertEqual(handler.requests, ["/bizarre", b"get=with_feeling"])
 
+    def start_keepalive_server(self, bodies):
+        responses = [(200, [("Content-Length", str(len(body)))], body)
+                     for body in bodies]
+        handler = self.start_server(responses)
+        handler.protocol_version = "HTTP/1.1"
+        pool = urllib.request.HTTPConnectionPool()
+        self.addCleanup(pool.close)
+        opener = urllib.request.build_opener(
+            urllib.request.HTTPHandler(pool=pool))
+        return handler, pool, opener
+
+    def test_keepalive(self):
+        bodies = [b"first", b"second", b"", b"fourth"]
+        handler, pool, opener = self.start_keepalive_server(bodies)
+        url = "http://localhost:%s/" % handler.port
+        with opener.open(url + "a") as f:
+            self.assertEqual(f.read(), b"first")
+        with opener.open(url + "b", data=b"data") as f:
+            self.assertEqual(f.read(2), b"se")
+            self.assertEqual(f.read(), b"cond")
+        with opener.open(url + "c") as f:
+            pass
+        with opener.open(url + "d") as f:
+            self.assertEqual(f.readlines(), [b"fourth"])
+        self.assertEqual(handler.requests, ["/a", "/b", b"data", "/c", "/d"])
+        self.assertNotIn("Connection", handler.headers_received)
+        self.assertEqual(len(set(handler.clients)), 1)
+
+    def test_keepalive_chunked(self):
+        handler = self.start_server([
+            (200, [("Transfer-Encoding", "chunked")],
+             b"3\r\nabc\r\n0\r\n\r\n"),
+            (200, [("Content-Length", "3")], b"def"),
+        ])
+        handler.protocol_version = "HTTP/1.1"
+        pool = urllib.request.HTTPConnectionPool()
+        self.addCleanup(pool.close)
+        opener = urllib.request.build_opener(
+            urllib.request.HTTPHandler(pool=pool))
+        url = "http://localhost:%s/" % handler.port
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"abc")
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"def")
+        self.assertEqual(len(set(handler.clients)), 1)
+
+    def test_keepalive_not_fully_read(self):
+        handler, pool, opener = self.start_keepalive_server([b"first",
+                                                             b"second"])
+        url = "http://localhost:%s/" % handler.port
+        with opener.open(url) as f:
+            self.assertEqual(f.read(2), b"fi")
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"second")
+        self.assertEqual(len(set(handler.clients)), 2)
+
+    def test_keepalive_closed_by_server(self):
+        handler, pool, opener = self.start_keepalive_server([b"first",
+                                                             b"second"])
+        do_GET = handler.do_GET
+        def close_after_get(self):
+            do_GET(self)
+            self.close_connection = True
+        handler.do_GET = close_after_get
+        url = "http://localhost:%s/" % handler.port
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"first")
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"second")
+        self.assertEqual(len(set(handler.clients)), 2)
+
+    def test_keepalive_post_not_retried(self):
+        handler, pool, opener = self.start_keepalive_server([b"first"])
+        def drop_after_post(self):
+            self.requests.append(self.rfile.read(
+                int(self.headers["Content-Length"])))
+            self.close_connection = True
+        handler.do_POST = drop_after_post
+        url = "http://localhost:%s/" % handler.port
+        with opener.open(url) as f:
+            self.assertEqual(f.read(), b"first")
+        # The server handled the POST and closed the connection without
+        # answering: the request must not be sent a second time.
+        with self.assertRaises(ConnectionError):
+            opener.open(url, data=b"data")
+        self.assertEqual(handler.requests, ["/", b"data"])
+
     def test_https(self):
         handler = self.start_https_server()
         context = ssl.create_default_context(cafile=CERT_localhost)
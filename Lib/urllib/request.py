@@ -90,9 +90,11 @@ import io
 import os
 import posixpath
 import re
+import select
 import socket
 import string
 import sys
+import threading
 import time
 import tempfile
 import contextlib
@@ -123,6 +125,7 @@ __all__ = [
     'HTTPPasswordMgrWithPriorAuth', 'AbstractBasicAuthHandler',
     'HTTPBasicAuthHandler', 'ProxyBasicAuthHandler', 'AbstractDigestAuthHandler',
     'HTTPDigestAuthHandler', 'ProxyDigestAuthHandler', 'HTTPHandler',
+    'HTTPConnectionPool',
     'FileHandler', 'FTPHandler', 'CacheFTPHandler', 'DataHandler',
     'UnknownHandler', 'HTTPErrorProcessor',
     # Functions
@@ -1214,10 +1217,122 @@ class ProxyDigestAuthHandler(BaseHandler, AbstractDigestAuthHandler):
         self.reset_retry_count()
         return retry
 
+class HTTPConnectionPool:
+    """Pool of persistent connections of HTTPHandler and HTTPSHandler.
+
+    Connections are returned to the pool once their response has been
+    fully read, unless the server closes them, and are reused for the next
+    request to the same host (through the same proxy, with the same SSL
+    context).  At most maxsize idle connections are kept per host, and
+    connections idle for more than idle_timeout seconds are closed.
+    """
+
+    def __init__(self, maxsize=10, idle_timeout=60.0):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return an idle connection for key, or None."""
+        expired = []
+        conn = None
+        with self._lock:
+            conns = self._idle.get(key)
+            now = time.monotonic()
+            while conns:
+                when, c = conns.pop()
+                if now - when < self.idle_timeout and not _dropped(c.sock):
+                    conn = c
+                    break
+                expired.append(c)
+        for c in expired:
+            c.close()
+        return conn
+
+    def put(self, key, conn):
+        """Return a connection to the pool."""
+        expired = []
+        with self._lock:
+            now = time.monotonic()
+            for k, conns in list(self._idle.items()):
+                while conns and now - conns[0][0] >= self.idle_timeout:
+                    expired.append(conns.pop(0)[1])
+                if not conns:
+                    del self._idle[k]
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self.maxsize:
+                conns.append((now, conn))
+            else:
+                expired.append(conn)
+        for c in expired:
+            c.close()
+
+    def close(self):
+        """Close all the idle connections."""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for conns in idle.values():
+            for when, conn in conns:
+                conn.close()
+
+def _dropped(sock):
+    """Return true if an idle connection was closed by the server."""
+    # An idle connection only becomes readable at EOF (or if the server
+    # sent unexpected data, in which case it can't be reused either).
+    if sock is None:
+        return True
+    try:
+        if hasattr(select, 'poll'):
+            p = select.poll()
+            p.register(sock, select.POLLIN)
+            return bool(p.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+# Requests which can be sent again on a new connection if a persistent
+# connection fails
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE',
+                                 'PUT', 'DELETE'})
+
+
+class _PooledHTTPResponse(http.client.HTTPResponse):
+    # Calls _release(reusable) when the response is closed: reusable is
+    # true if the body was fully read and the connection stays open.
+    _release = None
+    _trailer_read = False
+
+    def _read_and_discard_trailer(self):
+        super()._read_and_discard_trailer()
+        self._trailer_read = True
+
+    def _close_conn(self):
+        super()._close_conn()
+        release = self._release
+        if release is not None:
+            self._release = None
+            if self.chunked:
+                complete = self._trailer_read
+            else:
+                complete = self.length == 0
+            release(complete and not self.will_close)
+
+    def close(self):
+        release = self._release
+        self._release = None
+        try:
+            super().close()
+        finally:
+            if release is not None:
+                release(False)
+
 class AbstractHTTPHandler(BaseHandler):
 
-    def __init__(self, debuglevel=0):
+    def __init__(self, debuglevel=0, *, pool=None):
         self._debuglevel = debuglevel
+        self._pool = pool
 
     def set_http_debuglevel(self, level):
         self._debuglevel = level
@@ -1274,53 +1389,101 @@ class AbstractHTTPHandler(BaseHandler):
         if not host:
             raise URLError('no host given')
 
-        # will parse host:port
-        h = http_class(host, timeout=req.timeout, **http_conn_args)
-        h.set_debuglevel(self._debuglevel)
-
         headers = dict(req.unredirected_hdrs)
         headers.update({k: v for k, v in req.headers.items()
                         if k not in headers})
 
-        # TODO(jhylton): Should this be redesigned to handle
-        # persistent connections?
-
-        # We want to make an HTTP/1.1 request, but the addinfourl
-        # class isn't prepared to deal with a persistent connection.
-        # It will try to read all remaining data from the socket,
-        # which will block while the server waits for the next request.
-        # So make sure the connection gets closed after the (only)
-        # request.
-        headers["Connection"] = "close"
+        # Persistent connections are only used with a pool, and if the
+        # response class of http_class can be replaced.
+        pool = self._pool
+        key = None
+        if (pool is not None and
+                http_class.response_class is http.client.HTTPResponse):
+            key = (http_class, host, req._tunnel_host,
+                   tuple(http_conn_args.items()))
+        if key is None:
+            # We want to make an HTTP/1.1 request, but the addinfourl
+            # class isn't prepared to deal with a persistent connection.
+            # It will try to read all remaining data from the socket,
+            # which will block while the server waits for the next request.
+            # So make sure the connection gets closed after the (only)
+            # request.
+            headers["Connection"] = "close"
         headers = {name.title(): val for name, val in headers.items()}
 
+        tunnel_headers = {}
         if req._tunnel_host:
-            tunnel_headers = {}
             proxy_auth_hdr = "Proxy-Authorization"
             if proxy_auth_hdr in headers:
                 tunnel_headers[proxy_auth_hdr] = headers[proxy_auth_hdr]
                 # Proxy-Authorization should not be sent to origin
                 # server.
                 del headers[proxy_auth_hdr]
-            h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
 
-        try:
+        while True:
+            h = None if key is None else pool.get(key)
+            reused = h is not None
+            if reused:
+                h.timeout = req.timeout
+                if h.timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+                    h.sock.settimeout(socket.getdefaulttimeout())
+                else:
+                    h.sock.settimeout(h.timeout)
+            else:
+                # will parse host:port
+                h = http_class(host, timeout=req.timeout, **http_conn_args)
+                if key is not None:
+                    h.response_class = _PooledHTTPResponse
+                if req._tunnel_host:
+                    h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            h.set_debuglevel(self._debuglevel)
+
             try:
-                h.request(req.get_method(), req.selector, req.data, headers,
-                          encode_chunked=req.has_header('Transfer-encoding'))
-            except OSError as err: # timeout error
-                raise URLError(err)
-            r = h.getresponse()
-        except:
-            h.close()
-            raise
+                try:
+                    h.request(req.get_method(), req.selector, req.data,
+                              headers, encode_chunked=req.has_header(
+                                  'Transfer-encoding'))
+                except OSError as err: # timeout error
+                    raise URLError(err)
+                r = h.getresponse()
+            except Exception as exc:
+                h.close()
+                # The server may have closed an idle connection in the
+                # meantime: retry on another connection if the request
+                # is idempotent (RFC 7230, section 6.3.1) and its body
+                # can be sent again.
+                err = exc.reason if isinstance(exc, URLError) else exc
+                if (reused and isinstance(err, ConnectionError) and
+                        req.get_method() in _IDEMPOTENT_METHODS and
+                        (req.data is None or
+                         isinstance(req.data, (bytes, bytearray)))):
+                    continue
+                raise
+            except:
+                h.close()
+                raise
+            break
 
-        # If the server does not send us a 'Connection: close' header,
-        # HTTPConnection assumes the socket should be left open. Manually
-        # mark the socket to be closed when this response object goes away.
         if h.sock:
-            h.sock.close()
-            h.sock = None
+            if key is None:
+                # If the server does not send us a 'Connection: close'
+                # header, HTTPConnection assumes the socket should be left
+                # open. Manually mark the socket to be closed when this
+                # response object goes away.
+                h.sock.close()
+                h.sock = None
+            else:
+                # Return the connection to the pool once the response is
+                # fully read.
+                def release(reusable):
+                    if reusable:
+                        pool.put(key, h)
+                    else:
+                        h.close()
+                r._release = release
+                if r.length == 0 and not r.chunked:
+                    # No body to read
+                    r._close_conn()
 
         r.url = req.get_full_url()
         # This line replaces the .msg attribute of the HTTPResponse
@@ -1331,7 +1494,6 @@ class AbstractHTTPHandler(BaseHandler):
         r.msg = r.reason
         return r
 
-
 class HTTPHandler(AbstractHTTPHandler):
 
     def http_open(self, req):
@@ -1343,8 +1505,9 @@ if hasattr(http.client, 'HTTPSConnection'):
 
     class HTTPSHandler(AbstractHTTPHandler):
 
-        def __init__(self, debuglevel=0, context=None, check_hostname=None):
-            AbstractHTTPHandler.__init__(self, debuglevel)
+        def __init__(self, debuglevel=0, context=None, check_hostname=None,
+                     *, pool=None):
+            AbstractHTTPHandler.__init__(self, debuglevel, pool=pool)
             self._context = context
             self._check_hostname = check_hostname
 
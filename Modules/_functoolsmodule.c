@@ -720,6 +720,12 @@ sequence is empty.");
        from being called more than once.  In the C version, the "known hash"
        variants of dictionary calls as used to the same effect.
 
+   5)  When a ttl or a maxcost is given, both versions keep one link per
+       entry, with its expiration time and its cost.  With a ttl, the links
+       are also chained in a second list, in the order they expire.  The C
+       version measures time with _PyTime_GetMonotonicClock(), the clock
+       behind time.monotonic() used by the pure python version.
+
 */
 
 
@@ -734,6 +740,10 @@ typedef struct lru_list_elem {
     struct lru_list_elem *prev, *next;  /* borrowed links */
     Py_hash_t hash;
     PyObject *key, *result;
+    _PyTime_t expires;                  /* only used when ttl is set */
+    Py_ssize_t cost;                    /* only used when maxcost is set */
+    struct lru_list_elem *eprev, *enext;  /* borrowed links in expiration
+                                             order, only used with a ttl */
 } lru_list_elem;
 
 static void
@@ -782,6 +792,10 @@ typedef struct lru_cache_object {
     Py_ssize_t misses;
     PyObject *cache_info_type;
     PyObject *dict;
+    _PyTime_t ttl;                      /* 0 if entries never expire */
+    Py_ssize_t maxcost;                 /* -1 if the cost is unbounded */
+    Py_ssize_t currcost;
+    PyObject *cost_func;
 } lru_cache_object;
 
 static PyTypeObject lru_cache_type;
@@ -1130,20 +1144,223 @@ bounded_lru_cache_wrapper(lru_cache_object *self, PyObject *args, PyObject *kwds
     return result;
 }
 
+/* The constrained wrapper is used when entries expire after a ttl or when the
+   cache is bounded by the total cost of its results instead of (or besides)
+   the number of entries.  Unlike the bounded wrapper, links are never reused:
+   stale and evicted links are extracted from the linked list and chained
+   together through their next field, and their decrefs are deferred until
+   the cache is back in a consistent state.
+
+   Expired entries are purged lazily, either when they are looked up or when
+   a new entry is added.  Since a hit moves a link to the newest end of the
+   linked list regardless of its age, the links are also chained in the
+   order they were added, which is the order they expire in, through their
+   eprev and enext fields rooted at self->root.  All expired entries are
+   found at the oldest end of that second list.
+*/
+
+static void lru_cache_clear_list(lru_list_elem *link);
+
+static Py_ssize_t
+lru_cache_entry_cost(lru_cache_object *self, PyObject *result)
+{
+    PyObject *cost_O;
+    Py_ssize_t cost;
+
+    cost_O = _PyObject_CallOneArg(self->cost_func, result);
+    if (cost_O == NULL)
+        return -1;
+    cost = PyNumber_AsSsize_t(cost_O, PyExc_OverflowError);
+    Py_DECREF(cost_O);
+    if (cost < 0 && !PyErr_Occurred()) {
+        PyErr_SetString(PyExc_ValueError, "cost must be non-negative");
+    }
+    return cost;
+}
+
+static void
+lru_cache_extract_expiring_link(lru_list_elem *link)
+{
+    link->eprev->enext = link->enext;
+    link->enext->eprev = link->eprev;
+}
+
+static void
+lru_cache_append_expiring_link(lru_cache_object *self, lru_list_elem *link)
+{
+    lru_list_elem *root = &self->root;
+    lru_list_elem *last = root->eprev;
+    last->enext = root->eprev = link;
+    link->eprev = last;
+    link->enext = root;
+}
+
+static int
+lru_cache_discard_link(lru_cache_object *self, lru_list_elem *link,
+                       lru_list_elem **discarded)
+{
+    PyObject *popresult;
+
+    lru_cache_extract_link(link);
+    popresult = _PyDict_Pop_KnownHash(self->cache, link->key,
+                                      link->hash, Py_None);
+    if (popresult == NULL) {
+        /* Restore the link as the oldest one and let the error
+           propagate upward. */
+        lru_cache_prepend_link(self, link);
+        return -1;
+    }
+    /* Either the dict reference to the link or Py_None, which means that
+       the link was already an orphan.  The reference owned by the linked
+       list is released later, through the chain of discarded links. */
+    Py_DECREF(popresult);
+    if (self->ttl)
+        lru_cache_extract_expiring_link(link);
+    self->currcost -= link->cost;
+    link->next = *discarded;
+    *discarded = link;
+    return 0;
+}
+
+static PyObject *
+constrained_lru_cache_wrapper(lru_cache_object *self, PyObject *args, PyObject *kwds)
+{
+    lru_list_elem *link, *discarded = NULL;
+    PyObject *key, *result, *testresult;
+    Py_hash_t hash;
+    Py_ssize_t cost = 0;
+    _PyTime_t now = 0;
+
+    key = lru_cache_make_key(args, kwds, self->typed);
+    if (!key)
+        return NULL;
+    hash = PyObject_Hash(key);
+    if (hash == -1) {
+        Py_DECREF(key);
+        return NULL;
+    }
+    link  = (lru_list_elem *)_PyDict_GetItem_KnownHash(self->cache, key, hash);
+    if (link != NULL) {
+        if (!self->ttl || link->expires > _PyTime_GetMonotonicClock()) {
+            lru_cache_extract_link(link);
+            lru_cache_append_link(self, link);
+            result = link->result;
+            self->hits++;
+            Py_INCREF(result);
+            Py_DECREF(key);
+            return result;
+        }
+        /* The entry is stale: drop it and recompute the result. */
+        if (lru_cache_discard_link(self, link, &discarded) < 0) {
+            Py_DECREF(key);
+            return NULL;
+        }
+    }
+    else if (PyErr_Occurred()) {
+        Py_DECREF(key);
+        return NULL;
+    }
+    self->misses++;
+    result = PyObject_Call(self->func, args, kwds);
+    if (!result)
+        goto error_key;
+    if (self->maxcost >= 0) {
+        cost = lru_cache_entry_cost(self, result);
+        if (cost < 0)
+            goto error;
+    }
+    testresult = _PyDict_GetItem_KnownHash(self->cache, key, hash);
+    if (testresult != NULL) {
+        /* This same key was added to the cache during the PyObject_Call()
+           or the cost function call. */
+        goto done;
+    }
+    if (PyErr_Occurred())
+        goto error;
+    if (self->maxcost >= 0 && cost > self->maxcost) {
+        /* The result would not fit even in an empty cache. */
+        goto done;
+    }
+
+    /* Purge the expired entries, then evict the least recently used ones
+       until there is room for the new entry. */
+    if (self->ttl) {
+        now = _PyTime_GetMonotonicClock();
+        while (self->root.enext != &self->root &&
+               self->root.enext->expires <= now)
+        {
+            if (lru_cache_discard_link(self, self->root.enext,
+                                       &discarded) < 0)
+                goto error;
+        }
+    }
+    while (self->root.next != &self->root &&
+           ((self->maxsize >= 0 &&
+             PyDict_GET_SIZE(self->cache) >= self->maxsize) ||
+            (self->maxcost >= 0 && self->currcost > self->maxcost - cost)))
+    {
+        if (lru_cache_discard_link(self, self->root.next, &discarded) < 0)
+            goto error;
+    }
+
+    link = (lru_list_elem *)PyObject_New(lru_list_elem, &lru_list_elem_type);
+    if (link == NULL)
+        goto error;
+    link->hash = hash;
+    link->key = key;
+    link->result = result;
+    if (!self->ttl)
+        link->expires = 0;
+    else if (now > _PyTime_MAX - self->ttl)
+        link->expires = _PyTime_MAX;
+    else
+        link->expires = now + self->ttl;
+    link->cost = cost;
+    if (_PyDict_SetItem_KnownHash(self->cache, key, (PyObject *)link,
+                                  hash) < 0) {
+        Py_DECREF(link);
+        lru_cache_clear_list(discarded);
+        return NULL;
+    }
+    lru_cache_append_link(self, link);
+    if (self->ttl)
+        lru_cache_append_expiring_link(self, link);
+    self->currcost += cost;
+    Py_INCREF(result); /* for return */
+    lru_cache_clear_list(discarded);
+    return result;
+
+  done:
+    Py_DECREF(key);
+    lru_cache_clear_list(discarded);
+    return result;
+
+  error:
+    Py_DECREF(result);
+  error_key:
+    Py_DECREF(key);
+    lru_cache_clear_list(discarded);
+    return NULL;
+}
+
 static PyObject *
 lru_cache_new(PyTypeObject *type, PyObject *args, PyObject *kw)
 {
     PyObject *func, *maxsize_O, *cache_info_type, *cachedict;
+    PyObject *ttl_O = Py_None, *maxcost_O = Py_None, *cost_func = Py_None;
     int typed;
     lru_cache_object *obj;
-    Py_ssize_t maxsize;
+    Py_ssize_t maxsize, maxcost = -1;
+    _PyTime_t ttl = 0;
     PyObject *(*wrapper)(lru_cache_object *, PyObject *, PyObject *);
     static char *keywords[] = {"user_function", "maxsize", "typed",
-                               "cache_info_type", NULL};
+                               "cache_info_type", "ttl", "maxcost", "cost",
+                               NULL};
 
-    if (!PyArg_ParseTupleAndKeywords(args, kw, "OOpO:lru_cache", keywords,
+    if (!PyArg_ParseTupleAndKeywords(args, kw, "OOpO|OOO:lru_cache", keywords,
                                      &func, &maxsize_O, &typed,
-                                     &cache_info_type)) {
+                                     &cache_info_type, &ttl_O, &maxcost_O,
+                                     &cost_func)) {
         return NULL;
     }
 
@@ -1174,6 +1391,35 @@ lru_cache_new(PyTypeObject *type, PyObject *args, PyObject *kw)
         return NULL;
     }
 
+    if (ttl_O != Py_None) {
+        if (_PyTime_FromSecondsObject(&ttl, ttl_O, _PyTime_ROUND_CEILING) < 0)
+            return NULL;
+        if (ttl <= 0) {
+            PyErr_SetString(PyExc_ValueError, "ttl must be positive");
+            return NULL;
+        }
+    }
+    if (maxcost_O != Py_None) {
+        if (!PyIndex_Check(maxcost_O)) {
+            PyErr_SetString(PyExc_TypeError,
+                            "maxcost should be an integer or None");
+            return NULL;
+        }
+        maxcost = PyNumber_AsSsize_t(maxcost_O, PyExc_OverflowError);
+        if (maxcost == -1 && PyErr_Occurred())
+            return NULL;
+        if (maxcost < 0) {
+            maxcost = 0;
+        }
+        if (!PyCallable_Check(cost_func)) {
+            PyErr_SetString(PyExc_TypeError, "cost should be a callable");
+            return NULL;
+        }
+    }
+    if ((ttl || maxcost >= 0) && wrapper != uncached_lru_cache_wrapper) {
+        wrapper = constrained_lru_cache_wrapper;
+    }
+
     if (!(cachedict = PyDict_New()))
         return NULL;
 
@@ -1185,6 +1431,8 @@ lru_cache_new(PyTypeObject *type, PyObject *args, PyObject *kw)
 
     obj->root.prev = &obj->root;
     obj->root.next = &obj->root;
+    obj->root.eprev = &obj->root;
+    obj->root.enext = &obj->root;
     obj->wrapper = wrapper;
     obj->typed = typed;
     obj->cache = cachedict;
@@ -1194,6 +1442,11 @@ lru_cache_new(PyTypeObject *type, PyObject *args, PyObject *kw)
     obj->maxsize = maxsize;
     Py_INCREF(cache_info_type);
     obj->cache_info_type = cache_info_type;
+    obj->ttl = ttl;
+    obj->maxcost = maxcost;
+    obj->currcost = 0;
+    Py_INCREF(cost_func);
+    obj->cost_func = cost_func;
     return (PyObject *)obj;
 }
 
@@ -1206,6 +1459,7 @@ lru_cache_unlink_list(lru_cache_object *self)
         return NULL;
     root->prev->next = NULL;
     root->next = root->prev = root;
+    root->enext = root->eprev = root;
     return link;
 }
 
@@ -1231,6 +1485,7 @@ lru_cache_dealloc(lru_cache_object *obj)
     Py_XDECREF(obj->func);
     Py_XDECREF(obj->cache_info_type);
     Py_XDECREF(obj->dict);
+    Py_XDECREF(obj->cost_func);
     lru_cache_clear_list(list);
     Py_TYPE(obj)->tp_free(obj);
 }
@@ -1269,6 +1524,7 @@ lru_cache_cache_clear(lru_cache_object *self, PyObject *unused)
 {
     lru_list_elem *list = lru_cache_unlink_list(self);
     self->hits = self->misses = 0;
+    self->currcost = 0;
     PyDict_Clear(self->cache);
     lru_cache_clear_list(list);
     Py_RETURN_NONE;
@@ -1308,6 +1564,7 @@ lru_cache_tp_traverse(lru_cache_object *self, visitproc visit, void *arg)
     Py_VISIT(self->cache);
     Py_VISIT(self->cache_info_type);
     Py_VISIT(self->dict);
+    Py_VISIT(self->cost_func);
     return 0;
 }
 
@@ -1319,6 +1576,8 @@ lru_cache_tp_clear(lru_cache_object *self)
     Py_CLEAR(self->cache);
     Py_CLEAR(self->cache_info_type);
     Py_CLEAR(self->dict);
+    Py_CLEAR(self->cost_func);
+    self->currcost = 0;
     lru_cache_clear_list(list);
     return 0;
 }
@@ -1337,7 +1596,15 @@ typed:    False     cache f(3) and f(3.0) as identical calls\n\
           True      cache f(3) and f(3.0) as distinct calls\n\
 \n\
 cache_info_type:    namedtuple class with the fields:\n\
-                        hits misses currsize maxsize\n"
+                        hits misses currsize maxsize\n\
+\n\
+ttl:      None      cached results never expire\n\
+          t         results expire t seconds after being computed\n\
+\n\
+maxcost:  None      for no bound on the total cost of the results\n\
+          n         evict results until their total cost is at most n\n\
+\n\
+cost:               callable returning the cost of a result\n"
 );
 
 static PyMethodDef lru_cache_methods[] = {
@@ -49,6 +49,7 @@ typedef struct _PyEncoderObject {
     PyObject *indent;
     PyObject *key_separator;
     PyObject *item_separator;
+    PyObject *fields;
     char sort_keys;
     char skipkeys;
     int allow_nan;
@@ -64,9 +65,21 @@ static PyMemberDef encoder_members[] = {
     {"item_separator", T_OBJECT, offsetof(PyEncoderObject, item_separator), READONLY, "item_separator"},
     {"sort_keys", T_BOOL, offsetof(PyEncoderObject, sort_keys), READONLY, "sort_keys"},
     {"skipkeys", T_BOOL, offsetof(PyEncoderObject, skipkeys), READONLY, "skipkeys"},
+    {"fields", T_OBJECT, offsetof(PyEncoderObject, fields), READONLY, "fields"},
     {NULL}
 };
 
+/* Accumulator of the output of the encoder: either a list of str chunks,
+   or UTF-8 encoded bytes, optionally passed to a write() callable whenever
+   flush_size bytes are buffered. */
+typedef struct {
+    _PyAccu accu;               /* Used when bytes is NULL */
+    PyObject *bytes;            /* Buffer of the UTF-8 output */
+    Py_ssize_t size;            /* Number of bytes used in the buffer */
+    PyObject *write;
+    Py_ssize_t flush_size;
+} _JSONAccu;
+
 /* Forward decls */
 
 static PyObject *
@@ -91,11 +104,13 @@ encoder_dealloc(PyObject *self);
 static int
 encoder_clear(PyObject *self);
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc, PyObject *seq, Py_ssize_t indent_level);
+encoder_listencode_list(PyEncoderObject *s, _JSONAccu *acc, PyObject *seq, Py_ssize_t indent_level);
+static int
+encoder_listencode_obj(PyEncoderObject *s, _JSONAccu *acc, PyObject *obj, Py_ssize_t indent_level);
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc, PyObject *obj, Py_ssize_t indent_level);
+encoder_listencode_dict(PyEncoderObject *s, _JSONAccu *acc, PyObject *dct, Py_ssize_t indent_level);
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc, PyObject *dct, Py_ssize_t indent_level);
+encoder_listencode_fields(PyEncoderObject *s, _JSONAccu *acc, PyObject *obj, PyObject *names, Py_ssize_t indent_level);
 static PyObject *
 _encoded_const(PyObject *obj);
 static void
@@ -578,6 +593,149 @@ py_scanstring(PyObject* Py_UNUSED(self), PyObject *args)
     return _build_rval_index_tuple(rval, next_end);
 }
 
+/* Flags of the state of scan_stream(), also defined in json/scanner.py */
+#define STREAM_IN_VALUE 1
+#define STREAM_IN_STRING 2
+#define STREAM_ESCAPE 4
+#define STREAM_IN_SCALAR 8
+
+static int
+_add_span(PyObject *spans, Py_ssize_t start, Py_ssize_t end)
+{
+    PyObject *span = Py_BuildValue("(nn)", start, end);
+    if (span == NULL) {
+        return -1;
+    }
+    if (PyList_Append(spans, span) < 0) {
+        Py_DECREF(span);
+        return -1;
+    }
+    Py_DECREF(span);
+    return 0;
+}
+
+PyDoc_STRVAR(pydoc_scan_stream,
+    "scan_stream(string, depth, flags, start, level) -> (spans, depth, flags, start)\n"
+    "\n"
+    "Find the boundaries of the JSON values in a chunk of a stream.\n"
+    "\n"
+    "Values which begin inside level nested arrays or objects are reported\n"
+    "as a list of (start, end) indexes in string.  depth, flags and start\n"
+    "are the state left by the scan of the previous chunk, start being\n"
+    "relative to the beginning of string.  The values are not validated.\n"
+    "\n"
+    "Returns a tuple of the list and the new depth, flags and start."
+);
+
+static PyObject *
+py_scan_stream(PyObject* Py_UNUSED(self), PyObject *args)
+{
+    PyObject *pystr;
+    PyObject *spans;
+    Py_ssize_t depth, start, level, idx, end;
+    int flags;
+    int kind;
+    const void *data;
+
+    if (!PyArg_ParseTuple(args, "Uninn:scan_stream",
+                          &pystr, &depth, &flags, &start, &level)) {
+        return NULL;
+    }
+    if (PyUnicode_READY(pystr) == -1) {
+        return NULL;
+    }
+    kind = PyUnicode_KIND(pystr);
+    data = PyUnicode_DATA(pystr);
+    end = PyUnicode_GET_LENGTH(pystr);
+    spans = PyList_New(0);
+    if (spans == NULL) {
+        return NULL;
+    }
+
+    for (idx = 0; idx < end; idx++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, idx);
+        if (flags & STREAM_IN_STRING) {
+            if (flags & STREAM_ESCAPE) {
+                flags &= ~STREAM_ESCAPE;
+            }
+            else if (c == '\\') {
+                flags |= STREAM_ESCAPE;
+            }
+            else if (c == '"') {
+                flags &= ~STREAM_IN_STRING;
+                if (depth == level) {
+                    if (_add_span(spans, start, idx + 1) < 0) {
+                        goto bail;
+                    }
+                    flags &= ~STREAM_IN_VALUE;
+                }
+            }
+            continue;
+        }
+        if (flags & STREAM_IN_SCALAR) {
+            switch (c) {
+            case ' ': case '\t': case '\n': case '\r': case ',':
+            case '[': case ']': case '{': case '}': case '"':
+                if (_add_span(spans, start, idx) < 0) {
+                    goto bail;
+                }
+                flags &= ~(STREAM_IN_SCALAR | STREAM_IN_VALUE);
+                break;
+            default:
+                continue;
+            }
+        }
+        switch (c) {
+        case '"':
+            flags |= STREAM_IN_STRING;
+            if (depth == level) {
+                flags |= STREAM_IN_VALUE;
+                start = idx;
+            }
+            break;
+        case '[': case '{':
+            if (depth == level) {
+                flags |= STREAM_IN_VALUE;
+                start = idx;
+            }
+            depth++;
+            break;
+        case ']': case '}':
+            if (depth > level) {
+                depth--;
+                if (depth == level) {
+                    if (_add_span(spans, start, idx + 1) < 0) {
+                        goto bail;
+                    }
+                    flags &= ~STREAM_IN_VALUE;
+                }
+            }
+            else if (depth > 0) {
+                depth--;
+            }
+            else if (level == 0) {
+                /* Let the decoder report the unexpected character */
+                if (_add_span(spans, idx, idx + 1) < 0) {
+                    goto bail;
+                }
+            }
+            break;
+        case ' ': case '\t': case '\n': case '\r':
+            break;
+        default:
+            if (depth == level && (c != ',' || level == 0)) {
+                flags |= STREAM_IN_SCALAR | STREAM_IN_VALUE;
+                start = idx;
+            }
+        }
+    }
+    return Py_BuildValue("(Nnin)", spans, depth, flags, start);
+
+bail:
+    Py_DECREF(spans);
+    return NULL;
+}
+
 PyDoc_STRVAR(pydoc_encode_basestring_ascii,
     "encode_basestring_ascii(string) -> string\n"
     "\n"
@@ -1255,17 +1413,17 @@ PyTypeObject PyScannerType = {
 static PyObject *
 encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 {
-    static char *kwlist[] = {"markers", "default", "encoder", "indent", "key_separator", "item_separator", "sort_keys", "skipkeys", "allow_nan", NULL};
+    static char *kwlist[] = {"markers", "default", "encoder", "indent", "key_separator", "item_separator", "sort_keys", "skipkeys", "allow_nan", "fields", NULL};
 
     PyEncoderObject *s;
     PyObject *markers, *defaultfn, *encoder, *indent, *key_separator;
-    PyObject *item_separator;
+    PyObject *item_separator, *fields = Py_None;
     int sort_keys, skipkeys, allow_nan;
 
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOUUppp:make_encoder", kwlist,
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOUUppp|O:make_encoder", kwlist,
         &markers, &defaultfn, &encoder, &indent,
         &key_separator, &item_separator,
-        &sort_keys, &skipkeys, &allow_nan))
+        &sort_keys, &skipkeys, &allow_nan, &fields))
         return NULL;
 
     if (markers != Py_None && !PyDict_Check(markers)) {
@@ -1274,6 +1432,12 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
                      "not %.200s", Py_TYPE(markers)->tp_name);
         return NULL;
     }
+    if (fields != Py_None && !PyDict_Check(fields)) {
+        PyErr_Format(PyExc_TypeError,
+                     "make_encoder() argument 10 must be dict or None, "
+                     "not %.200s", Py_TYPE(fields)->tp_name);
+        return NULL;
+    }
 
     s = (PyEncoderObject *)type->tp_alloc(type, 0);
     if (s == NULL)
@@ -1285,6 +1449,7 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     s->indent = indent;
     s->key_separator = key_separator;
     s->item_separator = item_separator;
+    s->fields = fields;
     s->sort_keys = sort_keys;
     s->skipkeys = skipkeys;
     s->allow_nan = allow_nan;
@@ -1303,9 +1468,76 @@ encoder_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
     Py_INCREF(s->indent);
     Py_INCREF(s->key_separator);
     Py_INCREF(s->item_separator);
+    Py_INCREF(s->fields);
     return (PyObject *)s;
 }
 
+static int
+_JSONAccu_Accumulate(_JSONAccu *acc, PyObject *unicode)
+{
+    const char *data;
+    Py_ssize_t len;
+    PyObject *utf8 = NULL;
+
+    if (acc->bytes == NULL) {
+        return _PyAccu_Accumulate(&acc->accu, unicode);
+    }
+
+    if (PyUnicode_READY(unicode) == -1) {
+        return -1;
+    }
+    if (PyUnicode_IS_ASCII(unicode)) {
+        data = (const char *)PyUnicode_DATA(unicode);
+        len = PyUnicode_GET_LENGTH(unicode);
+    }
+    else {
+        utf8 = PyUnicode_AsUTF8String(unicode);
+        if (utf8 == NULL) {
+            return -1;
+        }
+        data = PyBytes_AS_STRING(utf8);
+        len = PyBytes_GET_SIZE(utf8);
+    }
+
+    if (len > PyBytes_GET_SIZE(acc->bytes) - acc->size) {
+        Py_ssize_t allocated = PyBytes_GET_SIZE(acc->bytes);
+        if (allocated > (PY_SSIZE_T_MAX - len) / 2) {
+            Py_XDECREF(utf8);
+            PyErr_NoMemory();
+            return -1;
+        }
+        /* Overallocate to resize the buffer in amortized linear time */
+        allocated = allocated * 2 + len;
+        if (_PyBytes_Resize(&acc->bytes, allocated) < 0) {
+            Py_XDECREF(utf8);
+            return -1;
+        }
+    }
+    memcpy(PyBytes_AS_STRING(acc->bytes) + acc->size, data, len);
+    acc->size += len;
+    Py_XDECREF(utf8);
+
+    if (acc->write != NULL && acc->size >= acc->flush_size) {
+        /* Pass the buffer itself to write() and start a new one */
+        PyObject *res;
+        if (_PyBytes_Resize(&acc->bytes, acc->size) < 0) {
+            return -1;
+        }
+        res = _PyObject_CallOneArg(acc->write, acc->bytes);
+        Py_CLEAR(acc->bytes);
+        acc->size = 0;
+        if (res == NULL) {
+            return -1;
+        }
+        Py_DECREF(res);
+        acc->bytes = PyBytes_FromStringAndSize(NULL, acc->flush_size);
+        if (acc->bytes == NULL) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
 static PyObject *
 encoder_call(PyObject *self, PyObject *args, PyObject *kwds)
 {
@@ -1314,22 +1546,85 @@ encoder_call(PyObject *self, PyObject *args, PyObject *kwds)
     PyObject *obj;
     Py_ssize_t indent_level;
     PyEncoderObject *s;
-    _PyAccu acc;
+    _JSONAccu acc = {.bytes = NULL};
 
     assert(PyEncoder_Check(self));
     s = (PyEncoderObject *)self;
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "On:_iterencode", kwlist,
         &obj, &indent_level))
         return NULL;
-    if (_PyAccu_Init(&acc))
+    if (_PyAccu_Init(&acc.accu))
         return NULL;
     if (encoder_listencode_obj(s, &acc, obj, indent_level)) {
-        _PyAccu_Destroy(&acc);
+        _PyAccu_Destroy(&acc.accu);
+        return NULL;
+    }
+    return _PyAccu_FinishAsList(&acc.accu);
+}
+
+PyDoc_STRVAR(encoder_encode_bytes_doc,
+"encode_bytes(obj, write=None, flush_size=65536)\n\
+\n\
+Return the JSON representation of obj encoded to UTF-8.\n\
+\n\
+If write is not None, call it with bytes objects of about flush_size\n\
+bytes as the output is produced, and return None instead.");
+
+static PyObject *
+encoder_encode_bytes(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"obj", "write", "flush_size", NULL};
+    PyObject *obj;
+    PyObject *write = Py_None;
+    Py_ssize_t flush_size = 65536;
+    PyEncoderObject *s;
+    _JSONAccu acc;
+
+    assert(PyEncoder_Check(self));
+    s = (PyEncoderObject *)self;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|On:encode_bytes", kwlist,
+        &obj, &write, &flush_size))
+        return NULL;
+    if (flush_size <= 0) {
+        PyErr_SetString(PyExc_ValueError, "flush_size must be positive");
+        return NULL;
+    }
+    acc.size = 0;
+    acc.write = write == Py_None ? NULL : write;
+    acc.flush_size = flush_size;
+    /* Without write(), start small: the output is returned as is */
+    acc.bytes = PyBytes_FromStringAndSize(NULL,
+                                          acc.write ? flush_size : 256);
+    if (acc.bytes == NULL)
+        return NULL;
+    if (encoder_listencode_obj(s, &acc, obj, 0)) {
+        Py_XDECREF(acc.bytes);
         return NULL;
     }
-    return _PyAccu_FinishAsList(&acc);
+    if (_PyBytes_Resize(&acc.bytes, acc.size) < 0)
+        return NULL;
+    if (acc.write == NULL) {
+        return acc.bytes;
+    }
+    if (acc.size > 0) {
+        PyObject *res = _PyObject_CallOneArg(acc.write, acc.bytes);
+        Py_DECREF(acc.bytes);
+        if (res == NULL)
+            return NULL;
+        Py_DECREF(res);
+    }
+    else {
+        Py_DECREF(acc.bytes);
+    }
+    Py_RETURN_NONE;
 }
 
+static PyMethodDef encoder_methods[] = {
+    {"encode_bytes", (PyCFunction)(void(*)(void))encoder_encode_bytes,
+     METH_VARARGS | METH_KEYWORDS, encoder_encode_bytes_doc},
+    {NULL, NULL}
+};
+
 static PyObject *
 _encoded_const(PyObject *obj)
 {
@@ -1411,20 +1706,20 @@ encoder_encode_string(PyEncoderObject *s, PyObject *obj)
 }
 
 static int
-_steal_accumulate(_PyAccu *acc, PyObject *stolen)
+_steal_accumulate(_JSONAccu *acc, PyObject *stolen)
 {
     /* Append stolen and then decrement its reference count */
-    int rval = _PyAccu_Accumulate(acc, stolen);
+    int rval = _JSONAccu_Accumulate(acc, stolen);
     Py_DECREF(stolen);
     return rval;
 }
 
 static int
-encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_obj(PyEncoderObject *s, _JSONAccu *acc,
                        PyObject *obj, Py_ssize_t indent_level)
 {
     /* Encode Python object obj to a JSON term */
-    PyObject *newobj;
+    PyObject *newobj, *names;
     int rv;
 
     if (obj == Py_None || obj == Py_True || obj == Py_False) {
@@ -1452,6 +1747,18 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
             return -1;
         return _steal_accumulate(acc, encoded);
     }
+    else if (s->fields != Py_None &&
+             (names = PyDict_GetItemWithError(s->fields,
+                                              (PyObject *)Py_TYPE(obj)))) {
+        if (Py_EnterRecursiveCall(" while encoding a JSON object"))
+            return -1;
+        rv = encoder_listencode_fields(s, acc, obj, names, indent_level);
+        Py_LeaveRecursiveCall();
+        return rv;
+    }
+    else if (s->fields != Py_None && PyErr_Occurred()) {
+        return -1;
+    }
     else if (PyList_Check(obj) || PyTuple_Check(obj)) {
         if (Py_EnterRecursiveCall(" while encoding a JSON object"))
             return -1;
@@ -1516,7 +1823,7 @@ encoder_listencode_obj(PyEncoderObject *s, _PyAccu *acc,
 }
 
 static int
-encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_dict(PyEncoderObject *s, _JSONAccu *acc,
                         PyObject *dct, Py_ssize_t indent_level)
 {
     /* Encode Python dict dct a JSON term */
@@ -1538,7 +1845,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
             return -1;
     }
     if (PyDict_GET_SIZE(dct) == 0)  /* Fast path */
-        return _PyAccu_Accumulate(acc, empty_dict);
+        return _JSONAccu_Accumulate(acc, empty_dict);
 
     if (s->markers != Py_None) {
         int has_key;
@@ -1556,7 +1863,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
     }
 
-    if (_PyAccu_Accumulate(acc, open_dict))
+    if (_JSONAccu_Accumulate(acc, open_dict))
         goto bail;
 
     if (s->indent != Py_None) {
@@ -1622,7 +1929,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         }
 
         if (idx) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_JSONAccu_Accumulate(acc, s->item_separator))
                 goto bail;
         }
 
@@ -1630,12 +1937,12 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
         Py_CLEAR(kstr);
         if (encoded == NULL)
             goto bail;
-        if (_PyAccu_Accumulate(acc, encoded)) {
+        if (_JSONAccu_Accumulate(acc, encoded)) {
             Py_DECREF(encoded);
             goto bail;
         }
         Py_DECREF(encoded);
-        if (_PyAccu_Accumulate(acc, s->key_separator))
+        if (_JSONAccu_Accumulate(acc, s->key_separator))
             goto bail;
 
         value = PyTuple_GET_ITEM(item, 1);
@@ -1659,7 +1966,7 @@ encoder_listencode_dict(PyEncoderObject *s, _PyAccu *acc,
 
         yield '\n' + (' ' * (_indent * _current_indent_level))
     }*/
-    if (_PyAccu_Accumulate(acc, close_dict))
+    if (_JSONAccu_Accumulate(acc, close_dict))
         goto bail;
     return 0;
 
@@ -1671,9 +1978,111 @@ bail:
     return -1;
 }
 
+static int
+encoder_listencode_fields(PyEncoderObject *s, _JSONAccu *acc,
+                          PyObject *obj, PyObject *names,
+                          Py_ssize_t indent_level)
+{
+    /* Encode the fields of a dataclass or named tuple obj as a JSON object.
+       names is the tuple of the field names, in declaration order. */
+    static PyObject *open_dict = NULL;
+    static PyObject *close_dict = NULL;
+    static PyObject *empty_dict = NULL;
+    PyObject *ident = NULL;
+    PyObject *sorted_names = NULL;
+    Py_ssize_t i;
+
+    if (open_dict == NULL || close_dict == NULL || empty_dict == NULL) {
+        open_dict = PyUnicode_InternFromString("{");
+        close_dict = PyUnicode_InternFromString("}");
+        empty_dict = PyUnicode_InternFromString("{}");
+        if (open_dict == NULL || close_dict == NULL || empty_dict == NULL)
+            return -1;
+    }
+    if (!PyTuple_Check(names)) {
+        PyErr_SetString(PyExc_TypeError, "field names must be a tuple");
+        return -1;
+    }
+    if (PyTuple_GET_SIZE(names) == 0)  /* Fast path */
+        return _JSONAccu_Accumulate(acc, empty_dict);
+
+    if (s->markers != Py_None) {
+        int has_key;
+        ident = PyLong_FromVoidPtr(obj);
+        if (ident == NULL)
+            goto bail;
+        has_key = PyDict_Contains(s->markers, ident);
+        if (has_key) {
+            if (has_key != -1)
+                PyErr_SetString(PyExc_ValueError, "Circular reference detected");
+            goto bail;
+        }
+        if (PyDict_SetItem(s->markers, ident, obj)) {
+            goto bail;
+        }
+    }
+
+    if (s->sort_keys) {
+        sorted_names = PySequence_List(names);
+        if (sorted_names == NULL || PyList_Sort(sorted_names) < 0)
+            goto bail;
+        names = sorted_names;
+    }
+
+    if (_JSONAccu_Accumulate(acc, open_dict))
+        goto bail;
+    for (i = 0; i < PySequence_Fast_GET_SIZE(names); i++) {
+        PyObject *encoded, *value;
+        PyObject *name = PySequence_Fast_GET_ITEM(names, i);
+        if (!PyUnicode_Check(name)) {
+            PyErr_Format(PyExc_TypeError,
+                         "field names must be str, not %.100s",
+                         Py_TYPE(name)->tp_name);
+            goto bail;
+        }
+        if (i) {
+            if (_JSONAccu_Accumulate(acc, s->item_separator))
+                goto bail;
+        }
+        encoded = encoder_encode_string(s, name);
+        if (encoded == NULL)
+            goto bail;
+        if (_JSONAccu_Accumulate(acc, encoded)) {
+            Py_DECREF(encoded);
+            goto bail;
+        }
+        Py_DECREF(encoded);
+        if (_JSONAccu_Accumulate(acc, s->key_separator))
+            goto bail;
+
+        value = PyObject_GetAttr(obj, name);
+        if (value == NULL)
+            goto bail;
+        if (encoder_listencode_obj(s, acc, value, indent_level)) {
+            Py_DECREF(value);
+            goto bail;
+        }
+        Py_DECREF(value);
+    }
+    Py_CLEAR(sorted_names);
+
+    if (ident != NULL) {
+        if (PyDict_DelItem(s->markers, ident))
+            goto bail;
+        Py_CLEAR(ident);
+    }
+    if (_JSONAccu_Accumulate(acc, close_dict))
+        goto bail;
+    return 0;
+
+bail:
+    Py_XDECREF(sorted_names);
+    Py_XDECREF(ident);
+    return -1;
+}
 
 static int
-encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
+encoder_listencode_list(PyEncoderObject *s, _JSONAccu *acc,
                         PyObject *seq, Py_ssize_t indent_level)
 {
     /* Encode Python list seq to a JSON term */
@@ -1697,7 +2106,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         return -1;
     if (PySequence_Fast_GET_SIZE(s_fast) == 0) {
         Py_DECREF(s_fast);
-        return _PyAccu_Accumulate(acc, empty_array);
+        return _JSONAccu_Accumulate(acc, empty_array);
     }
 
     if (s->markers != Py_None) {
@@ -1716,7 +2125,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
         }
     }
 
-    if (_PyAccu_Accumulate(acc, open_array))
+    if (_JSONAccu_Accumulate(acc, open_array))
         goto bail;
     if (s->indent != Py_None) {
         /* TODO: DOES NOT RUN */
@@ -1730,7 +2139,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
     for (i = 0; i < PySequence_Fast_GET_SIZE(s_fast); i++) {
         PyObject *obj = PySequence_Fast_GET_ITEM(s_fast, i);
         if (i) {
-            if (_PyAccu_Accumulate(acc, s->item_separator))
+            if (_JSONAccu_Accumulate(acc, s->item_separator))
                 goto bail;
         }
         if (encoder_listencode_obj(s, acc, obj, indent_level))
@@ -1748,7 +2157,7 @@ encoder_listencode_list(PyEncoderObject *s, _PyAccu *acc,
 
         yield '\n' + (' ' * (_indent * _current_indent_level))
     }*/
-    if (_PyAccu_Accumulate(acc, close_array))
+    if (_JSONAccu_Accumulate(acc, close_array))
         goto bail;
     Py_DECREF(s_fast);
     return 0;
@@ -1780,6 +2189,7 @@ encoder_traverse(PyObject *self, visitproc visit, void *arg)
     Py_VISIT(s->indent);
     Py_VISIT(s->key_separator);
     Py_VISIT(s->item_separator);
+    Py_VISIT(s->fields);
     return 0;
 }
 
@@ -1796,6 +2206,7 @@ encoder_clear(PyObject *self)
     Py_CLEAR(s->indent);
     Py_CLEAR(s->key_separator);
     Py_CLEAR(s->item_separator);
+    Py_CLEAR(s->fields);
     return 0;
 }
 
@@ -1830,7 +2241,7 @@ PyTypeObject PyEncoderType = {
     0,                    /* tp_weaklistoffset */
     0,                    /* tp_iter */
     0,                    /* tp_iternext */
-    0,                    /* tp_methods */
+    encoder_methods,      /* tp_methods */
     encoder_members,      /* tp_members */
     0,                    /* tp_getset */
     0,                    /* tp_base */
@@ -1857,6 +2268,10 @@ static PyMethodDef speedups_methods[] = {
         (PyCFunction)py_scanstring,
         METH_VARARGS,
         pydoc_scanstring},
+    {"scan_stream",
+        (PyCFunction)py_scan_stream,
+        METH_VARARGS,
+        pydoc_scan_stream},
     {NULL, NULL, 0, NULL}
 };
 
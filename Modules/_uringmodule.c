@@ -0,0 +1,1099 @@
+/*
+ * Support for Linux io_uring, used by asyncio's UringEventLoop.
+ *
+ * A Ring queues operations in the submission queue shared with the kernel
+ * and hands them all over in a single io_uring_enter() call, which also
+ * reaps the completions.  Buffers of in-flight operations are kept alive
+ * in a dictionary indexed by the key given by the caller until their
+ * completion is reaped.
+ */
+
+#include "Python.h"
+
+#include <linux/io_uring.h>
+#include <poll.h>
+#include <sys/mman.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+
+#if !defined(__NR_io_uring_setup) || !defined(__NR_io_uring_enter)
+#  error "io_uring system calls are not available"
+#endif
+
+/* user_data of the operations whose completion is not reported */
+#define INTERNAL_KEY 0
+
+/*[clinic input]
+module _uring
+class _uring.Ring "RingObject *" "&RingType"
+[clinic start generated code]*/
+/*[clinic end generated code: output=da39a3ee5e6b4b0d input=4b2b2e732b720aff]*/
+
+static PyTypeObject RingType;
+
+typedef struct {
+    PyObject_HEAD
+    int fd;
+    /* submission queue */
+    unsigned *sq_khead;
+    unsigned *sq_ktail;
+    unsigned sq_mask;
+    unsigned sq_entries;
+    unsigned sq_tail;                   /* local copy of *sq_ktail */
+    struct io_uring_sqe *sqes;
+    /* completion queue */
+    unsigned *cq_khead;
+    unsigned *cq_ktail;
+    unsigned cq_mask;
+    struct io_uring_cqe *cqes;
+    /* mappings */
+    void *sq_ring;
+    size_t sq_ring_size;
+    void *cq_ring;
+    size_t cq_ring_size;
+    size_t sqes_size;
+    /* key => bytes or memoryview used by an in-flight operation */
+    PyObject *ops;
+    /* list of reaped (key, result, data) tuples */
+    PyObject *completed;
+} RingObject;
+
+
+static PyObject *
+ring_err_closed(void)
+{
+    PyErr_SetString(PyExc_ValueError, "I/O operation on closed ring");
+    return NULL;
+}
+
+static int
+ring_enter(RingObject *self, unsigned to_submit, unsigned min_complete,
+           unsigned flags, struct io_uring_getevents_arg *arg)
+{
+    return (int)syscall(__NR_io_uring_enter, self->fd, to_submit,
+                        min_complete, flags, arg,
+                        arg != NULL ? sizeof(*arg) : 0);
+}
+
+static unsigned
+ring_unsubmitted(RingObject *self)
+{
+    return self->sq_tail - __atomic_load_n(self->sq_khead, __ATOMIC_ACQUIRE);
+}
+
+/* Move the completions from the completion queue to self->completed.
+
+   On error, the failing completion and the following ones are left in the
+   completion queue for the next call: the futures of their operations
+   would never complete if they were dropped. */
+static int
+ring_reap(RingObject *self)
+{
+    unsigned head = *self->cq_khead;
+    unsigned tail = __atomic_load_n(self->cq_ktail, __ATOMIC_ACQUIRE);
+    int status = 0;
+
+    for (; head != tail; head++) {
+        struct io_uring_cqe *cqe = &self->cqes[head & self->cq_mask];
+        PyObject *key, *obj, *item, *data;
+        int res = cqe->res;
+
+        if (cqe->user_data == INTERNAL_KEY) {
+            continue;
+        }
+        key = PyLong_FromUnsignedLongLong(cqe->user_data);
+        if (key == NULL) {
+            status = -1;
+            break;
+        }
+        obj = PyDict_GetItemWithError(self->ops, key);
+        if (obj == NULL) {
+            Py_DECREF(key);
+            if (PyErr_Occurred()) {
+                status = -1;
+                break;
+            }
+            continue;
+        }
+        /* Report the completion before forgetting the operation, so that
+           nothing can fail once it is removed from self->ops.  The data
+           is filled in below. */
+        item = Py_BuildValue("NiO", key, res, Py_None);
+        if (item == NULL) {
+            status = -1;
+            break;
+        }
+        if (PyList_Append(self->completed, item) < 0) {
+            Py_DECREF(item);
+            status = -1;
+            break;
+        }
+        Py_DECREF(item);
+        Py_INCREF(obj);
+        /* Cannot fail: the int key was just found. */
+        (void)PyDict_DelItem(self->ops, key);
+        if (PyBytes_CheckExact(obj) && res >= 0) {
+            /* We own the only reference: shrink the buffer to what was
+               actually read. */
+            if (res != PyBytes_GET_SIZE(obj) &&
+                _PyBytes_Resize(&obj, res) < 0) {
+                /* The buffer was freed: report the operation as failed
+                   instead of reaping it again. */
+                PyObject *err;
+
+                PyErr_Clear();
+                err = PyLong_FromLong(-ENOMEM);
+                if (err == NULL) {
+                    status = -1;
+                    head++;
+                    break;
+                }
+                Py_SETREF(PyTuple_GET_ITEM(item, 1), err);
+                continue;
+            }
+            data = obj;
+        }
+        else {
+            /* Releases the buffer of a memoryview. */
+            Py_DECREF(obj);
+            continue;
+        }
+        Py_SETREF(PyTuple_GET_ITEM(item, 2), data);
+    }
+    __atomic_store_n(self->cq_khead, head, __ATOMIC_RELEASE);
+    return status;
+}
+
+/* Hand the queued operations to the kernel without waiting. */
+static int
+ring_flush(RingObject *self)
+{
+    for (;;) {
+        unsigned to_submit = ring_unsubmitted(self);
+        int ret;
+
+        if (to_submit == 0) {
+            return 0;
+        }
+        ret = ring_enter(self, to_submit, 0, 0, NULL);
+        if (ret > 0) {
+            continue;
+        }
+        if (ret == 0) {
+            errno = EBUSY;
+        }
+        if (errno == EINTR) {
+            if (PyErr_CheckSignals()) {
+                return -1;
+            }
+        }
+        else if (errno == EAGAIN || errno == EBUSY) {
+            /* The completion queue is full: make room, flushing the
+               completions kept by the kernel on overflow. */
+            if (ring_reap(self) < 0) {
+                return -1;
+            }
+            if (ring_enter(self, 0, 0, IORING_ENTER_GETEVENTS, NULL) < 0 &&
+                errno != EINTR && errno != EAGAIN && errno != EBUSY) {
+                PyErr_SetFromErrno(PyExc_OSError);
+                return -1;
+            }
+            if (ring_reap(self) < 0) {
+                return -1;
+            }
+        }
+        else {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return -1;
+        }
+    }
+}
+
+static struct io_uring_sqe *
+ring_get_sqe(RingObject *self, unsigned long long user_data)
+{
+    struct io_uring_sqe *sqe;
+
+    if (ring_unsubmitted(self) >= self->sq_entries) {
+        /* The submission queue is full: submit it early. */
+        if (ring_flush(self) < 0) {
+            return NULL;
+        }
+    }
+    sqe = &self->sqes[self->sq_tail & self->sq_mask];
+    memset(sqe, 0, sizeof(*sqe));
+    sqe->user_data = user_data;
+    return sqe;
+}
+
+static void
+ring_push_sqe(RingObject *self)
+{
+    self->sq_tail++;
+    __atomic_store_n(self->sq_ktail, self->sq_tail, __ATOMIC_RELEASE);
+}
+
+/* Register obj as the buffer owner of the operation key and return the
+   submission queue entry to fill. */
+static struct io_uring_sqe *
+ring_prepare(RingObject *self, PyObject *key, PyObject *obj)
+{
+    unsigned long long user_data;
+    struct io_uring_sqe *sqe;
+    int contains;
+
+    if (self->fd < 0) {
+        ring_err_closed();
+        return NULL;
+    }
+    user_data = PyLong_AsUnsignedLongLong(key);
+    if (user_data == (unsigned long long)-1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (user_data == INTERNAL_KEY) {
+        PyErr_SetString(PyExc_ValueError, "key must be greater than 0");
+        return NULL;
+    }
+    contains = PyDict_Contains(self->ops, key);
+    if (contains < 0) {
+        return NULL;
+    }
+    if (contains) {
+        PyErr_Format(PyExc_ValueError, "operation %R is already pending",
+                     key);
+        return NULL;
+    }
+    if (PyDict_SetItem(self->ops, key, obj) < 0) {
+        return NULL;
+    }
+    sqe = ring_get_sqe(self, user_data);
+    if (sqe == NULL) {
+        PyObject *type, *value, *traceback;
+        PyErr_Fetch(&type, &value, &traceback);
+        (void)PyDict_DelItem(self->ops, key);
+        PyErr_Restore(type, value, traceback);
+    }
+    return sqe;
+}
+
+static PyObject *
+ring_buffer(PyObject *buffer, int writable)
+{
+    PyObject *view = PyMemoryView_FromObject(buffer);
+    Py_buffer *buf;
+
+    if (view == NULL) {
+        return NULL;
+    }
+    buf = PyMemoryView_GET_BUFFER(view);
+    if (writable && buf->readonly) {
+        Py_DECREF(view);
+        PyErr_SetString(PyExc_TypeError, "buffer is read-only");
+        return NULL;
+    }
+    if (!PyBuffer_IsContiguous(buf, 'C')) {
+        Py_DECREF(view);
+        PyErr_SetString(PyExc_TypeError, "buffer is not contiguous");
+        return NULL;
+    }
+    return view;
+}
+
+static PyObject *
+ring_rw(RingObject *self, PyObject *key, int opcode, int fd, PyObject *obj,
+        char *addr, Py_ssize_t len, unsigned long long off, int flags)
+{
+    struct io_uring_sqe *sqe;
+
+    sqe = ring_prepare(self, key, obj);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = opcode;
+    sqe->fd = fd;
+    sqe->addr = (unsigned long long)(uintptr_t)addr;
+    sqe->len = (unsigned)Py_MIN(len, (Py_ssize_t)UINT_MAX);
+    sqe->off = off;
+    sqe->msg_flags = flags;
+    ring_push_sqe(self);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+ring_rw_bytes(RingObject *self, PyObject *key, int opcode, int fd,
+              Py_ssize_t nbytes, unsigned long long off, int flags)
+{
+    PyObject *buf, *res;
+
+    if (nbytes < 0) {
+        PyErr_SetString(PyExc_ValueError, "negative buffersize");
+        return NULL;
+    }
+    buf = PyBytes_FromStringAndSize(NULL, nbytes);
+    if (buf == NULL) {
+        return NULL;
+    }
+    res = ring_rw(self, key, opcode, fd, buf, PyBytes_AS_STRING(buf),
+                  nbytes, off, flags);
+    Py_DECREF(buf);
+    return res;
+}
+
+static PyObject *
+ring_rw_buffer(RingObject *self, PyObject *key, int opcode, int fd,
+               PyObject *buffer, int writable, unsigned long long off,
+               int flags)
+{
+    PyObject *view, *res;
+    Py_buffer *buf;
+
+    view = ring_buffer(buffer, writable);
+    if (view == NULL) {
+        return NULL;
+    }
+    buf = PyMemoryView_GET_BUFFER(view);
+    res = ring_rw(self, key, opcode, fd, view, buf->buf, buf->len, off,
+                  flags);
+    Py_DECREF(view);
+    return res;
+}
+
+static int
+ring_setup(RingObject *self, unsigned entries)
+{
+    struct io_uring_params p;
+    unsigned *array;
+    unsigned i;
+    int fd;
+
+    memset(&p, 0, sizeof(p));
+#ifdef IORING_SETUP_CLAMP
+    p.flags |= IORING_SETUP_CLAMP;
+#endif
+#ifdef IORING_SETUP_COOP_TASKRUN
+    /* The ring is only used by the thread running the event loop: there is
+       no need to interrupt it to run completion work. */
+    p.flags |= IORING_SETUP_COOP_TASKRUN;
+#endif
+    Py_BEGIN_ALLOW_THREADS
+    fd = (int)syscall(__NR_io_uring_setup, entries, &p);
+#ifdef IORING_SETUP_COOP_TASKRUN
+    if (fd < 0 && errno == EINVAL) {
+        /* Linux older than 5.19 */
+        p.flags &= ~IORING_SETUP_COOP_TASKRUN;
+        fd = (int)syscall(__NR_io_uring_setup, entries, &p);
+    }
+#endif
+    Py_END_ALLOW_THREADS
+    if (fd < 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    self->fd = fd;
+    if (!(p.features & IORING_FEAT_EXT_ARG) ||
+        !(p.features & IORING_FEAT_NODROP)) {
+        /* Linux older than 5.11 */
+        errno = ENOSYS;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+
+    self->sq_ring_size = p.sq_off.array + p.sq_entries * sizeof(unsigned);
+    self->cq_ring_size = (p.cq_off.cqes +
+                          p.cq_entries * sizeof(struct io_uring_cqe));
+    if (p.features & IORING_FEAT_SINGLE_MMAP) {
+        self->sq_ring_size = self->cq_ring_size = Py_MAX(self->sq_ring_size,
+                                                         self->cq_ring_size);
+    }
+    self->sq_ring = mmap(NULL, self->sq_ring_size, PROT_READ | PROT_WRITE,
+                         MAP_SHARED | MAP_POPULATE, fd, IORING_OFF_SQ_RING);
+    if (self->sq_ring == MAP_FAILED) {
+        self->sq_ring = NULL;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    if (p.features & IORING_FEAT_SINGLE_MMAP) {
+        self->cq_ring = self->sq_ring;
+    }
+    else {
+        self->cq_ring = mmap(NULL, self->cq_ring_size,
+                             PROT_READ | PROT_WRITE,
+                             MAP_SHARED | MAP_POPULATE, fd,
+                             IORING_OFF_CQ_RING);
+        if (self->cq_ring == MAP_FAILED) {
+            self->cq_ring = NULL;
+            PyErr_SetFromErrno(PyExc_OSError);
+            return -1;
+        }
+    }
+    self->sqes_size = p.sq_entries * sizeof(struct io_uring_sqe);
+    self->sqes = mmap(NULL, self->sqes_size, PROT_READ | PROT_WRITE,
+                      MAP_SHARED | MAP_POPULATE, fd, IORING_OFF_SQES);
+    if (self->sqes == MAP_FAILED) {
+        self->sqes = NULL;
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+
+    self->sq_khead = (unsigned *)((char *)self->sq_ring + p.sq_off.head);
+    self->sq_ktail = (unsigned *)((char *)self->sq_ring + p.sq_off.tail);
+    self->sq_mask = *(unsigned *)((char *)self->sq_ring + p.sq_off.ring_mask);
+    self->sq_entries = p.sq_entries;
+    self->sq_tail = *self->sq_ktail;
+    array = (unsigned *)((char *)self->sq_ring + p.sq_off.array);
+    for (i = 0; i < p.sq_entries; i++) {
+        array[i] = i;
+    }
+    self->cq_khead = (unsigned *)((char *)self->cq_ring + p.cq_off.head);
+    self->cq_ktail = (unsigned *)((char *)self->cq_ring + p.cq_off.tail);
+    self->cq_mask = *(unsigned *)((char *)self->cq_ring + p.cq_off.ring_mask);
+    self->cqes = (struct io_uring_cqe *)((char *)self->cq_ring +
+                                         p.cq_off.cqes);
+    return 0;
+}
+
+/* Cancel the pending operations and wait until the kernel is done with
+   their buffers. */
+static void
+ring_drain(RingObject *self)
+{
+    PyObject *type, *value, *traceback;
+    PyObject *keys;
+    Py_ssize_t i;
+
+    if (self->ops == NULL || PyDict_GET_SIZE(self->ops) == 0) {
+        return;
+    }
+    PyErr_Fetch(&type, &value, &traceback);
+    /* Queuing may reap completions and so mutate self->ops. */
+    keys = PyDict_Keys(self->ops);
+    if (keys == NULL) {
+        PyErr_Clear();
+        keys = PyList_New(0);
+    }
+    for (i = 0; keys != NULL && i < PyList_GET_SIZE(keys); i++) {
+        struct io_uring_sqe *sqe;
+        unsigned long long user_data;
+
+        user_data = PyLong_AsUnsignedLongLong(PyList_GET_ITEM(keys, i));
+
+        sqe = ring_get_sqe(self, INTERNAL_KEY);
+        if (sqe == NULL) {
+            PyErr_Clear();
+            break;
+        }
+        sqe->opcode = IORING_OP_ASYNC_CANCEL;
+        sqe->fd = -1;
+        sqe->addr = user_data;
+        ring_push_sqe(self);
+    }
+    Py_XDECREF(keys);
+    while (PyDict_GET_SIZE(self->ops) > 0) {
+        int ret;
+
+        Py_BEGIN_ALLOW_THREADS
+        ret = ring_enter(self, ring_unsubmitted(self), 1,
+                         IORING_ENTER_GETEVENTS, NULL);
+        Py_END_ALLOW_THREADS
+        if (ret < 0 && errno != EINTR && errno != EAGAIN &&
+            errno != EBUSY) {
+            break;
+        }
+        if (ring_reap(self) < 0) {
+            PyErr_Clear();
+            break;
+        }
+    }
+    Py_CLEAR(self->completed);
+    self->completed = PyList_New(0);
+    if (self->completed == NULL) {
+        PyErr_Clear();
+    }
+    PyErr_Restore(type, value, traceback);
+}
+
+static int
+ring_internal_close(RingObject *self)
+{
+    int save_errno = 0;
+
+    if (self->fd >= 0) {
+        ring_drain(self);
+    }
+    if (self->sqes != NULL) {
+        munmap(self->sqes, self->sqes_size);
+        self->sqes = NULL;
+    }
+    if (self->cq_ring != NULL && self->cq_ring != self->sq_ring) {
+        munmap(self->cq_ring, self->cq_ring_size);
+    }
+    self->cq_ring = NULL;
+    if (self->sq_ring != NULL) {
+        munmap(self->sq_ring, self->sq_ring_size);
+        self->sq_ring = NULL;
+    }
+    if (self->fd >= 0) {
+        int fd = self->fd;
+        self->fd = -1;
+        Py_BEGIN_ALLOW_THREADS
+        if (close(fd) < 0)
+            save_errno = errno;
+        Py_END_ALLOW_THREADS
+    }
+    return save_errno;
+}
+
+/*[clinic input]
+@classmethod
+_uring.Ring.__new__ as ring_new
+
+    entries: unsigned_int(bitwise=False) = 256
+        The size of the submission queue.  Larger values are rounded up
+        to a power of 2 and clamped to the maximum supported by the kernel.
+
+Create an io_uring instance.
+[clinic start generated code]*/
+
+static PyObject *
+ring_new_impl(PyTypeObject *type, unsigned int entries)
+/*[clinic end generated code: output=f848e982461875a8 input=f4d3821167f33958]*/
+{
+    RingObject *self;
+
+    if (entries == 0) {
+        PyErr_SetString(PyExc_ValueError, "entries must be greater than 0");
+        return NULL;
+    }
+    self = (RingObject *)type->tp_alloc(type, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->fd = -1;
+    self->ops = PyDict_New();
+    self->completed = PyList_New(0);
+    if (self->ops == NULL || self->completed == NULL ||
+        ring_setup(self, entries) < 0) {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject *)self;
+}
+
+static void
+ring_dealloc(RingObject *self)
+{
+    (void)ring_internal_close(self);
+    Py_CLEAR(self->ops);
+    Py_CLEAR(self->completed);
+    Py_TYPE(self)->tp_free(self);
+}
+
+/*[clinic input]
+_uring.Ring.close
+
+Close the ring.
+
+Pending operations are cancelled first, waiting until the kernel
+no longer uses their buffers.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_close_impl(RingObject *self)
+/*[clinic end generated code: output=447415269da3419f input=2793e1a88775b3c6]*/
+{
+    errno = ring_internal_close(self);
+    if (errno != 0) {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+ring_get_closed(RingObject *self, void *Py_UNUSED(ignored))
+{
+    return PyBool_FromLong(self->fd < 0);
+}
+
+static PyObject *
+ring_get_pending(RingObject *self, void *Py_UNUSED(ignored))
+{
+    return PyLong_FromSsize_t(self->ops != NULL ?
+                              PyDict_GET_SIZE(self->ops) : 0);
+}
+
+/*[clinic input]
+_uring.Ring.fileno
+
+Return the io_uring file descriptor.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_fileno_impl(RingObject *self)
+/*[clinic end generated code: output=773263c5ad53ca3d input=ec7799adb2a5c450]*/
+{
+    if (self->fd < 0)
+        return ring_err_closed();
+    return PyLong_FromLong(self->fd);
+}
+
+/*[clinic input]
+_uring.Ring.recv
+
+    key: object
+    fd: int
+    nbytes: Py_ssize_t
+    flags: int = 0
+    /
+
+Queue a recv() of up to nbytes bytes from the socket fd.
+
+The data of the completion is the bytes received.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_recv_impl(RingObject *self, PyObject *key, int fd,
+                      Py_ssize_t nbytes, int flags)
+/*[clinic end generated code: output=7f9e4f473ba7ae46 input=2c89c18e52bf88d3]*/
+{
+    return ring_rw_bytes(self, key, IORING_OP_RECV, fd, nbytes, 0, flags);
+}
+
+/*[clinic input]
+_uring.Ring.recv_into
+
+    key: object
+    fd: int
+    buffer: object
+    flags: int = 0
+    /
+
+Queue a recv() from the socket fd into a writable buffer.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_recv_into_impl(RingObject *self, PyObject *key, int fd,
+                           PyObject *buffer, int flags)
+/*[clinic end generated code: output=b0c6f6aad3341ef4 input=e274b3ea536de41e]*/
+{
+    return ring_rw_buffer(self, key, IORING_OP_RECV, fd, buffer, 1, 0,
+                          flags);
+}
+
+/*[clinic input]
+_uring.Ring.send
+
+    key: object
+    fd: int
+    buffer: object
+    flags: int = 0
+    /
+
+Queue a send() of the buffer to the socket fd.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_send_impl(RingObject *self, PyObject *key, int fd,
+                      PyObject *buffer, int flags)
+/*[clinic end generated code: output=7033028f5cd0c3ea input=dc09ca30f9f853fe]*/
+{
+    return ring_rw_buffer(self, key, IORING_OP_SEND, fd, buffer, 0, 0,
+                          flags);
+}
+
+/*[clinic input]
+_uring.Ring.read
+
+    key: object
+    fd: int
+    nbytes: Py_ssize_t
+    offset: long_long = -1
+        The file offset to read at, or -1 to read at the current file
+        position and advance it.
+    /
+
+Queue a read() of up to nbytes bytes from the file descriptor fd.
+
+The data of the completion is the bytes read.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_read_impl(RingObject *self, PyObject *key, int fd,
+                      Py_ssize_t nbytes, long long offset)
+/*[clinic end generated code: output=f9d26f77048d2c58 input=cc5469c578fc0764]*/
+{
+    return ring_rw_bytes(self, key, IORING_OP_READ, fd, nbytes,
+                         (unsigned long long)offset, 0);
+}
+
+/*[clinic input]
+_uring.Ring.read_into
+
+    key: object
+    fd: int
+    buffer: object
+    offset: long_long = -1
+    /
+
+Queue a read() from the file descriptor fd into a writable buffer.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_read_into_impl(RingObject *self, PyObject *key, int fd,
+                           PyObject *buffer, long long offset)
+/*[clinic end generated code: output=0daccca776b78f3d input=51d75a6dbe66ba4b]*/
+{
+    return ring_rw_buffer(self, key, IORING_OP_READ, fd, buffer, 1,
+                          (unsigned long long)offset, 0);
+}
+
+/*[clinic input]
+_uring.Ring.write
+
+    key: object
+    fd: int
+    buffer: object
+    offset: long_long = -1
+    /
+
+Queue a write() of the buffer to the file descriptor fd.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_write_impl(RingObject *self, PyObject *key, int fd,
+                       PyObject *buffer, long long offset)
+/*[clinic end generated code: output=f5fecb5aaf72d56d input=e0cc1db53f0c43aa]*/
+{
+    return ring_rw_buffer(self, key, IORING_OP_WRITE, fd, buffer, 0,
+                          (unsigned long long)offset, 0);
+}
+
+/*[clinic input]
+_uring.Ring.accept
+
+    key: object
+    fd: int
+    flags: int = 0
+        Flags of the accepted socket, such as SOCK_CLOEXEC.
+    /
+
+Queue an accept() on the listening socket fd.
+
+The result of the completion is the file descriptor of the new
+connection.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_accept_impl(RingObject *self, PyObject *key, int fd, int flags)
+/*[clinic end generated code: output=4e11dc687d8b862b input=a641045d6da8ddba]*/
+{
+    struct io_uring_sqe *sqe;
+
+    sqe = ring_prepare(self, key, Py_None);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = IORING_OP_ACCEPT;
+    sqe->fd = fd;
+    sqe->accept_flags = (unsigned)flags;
+    ring_push_sqe(self);
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+_uring.Ring.poll
+
+    key: object
+    fd: int
+    eventmask: unsigned_int(bitwise=True)
+        The events to wait for, such as select.POLLIN.
+    /
+
+Queue a one-shot poll() of the file descriptor fd.
+
+The result of the completion is the mask of the events which occurred.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_poll_impl(RingObject *self, PyObject *key, int fd,
+                      unsigned int eventmask)
+/*[clinic end generated code: output=b744f04f551de0a8 input=4738bb5925971e47]*/
+{
+    struct io_uring_sqe *sqe;
+    unsigned events = eventmask;
+
+    sqe = ring_prepare(self, key, Py_None);
+    if (sqe == NULL) {
+        return NULL;
+    }
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_BIG_ENDIAN__
+    events = (events << 16) | (events >> 16);
+#endif
+    sqe->opcode = IORING_OP_POLL_ADD;
+    sqe->fd = fd;
+    sqe->poll32_events = events;
+    ring_push_sqe(self);
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+_uring.Ring.cancel
+
+    key: object
+    /
+
+Request the cancellation of the pending operation key.
+
+The cancelled operation still completes, usually with -ECANCELED, and
+its buffer is kept alive until then.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_cancel(RingObject *self, PyObject *key)
+/*[clinic end generated code: output=da3ff7e793d6af1b input=12f60cc4ef705556]*/
+{
+    struct io_uring_sqe *sqe;
+    unsigned long long user_data;
+
+    if (self->fd < 0)
+        return ring_err_closed();
+    user_data = PyLong_AsUnsignedLongLong(key);
+    if (user_data == (unsigned long long)-1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    sqe = ring_get_sqe(self, INTERNAL_KEY);
+    if (sqe == NULL) {
+        return NULL;
+    }
+    sqe->opcode = IORING_OP_ASYNC_CANCEL;
+    sqe->fd = -1;
+    sqe->addr = user_data;
+    ring_push_sqe(self);
+    Py_RETURN_NONE;
+}
+
+/*[clinic input]
+_uring.Ring.submit
+
+    timeout as timeout_obj: object = None
+        The maximum time to wait for a completion in seconds: None waits
+        forever and 0 does not wait at all.
+
+Submit the queued operations and wait for completions.
+
+Return a list of (key, result, data) tuples.  result is the return value
+of the operation, or a negative errno value on failure.  data is the
+bytes object read by recv() and read(), or None.
+[clinic start generated code]*/
+
+static PyObject *
+_uring_Ring_submit_impl(RingObject *self, PyObject *timeout_obj)
+/*[clinic end generated code: output=4b791db1b82bd678 input=15fdda96efa2b60c]*/
+{
+    struct __kernel_timespec ts;
+    struct io_uring_getevents_arg arg;
+    _PyTime_t timeout = -1, deadline = 0;
+    PyObject *completed;
+    int ret;
+
+    if (self->fd < 0)
+        return ring_err_closed();
+
+    if (timeout_obj != Py_None) {
+        if (_PyTime_FromSecondsObject(&timeout, timeout_obj,
+                                      _PyTime_ROUND_TIMEOUT) < 0) {
+            if (PyErr_ExceptionMatches(PyExc_TypeError)) {
+                PyErr_SetString(PyExc_TypeError,
+                                "timeout must be a number or None");
+            }
+            return NULL;
+        }
+        if (timeout < 0) {
+            timeout = 0;
+        }
+        deadline = _PyTime_GetMonotonicClock() + timeout;
+    }
+
+    if (ring_reap(self) < 0) {
+        return NULL;
+    }
+    if (PyList_GET_SIZE(self->completed) > 0 || timeout == 0) {
+        if (ring_flush(self) < 0 || ring_reap(self) < 0) {
+            return NULL;
+        }
+        goto done;
+    }
+
+    memset(&arg, 0, sizeof(arg));
+    do {
+        unsigned to_submit = ring_unsubmitted(self);
+
+        if (timeout >= 0) {
+            struct timespec tv;
+            if (_PyTime_AsTimespec(timeout, &tv) < 0) {
+                return NULL;
+            }
+            ts.tv_sec = tv.tv_sec;
+            ts.tv_nsec = tv.tv_nsec;
+            arg.ts = (unsigned long long)(uintptr_t)&ts;
+        }
+        Py_BEGIN_ALLOW_THREADS
+        ret = ring_enter(self, to_submit, 1,
+                         IORING_ENTER_GETEVENTS | IORING_ENTER_EXT_ARG,
+                         &arg);
+        Py_END_ALLOW_THREADS
+
+        if (ret >= 0 && (unsigned)ret < to_submit) {
+            /* Not everything was submitted: the completion queue must be
+               drained first. */
+            ret = -1;
+            errno = EBUSY;
+        }
+        if (ret >= 0 || errno == ETIME) {
+            break;
+        }
+        if (errno == EINTR) {
+            /* interrupted by a signal */
+            if (PyErr_CheckSignals()) {
+                return NULL;
+            }
+        }
+        else if (errno == EAGAIN || errno == EBUSY) {
+            if (ring_reap(self) < 0) {
+                return NULL;
+            }
+            if (PyList_GET_SIZE(self->completed) > 0) {
+                break;
+            }
+        }
+        else {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return NULL;
+        }
+
+        if (timeout >= 0) {
+            timeout = deadline - _PyTime_GetMonotonicClock();
+            if (timeout < 0) {
+                timeout = 0;
+            }
+        }
+        /* retry io_uring_enter() with the recomputed timeout */
+    } while (1);
+
+    if (ring_reap(self) < 0 || ring_flush(self) < 0) {
+        return NULL;
+    }
+
+done:
+    completed = self->completed;
+    self->completed = PyList_New(0);
+    if (self->completed == NULL) {
+        self->completed = completed;
+        return NULL;
+    }
+    return completed;
+}
+
+
+#include "clinic/_uringmodule.c.h"
+
+static PyMethodDef ring_methods[] = {
+    _URING_RING_ACCEPT_METHODDEF
+    _URING_RING_CANCEL_METHODDEF
+    _URING_RING_CLOSE_METHODDEF
+    _URING_RING_FILENO_METHODDEF
+    _URING_RING_POLL_METHODDEF
+    _URING_RING_READ_METHODDEF
+    _URING_RING_READ_INTO_METHODDEF
+    _URING_RING_RECV_METHODDEF
+    _URING_RING_RECV_INTO_METHODDEF
+    _URING_RING_SEND_METHODDEF
+    _URING_RING_SUBMIT_METHODDEF
+    _URING_RING_WRITE_METHODDEF
+    {NULL, NULL}
+};
+
+static PyGetSetDef ring_getsetlist[] = {
+    {"closed", (getter)ring_get_closed, NULL,
+     "True if the ring is closed"},
+    {"pending", (getter)ring_get_pending, NULL,
+     "Number of operations whose completion was not reaped yet"},
+    {NULL}
+};
+
+static PyTypeObject RingType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    "_uring.Ring",                      /*tp_name*/
+    sizeof(RingObject),                 /*tp_basicsize*/
+    0,                                  /*tp_itemsize*/
+    /* methods */
+    (destructor)ring_dealloc,           /*tp_dealloc*/
+    0,                                  /*tp_vectorcall_offset*/
+    0,                                  /*tp_getattr*/
+    0,                                  /*tp_setattr*/
+    0,                                  /*tp_as_async*/
+    0,                                  /*tp_repr*/
+    0,                                  /*tp_as_number*/
+    0,                                  /*tp_as_sequence*/
+    0,                                  /*tp_as_mapping*/
+    0,                                  /*tp_hash*/
+    0,                                  /*tp_call*/
+    0,                                  /*tp_str*/
+    0,                                  /*tp_getattro*/
+    0,                                  /*tp_setattro*/
+    0,                                  /*tp_as_buffer*/
+    Py_TPFLAGS_DEFAULT,                 /*tp_flags*/
+    ring_new__doc__,                    /*tp_doc*/
+    0,                                  /*tp_traverse*/
+    0,                                  /*tp_clear*/
+    0,                                  /*tp_richcompare*/
+    0,                                  /*tp_weaklistoffset*/
+    0,                                  /*tp_iter*/
+    0,                                  /*tp_iternext*/
+    ring_methods,                       /*tp_methods*/
+    0,                                  /*tp_members*/
+    ring_getsetlist,                    /*tp_getset*/
+    0,                                  /*tp_base*/
+    0,                                  /*tp_dict*/
+    0,                                  /*tp_descr_get*/
+    0,                                  /*tp_descr_set*/
+    0,                                  /*tp_dictoffset*/
+    0,                                  /*tp_init*/
+    0,                                  /*tp_alloc*/
+    ring_new,                           /*tp_new*/
+};
+
+
+PyDoc_STRVAR(uring_module_doc,
+"Linux io_uring support for asyncio.\n\
+This module is an implementation detail, please do not use it directly.");
+
+static struct PyModuleDef uringmodule = {
+    PyModuleDef_HEAD_INIT,
+    "_uring",
+    uring_module_doc,
+    -1,
+    NULL,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__uring(void)
+{
+    PyObject *m;
+
+    m = PyModule_Create(&uringmodule);
+    if (m == NULL)
+        return NULL;
+
+    if (PyType_Ready(&RingType) < 0)
+        return NULL;
+    Py_INCREF(&RingType);
+    if (PyModule_AddObject(m, "Ring", (PyObject *)&RingType) < 0)
+        return NULL;
+
+    return m;
+}
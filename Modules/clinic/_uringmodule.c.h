@@ -0,0 +1,624 @@
+/*[clinic input]
+preserve
+[clinic start generated code]*/
+
+PyDoc_STRVAR(ring_new__doc__,
+"Ring(entries=256)\n"
+"--\n"
+"\n"
+"Create an io_uring instance.\n"
+"\n"
+"  entries\n"
+"    The size of the submission queue.  Larger values are rounded up\n"
+"    to a power of 2 and clamped to the maximum supported by the kernel.");
+
+static PyObject *
+ring_new_impl(PyTypeObject *type, unsigned int entries);
+
+static PyObject *
+ring_new(PyTypeObject *type, PyObject *args, PyObject *kwargs)
+{
+    PyObject *return_value = NULL;
+    static const char * const _keywords[] = {"entries", NULL};
+    static _PyArg_Parser _parser = {NULL, _keywords, "Ring", 0};
+    PyObject *argsbuf[1];
+    PyObject * const *fastargs;
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    Py_ssize_t noptargs = nargs + (kwargs ? PyDict_GET_SIZE(kwargs) : 0) - 0;
+    unsigned int entries = 256;
+
+    fastargs = _PyArg_UnpackKeywords(_PyTuple_CAST(args)->ob_item, nargs, kwargs, NULL, &_parser, 0, 1, 0, argsbuf);
+    if (!fastargs) {
+        goto exit;
+    }
+    if (!noptargs) {
+        goto skip_optional_pos;
+    }
+    if (!_PyLong_UnsignedInt_Converter(fastargs[0], &entries)) {
+        goto exit;
+    }
+skip_optional_pos:
+    return_value = ring_new_impl(type, entries);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_close__doc__,
+"close($self, /)\n"
+"--\n"
+"\n"
+"Close the ring.\n"
+"\n"
+"Pending operations are cancelled first, waiting until the kernel\n"
+"no longer uses their buffers.");
+
+#define _URING_RING_CLOSE_METHODDEF    \
+    {"close", (PyCFunction)_uring_Ring_close, METH_NOARGS, _uring_Ring_close__doc__},
+
+static PyObject *
+_uring_Ring_close_impl(RingObject *self);
+
+static PyObject *
+_uring_Ring_close(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return _uring_Ring_close_impl(self);
+}
+
+PyDoc_STRVAR(_uring_Ring_fileno__doc__,
+"fileno($self, /)\n"
+"--\n"
+"\n"
+"Return the io_uring file descriptor.");
+
+#define _URING_RING_FILENO_METHODDEF    \
+    {"fileno", (PyCFunction)_uring_Ring_fileno, METH_NOARGS, _uring_Ring_fileno__doc__},
+
+static PyObject *
+_uring_Ring_fileno_impl(RingObject *self);
+
+static PyObject *
+_uring_Ring_fileno(RingObject *self, PyObject *Py_UNUSED(ignored))
+{
+    return _uring_Ring_fileno_impl(self);
+}
+
+PyDoc_STRVAR(_uring_Ring_recv__doc__,
+"recv($self, key, fd, nbytes, flags=0, /)\n"
+"--\n"
+"\n"
+"Queue a recv() of up to nbytes bytes from the socket fd.\n"
+"\n"
+"The data of the completion is the bytes received.");
+
+#define _URING_RING_RECV_METHODDEF    \
+    {"recv", (PyCFunction)(void(*)(void))_uring_Ring_recv, METH_FASTCALL, _uring_Ring_recv__doc__},
+
+static PyObject *
+_uring_Ring_recv_impl(RingObject *self, PyObject *key, int fd,
+                      Py_ssize_t nbytes, int flags);
+
+static PyObject *
+_uring_Ring_recv(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    Py_ssize_t nbytes;
+    int flags = 0;
+
+    if (!_PyArg_CheckPositional("recv", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    if (PyFloat_Check(args[2])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    {
+        Py_ssize_t ival = -1;
+        PyObject *iobj = PyNumber_Index(args[2]);
+        if (iobj != NULL) {
+            ival = PyLong_AsSsize_t(iobj);
+            Py_DECREF(iobj);
+        }
+        if (ival == -1 && PyErr_Occurred()) {
+            goto exit;
+        }
+        nbytes = ival;
+    }
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    flags = _PyLong_AsInt(args[3]);
+    if (flags == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_recv_impl(self, key, fd, nbytes, flags);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_recv_into__doc__,
+"recv_into($self, key, fd, buffer, flags=0, /)\n"
+"--\n"
+"\n"
+"Queue a recv() from the socket fd into a writable buffer.");
+
+#define _URING_RING_RECV_INTO_METHODDEF    \
+    {"recv_into", (PyCFunction)(void(*)(void))_uring_Ring_recv_into, METH_FASTCALL, _uring_Ring_recv_into__doc__},
+
+static PyObject *
+_uring_Ring_recv_into_impl(RingObject *self, PyObject *key, int fd,
+                           PyObject *buffer, int flags);
+
+static PyObject *
+_uring_Ring_recv_into(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    PyObject *buffer;
+    int flags = 0;
+
+    if (!_PyArg_CheckPositional("recv_into", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    buffer = args[2];
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    flags = _PyLong_AsInt(args[3]);
+    if (flags == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_recv_into_impl(self, key, fd, buffer, flags);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_send__doc__,
+"send($self, key, fd, buffer, flags=0, /)\n"
+"--\n"
+"\n"
+"Queue a send() of the buffer to the socket fd.");
+
+#define _URING_RING_SEND_METHODDEF    \
+    {"send", (PyCFunction)(void(*)(void))_uring_Ring_send, METH_FASTCALL, _uring_Ring_send__doc__},
+
+static PyObject *
+_uring_Ring_send_impl(RingObject *self, PyObject *key, int fd,
+                      PyObject *buffer, int flags);
+
+static PyObject *
+_uring_Ring_send(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    PyObject *buffer;
+    int flags = 0;
+
+    if (!_PyArg_CheckPositional("send", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    buffer = args[2];
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    flags = _PyLong_AsInt(args[3]);
+    if (flags == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_send_impl(self, key, fd, buffer, flags);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_read__doc__,
+"read($self, key, fd, nbytes, offset=-1, /)\n"
+"--\n"
+"\n"
+"Queue a read() of up to nbytes bytes from the file descriptor fd.\n"
+"\n"
+"  offset\n"
+"    The file offset to read at, or -1 to read at the current file\n"
+"    position and advance it.\n"
+"\n"
+"The data of the completion is the bytes read.");
+
+#define _URING_RING_READ_METHODDEF    \
+    {"read", (PyCFunction)(void(*)(void))_uring_Ring_read, METH_FASTCALL, _uring_Ring_read__doc__},
+
+static PyObject *
+_uring_Ring_read_impl(RingObject *self, PyObject *key, int fd,
+                      Py_ssize_t nbytes, long long offset);
+
+static PyObject *
+_uring_Ring_read(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    Py_ssize_t nbytes;
+    long long offset = -1;
+
+    if (!_PyArg_CheckPositional("read", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    if (PyFloat_Check(args[2])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    {
+        Py_ssize_t ival = -1;
+        PyObject *iobj = PyNumber_Index(args[2]);
+        if (iobj != NULL) {
+            ival = PyLong_AsSsize_t(iobj);
+            Py_DECREF(iobj);
+        }
+        if (ival == -1 && PyErr_Occurred()) {
+            goto exit;
+        }
+        nbytes = ival;
+    }
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    offset = PyLong_AsLongLong(args[3]);
+    if (offset == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_read_impl(self, key, fd, nbytes, offset);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_read_into__doc__,
+"read_into($self, key, fd, buffer, offset=-1, /)\n"
+"--\n"
+"\n"
+"Queue a read() from the file descriptor fd into a writable buffer.");
+
+#define _URING_RING_READ_INTO_METHODDEF    \
+    {"read_into", (PyCFunction)(void(*)(void))_uring_Ring_read_into, METH_FASTCALL, _uring_Ring_read_into__doc__},
+
+static PyObject *
+_uring_Ring_read_into_impl(RingObject *self, PyObject *key, int fd,
+                           PyObject *buffer, long long offset);
+
+static PyObject *
+_uring_Ring_read_into(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    PyObject *buffer;
+    long long offset = -1;
+
+    if (!_PyArg_CheckPositional("read_into", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    buffer = args[2];
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    offset = PyLong_AsLongLong(args[3]);
+    if (offset == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_read_into_impl(self, key, fd, buffer, offset);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_write__doc__,
+"write($self, key, fd, buffer, offset=-1, /)\n"
+"--\n"
+"\n"
+"Queue a write() of the buffer to the file descriptor fd.");
+
+#define _URING_RING_WRITE_METHODDEF    \
+    {"write", (PyCFunction)(void(*)(void))_uring_Ring_write, METH_FASTCALL, _uring_Ring_write__doc__},
+
+static PyObject *
+_uring_Ring_write_impl(RingObject *self, PyObject *key, int fd,
+                       PyObject *buffer, long long offset);
+
+static PyObject *
+_uring_Ring_write(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    PyObject *buffer;
+    long long offset = -1;
+
+    if (!_PyArg_CheckPositional("write", nargs, 3, 4)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    buffer = args[2];
+    if (nargs < 4) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[3])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    offset = PyLong_AsLongLong(args[3]);
+    if (offset == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_write_impl(self, key, fd, buffer, offset);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_accept__doc__,
+"accept($self, key, fd, flags=0, /)\n"
+"--\n"
+"\n"
+"Queue an accept() on the listening socket fd.\n"
+"\n"
+"  flags\n"
+"    Flags of the accepted socket, such as SOCK_CLOEXEC.\n"
+"\n"
+"The result of the completion is the file descriptor of the new\n"
+"connection.");
+
+#define _URING_RING_ACCEPT_METHODDEF    \
+    {"accept", (PyCFunction)(void(*)(void))_uring_Ring_accept, METH_FASTCALL, _uring_Ring_accept__doc__},
+
+static PyObject *
+_uring_Ring_accept_impl(RingObject *self, PyObject *key, int fd, int flags);
+
+static PyObject *
+_uring_Ring_accept(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    int flags = 0;
+
+    if (!_PyArg_CheckPositional("accept", nargs, 2, 3)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    if (nargs < 3) {
+        goto skip_optional;
+    }
+    if (PyFloat_Check(args[2])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    flags = _PyLong_AsInt(args[2]);
+    if (flags == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+skip_optional:
+    return_value = _uring_Ring_accept_impl(self, key, fd, flags);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_poll__doc__,
+"poll($self, key, fd, eventmask, /)\n"
+"--\n"
+"\n"
+"Queue a one-shot poll() of the file descriptor fd.\n"
+"\n"
+"  eventmask\n"
+"    The events to wait for, such as select.POLLIN.\n"
+"\n"
+"The result of the completion is the mask of the events which occurred.");
+
+#define _URING_RING_POLL_METHODDEF    \
+    {"poll", (PyCFunction)(void(*)(void))_uring_Ring_poll, METH_FASTCALL, _uring_Ring_poll__doc__},
+
+static PyObject *
+_uring_Ring_poll_impl(RingObject *self, PyObject *key, int fd,
+                      unsigned int eventmask);
+
+static PyObject *
+_uring_Ring_poll(RingObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *return_value = NULL;
+    PyObject *key;
+    int fd;
+    unsigned int eventmask;
+
+    if (!_PyArg_CheckPositional("poll", nargs, 3, 3)) {
+        goto exit;
+    }
+    key = args[0];
+    if (PyFloat_Check(args[1])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    fd = _PyLong_AsInt(args[1]);
+    if (fd == -1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    if (PyFloat_Check(args[2])) {
+        PyErr_SetString(PyExc_TypeError,
+                        "integer argument expected, got float" );
+        goto exit;
+    }
+    eventmask = (unsigned int)PyLong_AsUnsignedLongMask(args[2]);
+    if (eventmask == (unsigned int)-1 && PyErr_Occurred()) {
+        goto exit;
+    }
+    return_value = _uring_Ring_poll_impl(self, key, fd, eventmask);
+
+exit:
+    return return_value;
+}
+
+PyDoc_STRVAR(_uring_Ring_cancel__doc__,
+"cancel($self, key, /)\n"
+"--\n"
+"\n"
+"Request the cancellation of the pending operation key.\n"
+"\n"
+"The cancelled operation still completes, usually with -ECANCELED, and\n"
+"its buffer is kept alive until then.");
+
+#define _URING_RING_CANCEL_METHODDEF    \
+    {"cancel", (PyCFunction)_uring_Ring_cancel, METH_O, _uring_Ring_cancel__doc__},
+
+PyDoc_STRVAR(_uring_Ring_submit__doc__,
+"submit($self, /, timeout=None)\n"
+"--\n"
+"\n"
+"Submit the queued operations and wait for completions.\n"
+"\n"
+"  timeout\n"
+"    The maximum time to wait for a completion in seconds: None waits\n"
+"    forever and 0 does not wait at all.\n"
+"\n"
+"Return a list of (key, result, data) tuples.  result is the return value\n"
+"of the operation, or a negative errno value on failure.  data is the\n"
+"bytes object read by recv() and read(), or None.");
+
+#define _URING_RING_SUBMIT_METHODDEF    \
+    {"submit", (PyCFunction)(void(*)(void))_uring_Ring_submit, METH_FASTCALL|METH_KEYWORDS, _uring_Ring_submit__doc__},
+
+static PyObject *
+_uring_Ring_submit_impl(RingObject *self, PyObject *timeout_obj);
+
+static PyObject *
+_uring_Ring_submit(RingObject *self, PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *return_value = NULL;
+    static const char * const _keywords[] = {"timeout", NULL};
+    static _PyArg_Parser _parser = {NULL, _keywords, "submit", 0};
+    PyObject *argsbuf[1];
+    Py_ssize_t noptargs = nargs + (kwnames ? PyTuple_GET_SIZE(kwnames) : 0) - 0;
+    PyObject *timeout_obj = Py_None;
+
+    args = _PyArg_UnpackKeywords(args, nargs, NULL, kwnames, &_parser, 0, 1, 0, argsbuf);
+    if (!args) {
+        goto exit;
+    }
+    if (!noptargs) {
+        goto skip_optional_pos;
+    }
+    timeout_obj = args[0];
+skip_optional_pos:
+    return_value = _uring_Ring_submit_impl(self, timeout_obj);
+
+exit:
+    return return_value;
+}
+/*[clinic end generated code: output=70bb929081a84299 input=a9049054013a1b77]*/
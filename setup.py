@@ -1477,6 +1477,20 @@ class PyBuildExt(build_ext):
         elif not AIX:
             self.missing.append('ossaudiodev')
 
+        # Linux io_uring, used by asyncio.UringEventLoop.  The getevents
+        # argument of io_uring_enter() appeared in Linux 5.11.
+        if HOST_PLATFORM.startswith('linux'):
+            have_uring = False
+            uring_inc = find_file('linux/io_uring.h', [], self.inc_dirs)
+            if uring_inc is not None:
+                uring_h = os.path.join(uring_inc[0], 'linux', 'io_uring.h')
+                with open(uring_h) as fp:
+                    have_uring = 'IORING_ENTER_EXT_ARG' in fp.read()
+            if have_uring:
+                self.add(Extension('_uring', ['_uringmodule.c']))
+            else:
+                self.missing.append('_uring')
+
         if MACOS:
             self.add(Extension('_scproxy', ['_scproxy.c'],
                                extra_link_args=[